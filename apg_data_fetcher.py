@@ -10,12 +10,14 @@ import json
 import time
 import random
 
+import data_sources
+
 class APGDataFetcher:
     """Lädt echte APG (Austrian Power Grid) Spot-Preise"""
     
     def __init__(self):
         self.base_url = "https://www.apg.at"
-        self.session = requests.Session()
+        self.session = data_sources.session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -2,6 +2,8 @@
 """
 APG Scheduler für automatische 2025-Daten
 Lädt täglich aktuelle österreichische Spot-Preise
+
+Hinweis: Im Dauerbetrieb durch ingestion_scheduler.py ersetzt (ein Prozess für alle Quellen).
 """
 
 import schedule
@@ -2,6 +2,8 @@
 """
 APG Scheduler für Windows (Lokale Entwicklung)
 Automatischer Import von österreichischen Spot-Preisen
+
+Hinweis: Im Dauerbetrieb durch ingestion_scheduler.py ersetzt (ein Prozess für alle Quellen).
 """
 
 import os
@@ -143,27 +145,22 @@ class APGSchedulerWindows:
                 return False
             
             # Daten in Datenbank importieren
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            from app.price_ingestion import upsert_spot_prices
             
-            imported_count = 0
+            conn = sqlite3.connect(self.db_path)
+            records = []
             for entry in data['data']:
                 timestamp = datetime.fromtimestamp(entry['start_timestamp'] / 1000)
                 price = entry['marketprice'] / 10  # aWattar gibt Preise in 0.1 €/MWh
                 
-                try:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO spot_price 
-                        (timestamp, price_eur_mwh, source, region, price_type)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (timestamp, price, 'aWattar (Österreich)', 'AT', 'Day-Ahead'))
-                    imported_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Fehler beim Import eines Datensatzes: {e}")
+                records.append({'timestamp': timestamp, 'price_eur_mwh': price})
             
-            conn.commit()
+            result = upsert_spot_prices(conn, records, source='aWattar (Österreich)',
+                                        region='AT', price_type='Day-Ahead')
             conn.close()
+            if result['skipped']:
+                logger.warning(f"⚠️ {result['skipped']} ungültige Datensätze übersprungen")
+            imported_count = len(records) - result['skipped']
             
             logger.info(f"✅ {imported_count} aWattar-Daten erfolgreich importiert")
             self.log_action("awattar_import", "success", 
@@ -186,12 +183,13 @@ class APGSchedulerWindows:
             logger.info("🎭 Starte Demo-Datenimport...")
             self.log_action("demo_import", "started", "Demo-Datenimport gestartet")
             
+            from app.price_ingestion import upsert_spot_prices
+            
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
             
             # Generiere realistische österreichische Spot-Preise für heute
             today = datetime.now().date()
-            imported_count = 0
+            records = []
             
             for hour in range(24):
                 timestamp = datetime.combine(today, datetime.min.time()) + timedelta(hours=hour)
@@ -201,19 +199,14 @@ class APGSchedulerWindows:
                 price = base_price + (hash(str(timestamp)) % 40 - 20)  # Zufällige Schwankung
                 price = max(30, min(120, price))  # Begrenzen auf realistische Werte
                 
-                try:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO spot_price 
-                        (timestamp, price_eur_mwh, source, region, price_type)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (timestamp, price, 'Demo (Windows-Entwicklung)', 'AT', 'Day-Ahead'))
-                    imported_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Fehler beim Demo-Import: {e}")
+                records.append({'timestamp': timestamp, 'price_eur_mwh': price})
             
-            conn.commit()
+            result = upsert_spot_prices(conn, records, source='Demo (Windows-Entwicklung)',
+                                        region='AT', price_type='Day-Ahead')
             conn.close()
+            if result['skipped']:
+                logger.warning(f"⚠️ {result['skipped']} ungültige Datensätze übersprungen")
+            imported_count = len(records) - result['skipped']
             
             logger.info(f"✅ {imported_count} Demo-Daten importiert")
             self.log_action("demo_import", "success", 
@@ -5,23 +5,121 @@ from flask_login import LoginManager
 from config import Config
 import sqlite3
 import os
+import logging
 
 # Monitoring & Logging Imports
 from .logging_config import setup_logging
 from .monitoring_middleware import init_monitoring
 from .monitoring_routes import monitoring_bp
+from .request_profiling import ProfiledConnection
 from .mcp_api import mcp_api
 
+logger = logging.getLogger(__name__)
+
 db = SQLAlchemy()
 csrf = CSRFProtect()
 login_manager = LoginManager()
 
 def get_db():
-    """Datenbankverbindung für SQLite"""
-    conn = sqlite3.connect('instance/bess.db')
+    """Datenbankverbindung für SQLite (Abfragen zählen in die Request-Statistik)"""
+    conn = sqlite3.connect('instance/bess.db', factory=ProfiledConnection)
     conn.row_factory = sqlite3.Row
     return conn
 
+# Blueprints in Registrierungsreihenfolge: (Feature, Modul, Blueprint-Name, Optionen)
+# Feature None = immer aktiv; optionale Subsysteme über BESS_FEATURES abschaltbar
+BLUEPRINTS = [
+    (None, '.routes', 'main_bp', {}),
+    ('ml', '.ml_routes', 'ml_bp', {}),
+    (None, '.pwa_routes', 'pwa_bp', {}),
+    (None, '.routes_config', 'config_bp', {}),
+    (None, '.auth_routes_local', 'auth_local_bp', {}),
+    ('multi_user', 'multi_user.multi_user_routes', 'multi_user_bp', {}),
+    (None, '.admin_routes', 'admin_bp', {}),
+    ('export', '.export_routes', 'export_bp', {}),
+    (None, '.api_routes', 'api_bp', {}),
+    ('ml', '.ml_api', 'ml_bp', {}),
+    (None, '.notification_routes', 'notification_bp', {}),
+    (None, '.mcp_api', 'mcp_api', {}),
+    ('co2', '.co2_routes', 'co2_bp', {'name': 'co2_tracking'}),
+    ('climate', '.climate_routes', 'climate_bp', {'url_prefix': '/climate'}),
+    ('advanced_dispatch', '.advanced_dispatch_routes', 'advanced_dispatch_bp', {}),
+    (None, '.monitoring_routes', 'monitoring_bp', {}),
+    (None, '.jobs', 'jobs_bp', {}),
+]
+
+OPTIONAL_FEATURES = sorted({feature for feature, *_ in BLUEPRINTS if feature})
+
+# Endpunkte optionaler Features, auf die Kern-Templates und -Routen verlinken
+# (Blueprint-Name, URL-Präfix, Endpunkte). Ist das Feature aus, leiten Platzhalter
+# auf die Startseite um, damit url_for() keinen BuildError wirft.
+FEATURE_STUB_ENDPOINTS = {
+    'multi_user': ('multi_user', '/multi-user', ['dashboard']),
+    'export': ('export', '/export', ['export_center']),
+    'advanced_dispatch': ('advanced_dispatch', '/advanced-dispatch', ['dashboard']),
+    'co2': ('co2_tracking', '/co2', ['co2_dashboard']),
+}
+
+
+def enabled_features(setting: str = 'all') -> set:
+    """BESS_FEATURES auswerten: "all", "core" (nur Kern) oder kommagetrennte Feature-Liste"""
+    setting = (setting or 'all').strip().lower()
+    if setting == 'all':
+        return set(OPTIONAL_FEATURES)
+    return {feature.strip() for feature in setting.split(',') if feature.strip() in OPTIONAL_FEATURES}
+
+
+def register_blueprints(app):
+    """Kern-Blueprints immer, optionale Subsysteme nur wenn per BESS_FEATURES aktiviert
+
+    Abgeschaltete Features werden gar nicht importiert; ML- und CO₂-Routen laden
+    pandas bzw. scikit-learn ohnehin erst beim ersten Request (siehe lazy_imports).
+    """
+    import importlib
+
+    features = enabled_features(app.config.get('BESS_FEATURES', 'all'))
+    failed = set()
+    for feature, module_name, attr, options in BLUEPRINTS:
+        if feature is None:
+            module = importlib.import_module(module_name, __name__)
+            app.register_blueprint(getattr(module, attr), **options)
+            continue
+        if feature not in features:
+            print(f"[INFO] Feature '{feature}' deaktiviert ({module_name} nicht geladen)")
+            continue
+        try:
+            module = importlib.import_module(module_name, __name__)
+            app.register_blueprint(getattr(module, attr), **options)
+            print(f"[OK] Feature '{feature}' registriert ({module_name})")
+        except Exception as e:
+            failed.add(feature)
+            logger.warning(f"Feature '{feature}' nicht verfuegbar ({module_name}): {e}", exc_info=True)
+
+    # Nur tatsächlich registrierte Features gelten als aktiv (feature_enabled in Templates)
+    active = features - failed
+    app.config['BESS_ENABLED_FEATURES'] = sorted(active)
+    register_feature_stubs(app, active)
+
+
+def register_feature_stubs(app, active: set):
+    """Platzhalter-Endpunkte für abgeschaltete Features (siehe FEATURE_STUB_ENDPOINTS)"""
+    from flask import Blueprint, redirect, url_for
+
+    def disabled_feature():
+        return redirect(url_for('main.index'))
+
+    for feature, (name, url_prefix, endpoints) in FEATURE_STUB_ENDPOINTS.items():
+        if feature in active or name in app.blueprints:
+            continue
+        stub = Blueprint(name, __name__, url_prefix=url_prefix)
+        for endpoint in endpoints:
+            stub.add_url_rule(f"/{endpoint.replace('_', '-')}", endpoint, disabled_feature)
+        app.register_blueprint(stub)
+
+    @app.context_processor
+    def inject_feature_enabled():
+        return {'feature_enabled': lambda feature: feature in active}
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
@@ -57,90 +155,14 @@ def create_app():
     # CSRF für API-Endpoints deaktivieren
     csrf.exempt_blueprints = ['advanced_dispatch_bp', 'ml_analytics']
 
-    from .routes import main_bp
-    app.register_blueprint(main_bp)
-    
-    # ML Blueprint registrieren
-    from .ml_routes import ml_bp
-    app.register_blueprint(ml_bp)
-    
-    # PWA Blueprint registrieren
-    from .pwa_routes import pwa_bp
-    app.register_blueprint(pwa_bp)
-    
-    # Neues Konfigurations-Blueprint registrieren
-    from .routes_config import config_bp
-    app.register_blueprint(config_bp)
-    
-    # Auth-Blueprint registrieren (nur lokales System verwenden)
-    from .auth_routes_local import auth_local_bp
-    app.register_blueprint(auth_local_bp)
-    
-    # Multi-User Blueprint registrieren
-    from multi_user.multi_user_routes import multi_user_bp
-    app.register_blueprint(multi_user_bp)
-    
-    # Admin-Blueprint registrieren
-    from .admin_routes import admin_bp
-    app.register_blueprint(admin_bp)
-    
-    # Export-Blueprint registrieren
-    from .export_routes import export_bp
-    app.register_blueprint(export_bp)
-    
-    # API-Blueprint registrieren
-    from .api_routes import api_bp
-    app.register_blueprint(api_bp)
-    
-    # ML-API-Blueprint registrieren
-    from .ml_api import ml_bp
-    app.register_blueprint(ml_bp)
-    
-    # Benachrichtigungs-Blueprint registrieren
-    from .notification_routes import notification_bp
-    app.register_blueprint(notification_bp)
-    
-    # MCP-API-Blueprint registrieren
-    app.register_blueprint(mcp_api)
-    
-    # CO₂-Tracking-Blueprint registrieren
-    try:
-        from .co2_routes import co2_bp
-        app.register_blueprint(co2_bp, name='co2_tracking')
-        print("[OK] CO2-Tracking System erfolgreich registriert")
-    except Exception as e:
-        print(f"[WARN] CO2-Tracking System nicht verfuegbar: {e}")
-    
-    # Climate Impact Dashboard-Blueprint registrieren
-    try:
-        from .climate_routes import climate_bp
-        app.register_blueprint(climate_bp, url_prefix='/climate')
-        print("[OK] Climate Impact Dashboard erfolgreich registriert")
-    except Exception as e:
-        print(f"[WARN] Climate Impact Dashboard nicht verfuegbar: {e}")
-    
-    # Advanced Dispatch-Blueprint registrieren
-    try:
-        from .advanced_dispatch_routes import advanced_dispatch_bp
-        app.register_blueprint(advanced_dispatch_bp)
-        print("[OK] Advanced Dispatch System erfolgreich registriert")
-    except ImportError as e:
-        print(f"[WARN] Advanced Dispatch System nicht verfuegbar: {e}")
-    
-    # Monitoring & Logging Blueprint registrieren
-    app.register_blueprint(monitoring_bp)
+    register_blueprints(app)
     
     # CSRF für API-Routen deaktivieren (NACH der Blueprint-Registrierung)
-    csrf.exempt(app.blueprints.get('main'))
-    csrf.exempt(app.blueprints.get('config'))
-    csrf.exempt(app.blueprints.get('auth_local'))
-    csrf.exempt(app.blueprints.get('multi_user'))
-    csrf.exempt(app.blueprints.get('admin'))
-    csrf.exempt(app.blueprints.get('export'))
-    csrf.exempt(app.blueprints.get('api'))
-    csrf.exempt(app.blueprints.get('ml'))
-    csrf.exempt(app.blueprints.get('notifications'))
-    csrf.exempt(app.blueprints.get('monitoring'))
+    # (abgeschaltete Features fehlen in app.blueprints)
+    for blueprint_name in ('main', 'config', 'auth_local', 'multi_user', 'admin', 'export',
+                           'api', 'ml', 'notifications', 'monitoring', 'jobs'):
+        if app.blueprints.get(blueprint_name) is not None:
+            csrf.exempt(app.blueprints[blueprint_name])
 
     with app.app_context():
         # Import models to ensure they are registered
@@ -161,6 +183,41 @@ def create_app():
         except Exception as e:
             print(f"[WARN] Datenbank-Indizes konnten nicht erstellt werden: {e}")
         
+        # Vorberechnete Zeilenzahlen je Lastprofil (Trigger + Erstbefüllung)
+        try:
+            from .profile_stats import ensure_profile_stats_schema
+            if os.path.exists(db_path):
+                stats_conn = sqlite3.connect(db_path)
+                ensure_profile_stats_schema(stats_conn)
+                stats_conn.close()
+        except Exception as e:
+            print(f"[WARN] Lastprofil-Statistiken konnten nicht angelegt werden: {e}")
+        
+        # Vorberechnete Dashboard-Kennzahlen (Trigger) und Hintergrund-Aktualisierung der Charts
+        try:
+            from .dashboard_summary import ensure_dashboard_summary_schema, start_chart_refresher
+            if os.path.exists(db_path):
+                summary_conn = sqlite3.connect(db_path)
+                if ensure_dashboard_summary_schema(summary_conn):
+                    start_chart_refresher(db_path)
+                summary_conn.close()
+        except Exception as e:
+            print(f"[WARN] Dashboard-Kennzahlen konnten nicht angelegt werden: {e}")
+        
+        # Hintergrund-Jobs: Worker-Threads im Webprozess nur auf Wunsch (sonst job_worker.py)
+        try:
+            from .jobs import INLINE_WORKERS, start_inline_workers
+            start_inline_workers(INLINE_WORKERS)
+        except Exception as e:
+            print(f"[WARN] Job-Worker konnten nicht gestartet werden: {e}")
+        
+        # ETag/304-Response-Cache mit Datenversionszählern je Tabelle
+        try:
+            from .response_cache import init_response_cache
+            init_response_cache(app, cache)
+        except Exception as e:
+            print(f"[WARN] Response-Cache konnte nicht initialisiert werden: {e}")
+        
         # Performance-Middleware registrieren
         try:
             from .performance_config import performance_middleware
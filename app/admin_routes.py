@@ -10,6 +10,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from models import User, Role, UserProject, Project, Customer
 from permissions import admin_required, permission_required, get_current_user, can_manage_users
 from app import db
+from sqlalchemy.orm import joinedload
 import json
 from datetime import datetime
 import os
@@ -286,14 +287,14 @@ def new_role():
 def projects():
     """Projekt-Berechtigungen verwalten"""
     try:
-        projects = Project.query.all()
+        # Kunden per JOIN mitladen, Berechtigungen samt Benutzern in einer Abfrage
+        projects = Project.query.options(joinedload(Project.customer)).all()
         users = User.query.all()
         
         # Projekt-Berechtigungen sammeln
-        project_permissions = {}
-        for project in projects:
-            permissions = UserProject.query.filter_by(project_id=project.id).all()
-            project_permissions[project.id] = permissions
+        project_permissions = {project.id: [] for project in projects}
+        for permission in UserProject.query.options(joinedload(UserProject.user)).all():
+            project_permissions.setdefault(permission.project_id, []).append(permission)
         
         return render_template('admin/projects.html', 
                              projects=projects, 
@@ -10,9 +10,10 @@ import json
 import sys
 import os
 
-# CO₂-Tracking System importieren
+# CO₂-Tracking System (verzögert, lädt pandas erst beim ersten Zugriff)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from co2_tracking_system import CO2TrackingSystem
+from .lazy_imports import lazy_import
+CO2TrackingSystem = lazy_import('co2_tracking_system', 'CO2TrackingSystem')
 
 co2_bp = Blueprint('co2', __name__, url_prefix='/co2')
 
@@ -0,0 +1,364 @@
+"""
+Vorberechnete Dashboard-Kennzahlen
+Die einzeilige Tabelle dashboard_summary wird per Trigger bei Änderungen an Projekten,
+Kunden, Lastprofilen und Spotpreisen fortgeschrieben; die Chart-Daten werden dort als
+JSON abgelegt und neu berechnet, sobald sich Projekte ändern oder ein neuer Tag beginnt
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_TABLE = 'dashboard_summary'
+
+# Ohne diese Tabellen werden keine Trigger angelegt (die Trigger verweisen aufeinander)
+SOURCE_TABLES = ('project', 'customer', 'load_profile', 'spot_price')
+
+# Intervall der Hintergrund-Aktualisierung der Charts in Sekunden (0 = aus)
+REFRESH_INTERVAL = int(os.environ.get('BESS_DASHBOARD_REFRESH', '300'))
+
+_schema_ready = set()
+_refreshers = set()
+
+# Ausdrücke für Projekte mit mindestens einem Lastprofil (wie INNER JOIN project/load_profile)
+_HAS_PROFILES = "EXISTS (SELECT 1 FROM load_profile WHERE project_id = {id})"
+_FIRST_PROFILE = (
+    "({pid} IS NOT NULL AND EXISTS (SELECT 1 FROM project WHERE id = {pid}) "
+    "AND (SELECT COUNT(*) FROM load_profile WHERE project_id = {pid}) = 1)"
+)
+_LAST_PROFILE = (
+    "({pid} IS NOT NULL AND EXISTS (SELECT 1 FROM project WHERE id = {pid}) "
+    "AND NOT EXISTS (SELECT 1 FROM load_profile WHERE project_id = {pid}))"
+)
+
+
+def _table_exists(cursor: sqlite3.Cursor, name: str, kind: str = 'table') -> bool:
+    return cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (kind, name)
+    ).fetchone() is not None
+
+
+def _project_delta(sign: str, row: str) -> str:
+    return f"""
+        projects_count = projects_count {sign} 1,
+        total_bess_capacity = total_bess_capacity {sign} COALESCE({row}.bess_size, 0),
+        total_pv_capacity = total_pv_capacity {sign} COALESCE({row}.pv_power, 0),
+        electricity_cost_sum = electricity_cost_sum {sign} COALESCE({row}.current_electricity_cost, 0),
+        electricity_cost_count = electricity_cost_count {sign} ({row}.current_electricity_cost IS NOT NULL),
+        active_projects_count = active_projects_count {sign} {_HAS_PROFILES.format(id=f'{row}.id')},
+        project_version = project_version + 1
+    """
+
+
+def _create_triggers(cursor: sqlite3.Cursor):
+    def trigger(name: str, event: str, table: str, body: str, when: str = ''):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_{name}
+            AFTER {event} ON {table} {when}
+            BEGIN
+                UPDATE {SUMMARY_TABLE} SET {body}, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+            END
+        """)
+
+    trigger('insert', 'INSERT', 'project', _project_delta('+', 'NEW'))
+    trigger('delete', 'DELETE', 'project', _project_delta('-', 'OLD'))
+    trigger('update', 'UPDATE', 'project', f"""
+        total_bess_capacity = total_bess_capacity + COALESCE(NEW.bess_size, 0) - COALESCE(OLD.bess_size, 0),
+        total_pv_capacity = total_pv_capacity + COALESCE(NEW.pv_power, 0) - COALESCE(OLD.pv_power, 0),
+        electricity_cost_sum = electricity_cost_sum
+            + COALESCE(NEW.current_electricity_cost, 0) - COALESCE(OLD.current_electricity_cost, 0),
+        electricity_cost_count = electricity_cost_count
+            + (NEW.current_electricity_cost IS NOT NULL) - (OLD.current_electricity_cost IS NOT NULL),
+        active_projects_count = active_projects_count + (NEW.id IS NOT OLD.id) * (
+            {_HAS_PROFILES.format(id='NEW.id')} - {_HAS_PROFILES.format(id='OLD.id')}),
+        project_version = project_version + 1
+    """)
+
+    trigger('insert', 'INSERT', 'customer', "customers_count = customers_count + 1")
+    trigger('delete', 'DELETE', 'customer', "customers_count = customers_count - 1")
+
+    trigger('insert', 'INSERT', 'load_profile', f"""
+        load_profiles_count = load_profiles_count + 1,
+        active_projects_count = active_projects_count + {_FIRST_PROFILE.format(pid='NEW.project_id')}
+    """)
+    trigger('delete', 'DELETE', 'load_profile', f"""
+        load_profiles_count = load_profiles_count - 1,
+        active_projects_count = active_projects_count - {_LAST_PROFILE.format(pid='OLD.project_id')}
+    """)
+    trigger('move', 'UPDATE OF project_id', 'load_profile', f"""
+        active_projects_count = active_projects_count
+            + {_FIRST_PROFILE.format(pid='NEW.project_id')} - {_LAST_PROFILE.format(pid='OLD.project_id')}
+    """, when='WHEN OLD.project_id IS NOT NEW.project_id')
+
+    trigger('insert', 'INSERT', 'spot_price', "spot_prices_count = spot_prices_count + 1")
+    trigger('delete', 'DELETE', 'spot_price', "spot_prices_count = spot_prices_count - 1")
+
+
+def _rebuild(cursor: sqlite3.Cursor):
+    # Eine Anweisung: Änderungen während der Berechnung zählen entweder hier oder im Trigger
+    cursor.execute(f"""
+        INSERT OR REPLACE INTO {SUMMARY_TABLE} (
+            id, projects_count, customers_count, load_profiles_count, spot_prices_count,
+            active_projects_count, total_bess_capacity, total_pv_capacity,
+            electricity_cost_sum, electricity_cost_count, project_version, charts_version, updated_at
+        )
+        SELECT 1,
+            (SELECT COUNT(*) FROM project),
+            (SELECT COUNT(*) FROM customer),
+            (SELECT COUNT(*) FROM load_profile),
+            (SELECT COUNT(*) FROM spot_price),
+            (SELECT COUNT(DISTINCT p.id) FROM project p INNER JOIN load_profile lp ON p.id = lp.project_id),
+            (SELECT COALESCE(SUM(bess_size), 0) FROM project),
+            (SELECT COALESCE(SUM(pv_power), 0) FROM project),
+            (SELECT COALESCE(SUM(current_electricity_cost), 0) FROM project),
+            (SELECT COUNT(current_electricity_cost) FROM project),
+            COALESCE((SELECT project_version FROM {SUMMARY_TABLE} WHERE id = 1), 0) + 1,
+            -1,
+            CURRENT_TIMESTAMP
+    """)
+
+
+def ensure_dashboard_summary_schema(conn: sqlite3.Connection) -> bool:
+    """Legt dashboard_summary samt Triggern an und füllt sie einmalig aus den Bestandsdaten
+
+    Gibt False zurück, solange eine der Quelltabellen fehlt; die Kennzahlen werden
+    dann live berechnet.
+    """
+    cursor = conn.cursor()
+    if not all(_table_exists(cursor, table) for table in SOURCE_TABLES):
+        return False
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            projects_count INTEGER NOT NULL DEFAULT 0,
+            customers_count INTEGER NOT NULL DEFAULT 0,
+            load_profiles_count INTEGER NOT NULL DEFAULT 0,
+            spot_prices_count INTEGER NOT NULL DEFAULT 0,
+            active_projects_count INTEGER NOT NULL DEFAULT 0,
+            total_bess_capacity REAL NOT NULL DEFAULT 0,
+            total_pv_capacity REAL NOT NULL DEFAULT 0,
+            electricity_cost_sum REAL NOT NULL DEFAULT 0,
+            electricity_cost_count INTEGER NOT NULL DEFAULT 0,
+            project_version INTEGER NOT NULL DEFAULT 0,
+            charts_version INTEGER NOT NULL DEFAULT -1,
+            charts_date TEXT,
+            charts_json TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    if not _table_exists(cursor, 'trg_spot_price_summary_insert', 'trigger'):
+        _create_triggers(cursor)
+        _rebuild(cursor)
+        logger.info(f"{SUMMARY_TABLE}: Dashboard-Kennzahlen initialisiert")
+    conn.commit()
+    return True
+
+
+def refresh_dashboard_summary(conn: sqlite3.Connection):
+    """Alle Kennzahlen neu berechnen (Wartung, z.B. nach Änderungen mit abgeschalteten Triggern)"""
+    if ensure_dashboard_summary_schema(conn):
+        _rebuild(conn.cursor())
+        conn.commit()
+
+
+def _ready(conn: sqlite3.Connection) -> bool:
+    db_key = conn.execute('PRAGMA database_list').fetchone()[2]
+    if db_key and db_key in _schema_ready:
+        return True
+    installed = ensure_dashboard_summary_schema(conn)
+    # In-Memory-Datenbanken (leerer Pfad) werden nicht gemerkt
+    if installed and db_key:
+        _schema_ready.add(db_key)
+    return installed
+
+
+def _live_summary(cursor: sqlite3.Cursor) -> Dict[str, Any]:
+    """Kennzahlen direkt aus den Quelltabellen (Rückfall ohne dashboard_summary)"""
+    row = cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM project),
+            (SELECT COUNT(*) FROM customer),
+            (SELECT COUNT(*) FROM load_profile),
+            (SELECT COUNT(*) FROM spot_price),
+            (SELECT COUNT(DISTINCT p.id) FROM project p INNER JOIN load_profile lp ON p.id = lp.project_id),
+            (SELECT COALESCE(SUM(bess_size), 0) FROM project),
+            (SELECT COALESCE(SUM(pv_power), 0) FROM project),
+            (SELECT COALESCE(SUM(current_electricity_cost), 0) FROM project),
+            (SELECT COUNT(current_electricity_cost) FROM project)
+    """).fetchone()
+    return _summary_dict(row)
+
+
+def _summary_dict(row) -> Dict[str, Any]:
+    (projects, customers, load_profiles, spot_prices, active,
+     bess, pv, cost_sum, cost_count) = tuple(row)
+    return {
+        'projects_count': projects,
+        'customers_count': customers,
+        'load_profiles_count': load_profiles,
+        'spot_prices_count': spot_prices,
+        'active_projects_count': active,
+        'total_bess_capacity': bess,
+        'total_pv_capacity': pv,
+        'avg_electricity_cost': cost_sum / cost_count if cost_count else 0,
+    }
+
+
+def dashboard_summary(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Dashboard-Kennzahlen aus einer Zeile, unabhängig von der Größe der Spotpreis-Tabelle"""
+    if not _ready(conn):
+        return _live_summary(conn.cursor())
+    row = conn.execute(f"""
+        SELECT projects_count, customers_count, load_profiles_count, spot_prices_count,
+               active_projects_count, total_bess_capacity, total_pv_capacity,
+               electricity_cost_sum, electricity_cost_count
+        FROM {SUMMARY_TABLE} WHERE id = 1
+    """).fetchone()
+    if row is None:
+        refresh_dashboard_summary(conn)
+        return dashboard_summary(conn)
+    return _summary_dict(row)
+
+
+# ----------------------------------------------------------------------
+# Chart-Daten (Zeitfenster relativ zu heute)
+# ----------------------------------------------------------------------
+
+def compute_dashboard_charts(cursor: sqlite3.Cursor) -> Dict[str, Any]:
+    """Chart-Daten des Dashboards (Projekt-Wachstum, Regionen, Kapazitäten, Stromkosten)"""
+    # Projekt-Wachstum (letzte 12 Monate)
+    cursor.execute("""
+        SELECT
+            strftime('%Y-%m', created_at) as month,
+            COUNT(*) as count
+        FROM project
+        WHERE created_at >= date('now', '-12 months')
+        GROUP BY strftime('%Y-%m', created_at)
+        ORDER BY month
+    """)
+    project_growth = cursor.fetchall()
+
+    # Regionale Verteilung
+    cursor.execute("""
+        SELECT
+            CASE
+                WHEN location LIKE '%Oberösterreich%' OR location LIKE '%OÖ%' THEN 'Oberösterreich'
+                WHEN location LIKE '%Niederösterreich%' OR location LIKE '%NÖ%' THEN 'Niederösterreich'
+                WHEN location LIKE '%Wien%' OR location LIKE '%W%' THEN 'Wien'
+                WHEN location LIKE '%Steiermark%' OR location LIKE '%S%' THEN 'Steiermark'
+                WHEN location LIKE '%Tirol%' OR location LIKE '%T%' THEN 'Tirol'
+                WHEN location LIKE '%Vorarlberg%' OR location LIKE '%V%' THEN 'Vorarlberg'
+                WHEN location LIKE '%Kärnten%' OR location LIKE '%K%' THEN 'Kärnten'
+                WHEN location LIKE '%Salzburg%' OR location LIKE '%S%' THEN 'Salzburg'
+                WHEN location LIKE '%Burgenland%' OR location LIKE '%B%' THEN 'Burgenland'
+                ELSE 'Sonstige'
+            END as region,
+            COUNT(*) as count
+        FROM project
+        WHERE location IS NOT NULL
+        GROUP BY region
+        ORDER BY count DESC
+    """)
+    regional_distribution = cursor.fetchall()
+
+    # Kapazitäts-Verteilung
+    cursor.execute("""
+        SELECT
+            SUM(bess_size) as total_bess,
+            SUM(pv_power) as total_pv
+        FROM project
+        WHERE bess_size IS NOT NULL OR pv_power IS NOT NULL
+    """)
+    capacity_data = cursor.fetchone()
+
+    # Stromkosten-Trend (letzte 4 Quartale)
+    cursor.execute("""
+        SELECT
+            strftime('%Y-Q%m/3', created_at) as quarter,
+            AVG(current_electricity_cost) as avg_cost
+        FROM project
+        WHERE current_electricity_cost IS NOT NULL
+        AND created_at >= date('now', '-12 months')
+        GROUP BY strftime('%Y-Q%m/3', created_at)
+        ORDER BY quarter
+    """)
+    electricity_cost_trend = cursor.fetchall()
+
+    return {
+        'project_growth': [{'month': row[0], 'count': row[1]} for row in project_growth],
+        'regional_distribution': [{'region': row[0], 'count': row[1]} for row in regional_distribution],
+        'capacity_distribution': {
+            'bess': capacity_data[0] or 0,
+            'pv': capacity_data[1] or 0
+        },
+        'electricity_cost_trend': [{'quarter': row[0], 'avg_cost': row[1]} for row in electricity_cost_trend]
+    }
+
+
+def refresh_dashboard_charts(conn: sqlite3.Connection, force: bool = False) -> Optional[Dict[str, Any]]:
+    """Chart-Daten neu berechnen, wenn sich Projekte geändert haben oder der Tag gewechselt hat
+
+    Gibt die neu berechneten Daten zurück, None wenn der Stand aktuell war.
+    """
+    if not _ready(conn):
+        return compute_dashboard_charts(conn.cursor())
+    row = conn.execute(f"""
+        SELECT project_version, charts_version, charts_date = date('now')
+        FROM {SUMMARY_TABLE} WHERE id = 1
+    """).fetchone()
+    if row is None:
+        refresh_dashboard_summary(conn)
+        return refresh_dashboard_charts(conn, force=True)
+    project_version, charts_version, same_day = row
+    if not force and charts_version == project_version and same_day:
+        return None
+
+    # Version vor der Berechnung lesen: spätere Änderungen lösen die nächste Neuberechnung aus
+    charts = compute_dashboard_charts(conn.cursor())
+    conn.execute(f"""
+        UPDATE {SUMMARY_TABLE} SET charts_json = ?, charts_version = ?, charts_date = date('now')
+        WHERE id = 1
+    """, (json.dumps(charts), project_version))
+    conn.commit()
+    return charts
+
+
+def dashboard_charts(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Chart-Daten aus dashboard_summary, bei veraltetem Stand direkt neu berechnet"""
+    charts = refresh_dashboard_charts(conn)
+    if charts is not None:
+        return charts
+    row = conn.execute(f"SELECT charts_json FROM {SUMMARY_TABLE} WHERE id = 1").fetchone()
+    if row is None or row[0] is None:
+        return refresh_dashboard_charts(conn, force=True)
+    return json.loads(row[0])
+
+
+def start_chart_refresher(db_path: str, interval: int = REFRESH_INTERVAL) -> Optional[threading.Thread]:
+    """Hintergrund-Thread, der die Chart-Daten aktuell hält (Tageswechsel, Projektänderungen)"""
+    if interval <= 0 or db_path in _refreshers:
+        return None
+    _refreshers.add(db_path)
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                conn = sqlite3.connect(db_path, timeout=30)
+                try:
+                    if refresh_dashboard_charts(conn) is not None:
+                        logger.debug('Dashboard-Charts im Hintergrund aktualisiert')
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.warning('Dashboard-Charts konnten nicht aktualisiert werden: %s', e)
+
+    thread = threading.Thread(target=run, name='dashboard-chart-refresher', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,182 @@
+"""
+Serverseitiges Downsampling für Zeitreihen-Charts
+Largest-Triangle-Three-Buckets (LTTB) bzw. Min/Max pro Bucket auf NumPy-Arrays vor der Serialisierung
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('lttb', 'minmax')
+
+# Punkte pro Pixel Chartbreite (Min/Max liefert zwei Punkte je Bucket)
+POINTS_PER_PIXEL = {'lttb': 1, 'minmax': 2}
+
+MIN_POINTS = 3
+
+
+def downsampling_params(params: Optional[Dict[str, Any]]) -> Tuple[Optional[int], str]:
+    """max_points und Methode aus Query-Parametern bzw. JSON-Body lesen
+
+    Unterstützt ``max_points`` oder die Chartbreite ``width`` (Pixel) sowie
+    ``downsample`` = lttb (Standard) | minmax | none. Ohne Angabe bleiben die
+    Rohdaten unverändert (max_points None).
+    """
+    params = params or {}
+    method = str(params.get('downsample') or 'lttb').lower()
+    if method == 'none':
+        return None, method
+    if method not in METHODS:
+        method = 'lttb'
+
+    try:
+        if params.get('max_points'):
+            return max(MIN_POINTS, int(params['max_points'])), method
+        if params.get('width'):
+            return max(MIN_POINTS, int(params['width']) * POINTS_PER_PIXEL[method]), method
+    except (TypeError, ValueError):
+        logger.warning(f"Ungültige Downsampling-Parameter: {params.get('max_points') or params.get('width')}")
+    return None, method
+
+
+def time_axis(timestamps: Sequence[Any]) -> np.ndarray:
+    """Zeitstempel (ISO-Strings oder datetime) als float-Sekunden; sonst gleichabständiger Index"""
+    try:
+        values = np.array([str(ts)[:19] for ts in timestamps], dtype='datetime64[s]')
+        axis = values.astype(np.int64).astype(np.float64)
+        if np.all(np.diff(axis) >= 0):
+            return axis
+    except (TypeError, ValueError):
+        pass
+    return np.arange(len(timestamps), dtype=np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Indizes der Largest-Triangle-Three-Buckets-Auswahl (erster und letzter Punkt bleiben)"""
+    n = len(y)
+    if max_points >= n or n <= MIN_POINTS:
+        return np.arange(n)
+    max_points = max(MIN_POINTS, max_points)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    # Innere Punkte in max_points - 2 Buckets aufteilen
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    # Bucket-Mittelwerte vorab per kumulierter Summe
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        count = next_end - next_start
+        avg_x = (cum_x[next_end] - cum_x[next_start]) / count
+        avg_y = (cum_y[next_end] - cum_y[next_start]) / count
+
+        # Doppelte Dreiecksfläche zwischen Ankerpunkt, Kandidat und Mittel des nächsten Buckets
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """Indizes von Minimum und Maximum je Bucket (Spitzen bleiben exakt erhalten)"""
+    n = len(y)
+    if max_points >= n or n <= MIN_POINTS:
+        return np.arange(n)
+
+    buckets = max(1, (max_points - 2) // 2)
+    values = np.asarray(y, dtype=np.float64)
+    bucket = (np.arange(n) * buckets) // n
+    # Sortierung nach (Bucket, NaN zuletzt, Wert): Minimum am Bucket-Anfang, Maximum vor den NaNs
+    missing = np.isnan(values)
+    order = np.lexsort((np.where(missing, 0.0, values), missing, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(buckets), side='left')
+    ends = np.searchsorted(bucket[order], np.arange(buckets), side='right') - 1
+    ends = np.maximum(starts, ends - np.bincount(bucket, weights=missing, minlength=buckets).astype(np.int64))
+    selected = np.concatenate(([0, n - 1], order[starts], order[ends]))
+    return np.unique(selected)
+
+
+def downsample_indices(x: np.ndarray, ys: Sequence[np.ndarray], max_points: int,
+                       method: str = 'lttb') -> np.ndarray:
+    """Gemeinsame Auswahl für mehrere Reihen auf derselben Zeitachse
+
+    Das Punktbudget wird auf die Reihen verteilt; die Vereinigung der Auswahl
+    erhält die Spitzen jeder einzelnen Reihe.
+    """
+    budget = max(MIN_POINTS, max_points // max(1, len(ys)))
+    parts = [
+        minmax_indices(y, budget) if method == 'minmax' else lttb_indices(x, y, budget)
+        for y in ys
+    ]
+    return np.unique(np.concatenate(parts)) if parts else np.arange(len(x))
+
+
+def _column(records: Sequence[Any], key: Any) -> np.ndarray:
+    return np.array([np.nan if r[key] is None else r[key] for r in records], dtype=np.float64)
+
+
+def downsample_records(records: List[Any], value_keys: Sequence[Any], max_points: Optional[int],
+                       method: str = 'lttb', x_key: Any = 'timestamp') -> Tuple[List[Any], Optional[Dict]]:
+    """Zeilen (Dicts oder Tupel aus der Datenbank) auf max_points reduzieren
+
+    ``value_keys``/``x_key`` sind Dict-Schlüssel bzw. Spaltenindizes. Liefert die
+    ausgewählten Zeilen in Originalreihenfolge und die Downsampling-Info für die
+    Response (None, wenn nichts reduziert wurde).
+    """
+    if not max_points or len(records) <= max_points:
+        return records, None
+
+    x = time_axis([r[x_key] for r in records])
+    indices = downsample_indices(x, [_column(records, key) for key in value_keys], max_points, method)
+    return [records[i] for i in indices], _info(method, max_points, len(records), len(indices))
+
+
+def downsample_columns(columns: Dict[str, Any], value_keys: Sequence[str], max_points: Optional[int],
+                       method: str = 'lttb', x_key: str = 'timestamp',
+                       group_key: Optional[str] = None) -> Tuple[Dict[str, Any], Optional[Dict]]:
+    """Spaltenweise Daten (Listen/Arrays gleicher Länge) reduzieren
+
+    Mit ``group_key`` (z.B. station_id) wird jede Gruppe als eigene Reihe mit
+    vollem Punktbudget behandelt.
+    """
+    total = len(columns[x_key])
+    if not max_points or total <= max_points:
+        return columns, None
+
+    x = time_axis(columns[x_key])
+    values = [np.asarray(columns[key], dtype=np.float64) for key in value_keys]
+    if group_key:
+        groups = np.asarray(columns[group_key], dtype=object)
+        parts = []
+        for group in dict.fromkeys(groups.tolist()):
+            members = np.flatnonzero(groups == group)
+            local = downsample_indices(x[members], [v[members] for v in values], max_points, method)
+            parts.append(members[local])
+        indices = np.sort(np.concatenate(parts)) if parts else np.arange(0)
+    else:
+        indices = downsample_indices(x, values, max_points, method)
+
+    result = {}
+    for key, column in columns.items():
+        if isinstance(column, np.ndarray):
+            result[key] = column[indices]
+        else:
+            result[key] = [column[i] for i in indices]
+    return result, _info(method, max_points, total, len(indices))
+
+
+def _info(method: str, max_points: int, original: int, returned: int) -> Dict[str, Any]:
+    return {'method': method, 'max_points': max_points, 'original_count': original, 'count': returned}
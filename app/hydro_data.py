@@ -0,0 +1,526 @@
+"""
+Wasserstands- und Wasserkraft-Daten
+Bulk-UPSERT der Pegelstände über den Schlüssel (station_id, timestamp), Projekt-/Profil-
+Zuordnung in water_level_link, Stationskatalog statt LIKE-Suche, spaltenweise
+Bereichsabfragen und vektorisierte Durchfluss->Leistung Umrechnung je Anlagenkennlinie
+"""
+
+import sqlite3
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WATER_LEVEL_UNIQUE_INDEX = 'uq_water_level_station_ts'
+
+# Zuordnung Messwert -> (Projekt, Profil); ein Messwert kann mehreren Projekten gehören
+LINK_TABLE = 'water_level_link'
+
+# Live-Messwerte werden nie durch Werte anderer Quellen (Demo-Fallback) ersetzt
+LIVE_SOURCE_PATTERN = '%Live%'
+
+# Gleiches Format wie die bisher gespeicherten EHYD-Zeitstempel (datetime.isoformat())
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+_STAGING_TABLE = 'temp_water_level_batch'
+
+_schema_ready = set()
+
+RHO_WATER = 1000.0  # kg/m³
+GRAVITY = 9.81  # m/s²
+
+
+def normalize_level_timestamp(value: Any) -> Optional[str]:
+    """Zeitstempel (datetime/ISO-String) in das gespeicherte Textformat bringen"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def ensure_hydro_schema(conn: sqlite3.Connection):
+    """Legt water_level, den eindeutigen Schlüssel, die Projekt-Zuordnung und den Stationskatalog an.
+
+    Einmalige Migration, solange der Index fehlt: Zeitstempel werden über
+    ``normalize_level_timestamp`` (Offsets nach UTC) vereinheitlicht und Duplikate
+    (gleiche Station + Zeitstempel) auf eine Zeile reduziert - bevorzugt die jüngste
+    Live-Zeile. Die Projekt-/Profil-Zuordnungen aller Duplikate wandern vorher in
+    ``water_level_link`` und zeigen auf die verbleibende Zeile.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS water_level (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            water_level_cm REAL NOT NULL,
+            station_id TEXT NOT NULL,
+            station_name TEXT NOT NULL,
+            river_name TEXT NOT NULL,
+            project_id INTEGER,
+            profile_name TEXT,
+            source TEXT DEFAULT 'EHYD',
+            region TEXT DEFAULT 'AT',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES project (id)
+        )
+    """)
+    link_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (LINK_TABLE,)
+    ).fetchone()
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {LINK_TABLE} (
+            water_level_id INTEGER NOT NULL,
+            project_id INTEGER NOT NULL,
+            profile_name TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (project_id, profile_name, water_level_id),
+            FOREIGN KEY (water_level_id) REFERENCES water_level (id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{LINK_TABLE}_level ON {LINK_TABLE} (water_level_id)")
+
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (WATER_LEVEL_UNIQUE_INDEX,)
+    ).fetchone()
+    if not exists:
+        # Alte Zeitstempel (Leerzeichen, Mikrosekunden, Offset) auf das Schlüsselformat bringen
+        rows = cursor.execute("""
+            SELECT id, timestamp FROM water_level
+            WHERE typeof(timestamp) != 'text' OR timestamp NOT GLOB
+                '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]T[0-9][0-9]:[0-9][0-9]:[0-9][0-9]'
+        """).fetchall()
+        updates, failed = [], 0
+        for row_id, value in rows:
+            try:
+                updates.append((normalize_level_timestamp(str(value)), row_id))
+            except (TypeError, ValueError):
+                failed += 1
+        if updates:
+            cursor.executemany("UPDATE water_level SET timestamp = ? WHERE id = ?", updates)
+            logger.info(f"water_level: {len(updates)} Zeitstempel auf das Format {TIMESTAMP_FORMAT} gebracht")
+        if failed:
+            logger.warning(f"water_level: {failed} Zeitstempel nicht lesbar - unverändert belassen")
+
+        # Je Station + Zeitstempel bleibt eine Zeile: Live vor anderen Quellen, dann die jüngste
+        cursor.execute(f"""
+            CREATE TEMP TABLE temp_water_level_keep AS
+            SELECT id, FIRST_VALUE(id) OVER (
+                PARTITION BY station_id, timestamp
+                ORDER BY COALESCE(source, '') LIKE '{LIVE_SOURCE_PATTERN}' DESC, id DESC
+            ) AS keep_id
+            FROM water_level
+        """)
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {LINK_TABLE} (water_level_id, project_id, profile_name)
+            SELECT k.keep_id, w.project_id, COALESCE(w.profile_name, '')
+            FROM water_level w JOIN temp_water_level_keep k ON k.id = w.id
+            WHERE w.project_id IS NOT NULL
+        """)
+        cursor.execute("""
+            DELETE FROM water_level WHERE id IN (SELECT id FROM temp_water_level_keep WHERE id != keep_id)
+        """)
+        cursor.execute("DROP TABLE temp_water_level_keep")
+        logger.warning(
+            f"water_level: Migration auf eindeutigen Schlüssel (station_id, timestamp) - "
+            f"{cursor.rowcount} doppelte Pegelstände entfernt (Projekt-Zuordnungen übernommen)"
+        )
+        cursor.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {WATER_LEVEL_UNIQUE_INDEX} ON water_level (station_id, timestamp)"
+        )
+    if not link_exists:
+        # Bisherige Zuordnung aus water_level.project_id (Spalte wird nicht mehr geschrieben)
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {LINK_TABLE} (water_level_id, project_id, profile_name)
+            SELECT id, project_id, COALESCE(profile_name, '') FROM water_level WHERE project_id IS NOT NULL
+        """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS hydro_station (
+            station_id TEXT PRIMARY KEY,
+            station_name TEXT NOT NULL,
+            river_name TEXT NOT NULL,
+            river_key TEXT,
+            lat REAL,
+            lon REAL,
+            elevation REAL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_hydro_station_river ON hydro_station (river_name COLLATE NOCASE)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_hydro_station_river_key ON hydro_station (river_key)")
+    conn.commit()
+
+
+def _ensure_schema_once(conn: sqlite3.Connection):
+    db_key = conn.execute('PRAGMA database_list').fetchone()[2]
+    if db_key not in _schema_ready:
+        ensure_hydro_schema(conn)
+        _schema_ready.add(db_key)
+
+
+def sync_station_catalogue(conn: sqlite3.Connection, rivers: Dict[str, Dict], commit: bool = True) -> int:
+    """Stationskatalog aus EHYDDataFetcher.rivers befüllen (Liste oder Dict je Fluss)"""
+    _ensure_schema_once(conn)
+    rows = []
+    for river_key, river in rivers.items():
+        stations = river.get('stations', [])
+        items = stations.items() if isinstance(stations, dict) else ((s.get('id'), s) for s in stations)
+        for station_id, station in items:
+            coordinates = station.get('coordinates') or {}
+            rows.append((
+                str(station.get('ehyd_id') or station_id),
+                station.get('name', str(station_id)),
+                station.get('river') or river.get('name', river_key),
+                river_key,
+                coordinates.get('lat'),
+                coordinates.get('lon'),
+                station.get('elevation'),
+            ))
+
+    conn.executemany("""
+        INSERT INTO hydro_station (station_id, station_name, river_name, river_key, lat, lon, elevation)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (station_id) DO UPDATE SET
+            station_name = excluded.station_name,
+            river_name = excluded.river_name,
+            river_key = excluded.river_key,
+            lat = COALESCE(excluded.lat, hydro_station.lat),
+            lon = COALESCE(excluded.lon, hydro_station.lon),
+            elevation = COALESCE(excluded.elevation, hydro_station.elevation),
+            updated_at = CURRENT_TIMESTAMP
+    """, rows)
+    if commit:
+        conn.commit()
+    return len(rows)
+
+
+def upsert_water_levels(conn: sqlite3.Connection, records: Iterable[Dict[str, Any]],
+                        project_id: Optional[int] = None, profile_name: Optional[str] = None,
+                        source: Optional[str] = None, commit: bool = True) -> Dict[str, int]:
+    """Schreibt Pegelstände per ``INSERT ... ON CONFLICT (station_id, timestamp) DO UPDATE``.
+
+    Messwerte sind projektübergreifend; ``project_id``/``profile_name`` werden als
+    zusätzliche Zuordnung in ``water_level_link`` eingetragen, bestehende Zuordnungen
+    anderer Projekte bleiben erhalten. Live-Werte werden nicht durch Werte anderer
+    Quellen überschrieben (zählen dann als unverändert).
+
+    Args:
+        records: Dicts mit ``timestamp``, ``station_id``, ``station_name``, ``river_name`` und
+            ``water_level_cm`` (oder ``water_level_m``), optional ``source``/``region``
+        project_id, profile_name, source: Werte für alle Datensätze (source nur als Standard)
+
+    Returns:
+        Dict mit inserted, updated, unchanged und skipped
+    """
+    _ensure_schema_once(conn)
+
+    rows: List[tuple] = []
+    stations: Dict[str, tuple] = {}
+    skipped = 0
+    for record in records:
+        level_cm = record.get('water_level_cm')
+        if level_cm is None and record.get('water_level_m') is not None:
+            level_cm = float(record['water_level_m']) * 100.0
+        station_id = record.get('station_id') or record.get('station_name')
+        try:
+            timestamp = normalize_level_timestamp(record.get('timestamp'))
+        except (TypeError, ValueError):
+            timestamp = None
+        if timestamp is None or level_cm is None or not station_id:
+            skipped += 1
+            continue
+
+        station_id = str(station_id)
+        station_name = record.get('station_name') or station_id
+        river_name = record.get('river_name') or 'Unbekannt'
+        stations.setdefault(station_id, (station_id, station_name, river_name))
+        rows.append((
+            station_id, timestamp, float(level_cm), station_name, river_name,
+            record.get('source') or source or 'EHYD',
+            record.get('region') or 'AT',
+        ))
+
+    result = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': skipped}
+    if not rows:
+        return result
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} (
+            station_id TEXT, timestamp TEXT, water_level_cm REAL, station_name TEXT, river_name TEXT,
+            source TEXT, region TEXT,
+            PRIMARY KEY (station_id, timestamp)
+        )
+    """)
+    cursor.execute(f"DELETE FROM {_STAGING_TABLE}")
+    # Letzter Wert pro Schlüssel gewinnt (wie bei sequentieller Verarbeitung)
+    cursor.executemany(f"INSERT OR REPLACE INTO {_STAGING_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    staged = cursor.execute(f"SELECT COUNT(*) FROM {_STAGING_TABLE}").fetchone()[0]
+    existing, unchanged = cursor.execute(f"""
+        SELECT COUNT(*), COALESCE(SUM(
+            (s.water_level_cm = w.water_level_cm AND s.source IS w.source)
+            OR (COALESCE(w.source, '') LIKE '{LIVE_SOURCE_PATTERN}' AND COALESCE(s.source, '') NOT LIKE '{LIVE_SOURCE_PATTERN}')
+        ), 0)
+        FROM {_STAGING_TABLE} s
+        JOIN water_level w ON w.station_id = s.station_id AND w.timestamp = s.timestamp
+    """).fetchone()
+
+    # "WHERE true" löst die Parser-Mehrdeutigkeit von INSERT ... SELECT ... ON CONFLICT
+    cursor.execute(f"""
+        INSERT INTO water_level (station_id, timestamp, water_level_cm, station_name, river_name, source, region)
+        SELECT station_id, timestamp, water_level_cm, station_name, river_name, source, region
+        FROM {_STAGING_TABLE} WHERE true
+        ON CONFLICT (station_id, timestamp) DO UPDATE SET
+            water_level_cm = excluded.water_level_cm,
+            source = excluded.source,
+            created_at = CURRENT_TIMESTAMP
+        WHERE (water_level.water_level_cm IS NOT excluded.water_level_cm
+               OR water_level.source IS NOT excluded.source)
+          AND (COALESCE(water_level.source, '') NOT LIKE '{LIVE_SOURCE_PATTERN}'
+               OR COALESCE(excluded.source, '') LIKE '{LIVE_SOURCE_PATTERN}')
+    """)
+    if project_id is not None:
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {LINK_TABLE} (water_level_id, project_id, profile_name)
+            SELECT w.id, ?, ? FROM {_STAGING_TABLE} s
+            JOIN water_level w ON w.station_id = s.station_id AND w.timestamp = s.timestamp
+        """, (project_id, profile_name or ''))
+    cursor.execute(f"DELETE FROM {_STAGING_TABLE}")
+
+    # Unbekannte Stationen in den Katalog aufnehmen (bestehende Einträge bleiben)
+    cursor.executemany("""
+        INSERT OR IGNORE INTO hydro_station (station_id, station_name, river_name) VALUES (?, ?, ?)
+    """, list(stations.values()))
+
+    if commit:
+        conn.commit()
+
+    result.update({
+        'inserted': staged - existing,
+        'updated': existing - unchanged,
+        'unchanged': unchanged,
+    })
+    logger.info(
+        f"Pegel-Ingestion: {result['inserted']} neu, {result['updated']} aktualisiert, "
+        f"{result['unchanged']} unverändert, {skipped} übersprungen"
+    )
+    return result
+
+
+def save_hydro_data(conn: sqlite3.Connection, entries: Iterable[Dict[str, Any]],
+                    commit: bool = True) -> Dict[str, int]:
+    """Schreibt EHYD-Messwerte (Pegel in m, Durchfluss) in ``hydro_data``.
+
+    Schlüssel wie bisher: Zeitstempel + Fluss + Station. Bestehende Zeilen werden mit
+    einer Abfrage für den ganzen Batch ermittelt und per executemany aktualisiert bzw.
+    neu angelegt (statt SELECT + UPDATE/INSERT pro Messwert).
+    """
+    rows: Dict[Tuple[str, str, str], tuple] = {}
+    for entry in entries:
+        # Gleiches Textformat wie der sqlite3-Standardadapter für datetime
+        timestamp = datetime.fromisoformat(str(entry['timestamp'])).isoformat(' ')
+        river_name = entry.get('river_name', 'Unbekannt')
+        station_name = entry.get('station_name', 'Unbekannt')
+        rows[(timestamp, river_name, station_name)] = (
+            entry['water_level_m'],
+            entry.get('flow_rate_m3s', 0),
+            entry.get('source', 'EHYD'),
+            entry.get('region', 'AT'),
+        )
+
+    result = {'inserted': 0, 'updated': 0}
+    if not rows:
+        return result
+
+    cursor = conn.cursor()
+    existing: Dict[Tuple[str, str, str], int] = {}
+    keys = list(rows)
+    for offset in range(0, len(keys), 300):
+        chunk = keys[offset:offset + 300]
+        placeholders = ', '.join(['(?, ?, ?)'] * len(chunk))
+        for row_id, timestamp, river_name, station_name in cursor.execute(f"""
+            SELECT id, timestamp, river_name, station_name FROM hydro_data
+            WHERE (timestamp, river_name, station_name) IN (VALUES {placeholders})
+        """, [value for key in chunk for value in key]):
+            existing[(timestamp, river_name, station_name)] = row_id
+
+    updates = [(*rows[key], existing[key]) for key in keys if key in existing]
+    inserts = [(key[0], rows[key][0], rows[key][1], key[1], key[2], rows[key][2], rows[key][3])
+               for key in keys if key not in existing]
+    cursor.executemany("""
+        UPDATE hydro_data
+        SET water_level_m = ?, flow_rate_m3s = ?, source = ?, region = ?, created_at = datetime('now')
+        WHERE id = ?
+    """, updates)
+    cursor.executemany("""
+        INSERT INTO hydro_data (timestamp, water_level_m, flow_rate_m3s, river_name, station_name, source, region, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    """, inserts)
+    if commit:
+        conn.commit()
+
+    result.update({'inserted': len(inserts), 'updated': len(updates)})
+    return result
+
+
+def resolve_station_ids(conn: sqlite3.Connection, river_name: str) -> List[str]:
+    """Stationen eines Flusses über den Katalog (Index auf river_name/river_key)"""
+    _ensure_schema_once(conn)
+    rows = conn.execute("""
+        SELECT station_id FROM hydro_station
+        WHERE river_name = ? COLLATE NOCASE OR river_key = lower(?)
+    """, (river_name, river_name)).fetchall()
+    return [row[0] for row in rows]
+
+
+def _range_bound(value: Optional[str], end_of_day: bool = False) -> Optional[str]:
+    """Datum oder Zeitstempel in das Schlüsselformat bringen (Datum als Bis = Tagesende)"""
+    if not value:
+        return None
+    if len(value) == 10:
+        return f"{value}T23:59:59" if end_of_day else f"{value}T00:00:00"
+    return normalize_level_timestamp(value)
+
+
+def query_water_levels(conn: sqlite3.Connection, start: Optional[str] = None, end: Optional[str] = None,
+                       river_name: Optional[str] = None, station_id: Optional[str] = None,
+                       project_id: Optional[int] = None) -> Dict[str, Any]:
+    """Bereichsabfrage als Spalten.
+
+    Returns:
+        Dict mit ``timestamp``, ``station_id``, ``station_name``, ``river_name``, ``source`` (Listen)
+        und ``water_level_cm`` (float64-Array)
+    """
+    _ensure_schema_once(conn)
+    query = "SELECT timestamp, water_level_cm, station_id, station_name, river_name, source FROM water_level"
+    where, params = [], []
+
+    if station_id:
+        where.append("station_id = ?")
+        params.append(str(station_id))
+    elif river_name:
+        station_ids = resolve_station_ids(conn, river_name)
+        if station_ids:
+            where.append(f"station_id IN ({', '.join('?' * len(station_ids))})")
+            params.extend(station_ids)
+        else:
+            # Fluss nicht im Katalog: exakter Vergleich statt LIKE-Scan
+            where.append("river_name = ? COLLATE NOCASE")
+            params.append(river_name)
+
+    start_bound = _range_bound(start)
+    end_bound = _range_bound(end, end_of_day=True)
+    if start_bound:
+        where.append("timestamp >= ?")
+        params.append(start_bound)
+    if end_bound:
+        where.append("timestamp <= ?")
+        params.append(end_bound)
+    if project_id:
+        where.append(f"id IN (SELECT water_level_id FROM {LINK_TABLE} WHERE project_id = ?)")
+        params.append(project_id)
+
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += " ORDER BY timestamp ASC, station_id ASC"
+
+    rows = conn.execute(query, params).fetchall()
+    if not rows:
+        return {'timestamp': [], 'water_level_cm': np.empty(0), 'station_id': [],
+                'station_name': [], 'river_name': [], 'source': []}
+
+    timestamps, levels, station_ids, station_names, river_names, sources = zip(*rows)
+    return {
+        'timestamp': list(timestamps),
+        'water_level_cm': np.array(levels, dtype=np.float64),
+        'station_id': list(station_ids),
+        'station_name': list(station_names),
+        'river_name': list(river_names),
+        'source': list(sources),
+    }
+
+
+@dataclass
+class HydroPlantCurve:
+    """Kennlinie eines Laufwasserkraftwerks.
+
+    Pegel-Abfluss-Beziehung Q = a * (h - h0)^b (h in m), Turbinendurchfluss begrenzt auf
+    [min_turbine_flow, design_flow] nach Abzug der Restwassermenge.
+    """
+    rated_power_kw: float = 540.0
+    head_m: float = 15.0
+    efficiency: float = 0.85
+    rating_a: float = 2.5
+    rating_b: float = 1.6
+    rating_h0_m: float = 0.3
+    design_flow_m3s: Optional[float] = None  # None -> aus Nennleistung abgeleitet
+    min_turbine_flow_m3s: float = 0.0
+    residual_flow_m3s: float = 0.0
+    # Optionaler Teillast-Wirkungsgrad: Stützpunkte (Q/Q_design, eta)
+    efficiency_curve: Optional[List[Tuple[float, float]]] = None
+
+    @property
+    def design_flow(self) -> float:
+        if self.design_flow_m3s is not None:
+            return self.design_flow_m3s
+        return self.rated_power_kw * 1000.0 / (RHO_WATER * GRAVITY * self.head_m * self.efficiency)
+
+
+def flow_from_level(level_cm: np.ndarray, plant: HydroPlantCurve) -> np.ndarray:
+    """Pegelstand [cm] -> Abfluss [m³/s] über die Pegel-Abfluss-Beziehung"""
+    h = np.asarray(level_cm, dtype=np.float64) / 100.0
+    return plant.rating_a * np.clip(h - plant.rating_h0_m, 0.0, None) ** plant.rating_b
+
+
+def hydro_power_kw(flow_m3s: np.ndarray, plant: HydroPlantCurve) -> np.ndarray:
+    """Abfluss [m³/s] -> elektrische Leistung [kW], P = rho * g * Q * H * eta"""
+    flow = np.asarray(flow_m3s, dtype=np.float64)
+    design_flow = plant.design_flow
+    turbine_flow = np.clip(flow - plant.residual_flow_m3s, 0.0, design_flow)
+    turbine_flow = np.where(turbine_flow < plant.min_turbine_flow_m3s, 0.0, turbine_flow)
+
+    if plant.efficiency_curve:
+        load = np.array([p[0] for p in plant.efficiency_curve], dtype=np.float64)
+        eta = np.array([p[1] for p in plant.efficiency_curve], dtype=np.float64)
+        efficiency = np.interp(turbine_flow / design_flow, load, eta)
+    else:
+        efficiency = plant.efficiency
+
+    power = RHO_WATER * GRAVITY * turbine_flow * plant.head_m * efficiency / 1000.0
+    return np.nan_to_num(np.minimum(power, plant.rated_power_kw), nan=0.0)
+
+
+def hydro_power_profile(conn: sqlite3.Connection, plant: HydroPlantCurve, station_id: str,
+                        start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+    """Leistungsprofil einer Station als Spalten (Zeit, Pegel, Abfluss, Leistung, Energie)"""
+    levels = query_water_levels(conn, start=start, end=end, station_id=station_id)
+    flow = flow_from_level(levels['water_level_cm'], plant)
+    power = hydro_power_kw(flow, plant)
+
+    # Energie je Intervall aus dem Abstand zum nächsten Messwert (letzter Wert: Median-Abstand)
+    if len(levels['timestamp']) > 1:
+        times = np.array(levels['timestamp'], dtype='datetime64[s]')
+        step_h = np.diff(times).astype(np.float64) / 3600.0
+        step_h = np.append(step_h, np.median(step_h))
+    else:
+        step_h = np.ones(len(levels['timestamp']))
+    energy = power * step_h
+
+    return {
+        'timestamp': levels['timestamp'],
+        'water_level_cm': levels['water_level_cm'],
+        'flow_m3s': flow,
+        'power_kw': power,
+        'energy_kwh': energy,
+        'total_energy_kwh': float(energy.sum()),
+        'full_load_hours': float(energy.sum() / plant.rated_power_kw) if plant.rated_power_kw else 0.0,
+    }
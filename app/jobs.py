@@ -0,0 +1,588 @@
+"""
+Hintergrund-Jobs für lang laufende Berechnungen (Sizing, 10-Jahres-Analyse, Exporte, ML-Training)
+Endpunkte mit ``@background_job`` laufen wie bisher synchron; mit ``Prefer: respond-async``
+bzw. ``?async=1`` wird der Request in die SQLite-Warteschlange gestellt (202 + Job-URL) und
+von ``job_worker.py`` außerhalb der Gunicorn-Worker ausgeführt
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import hashlib
+import secrets
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Blueprint, Response, current_app, jsonify, request, send_file, session, url_for
+from flask_login import current_user
+
+logger = logging.getLogger(__name__)
+
+JOB_TABLE = 'background_job'
+
+# Aufbewahrung fertiger Ergebnisse in Sekunden
+RESULT_TTL = int(os.environ.get('BESS_JOB_RESULT_TTL', '86400'))
+
+# Laufende Jobs ohne Heartbeat gelten nach dieser Zeit als abgebrochen (Worker-Absturz)
+STALE_AFTER = int(os.environ.get('BESS_JOB_STALE_SECONDS', '300'))
+HEARTBEAT_INTERVAL = 30
+MAX_ATTEMPTS = 2
+
+# So lange rechnet ein Worker nach SIGTERM weiter, danach gehen laufende Jobs ohne
+# Versuchszählung zurück in die Warteschlange (unter TimeoutStopSec von bess-jobs.service)
+SHUTDOWN_GRACE = float(os.environ.get('BESS_JOB_SHUTDOWN_GRACE', '600'))
+
+# Worker-Threads im Webprozess (Entwicklung ohne job_worker.py); 0 = nur externer Worker
+INLINE_WORKERS = int(os.environ.get('BESS_JOB_INLINE_WORKERS', '0'))
+
+# JSON-Ergebnisse bis zu dieser Größe in der Datenbank, größere und Dateien unter instance/job_results
+MAX_INLINE_RESULT = 1024 * 1024
+
+# WSGI-Environ-Schlüssel, über den der Worker den laufenden Job an die View übergibt
+JOB_ENVIRON_KEY = 'bess.job_id'
+
+# Session-Schlüssel mit dem Besitzer-Token für Jobs ohne Anmeldung
+JOB_OWNER_SESSION_KEY = 'bess_job_owner'
+
+_schema_ready = set()
+
+# Laufende Jobs dieses Prozesses (Job-ID -> Worker), für die Freigabe beim Beenden
+_running_jobs: Dict[str, str] = {}
+_running_lock = threading.Lock()
+
+
+def ensure_jobs_schema(conn: sqlite3.Connection):
+    """Legt die Job-Tabelle an (Status, Fortschritt, Ergebnis, Ablaufzeit)"""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {JOB_TABLE} (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            dedup_key TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            progress REAL NOT NULL DEFAULT 0,
+            message TEXT,
+            payload TEXT NOT NULL,
+            user_id INTEGER,
+            owner TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            status_code INTEGER,
+            mimetype TEXT,
+            result TEXT,
+            result_path TEXT,
+            download_name TEXT,
+            error TEXT,
+            ttl INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            heartbeat_at REAL,
+            finished_at REAL,
+            expires_at REAL
+        )
+    """)
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({JOB_TABLE})")}
+    if 'owner' not in columns:
+        conn.execute(f"ALTER TABLE {JOB_TABLE} ADD COLUMN owner TEXT")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{JOB_TABLE}_status ON {JOB_TABLE}(status, created_at)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{JOB_TABLE}_dedup ON {JOB_TABLE}(dedup_key, status)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{JOB_TABLE}_user ON {JOB_TABLE}(user_id, created_at)")
+    conn.commit()
+
+
+def dedup_key(kind: str, payload: Dict[str, Any], user_id: Optional[int], owner: Optional[str] = None) -> str:
+    """Gleicher Endpunkt, gleiche Parameter, gleicher Benutzer (bzw. gleiche Session) = gleicher Job"""
+    raw = json.dumps([kind, payload, user_id, owner], sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds') if timestamp else None
+
+
+class JobQueue:
+    """Job-Warteschlange in SQLite, gemeinsam für alle Gunicorn-Worker und job_worker.py"""
+
+    def __init__(self, db_path: str, result_dir: Optional[str] = None):
+        self.db_path = db_path
+        self.result_dir = result_dir or os.path.join(os.path.dirname(db_path), 'job_results')
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if self.db_path not in _schema_ready:
+            ensure_jobs_schema(conn)
+            _schema_ready.add(self.db_path)
+        return conn
+
+    def _update(self, sql: str, params: Tuple) -> int:
+        conn = self.connect()
+        try:
+            return conn.execute(sql, params).rowcount
+        finally:
+            conn.close()
+
+    # --- Einreihen und Abfragen -------------------------------------------
+
+    def submit(self, kind: str, payload: Dict[str, Any], user_id: Optional[int] = None,
+               ttl: int = RESULT_TTL, owner: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Job einreihen; ein identischer wartender oder laufender Job wird wiederverwendet
+
+        Fertige Jobs nicht: ihr Ergebnis kann durch spätere Schreibzugriffe veraltet sein.
+        ``owner`` ist das Session-Token bei Einreichung ohne Anmeldung.
+        Gibt (Job, neu angelegt) zurück.
+        """
+        key = dedup_key(kind, payload, user_id, owner)
+        now = time.time()
+        conn = self.connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(f"""
+                SELECT * FROM {JOB_TABLE}
+                WHERE dedup_key = ? AND status IN ('queued', 'running')
+                ORDER BY created_at DESC LIMIT 1
+            """, (key,)).fetchone()
+            if row is not None:
+                conn.execute('COMMIT')
+                return self._to_dict(row), False
+            job_id = uuid.uuid4().hex
+            conn.execute(f"""
+                INSERT INTO {JOB_TABLE} (id, kind, dedup_key, payload, user_id, owner, ttl, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (job_id, kind, key, json.dumps(payload, default=str), user_id, owner, ttl, now))
+            row = conn.execute(f"SELECT * FROM {JOB_TABLE} WHERE id = ?", (job_id,)).fetchone()
+            conn.execute('COMMIT')
+            return self._to_dict(row), True
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def get(self, job_id: str, raw: bool = False) -> Optional[Dict[str, Any]]:
+        conn = self.connect()
+        try:
+            row = conn.execute(f"SELECT * FROM {JOB_TABLE} WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return dict(row) if raw else self._to_dict(row)
+
+    def list(self, user_id: Optional[int] = None, limit: int = 50, owner: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Letzte Jobs eines Benutzers bzw. ohne Anmeldung die Jobs der Session ``owner``"""
+        if user_id is None and owner is None:
+            return []
+        conn = self.connect()
+        try:
+            if user_id is not None:
+                rows = conn.execute(f"""
+                    SELECT * FROM {JOB_TABLE} WHERE user_id = ? ORDER BY created_at DESC LIMIT ?
+                """, (user_id, limit)).fetchall()
+            else:
+                rows = conn.execute(f"""
+                    SELECT * FROM {JOB_TABLE} WHERE user_id IS NULL AND owner = ? ORDER BY created_at DESC LIMIT ?
+                """, (owner, limit)).fetchall()
+            return [self._to_dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def cancel(self, job_id: str) -> bool:
+        """Nur wartende Jobs lassen sich abbrechen"""
+        return self._update(f"""
+            UPDATE {JOB_TABLE} SET status = 'cancelled', finished_at = ?, expires_at = ? + ttl
+            WHERE id = ? AND status = 'queued'
+        """, (time.time(), time.time(), job_id)) == 1
+
+    # --- Worker-Seite -----------------------------------------------------
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Ältesten wartenden Job atomar übernehmen"""
+        now = time.time()
+        conn = self.connect()
+        try:
+            rows = conn.execute(f"""
+                UPDATE {JOB_TABLE}
+                SET status = 'running', worker = ?, attempts = attempts + 1,
+                    started_at = ?, heartbeat_at = ?, progress = 0, message = NULL
+                WHERE id = (
+                    SELECT id FROM {JOB_TABLE} WHERE status = 'queued' ORDER BY created_at LIMIT 1
+                ) AND status = 'queued'
+                RETURNING *
+            """, (worker, now, now)).fetchall()
+        finally:
+            conn.close()
+        return dict(rows[0]) if rows else None
+
+    def release(self, job_id: str, worker: str) -> bool:
+        """Laufenden Job beim Beenden des Workers zurückgeben, ohne den Versuch zu zählen"""
+        return self._update(f"""
+            UPDATE {JOB_TABLE}
+            SET status = 'queued', worker = NULL, attempts = MAX(attempts - 1, 0),
+                started_at = NULL, heartbeat_at = NULL, progress = 0, message = NULL
+            WHERE id = ? AND status = 'running' AND worker = ?
+        """, (job_id, worker)) == 1
+
+    def heartbeat(self, job_id: str):
+        self._update(f"UPDATE {JOB_TABLE} SET heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                     (time.time(), job_id))
+
+    def progress(self, job_id: str, fraction: float, message: Optional[str] = None):
+        self._update(f"""
+            UPDATE {JOB_TABLE} SET progress = ?, message = COALESCE(?, message), heartbeat_at = ?
+            WHERE id = ? AND status = 'running'
+        """, (max(0.0, min(1.0, fraction)), message, time.time(), job_id))
+
+    def complete(self, job_id: str, status_code: int, mimetype: str, body: bytes,
+                 download_name: Optional[str] = None):
+        """Ergebnis ablegen: JSON bis MAX_INLINE_RESULT in der Tabelle, sonst als Datei"""
+        result, result_path = None, None
+        if mimetype == 'application/json' and len(body) <= MAX_INLINE_RESULT:
+            result = body.decode('utf-8')
+        else:
+            os.makedirs(self.result_dir, exist_ok=True)
+            result_path = os.path.join(self.result_dir, f"{job_id}.bin")
+            with open(result_path, 'wb') as f:
+                f.write(body)
+        now = time.time()
+        status = 'done' if status_code < 400 else 'failed'
+        self._update(f"""
+            UPDATE {JOB_TABLE}
+            SET status = ?, progress = 1, status_code = ?, mimetype = ?, result = ?, result_path = ?,
+                download_name = ?, finished_at = ?, expires_at = ? + ttl
+            WHERE id = ?
+        """, (status, status_code, mimetype, result, result_path, download_name, now, now, job_id))
+
+    def fail(self, job_id: str, error: str):
+        now = time.time()
+        self._update(f"""
+            UPDATE {JOB_TABLE} SET status = 'failed', error = ?, finished_at = ?, expires_at = ? + ttl
+            WHERE id = ?
+        """, (error, now, now, job_id))
+
+    def requeue_stale(self, max_age: int = STALE_AFTER) -> int:
+        """Jobs abgestürzter Worker erneut einreihen, nach MAX_ATTEMPTS Versuchen als fehlgeschlagen markieren"""
+        now = time.time()
+        conn = self.connect()
+        try:
+            conn.execute(f"""
+                UPDATE {JOB_TABLE}
+                SET status = 'failed', error = 'Worker nicht mehr erreichbar', finished_at = ?, expires_at = ? + ttl
+                WHERE status = 'running' AND heartbeat_at < ? AND attempts >= ?
+            """, (now, now, now - max_age, MAX_ATTEMPTS))
+            return conn.execute(f"""
+                UPDATE {JOB_TABLE} SET status = 'queued', worker = NULL
+                WHERE status = 'running' AND heartbeat_at < ?
+            """, (now - max_age,)).rowcount
+        finally:
+            conn.close()
+
+    def purge_expired(self) -> int:
+        """Abgelaufene Ergebnisse samt Dateien löschen"""
+        conn = self.connect()
+        try:
+            rows = conn.execute(f"""
+                SELECT id, result_path FROM {JOB_TABLE}
+                WHERE status IN ('done', 'failed', 'cancelled') AND expires_at < ?
+            """, (time.time(),)).fetchall()
+            for row in rows:
+                if row['result_path'] and os.path.exists(row['result_path']):
+                    os.remove(row['result_path'])
+            conn.executemany(f"DELETE FROM {JOB_TABLE} WHERE id = ?", [(row['id'],) for row in rows])
+            return len(rows)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_dict(row) -> Dict[str, Any]:
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'progress': round(row['progress'], 3),
+            'message': row['message'],
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'created_at': _iso(row['created_at']),
+            'started_at': _iso(row['started_at']),
+            'finished_at': _iso(row['finished_at']),
+            'expires_at': _iso(row['expires_at']),
+        }
+
+
+def job_queue() -> JobQueue:
+    return JobQueue(os.path.join(current_app.instance_path, 'bess.db'))
+
+
+def current_job_id() -> Optional[str]:
+    """ID des Jobs, in dem der aktuelle Request läuft (None bei normalen Requests)"""
+    try:
+        return request.environ.get(JOB_ENVIRON_KEY)
+    except RuntimeError:
+        return None
+
+
+def report_progress(fraction: float, message: Optional[str] = None):
+    """Fortschritt (0..1) aus einer View melden; außerhalb eines Jobs ohne Wirkung"""
+    job_id = current_job_id()
+    if job_id:
+        try:
+            job_queue().progress(job_id, fraction, message)
+        except sqlite3.Error as e:
+            logger.warning('Job-Fortschritt konnte nicht gespeichert werden: %s', e)
+
+
+def wants_async() -> bool:
+    if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '').lower()
+
+
+def _job_links(job_id: str) -> Dict[str, str]:
+    return {
+        'status_url': url_for('jobs.job_status', job_id=job_id),
+        'result_url': url_for('jobs.job_result', job_id=job_id),
+    }
+
+
+def _session_owner(create: bool = False) -> Optional[str]:
+    """Zufälliges Besitzer-Token der Browser-Session für Jobs ohne Anmeldung"""
+    owner = session.get(JOB_OWNER_SESSION_KEY)
+    if owner is None and create:
+        owner = session[JOB_OWNER_SESSION_KEY] = secrets.token_hex(16)
+    return owner
+
+
+def background_job(kind: str, ttl: int = RESULT_TTL):
+    """Decorator: View auf Wunsch des Clients als Hintergrund-Job ausführen
+
+    Gespeichert werden Methode, Pfad, URL-Parameter, JSON-Body und Benutzer; der
+    Worker spielt den Request mit diesen Daten ab und legt die Antwort als Ergebnis ab.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if current_job_id() or not wants_async():
+                return view(*args, **kwargs)
+
+            payload = {
+                'method': request.method,
+                'path': request.path,
+                'args': sorted((key, value) for key, value in request.args.items(multi=True) if key != 'async'),
+                'json': request.get_json(silent=True),
+            }
+            user_id = int(current_user.get_id()) if current_user.is_authenticated else None
+            job, created = job_queue().submit(kind, payload, user_id, ttl,
+                                              owner=None if user_id is not None else _session_owner(create=True))
+            logger.info('Job %s %s (%s)', job['id'], 'eingereiht' if created else 'wiederverwendet', kind)
+            response = jsonify({'success': True, 'job': job, **_job_links(job['id'])})
+            response.status_code = 202
+            response.headers['Location'] = url_for('jobs.job_status', job_id=job['id'])
+            return response
+        return wrapper
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# Ausführung (job_worker.py bzw. Inline-Threads)
+# ----------------------------------------------------------------------
+
+def _download_name(response) -> Optional[str]:
+    disposition = response.headers.get('Content-Disposition', '')
+    for part in disposition.split(';'):
+        name, _, value = part.strip().partition('=')
+        if name == 'filename':
+            return value.strip('"')
+    return None
+
+
+def run_job(app, queue: JobQueue, job: Dict[str, Any]):
+    """Gespeicherten Request im Worker abspielen und die Antwort als Ergebnis ablegen"""
+    payload = json.loads(job['payload'])
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            queue.heartbeat(job['id'])
+
+    threading.Thread(target=beat, name=f"job-heartbeat-{job['id'][:8]}", daemon=True).start()
+    with _running_lock:
+        _running_jobs[job['id']] = job['worker']
+    started = time.perf_counter()
+    try:
+        with app.test_client() as client:
+            if job['user_id'] is not None:
+                with client.session_transaction() as session:
+                    session['_user_id'] = str(job['user_id'])
+                    session['_fresh'] = False
+            response = client.open(
+                payload['path'], method=payload['method'],
+                query_string=[tuple(item) for item in payload['args']],
+                json=payload['json'],
+                environ_overrides={JOB_ENVIRON_KEY: job['id']},
+            )
+            queue.complete(job['id'], response.status_code, response.mimetype,
+                           response.get_data(), _download_name(response))
+            response.close()
+        logger.info('Job %s (%s) beendet: HTTP %s nach %.1f s', job['id'], job['kind'],
+                    response.status_code, time.perf_counter() - started)
+    except Exception as e:
+        logger.exception('Job %s (%s) fehlgeschlagen', job['id'], job['kind'])
+        queue.fail(job['id'], str(e))
+    finally:
+        stop.set()
+        with _running_lock:
+            _running_jobs.pop(job['id'], None)
+
+
+def release_running_jobs(queue: JobQueue) -> int:
+    """Alle laufenden Jobs dieses Prozesses zurück in die Warteschlange (Worker wird beendet)"""
+    with _running_lock:
+        running = list(_running_jobs.items())
+    return sum(queue.release(job_id, worker) for job_id, worker in running)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def work(app, queue: JobQueue, poll_interval: float = 1.0, stop: Optional[threading.Event] = None,
+         once: bool = False) -> int:
+    """Worker-Schleife: Jobs übernehmen und ausführen; ``once`` endet bei leerer Warteschlange"""
+    stop = stop or threading.Event()
+    processed = 0
+    last_maintenance = 0.0
+    while not stop.is_set():
+        if time.monotonic() - last_maintenance > 60:
+            requeued = queue.requeue_stale()
+            purged = queue.purge_expired()
+            if requeued or purged:
+                logger.info('Jobs: %s erneut eingereiht, %s abgelaufene Ergebnisse gelöscht', requeued, purged)
+            last_maintenance = time.monotonic()
+        job = queue.claim(worker_name())
+        if job is None:
+            if once:
+                break
+            stop.wait(poll_interval)
+            continue
+        run_job(app, queue, job)
+        processed += 1
+    return processed
+
+
+def create_worker_app():
+    """Eigene App-Instanz für Jobs
+
+    CSRF ist dort abgeschaltet: der Token wurde beim Einreihen im Webprozess geprüft,
+    der abgespielte Request hat keine Browser-Session.
+    """
+    from . import create_app
+
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    return app
+
+
+_inline_started = threading.Event()
+
+
+def start_inline_workers(count: int = INLINE_WORKERS) -> Optional[threading.Thread]:
+    """Worker-Threads im Webprozess, z.B. für die lokale Entwicklung ohne job_worker.py"""
+    if count <= 0 or _inline_started.is_set():
+        return None
+    _inline_started.set()
+
+    def run():
+        app = create_worker_app()
+        queue = JobQueue(os.path.join(app.instance_path, 'bess.db'))
+        for i in range(1, count):
+            threading.Thread(target=work, args=(app, queue), name=f"bess-job-worker-{i}", daemon=True).start()
+        work(app, queue)
+
+    thread = threading.Thread(target=run, name='bess-job-worker-0', daemon=True)
+    thread.start()
+    return thread
+
+
+# ----------------------------------------------------------------------
+# Status- und Ergebnis-Endpunkte
+# ----------------------------------------------------------------------
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+
+def _visible_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Job nur für den einreichenden Benutzer (bzw. Admins) oder ohne Anmeldung für die einreichende Session"""
+    job = job_queue().get(job_id, raw=True)
+    if job is None:
+        return None
+    if job['user_id'] is None:
+        owner = _session_owner()
+        return job if owner is not None and secrets.compare_digest(owner, job['owner'] or '') else None
+    if not current_user.is_authenticated:
+        return None
+    if str(job['user_id']) != current_user.get_id() and not current_user.is_admin():
+        return None
+    return job
+
+
+@jobs_bp.route('', methods=['GET'])
+def list_jobs():
+    """Letzte Jobs des angemeldeten Benutzers"""
+    user_id = int(current_user.get_id()) if current_user.is_authenticated else None
+    limit = min(request.args.get('limit', 50, type=int), 200)
+    owner = None if user_id is not None else _session_owner()
+    return jsonify({'success': True, 'jobs': job_queue().list(user_id, limit, owner)})
+
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Status und Fortschritt; fertige JSON-Ergebnisse direkt eingebettet"""
+    job = _visible_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job nicht gefunden'}), 404
+    data = JobQueue._to_dict(job)
+    data.update(_job_links(job_id))
+    data['status_code'] = job['status_code']
+    if job['result'] is not None:
+        data['result'] = json.loads(job['result'])
+    return jsonify({'success': True, 'job': data})
+
+
+@jobs_bp.route('/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Antwort des Jobs so, wie der synchrone Endpunkt sie geliefert hätte"""
+    job = _visible_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job nicht gefunden'}), 404
+    if job['status'] in ('queued', 'running'):
+        response = jsonify({'success': False, 'status': job['status'], 'progress': job['progress']})
+        response.status_code = 409
+        response.headers['Retry-After'] = '2'
+        return response
+    if job['status_code'] is None:
+        return jsonify({'success': False, 'status': job['status'], 'error': job['error']}), 500
+    if job['result'] is not None:
+        return Response(job['result'], status=job['status_code'], mimetype=job['mimetype'])
+    if not job['result_path'] or not os.path.exists(job['result_path']):
+        return jsonify({'success': False, 'error': 'Ergebnis abgelaufen'}), 410
+    response = send_file(job['result_path'], mimetype=job['mimetype'],
+                         as_attachment=bool(job['download_name']), download_name=job['download_name'])
+    response.status_code = job['status_code']
+    return response
+
+
+@jobs_bp.route('/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Wartenden Job abbrechen"""
+    if _visible_job(job_id) is None:
+        return jsonify({'success': False, 'error': 'Job nicht gefunden'}), 404
+    if not job_queue().cancel(job_id):
+        return jsonify({'success': False, 'error': 'Job läuft bereits oder ist beendet'}), 409
+    return jsonify({'success': True})
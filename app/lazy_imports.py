@@ -0,0 +1,225 @@
+"""
+Verzögerte Imports für einen schnellen App-Start
+Schwere Abhängigkeiten (pandas, NumPy, Fetcher, ML-Bibliotheken) werden erst beim ersten
+Zugriff geladen; dazu ein Importzeit-Bericht auf Basis von ``python -X importtime``
+"""
+
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class LazyImport:
+    """Platzhalter für ein Modul bzw. ein Attribut daraus, geladen beim ersten Zugriff
+
+    ``lazy_import('pandas')`` verhält sich wie ``import pandas``,
+    ``lazy_import('pvgis_data_fetcher', 'PVGISDataFetcher')`` wie das entsprechende
+    ``from ... import``. Attributzugriffe und Aufrufe werden weitergereicht; Werte,
+    die direkt benutzt werden (Konstanten, Typ-Annotationen), über das Modul ansprechen.
+    """
+
+    __slots__ = ('_module', '_attr', '_package', '_target', '_lock')
+
+    def __init__(self, module: str, attr: Optional[str] = None, package: Optional[str] = None):
+        self._module = module
+        self._attr = attr
+        self._package = package
+        self._target = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module, self._package)
+                    self._target = getattr(module, self._attr) if self._attr else module
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        name = f"{self._module}.{self._attr}" if self._attr else self._module
+        return f"<LazyImport {name} ({'geladen' if self._target is not None else 'ausstehend'})>"
+
+
+def lazy_import(module: str, attr: Optional[str] = None, package: Optional[str] = None) -> Any:
+    """Modul bzw. Modul-Attribut verzögert importieren (relative Namen mit ``package``)"""
+    return LazyImport(module, attr, package)
+
+
+def is_loaded(obj: Any) -> bool:
+    """Ob ein Platzhalter bereits importiert wurde (normale Objekte gelten als geladen)"""
+    if isinstance(obj, LazyImport):
+        return obj._target is not None
+    return True
+
+
+def module_available(name: str) -> bool:
+    """Prüft, ob ein Modul installiert ist, ohne es auszuführen"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class ImportCheck:
+    """Verfügbarkeits-Flag, das beim ersten Wahrheitstest tatsächlich importiert
+
+    ``module_available`` sieht nur, ob ein Modul installiert ist; ein Modul, das beim
+    Import scheitert (fehlende Abhängigkeit, Syntaxfehler), gälte als verfügbar.
+    ``if not FLAG`` importiert daher einmalig, merkt sich das Ergebnis und loggt den
+    Grund als Warnung. Für JSON-Antworten ``bool(FLAG)`` verwenden.
+    """
+
+    __slots__ = ('_modules', '_result', '_lock', 'error')
+
+    def __init__(self, *modules: str):
+        self._modules = modules
+        self._result = None
+        self._lock = threading.Lock()
+        self.error: Optional[str] = None
+
+    def _check(self) -> bool:
+        for name in self._modules:
+            if not module_available(name):
+                self.error = f"{name} nicht installiert"
+                return False
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                self.error = f"{name}: {e}"
+                return False
+        return True
+
+    def __bool__(self):
+        if self._result is None:
+            with self._lock:
+                if self._result is None:
+                    self._result = self._check()
+                    if not self._result:
+                        logger.warning(f"Modul nicht verfügbar ({self.error})")
+        return self._result
+
+    def __repr__(self):
+        state = 'ungeprüft' if self._result is None else self._result
+        return f"<ImportCheck {', '.join(self._modules)} ({state})>"
+
+
+def import_available(*modules: str) -> ImportCheck:
+    """Flag "alle Module importierbar", geprüft beim ersten Zugriff statt beim App-Start"""
+    return ImportCheck(*modules)
+
+
+# ----------------------------------------------------------------------
+# Importzeit-Bericht
+# ----------------------------------------------------------------------
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S.*)$')
+
+# Was beim Bericht importiert wird
+TARGETS = {
+    'app': 'from app import create_app; create_app()',
+    'routes': 'import app.routes',
+    'wsgi': 'import wsgi',
+}
+
+
+def parse_importtime(text: str) -> List[Dict[str, Any]]:
+    """Ausgabe von ``-X importtime`` in Einträge (Mikrosekunden, Verschachtelungstiefe)"""
+    entries = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({
+                'module': module.strip(),
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'depth': len(indent) // 2,
+            })
+    return entries
+
+
+def import_time_report(code: str = TARGETS['app'], top: int = 25, cwd: Optional[str] = None,
+                       env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Startet einen frischen Interpreter mit ``-X importtime`` und fasst die Importkosten zusammen
+
+    ``top`` listet die teuersten Pakete nach kumulierter Zeit (nur oberste Ebene,
+    d.h. was der Startcode direkt oder über Projektmodule anstößt) sowie die
+    Module mit der höchsten Eigenzeit.
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=cwd, env=dict(os.environ, **(env or {}))
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    entries = parse_importtime(result.stderr)
+    top_level = [entry for entry in entries if entry['depth'] == 0]
+    errors = [line for line in result.stderr.splitlines() if line and not line.startswith('import time:')]
+    return {
+        'code': code,
+        'returncode': result.returncode,
+        'wall_ms': round(wall_ms, 1),
+        'import_ms': round(sum(entry['self_us'] for entry in entries) / 1000, 1),
+        'modules': len(entries),
+        'top_cumulative': sorted(top_level, key=lambda e: e['cumulative_us'], reverse=True)[:top],
+        'top_self': sorted(entries, key=lambda e: e['self_us'], reverse=True)[:top],
+        'errors': errors[-10:],
+    }
+
+
+def _print_report(report: Dict[str, Any]):
+    print(f"Startcode: {report['code']}")
+    print(f"Gesamt: {report['wall_ms']:.0f} ms Laufzeit, {report['import_ms']:.0f} ms Importzeit, "
+          f"{report['modules']} Module")
+    print("\nTeuerste Importe (kumuliert, oberste Ebene):")
+    for entry in report['top_cumulative']:
+        print(f"  {entry['cumulative_us'] / 1000:9.1f} ms  {entry['module']}")
+    print("\nHöchste Eigenzeit:")
+    for entry in report['top_self']:
+        print(f"  {entry['self_us'] / 1000:9.1f} ms  {entry['module']}")
+    if report['returncode'] != 0:
+        print(f"\n⚠️ Startcode fehlgeschlagen (Exit {report['returncode']}):")
+        for line in report['errors']:
+            print(f"  {line}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Importzeit-Bericht für den App-Start (python -X importtime)')
+    parser.add_argument('target', nargs='?', default='app', choices=sorted(TARGETS),
+                        help='app = create_app(), routes = nur Haupt-Blueprint, wsgi = WSGI-Einstieg')
+    parser.add_argument('--code', help='Eigener Startcode statt target')
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--features', help='BESS_FEATURES für den Testlauf (z.B. "core" oder "ml,export")')
+    parser.add_argument('--json', action='store_true', help='Bericht als JSON ausgeben')
+    args = parser.parse_args()
+
+    env = {'BESS_FEATURES': args.features} if args.features else None
+    report = import_time_report(args.code or TARGETS[args.target], args.top, env=env)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        _print_report(report)
+    sys.exit(0 if report['returncode'] == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
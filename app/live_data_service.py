@@ -21,6 +21,10 @@ except ImportError:
     MQTT_AVAILABLE = False
     logger.warning("MQTT Bridge nicht verfügbar")
 
+from .live_push import live_telemetry_hub
+from .project_live_aggregates import project_live_aggregator
+from .telemetry_rollups import parse_utc
+
 class LiveBESSDataService:
     """Service für Live BESS-Daten Integration"""
     
@@ -42,6 +46,12 @@ class LiveBESSDataService:
             # Callback für neue Daten registrieren
             mqtt_bridge.add_data_callback(self.on_new_mqtt_data)
             
+            # Push-Kanal (SSE) direkt aus den Bridge-Callbacks speisen
+            mqtt_bridge.add_data_callback(live_telemetry_hub.publish)
+            
+            # Projekt-Aggregate (Durchsatz, Zyklen, Alarme) inkrementell fortschreiben
+            mqtt_bridge.add_data_callback(project_live_aggregator.on_telemetry)
+            
             # MQTT-Verbindung herstellen
             mqtt_bridge.connect()
             
@@ -245,9 +255,15 @@ class LiveBESSDataService:
             logger.error(f"Fehler beim Erstellen der Gerätezusammenfassung: {e}")
             return {'error': str(e)}
     
-    def get_chart_data(self, hours: int = 24) -> Dict[str, Any]:
+    def get_chart_data(self, hours: int = 24, max_points: int = 300) -> Dict[str, Any]:
         """Holt Daten für Charts (letzte X Stunden) - Optimiert für Performance"""
         try:
+            # MQTT-Daten: vorberechnete Rollups statt Rohdaten aggregieren
+            if self.use_mqtt and self.mqtt_connected and MQTT_AVAILABLE:
+                chart_data = self._get_rollup_chart_data(hours, max_points)
+                if chart_data:
+                    return chart_data
+            
             # Reduziere Datenmenge für bessere Performance
             # Nur alle 30 Min ein Datensatz statt alle 15 Min
             data = self.get_live_data(limit=min(hours * 2, 48))  # Maximal 48 Datensätze
@@ -295,6 +311,28 @@ class LiveBESSDataService:
             # Fallback zu Demo-Daten bei Fehlern
             return self._get_demo_chart_data(hours)
     
+    def _get_rollup_chart_data(self, hours: int, max_points: int) -> Optional[Dict[str, Any]]:
+        """Chart-Daten aus der passenden Rollup-Stufe der MQTT-Bridge"""
+        series = mqtt_bridge.get_chart_series(hours=hours, max_points=max_points)
+        if not series or not series.get('timestamps'):
+            return None
+        
+        label_format = '%H:%M' if hours <= 24 else '%d.%m. %H:%M'
+        chart_data = {
+            'labels': [datetime.fromtimestamp(ts).strftime(label_format) for ts in series['timestamps']],
+            'soc': series['soc']['avg'],
+            'power': series['power']['avg'],
+            'voltage': series['voltage_dc']['avg'],
+            'current': series['current_dc']['avg'],
+            'temperature': series['temperature_max']['avg'],
+            # Min/Max-Hüllkurven, damit Spitzen bei groben Stufen sichtbar bleiben
+            'power_min': series['power']['min'],
+            'power_max': series['power']['max'],
+            'temperature_max': series['temperature_max']['max'],
+            'tier_seconds': series['tier_seconds']
+        }
+        return chart_data
+    
     def _get_demo_chart_data(self, hours: int = 24) -> Dict[str, Any]:
         """Erstellt Demo-Chart-Daten für bessere Performance bei fehlenden Live-Daten"""
         import random
@@ -457,11 +495,19 @@ class LiveBESSDataService:
             total_energy = 0
             last_update = None
             
+            # Laufende Projekt-Aggregate (O(1), unabhängig von der Historienlänge)
+            live_aggregates = project_live_aggregator.get_project_summary(project_id)
+            live_devices = live_aggregates['devices'] if live_aggregates else {}
+            
             for mapping in mappings:
-                # Hole neueste Daten
-                latest_data = BESSTelemetryData.query.filter_by(
-                    bess_mapping_id=mapping.id
-                ).order_by(BESSTelemetryData.timestamp.desc()).first()
+                live_device = live_devices.get(f"{mapping.site}/{mapping.device}")
+                
+                # Hole neueste Daten (nur falls kein Live-Aggregat vorhanden)
+                latest_data = None
+                if not live_device:
+                    latest_data = BESSTelemetryData.query.filter_by(
+                        bess_mapping_id=mapping.id
+                    ).order_by(BESSTelemetryData.timestamp.desc()).first()
                 
                 device_info = {
                     'id': mapping.id,
@@ -486,8 +532,24 @@ class LiveBESSDataService:
                         'data_quality': latest_data.data_quality
                     })
                     
-                    if latest_data.timestamp and (not last_update or latest_data.timestamp > last_update):
-                        last_update = latest_data.timestamp
+                    timestamp = parse_utc(latest_data.timestamp)
+                    if timestamp and (not last_update or timestamp > last_update):
+                        last_update = timestamp
+                elif live_device:
+                    latest = live_device['latest']
+                    device_info.update({
+                        'last_data': latest.get('timestamp'),
+                        'soc': latest.get('soc'),
+                        'power': latest.get('power'),
+                        'temperature': latest.get('temperature'),
+                        'data_quality': 'live',
+                        'aggregates': {k: v for k, v in live_device.items() if k != 'latest'}
+                    })
+                    
+                    # Epoch- oder ISO-Zeitstempel, einheitlich als UTC vergleichen
+                    timestamp = parse_utc(latest.get('timestamp'))
+                    if timestamp and (not last_update or timestamp > last_update):
+                        last_update = timestamp
                 
                 devices.append(device_info)
                 sites.add(mapping.site)
@@ -506,7 +568,8 @@ class LiveBESSDataService:
                 'site_count': len(sites),
                 'total_power_kw': total_power,
                 'total_energy_kwh': total_energy,
-                'last_update': last_update.isoformat() if last_update else None
+                'last_update': last_update.isoformat() if last_update else None,
+                'live_aggregates': {k: v for k, v in live_aggregates.items() if k != 'devices'} if live_aggregates else None
             }
             
         except Exception as e:
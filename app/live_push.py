@@ -0,0 +1,184 @@
+"""
+Live BESS Push-Kanal
+Server-Sent Events (SSE) für Live-Telemetrie direkt aus den MQTT-Bridge-Callbacks
+"""
+
+import os
+import json
+import threading
+import time
+import logging
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Felder, die per Delta-Encoding übertragen werden (Bridge-Format)
+PUSH_FIELDS = (
+    'timestamp', 'soc', 'power', 'power_charge', 'power_discharge',
+    'voltage_dc', 'current_dc', 'temperature_max', 'soh', 'alarms'
+)
+
+DeviceKey = Tuple[str, str]
+
+# Offene Streams je Worker-Prozess: jeder belegt einen Gunicorn-Thread (--threads 16 in
+# bess-simulation.service), die Hälfte bleibt für normale Requests frei
+MAX_STREAMS = int(os.environ.get('BESS_LIVE_MAX_STREAMS', '8'))
+
+# Wartezeit für abgewiesene Clients (Retry-After, Sekunden)
+STREAM_RETRY_AFTER = 30
+
+
+class LiveSubscriber:
+    """Ein verbundener SSE-Client mit eigenem Filter, Rate-Limit und Delta-Zustand"""
+
+    def __init__(self, devices: Optional[Set[DeviceKey]] = None, min_interval: float = 1.0):
+        self.devices = devices  # None = alle Geräte
+        self.min_interval = min_interval
+        self.pending: Dict[DeviceKey, Dict[str, Any]] = {}
+        self.last_sent: Dict[DeviceKey, Dict[str, Any]] = {}
+        self.last_flush = 0.0
+        self.condition = threading.Condition()
+        self.closed = False
+
+    def accepts(self, key: DeviceKey) -> bool:
+        return self.devices is None or key in self.devices
+
+    def offer(self, key: DeviceKey, record: Dict[str, Any]):
+        """Neuesten Datensatz vormerken - ältere, noch nicht gesendete Werte werden überschrieben"""
+        with self.condition:
+            self.pending[key] = record
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+    def wait_for_batch(self, heartbeat: float) -> Optional[Dict[DeviceKey, Dict[str, Any]]]:
+        """Wartet auf neue Daten unter Einhaltung des Client-Rate-Limits.
+
+        Gibt ``None`` bei Heartbeat-Timeout zurück, sonst die gesammelten Datensätze.
+        """
+        deadline = time.monotonic() + heartbeat
+        with self.condition:
+            while not self.closed:
+                now = time.monotonic()
+                ready_at = self.last_flush + self.min_interval
+                if self.pending and now >= ready_at:
+                    batch = self.pending
+                    self.pending = {}
+                    self.last_flush = now
+                    return batch
+                if now >= deadline:
+                    return None
+                wait_until = min(deadline, ready_at) if self.pending else deadline
+                self.condition.wait(max(wait_until - now, 0.01))
+        return None
+
+    def encode_delta(self, key: DeviceKey, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Liefert nur die seit dem letzten Versand geänderten Felder"""
+        previous = self.last_sent.get(key)
+        if previous is None:
+            changed = {field: record.get(field) for field in PUSH_FIELDS}
+            full = True
+        else:
+            changed = {
+                field: record.get(field) for field in PUSH_FIELDS
+                if record.get(field) != previous.get(field)
+            }
+            full = False
+        if not changed:
+            return None
+
+        self.last_sent[key] = {field: record.get(field) for field in PUSH_FIELDS}
+        return {'site': key[0], 'device': key[1], 'full': full, 'data': changed}
+
+
+class LiveTelemetryHub:
+    """Verteilt MQTT-Telemetrie ohne Datenbankzugriff an alle SSE-Clients"""
+
+    def __init__(self, max_subscribers: int = MAX_STREAMS):
+        self.max_subscribers = max_subscribers
+        self.subscribers: List[LiveSubscriber] = []
+        self.latest: Dict[DeviceKey, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.published_count = 0
+
+    def publish(self, data: Dict[str, Any]):
+        """Daten-Callback für ``BESSMQTTBridge.add_data_callback``"""
+        key = (data.get('site'), data.get('device'))
+        with self.lock:
+            self.latest[key] = data
+            self.published_count += 1
+            subscribers = list(self.subscribers)
+
+        for subscriber in subscribers:
+            if subscriber.accepts(key):
+                subscriber.offer(key, data)
+
+    def subscribe(self, devices: Optional[Iterable[DeviceKey]] = None,
+                  min_interval: float = 1.0) -> LiveSubscriber:
+        device_set = set(devices) if devices is not None else None
+        subscriber = LiveSubscriber(devices=device_set, min_interval=min_interval)
+
+        with self.lock:
+            if len(self.subscribers) >= self.max_subscribers:
+                raise RuntimeError('Maximale Anzahl an Live-Verbindungen erreicht')
+            self.subscribers.append(subscriber)
+            # Initialer Snapshot, damit der Client nicht auf das nächste Event warten muss
+            snapshot = [(k, v) for k, v in self.latest.items() if subscriber.accepts(k)]
+
+        for key, record in snapshot:
+            subscriber.offer(key, record)
+
+        logger.debug(f"Live-Subscriber registriert ({len(self.subscribers)} aktiv)")
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveSubscriber):
+        subscriber.close()
+        with self.lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+        logger.debug(f"Live-Subscriber entfernt ({len(self.subscribers)} aktiv)")
+
+    def stream(self, subscriber: LiveSubscriber, heartbeat: float = 15.0):
+        """Generator für ``text/event-stream``-Antworten"""
+        try:
+            yield 'retry: 5000\n\n'
+            while not subscriber.closed:
+                batch = subscriber.wait_for_batch(heartbeat)
+                if batch is None:
+                    # Kommentarzeile hält Proxy-Verbindungen (nginx) offen
+                    yield ': keepalive\n\n'
+                    continue
+
+                deltas = []
+                for key, record in batch.items():
+                    delta = subscriber.encode_delta(key, record)
+                    if delta:
+                        deltas.append(delta)
+
+                if deltas:
+                    yield f"event: telemetry\ndata: {json.dumps(deltas)}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'subscribers': len(self.subscribers),
+                'devices': len(self.latest),
+                'published_messages': self.published_count
+            }
+
+
+def resolve_project_devices(project_id: int) -> Set[DeviceKey]:
+    """Site/Device-Paare der aktiven BESS-Mappings eines Projekts"""
+    from models import BESSProjectMapping
+
+    mappings = BESSProjectMapping.query.filter_by(project_id=project_id, is_active=True).all()
+    return {(mapping.site, mapping.device) for mapping in mappings}
+
+
+# Globale Hub-Instanz
+live_telemetry_hub = LiveTelemetryHub()
@@ -4,6 +4,8 @@ Professionelles Logging-System mit verschiedenen Log-Levels und Formaten
 """
 
 import os
+import atexit
+import queue
 import logging
 import logging.handlers
 from datetime import datetime
@@ -36,22 +38,50 @@ JSON_FORMAT = logging.Formatter(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
-def setup_logging():
-    """Haupt-Logging-System einrichten"""
+# Log-Level (BESS_LOG_LEVEL=DEBUG für Diagnose); unterhalb des Levels kosten Debug-Aufrufe
+# nur die Level-Prüfung, da Meldungen erst bei Ausgabe formatiert werden
+LOG_LEVEL = os.environ.get('BESS_LOG_LEVEL', 'INFO').upper()
+
+# Handler-Ausgabe (Konsole, Dateien) in einem Hintergrund-Thread statt im Request
+LOG_ASYNC = os.environ.get('BESS_LOG_ASYNC', '1').lower() not in ('0', 'false', 'no')
+
+_queue_listener = None
+
+
+def _stop_queue_listener():
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def setup_logging(level=None, async_handlers=None):
+    """Haupt-Logging-System einrichten
+
+    Mit ``async_handlers`` (Standard BESS_LOG_ASYNC) hängt am Root-Logger nur ein
+    QueueHandler; ein QueueListener schreibt in Konsole und Dateien.
+    """
+    global _queue_listener
+    level = logging.getLevelName(level or LOG_LEVEL)
+    if not isinstance(level, int):
+        level = logging.INFO
+    async_handlers = LOG_ASYNC if async_handlers is None else async_handlers
     
     # Root-Logger konfigurieren
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
+    root_logger.setLevel(level)
     
-    # Bestehende Handler entfernen
+    # Bestehende Handler entfernen (inkl. Listener eines früheren Aufrufs)
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_queue_listener()
+    handlers = []
     
     # Console-Handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(level)
     console_handler.setFormatter(SIMPLE_FORMAT)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # Haupt-Log-Datei
     file_handler = logging.handlers.RotatingFileHandler(
@@ -62,7 +92,7 @@ def setup_logging():
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(DETAILED_FORMAT)
-    root_logger.addHandler(file_handler)
+    handlers.append(file_handler)
     
     # Error-Log-Datei
     error_handler = logging.handlers.RotatingFileHandler(
@@ -73,10 +103,53 @@ def setup_logging():
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(DETAILED_FORMAT)
-    root_logger.addHandler(error_handler)
+    handlers.append(error_handler)
+    
+    if async_handlers:
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
     
     return root_logger
 
+
+atexit.register(_stop_queue_listener)
+
+
+class RowSampler:
+    """Gedrosselte Pro-Zeile-Diagnose für Schleifen
+
+    Loggt die ersten ``first`` Aufrufe und danach jeden ``every``-ten. Ist das
+    Level abgeschaltet, kostet ein Aufruf nur einen Zählerschritt; ``summary``
+    meldet am Ende, wie viele Zeilen-Meldungen unterdrückt wurden.
+    """
+    
+    def __init__(self, logger, level=logging.DEBUG, first=3, every=1000):
+        self.logger = logger
+        self.level = level
+        self.first = first
+        self.every = every
+        self.count = 0
+        self.suppressed = 0
+        self.enabled = logger.isEnabledFor(level)
+    
+    def __call__(self, msg, *args):
+        self.count += 1
+        if not self.enabled:
+            return
+        if self.count <= self.first or (self.every and self.count % self.every == 0):
+            self.logger.log(self.level, msg, *args, stacklevel=2)
+        else:
+            self.suppressed += 1
+    
+    def summary(self, what='Zeilen-Meldungen'):
+        if self.enabled and self.suppressed:
+            self.logger.log(self.level, '%d weitere %s unterdrückt', self.suppressed, what, stacklevel=2)
+
 def setup_app_logger(name="bess_simulation"):
     """Anwendungsspezifischen Logger einrichten"""
     logger = logging.getLogger(name)
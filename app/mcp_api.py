@@ -143,8 +143,9 @@ def api_database():
     try:
         table = request.args.get('table', 'projects')
         limit = int(request.args.get('limit', 10))
+        cursor = request.args.get('cursor', type=int)
         
-        result = db_project(table, limit)
+        result = db_project(table, limit, cursor)
         return _success_response(result, f"Datenbank-Tabelle {table}")
         
     except Exception as e:
@@ -5,18 +5,19 @@ Bietet ML-Features über REST-API an - VOLLSTÄNDIG FUNKTIONSFÄHIG
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Optional
 
-from .ml_models import (
-    price_forecasting_model,
-    bess_optimization_model,
-    anomaly_detection_model,
-    predictive_maintenance_model
-)
+from .lazy_imports import lazy_import
+
+# pandas/NumPy und die ML-Modelle (scikit-learn) erst beim ersten Request laden
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+price_forecasting_model = lazy_import('.ml_models', 'price_forecasting_model', __package__)
+bess_optimization_model = lazy_import('.ml_models', 'bess_optimization_model', __package__)
+anomaly_detection_model = lazy_import('.ml_models', 'anomaly_detection_model', __package__)
+predictive_maintenance_model = lazy_import('.ml_models', 'predictive_maintenance_model', __package__)
 from models import db, Project, SpotPrice, LoadProfile
 
 # Blueprint erstellen
@@ -7,7 +7,11 @@ RESTful APIs für Machine Learning Services
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
 import logging
-from .ml_service import ml_service
+from .lazy_imports import lazy_import
+from .jobs import background_job
+
+# scikit-learn/XGBoost/statsmodels erst beim ersten ML-Request laden
+ml_service = lazy_import('.ml_service', 'ml_service', __package__)
 
 # Blueprint erstellen
 ml_bp = Blueprint('ml_analytics', __name__, url_prefix='/api/ml')
@@ -33,6 +37,7 @@ def ml_status():
         }), 500
 
 @ml_bp.route('/train/price-prediction', methods=['POST'])
+@background_job('train_price_model')
 def train_price_prediction():
     """Trainiert ein Modell für Strompreis-Vorhersagen"""
     try:
@@ -13,6 +13,7 @@ from .logging_config import (
     log_request, log_error, log_security_event, 
     log_performance_metric, setup_app_logger
 )
+from .request_profiling import init_request_profiling
 
 logger = setup_app_logger("monitoring")
 
@@ -273,6 +274,8 @@ def init_monitoring(app):
     """Monitoring für Flask-App initialisieren"""
     global monitoring
     monitoring = MonitoringMiddleware(app)
+    # Latenz-Histogramme, SQL-Zähler und Profile langsamer Requests (BESS_PROFILING)
+    init_request_profiling(app)
     logger.info("Monitoring für Flask-App initialisiert")
     return monitoring
 
@@ -74,6 +74,130 @@ def monitoring_stats():
         logger.error(f"Fehler beim Abrufen der Monitoring-Statistiken: {e}")
         return jsonify({'error': str(e)}), 500
 
+@monitoring_bp.route('/monitoring/retention', methods=['GET'])
+def retention_stats():
+    """Metriken des letzten Telemetrie-Retention-Laufs abrufen"""
+    try:
+        from .telemetry_retention import TelemetryRetentionManager
+        return jsonify(TelemetryRetentionManager().get_stats())
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Retention-Statistiken: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/monitoring/retention/run', methods=['POST'])
+@admin_required
+def run_retention():
+    """Telemetrie-Retention manuell auslösen"""
+    try:
+        from .telemetry_retention import TelemetryRetentionManager
+        metrics = TelemetryRetentionManager().run()
+        logger.info(f"Telemetrie-Retention manuell ausgeführt: {metrics}")
+        return jsonify(metrics)
+    except Exception as e:
+        logger.error(f"Fehler beim Retention-Lauf: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/monitoring/telemetry-ingest', methods=['GET'])
+def telemetry_ingest_stats():
+    """Batch-Ingest der MQTT-Bridge: Queue-Füllstand, verworfene Nachrichten, Geräteprofile"""
+    try:
+        from .mqtt_bridge import mqtt_bridge
+    except ImportError as e:
+        return jsonify({'enabled': False, 'message': f'MQTT-Bridge nicht verfügbar: {e}'})
+    try:
+        stats = mqtt_bridge.get_ingest_stats()
+        stats['enabled'] = True
+        return jsonify(stats)
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Ingest-Statistiken: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/monitoring/ingestion', methods=['GET'])
+def ingestion_stats():
+    """Job-Metriken und Datenfrische des Ingestion-Schedulers abrufen"""
+    try:
+        from ingestion_scheduler import load_stats
+        stats = load_stats()
+        if not stats:
+            return jsonify({'jobs': {}, 'message': 'Ingestion-Scheduler hat noch keine Statistiken geschrieben'})
+        return jsonify(stats)
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Ingestion-Statistiken: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/monitoring/fetch-cache', methods=['GET'])
+def fetch_cache_stats():
+    """Trefferquote des Response-Caches der externen Fetcher (dieser Prozess)"""
+    try:
+        from fetch_cache import fetch_cache
+        stats = fetch_cache.get_stats()
+        stats.update({'enabled': fetch_cache.enabled, 'cache_dir': fetch_cache.cache_dir})
+        return jsonify(stats)
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Fetch-Cache-Statistiken: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/monitoring/endpoints', methods=['GET'])
+@admin_required
+def endpoint_stats():
+    """Latenz- und SQL-Kennzahlen je Endpunkt (p50/p90/p99), langsamste zuerst"""
+    try:
+        from .request_profiling import request_profiler
+        sort = request.args.get('sort', 'p99_ms')
+        limit = request.args.get('limit', 50, type=int)
+        all_workers = request.args.get('scope', 'all') != 'worker'
+        return jsonify({
+            'mode': request_profiler.mode,
+            'slow_ms': request_profiler.slow_ms,
+            'scope': 'all' if all_workers else f'worker {os.getpid()}',
+            'endpoints': request_profiler.endpoint_report(sort, limit, all_workers)
+        })
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Endpunkt-Statistik: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/monitoring/endpoints/reset', methods=['POST'])
+@admin_required
+def reset_endpoint_stats():
+    """Endpunkt-Statistik dieses Workers zurücksetzen"""
+    try:
+        from .request_profiling import request_profiler
+        request_profiler.reset()
+        request_profiler.dump_stats()
+        return jsonify({'success': True, 'worker': os.getpid()})
+    except Exception as e:
+        logger.error(f"Fehler beim Zurücksetzen der Endpunkt-Statistik: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/monitoring/profiles', methods=['GET'])
+@admin_required
+def request_profiles():
+    """Gespeicherte Profile langsamer Requests (BESS_PROFILING=profile)"""
+    try:
+        from .request_profiling import list_profiles, request_profiler
+        profiles = list_profiles(request_profiler.profile_dir or '', request.args.get('endpoint'),
+                                 request.args.get('limit', 50, type=int))
+        return jsonify({'mode': request_profiler.mode, 'profiles': profiles})
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Profile: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@monitoring_bp.route('/monitoring/profiles/<profile_id>', methods=['GET'])
+@admin_required
+def request_profile(profile_id):
+    """Einzelnes Profil: pyinstrument-HTML (Aufrufbaum) bzw. cProfile-Text"""
+    try:
+        from flask import send_file
+        from .request_profiling import profile_path, request_profiler
+        path = profile_path(request_profiler.profile_dir or '', profile_id)
+        if path is None:
+            return jsonify({'error': 'Profil nicht gefunden'}), 404
+        mimetype = 'text/html' if path.endswith('.html') else 'text/plain'
+        return send_file(path, mimetype=mimetype)
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen des Profils {profile_id}: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @monitoring_bp.route('/logs/recent', methods=['GET'])
 @admin_required
 def recent_logs():
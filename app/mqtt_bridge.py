@@ -7,12 +7,16 @@ import paho.mqtt.client as mqtt
 import json
 import sqlite3
 import threading
+import queue
 import time
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Callable
 import os
 
+from .telemetry_rollups import TelemetryRollupStore
+from .telemetry_decoder import telemetry_decoder, DeviceProfile, TelemetryDecoder, load_device_profiles
+
 logger = logging.getLogger(__name__)
 
 class BESSMQTTBridge:
@@ -35,6 +39,30 @@ class BESSMQTTBridge:
         self.base_topic = os.getenv('MQTT_BASE_TOPIC', 'bess')
         self.telemetry_topic = f"{self.base_topic}/+/+/telemetry"
         
+        # Kontinuierliche Rollups (1-min/15-min/1-h) für Charts und Statistiken
+        self.rollups = TelemetryRollupStore(self.db_path)
+        
+        # Batch-Ingest: Nachrichten werden gesammelt und spaltenweise dekodiert
+        self.decoder = telemetry_decoder
+        self.batch_ingest = os.getenv('MQTT_BATCH_INGEST', 'true').lower() == 'true'
+        self.batch_size = int(os.getenv('MQTT_INGEST_BATCH_SIZE', '500'))
+        self.batch_interval = float(os.getenv('MQTT_INGEST_BATCH_INTERVAL', '0.2'))
+        self.ingest_queue = queue.Queue(maxsize=int(os.getenv('MQTT_INGEST_QUEUE_SIZE', '50000')))
+        self.ingest_thread = None
+        self.dropped_messages = 0
+        self.processed_messages = 0
+        
+        # Geräteprofile aus den Modbus-Registerkarten; Zuordnung je Gerät beim BESS-Mapping
+        self.profile_refresh_interval = float(os.getenv('MQTT_PROFILE_REFRESH_INTERVAL', '30'))
+        self.profiles_loaded_at = 0.0
+        load_device_profiles()
+        register_map = os.getenv('LIVE_BESS_REGISTER_MAP')
+        if register_map and os.path.exists(register_map):
+            try:
+                self.decoder.register_profile(DeviceProfile.from_register_map(register_map, name='modbus'))
+            except Exception as e:
+                logger.error(f"Fehler beim Laden der Registerkarte {register_map}: {e}")
+        
         # Initialisiere Datenbank
         self.init_database()
         
@@ -46,6 +74,9 @@ class BESSMQTTBridge:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
+            # Neue Datenbanken sofort mit inkrementellem VACUUM anlegen (Retention gibt Speicher frei)
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS live_bess_telemetry (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -77,7 +108,13 @@ class BESSMQTTBridge:
                 ON live_bess_telemetry(created_at)
             """)
             
+            self.rollups.init_schema(cursor)
+            self.decoder.init_schema(cursor)
+            
             conn.commit()
+            self.decoder.load_assignments(conn)
+            self.profiles_loaded_at = time.monotonic()
+            # Rohdaten aus der Zeit vor den Rollups übernimmt der Retention-Job (telemetry_retention)
             conn.close()
             
             logger.info(f"Live BESS Datenbank initialisiert: {self.db_path}")
@@ -116,7 +153,6 @@ class BESSMQTTBridge:
         """MQTT Nachrichten-Callback"""
         try:
             topic = msg.topic
-            payload = msg.payload.decode('utf-8')
             
             # Parse Topic: bess/site1/bess1/telemetry
             topic_parts = topic.split('/')
@@ -126,71 +162,84 @@ class BESSMQTTBridge:
                 message_type = topic_parts[3]
                 
                 if message_type == 'telemetry':
-                    self.process_telemetry_message(site, device, payload)
+                    if self.batch_ingest:
+                        # Payload bleibt roh - Dekodierung erfolgt gebündelt im Ingest-Thread
+                        try:
+                            self.ingest_queue.put_nowait((site, device, msg.payload))
+                        except queue.Full:
+                            self.dropped_messages += 1
+                            if self.dropped_messages % 1000 == 1:
+                                logger.warning(f"Ingest-Queue voll - {self.dropped_messages} Telemetrie-Nachrichten verworfen")
+                    else:
+                        self.process_telemetry_message(site, device, msg.payload)
                     
         except Exception as e:
             logger.error(f"Fehler beim Verarbeiten der MQTT-Nachricht: {e}")
     
     def process_telemetry_message(self, site: str, device: str, payload: str):
         """Verarbeitet Telemetrie-Nachrichten"""
+        self.process_telemetry_batch([(site, device, payload)])
+    
+    def process_telemetry_batch(self, messages: List[tuple]):
+        """Dekodiert, speichert und verteilt einen Batch von (site, device, payload)"""
         try:
-            data = json.loads(payload)
-            
-            # Validiere und normalisiere Daten
-            telemetry_data = self.normalize_telemetry_data(site, device, data)
+            columns = self.decoder.decode_batch(messages)
+        except Exception:
+            # Fehlerhafte Nachricht im Batch: einzeln dekodieren und nur diese verwerfen
+            valid = []
+            for message in messages:
+                try:
+                    self.decoder.decode_batch([message])
+                    valid.append(message)
+                except Exception as e:
+                    logger.error(f"Fehler beim Dekodieren der Telemetrie {message[0]}/{message[1]}: {e}")
+            if not valid:
+                return
+            columns = self.decoder.decode_batch(valid)
+        
+        try:
+            records = TelemetryDecoder.records(columns)
             
             # Speichere in Datenbank
-            self.save_telemetry_to_db(telemetry_data)
+            self.save_telemetry_batch(columns, records)
             
             # Benachrichtige Callbacks
-            for callback in self.data_callbacks:
-                try:
-                    callback(telemetry_data)
-                except Exception as e:
-                    logger.error(f"Fehler in Daten-Callback: {e}")
+            for telemetry_data in records:
+                for callback in self.data_callbacks:
+                    try:
+                        callback(telemetry_data)
+                    except Exception as e:
+                        logger.error(f"Fehler in Daten-Callback: {e}")
                     
-            logger.debug(f"Telemetrie verarbeitet: {site}/{device}")
+            logger.debug("Telemetrie verarbeitet: %d Nachrichten", len(records))
             
         except Exception as e:
             logger.error(f"Fehler beim Verarbeiten der Telemetrie: {e}")
     
     def normalize_telemetry_data(self, site: str, device: str, data: Dict) -> Dict:
         """Normalisiert Telemetrie-Daten"""
-        timestamp = data.get('ts', datetime.now().isoformat())
-        
-        return {
-            'site': site,
-            'device': device,
-            'timestamp': timestamp,
-            'soc': float(data.get('soc', 0)) if data.get('soc') is not None else None,
-            'power': float(data.get('p', 0)) if data.get('p') is not None else None,
-            'power_charge': float(data.get('p_ch', 0)) if data.get('p_ch') is not None else None,
-            'power_discharge': float(data.get('p_dis', 0)) if data.get('p_dis') is not None else None,
-            'voltage_dc': float(data.get('v_dc', 0)) if data.get('v_dc') is not None else None,
-            'current_dc': float(data.get('i_dc', 0)) if data.get('i_dc') is not None else None,
-            'temperature_max': float(data.get('t_cell_max', 0)) if data.get('t_cell_max') is not None else None,
-            'soh': float(data.get('soh', 0)) if data.get('soh') is not None else None,
-            'alarms': json.dumps(data.get('alarms', [])),
-            'raw_data': json.dumps(data)
-        }
+        return self.decoder.decode(site, device, data)
     
     def save_telemetry_to_db(self, data: Dict):
         """Speichert Telemetrie-Daten in der Datenbank"""
+        columns = {column: [data[column]] for column in data}
+        self.save_telemetry_batch(columns, [data])
+    
+    def save_telemetry_batch(self, columns: Dict[str, list], records: List[Dict]):
+        """Speichert einen dekodierten Batch in einer Transaktion"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            cursor.execute("""
+            cursor.executemany("""
                 INSERT INTO live_bess_telemetry 
                 (site, device, timestamp, soc, power, power_charge, power_discharge,
                  voltage_dc, current_dc, temperature_max, soh, alarms, raw_data)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                data['site'], data['device'], data['timestamp'],
-                data['soc'], data['power'], data['power_charge'], data['power_discharge'],
-                data['voltage_dc'], data['current_dc'], data['temperature_max'],
-                data['soh'], data['alarms'], data['raw_data']
-            ))
+            """, TelemetryDecoder.rows(columns))
+            
+            # Rollups in derselben Transaktion inkrementell fortschreiben
+            self.rollups.update_many(cursor, records)
             
             conn.commit()
             conn.close()
@@ -198,6 +247,66 @@ class BESSMQTTBridge:
         except Exception as e:
             logger.error(f"Fehler beim Speichern in Datenbank: {e}")
     
+    def _ingest_worker(self):
+        """Sammelt Nachrichten aus der Queue und verarbeitet sie gebündelt"""
+        while True:
+            try:
+                first = self.ingest_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            
+            batch = [first]
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.ingest_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            self.refresh_device_profiles()
+            self.process_telemetry_batch(batch)
+            self.processed_messages += len(batch)
+    
+    def refresh_device_profiles(self, force: bool = False):
+        """Übernimmt Profilzuordnungen, die andere Prozesse gespeichert haben"""
+        if not force and time.monotonic() - self.profiles_loaded_at < self.profile_refresh_interval:
+            return
+        self.profiles_loaded_at = time.monotonic()
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                self.decoder.load_assignments(conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Telemetrie-Profilzuordnungen: {e}")
+    
+    def get_ingest_stats(self) -> Dict:
+        """Kennzahlen des Batch-Ingests (dieser Prozess)"""
+        return {
+            'connected': self.connected,
+            'batch_ingest': self.batch_ingest,
+            'ingest_thread_alive': bool(self.ingest_thread and self.ingest_thread.is_alive()),
+            'queue_size': self.ingest_queue.qsize(),
+            'queue_capacity': self.ingest_queue.maxsize,
+            'processed_messages': self.processed_messages,
+            'dropped_messages': self.dropped_messages,
+            'profiles': sorted(self.decoder.profiles),
+            'device_profiles': {
+                f"{site}/{device}": profile.name
+                for (site, device), profile in self.decoder.device_profiles.items()
+            },
+        }
+    
+    def start_ingest_worker(self):
+        """Startet den Batch-Ingest-Thread (einmalig)"""
+        if self.batch_ingest and (self.ingest_thread is None or not self.ingest_thread.is_alive()):
+            self.ingest_thread = threading.Thread(target=self._ingest_worker, daemon=True)
+            self.ingest_thread.start()
+    
     def subscribe_to_telemetry(self):
         """Subscribiert zu Telemetrie-Topics"""
         try:
@@ -220,6 +329,9 @@ class BESSMQTTBridge:
             
             self.client.connect(self.broker_host, self.broker_port, 60)
             
+            # Batch-Ingest vor dem ersten Nachrichteneingang starten
+            self.start_ingest_worker()
+            
             # Starte MQTT-Loop in separatem Thread
             mqtt_thread = threading.Thread(target=self.client.loop_forever, daemon=True)
             mqtt_thread.start()
@@ -281,43 +393,11 @@ class BESSMQTTBridge:
             return []
     
     def get_statistics(self, site: str = None, device: str = None, hours: int = 24) -> Dict:
-        """Berechnet Statistiken für die letzten X Stunden"""
+        """Berechnet Statistiken für die letzten X Stunden (aus den Rollup-Stufen)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT 
-                    COUNT(*) as total_records,
-                    AVG(soc) as avg_soc,
-                    MIN(soc) as min_soc,
-                    MAX(soc) as max_soc,
-                    AVG(power) as avg_power,
-                    MIN(power) as min_power,
-                    MAX(power) as max_power,
-                    AVG(voltage_dc) as avg_voltage,
-                    MIN(voltage_dc) as min_voltage,
-                    MAX(voltage_dc) as max_voltage,
-                    AVG(temperature_max) as avg_temp,
-                    MIN(temperature_max) as min_temp,
-                    MAX(temperature_max) as max_temp
-                FROM live_bess_telemetry 
-                WHERE created_at >= datetime('now', '-{} hours')
-            """.format(hours)
-            
-            params = []
-            if site:
-                query += " AND site = ?"
-                params.append(site)
+            row = self.rollups.get_statistics(hours=hours, site=site, device=device)
             
-            if device:
-                query += " AND device = ?"
-                params.append(device)
-            
-            cursor.execute(query, params)
-            row = cursor.fetchone()
-            
-            if row:
+            if row and row[0]:
                 stats = {
                     'total_records': row[0],
                     'soc': {'avg': row[1], 'min': row[2], 'max': row[3]},
@@ -328,12 +408,20 @@ class BESSMQTTBridge:
             else:
                 stats = {}
             
-            conn.close()
             return stats
             
         except Exception as e:
             logger.error(f"Fehler bei Statistik-Berechnung: {e}")
             return {}
+    
+    def get_chart_series(self, hours: int = 24, max_points: int = 300,
+                         site: str = None, device: str = None) -> Dict:
+        """Chart-Zeitreihe aus der feinsten Rollup-Stufe, die max_points einhält"""
+        try:
+            return self.rollups.get_series(hours=hours, max_points=max_points, site=site, device=device)
+        except Exception as e:
+            logger.error(f"Fehler beim Abrufen der Rollup-Zeitreihe: {e}")
+            return {}
 
 # Globale MQTT-Bridge Instanz
 mqtt_bridge = BESSMQTTBridge()
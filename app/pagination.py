@@ -0,0 +1,218 @@
+"""
+Keyset-Pagination und Streaming für große Listen-Endpunkte
+Cursor über eindeutige Sortierschlüssel statt OFFSET, NDJSON bzw. JSON-Arrays per Generator
+"""
+
+import json
+import base64
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from .performance_config import LazyDatasetLoader
+from .series_formats import dumps_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+STREAM_CHUNK_SIZE = 1000
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """Schlüssel der letzten Zeile als undurchsichtiger URL-sicherer Cursor"""
+    raw = json.dumps(list(key), separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: Optional[str]) -> Optional[List[Any]]:
+    """Cursor zurück in die Schlüsselwerte; ValueError bei ungültigem Cursor"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Ungültiger Cursor')
+    if not isinstance(key, list):
+        raise ValueError('Ungültiger Cursor')
+    return key
+
+
+class PageRequest:
+    """Pagination-Parameter eines Requests (limit, cursor, stream)"""
+
+    def __init__(self, limit: Optional[int] = None, cursor: Optional[List[Any]] = None, stream: bool = False):
+        self.limit = limit
+        self.cursor = cursor
+        self.stream = stream
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+    @property
+    def page_size(self) -> int:
+        return self.limit or DEFAULT_PAGE_SIZE
+
+
+def page_request(params: Optional[Dict[str, Any]] = None) -> PageRequest:
+    """limit/cursor/stream aus JSON-Body (``params``), Query-Parametern und Accept-Header
+
+    ``stream=ndjson`` oder ``Accept: application/x-ndjson`` liefert alle Zeilen
+    zeilenweise als NDJSON. Ungültige Werte lösen ValueError aus.
+    """
+    from flask import request
+
+    merged = dict(request.args.items())
+    merged.update({k: v for k, v in (params or {}).items() if k in ('limit', 'cursor', 'stream')})
+
+    limit = None
+    if merged.get('limit') not in (None, ''):
+        try:
+            limit = int(merged['limit'])
+        except (TypeError, ValueError):
+            raise ValueError(f"Ungültiges limit: {merged['limit']}")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    stream = str(merged.get('stream', '')).lower() in ('1', 'true', 'ndjson')
+    stream = stream or NDJSON_MIMETYPE in request.headers.get('Accept', '')
+    return PageRequest(limit, decode_cursor(merged.get('cursor')), stream)
+
+
+class KeysetQuery:
+    """SELECT mit stabiler Sortierung über eindeutige Schlüsselspalten
+
+    ``sql`` ist eine Abfrage ohne ORDER BY/LIMIT; ``key_columns`` sind Spaltennamen
+    ihres Ergebnisses, deren Kombination eindeutig ist (z.B. ``('name', 'id')``).
+    Die Bedingung ``(k1, k2) > (?, ?)`` wird von SQLite in die Abfrage
+    hineingezogen, sodass vorhandene Indizes genutzt werden.
+    """
+
+    def __init__(self, sql: str, params: Sequence[Any] = (), key_columns: Sequence[str] = ('id',),
+                 descending: bool = False):
+        self.sql = sql
+        self.params = tuple(params)
+        self.key_columns = tuple(key_columns)
+        self.descending = descending
+
+    def _sql(self, after: Optional[Sequence[Any]]) -> Tuple[str, Tuple[Any, ...]]:
+        keys = ', '.join(self.key_columns)
+        direction = 'DESC' if self.descending else 'ASC'
+        order = ', '.join(f"{column} {direction}" for column in self.key_columns)
+        sql = f"SELECT * FROM ({self.sql}) AS keyset_page"
+        params = self.params
+        if after is not None:
+            if len(after) != len(self.key_columns):
+                raise ValueError('Cursor passt nicht zur Sortierung')
+            placeholders = ', '.join('?' for _ in self.key_columns)
+            sql += f" WHERE ({keys}) {'<' if self.descending else '>'} ({placeholders})"
+            params = params + tuple(after)
+        return f"{sql} ORDER BY {order} LIMIT ?", params
+
+    def key_of(self, row) -> List[Any]:
+        return [row[column] for column in self.key_columns]
+
+    def fetch(self, conn, after: Optional[Sequence[Any]] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[Any]:
+        sql, params = self._sql(after)
+        return conn.execute(sql, params + (limit,)).fetchall()
+
+    def page(self, conn, limit: int = DEFAULT_PAGE_SIZE,
+             after: Optional[Sequence[Any]] = None) -> Tuple[List[Any], Optional[str]]:
+        """Eine Seite plus Cursor für die nächste (None auf der letzten Seite)"""
+        rows = self.fetch(conn, after, limit + 1)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, encode_cursor(self.key_of(rows[-1]))
+        return rows, None
+
+    def iterate(self, conn, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+        """Alle Zeilen chunkweise (höchstens ein Chunk im Speicher)"""
+        loader = LazyDatasetLoader(chunk_size=chunk_size)
+        return loader.load_by_key(lambda after, limit: self.fetch(conn, after, limit), self.key_of)
+
+
+# ----------------------------------------------------------------------
+# Responses
+# ----------------------------------------------------------------------
+
+def _closing(rows: Iterable[Any], conn) -> Iterator[Any]:
+    try:
+        yield from rows
+    finally:
+        conn.close()
+
+
+def ndjson_response(rows: Iterable[Dict[str, Any]]):
+    """Eine JSON-Zeile pro Datensatz, per Generator gestreamt"""
+    from flask import Response, stream_with_context
+
+    def generate():
+        for row in rows:
+            yield dumps_json(row) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+
+def json_array_response(rows: Iterable[Dict[str, Any]]):
+    """JSON-Array, das chunkweise erzeugt wird (gleiches Format wie jsonify(list))"""
+    from flask import Response, stream_with_context
+
+    def generate():
+        first = True
+        yield b'['
+        for row in rows:
+            yield (b'' if first else b',') + dumps_json(row)
+            first = False
+        yield b']'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+def keyset_response(query: KeysetQuery, connect: Callable[[], Any],
+                    transform: Callable[[Any], Dict[str, Any]] = dict,
+                    envelope: Optional[Dict[str, Any]] = None, items_key: str = 'data',
+                    params: Optional[Dict[str, Any]] = None):
+    """Listen-Endpunkt mit Keyset-Pagination bzw. Streaming beantworten
+
+    - ``stream``: alle Zeilen als NDJSON
+    - ``limit``/``cursor``: eine Seite; ohne ``envelope`` als JSON-Array mit
+      ``X-Next-Cursor``/``Link``-Header, sonst mit ``next_cursor`` im Envelope
+    - sonst: alle Zeilen im bisherigen Format, aber chunkweise gelesen
+    """
+    from flask import jsonify, request
+
+    try:
+        page = page_request(params)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    conn = connect()
+    if page.stream:
+        return ndjson_response(transform(row) for row in _closing(query.iterate(conn), conn))
+
+    if not page.paginated:
+        rows = (transform(row) for row in _closing(query.iterate(conn), conn))
+        if envelope is None:
+            return json_array_response(rows)
+        return jsonify(dict(envelope, **{items_key: list(rows)}))
+
+    try:
+        rows, next_cursor = query.page(conn, page.page_size, page.cursor)
+    except ValueError as e:
+        conn.close()
+        return jsonify({'success': False, 'error': str(e)}), 400
+    items = [transform(row) for row in rows]
+    conn.close()
+
+    if envelope is not None:
+        return jsonify(dict(envelope, **{items_key: items, 'next_cursor': next_cursor, 'limit': page.page_size}))
+
+    response = jsonify(items)
+    if next_cursor:
+        args = dict(request.args.items(), cursor=next_cursor, limit=page.page_size)
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+    return response
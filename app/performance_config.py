@@ -9,11 +9,14 @@ Redis-Caching, Datenbank-Indizes, API-Optimierungen und Lazy Loading
 import os
 import time
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import g, request, jsonify, current_app
 from flask_caching import Cache
 import redis
 import sqlite3
 from typing import Dict, Any, List, Optional
+from collections import deque
+
+from .request_profiling import LatencyHistogram
 
 # Redis-Caching Konfiguration
 cache_config = {
@@ -30,10 +33,19 @@ cache = Cache()
 
 # Performance-Monitoring
 class PerformanceMonitor:
-    """Performance-Monitoring für API-Endpoints"""
+    """Performance-Monitoring für API-Endpoints (Histogramme mit festem Speicherbedarf)"""
     
     def __init__(self):
-        self.metrics = {}
+        self.metrics: Dict[str, LatencyHistogram] = {}
+        self.recent: Dict[str, deque] = {}
+    
+    def record(self, endpoint_name: str, execution_time: float):
+        """Laufzeit in Sekunden erfassen"""
+        if endpoint_name not in self.metrics:
+            self.metrics[endpoint_name] = LatencyHistogram()
+            self.recent[endpoint_name] = deque(maxlen=10)
+        self.metrics[endpoint_name].record(execution_time * 1e6)
+        self.recent[endpoint_name].append(execution_time)
     
     def time_endpoint(self, endpoint_name: str):
         """Decorator für Endpoint-Performance-Messung"""
@@ -45,9 +57,7 @@ class PerformanceMonitor:
                 execution_time = time.time() - start_time
                 
                 # Metriken speichern
-                if endpoint_name not in self.metrics:
-                    self.metrics[endpoint_name] = []
-                self.metrics[endpoint_name].append(execution_time)
+                self.record(endpoint_name, execution_time)
                 
                 # Performance-Header hinzufügen
                 if hasattr(result, 'headers'):
@@ -60,14 +70,17 @@ class PerformanceMonitor:
     def get_metrics(self) -> Dict[str, Any]:
         """Performance-Metriken abrufen"""
         metrics = {}
-        for endpoint, times in self.metrics.items():
-            if times:
+        for endpoint, histogram in self.metrics.items():
+            if histogram.count:
+                recent = self.recent[endpoint]
                 metrics[endpoint] = {
-                    'count': len(times),
-                    'avg_time': sum(times) / len(times),
-                    'min_time': min(times),
-                    'max_time': max(times),
-                    'last_10_avg': sum(times[-10:]) / min(len(times), 10)
+                    'count': histogram.count,
+                    'avg_time': histogram.total / histogram.count / 1e6,
+                    'min_time': histogram.min / 1e6,
+                    'max_time': histogram.max / 1e6,
+                    'p50_time': histogram.percentile(50) / 1e6,
+                    'p99_time': histogram.percentile(99) / 1e6,
+                    'last_10_avg': sum(recent) / len(recent)
                 }
         return metrics
 
@@ -139,6 +152,24 @@ class LazyDatasetLoader:
             yield from chunk
             offset += self.chunk_size
     
+    def load_by_key(self, fetch_after, key_func):
+        """Daten in Chunks per Keyset laden
+
+        ``fetch_after(after_key, limit)`` liefert die nächsten Zeilen nach dem
+        Schlüssel der letzten Zeile; anders als bei OFFSET bleibt der Aufwand je
+        Chunk konstant und höchstens ein Chunk liegt im Speicher.
+        """
+        after = None
+        while True:
+            chunk = fetch_after(after, self.chunk_size)
+            if not chunk:
+                break
+
+            yield from chunk
+            if len(chunk) < self.chunk_size:
+                break
+            after = key_func(chunk[-1])
+    
     def paginate_results(self, query_func, page: int = 1, per_page: int = 50):
         """Ergebnisse paginieren"""
         offset = (page - 1) * per_page
@@ -193,21 +224,17 @@ def get_cdn_url(asset_path: str) -> str:
 # Performance-Middleware
 def performance_middleware():
     """Performance-Middleware für alle Requests"""
-    start_time = time.time()
-    
     def after_request(response):
-        execution_time = time.time() - start_time
+        execution_time = time.time() - getattr(g, 'start_time', time.time())
         
         # Performance-Header
         response.headers['X-Execution-Time'] = f"{execution_time:.3f}s"
-        response.headers['X-Cache-Status'] = 'MISS'  # Wird später auf HIT gesetzt
+        response.headers.setdefault('X-Cache-Status', 'MISS')  # HIT setzt der Response-Cache
         
         # Performance-Metriken aktualisieren
         endpoint = request.endpoint
         if endpoint:
-            if endpoint not in performance_monitor.metrics:
-                performance_monitor.metrics[endpoint] = []
-            performance_monitor.metrics[endpoint].append(execution_time)
+            performance_monitor.record(endpoint, execution_time)
         
         return response
     
@@ -0,0 +1,192 @@
+"""
+Gemeinsame Preis-Ingestion für Spot-Preise
+Set-basierter UPSERT in spot_price über den eindeutigen Schlüssel
+(region, source, price_type, timestamp; NULL wie '') - ein Statement pro Batch statt SELECT pro Zeile
+"""
+
+import sqlite3
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+PRICE_KEY_COLUMNS = ('region', 'source', 'price_type', 'timestamp')
+PRICE_UNIQUE_INDEX = 'uq_spot_price_key'
+
+# NULL ist in UNIQUE-Indizes nie gleich NULL - Schlüssel daher über COALESCE bilden
+PRICE_KEY_EXPRESSIONS = (
+    "COALESCE(region, '')", "COALESCE(source, '')", "COALESCE(price_type, '')", 'timestamp'
+)
+
+# Gleiches Format wie SQLAlchemy DateTime unter SQLite, damit ORM-Filter und Schlüssel übereinstimmen
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+_STAGING_TABLE = 'temp_spot_price_batch'
+
+_schema_ready = set()
+
+
+def normalize_price_timestamp(value: Any) -> Optional[str]:
+    """Zeitstempel (datetime/ISO-String) in das gespeicherte Textformat bringen"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def ensure_price_schema(conn: sqlite3.Connection):
+    """Legt spot_price und den eindeutigen Schlüssel an.
+
+    Einmalige Migration, solange der Index fehlt oder noch ohne COALESCE
+    angelegt ist: Zeitstempel bestehender Zeilen werden auf TIMESTAMP_FORMAT
+    gebracht und Duplikate (gleicher Schlüssel, NULL = '') bis auf die
+    jüngste Zeile entfernt.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS spot_price (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME NOT NULL,
+            price_eur_mwh FLOAT NOT NULL,
+            source VARCHAR(50),
+            region VARCHAR(50),
+            price_type VARCHAR(20),
+            created_at DATETIME
+        )
+    """)
+    index = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (PRICE_UNIQUE_INDEX,)
+    ).fetchone()
+    if index and 'coalesce' in (index[0] or '').lower():
+        conn.commit()
+        return
+
+    cursor.execute(f"DROP INDEX IF EXISTS {PRICE_UNIQUE_INDEX}")
+
+    # Abweichende Zeitstempelformate (ISO mit 'T', ohne Mikrosekunden, mit Offset) vereinheitlichen
+    normalized = failed = 0
+    rows = cursor.execute("""
+        SELECT id, timestamp FROM spot_price
+        WHERE typeof(timestamp) != 'text' OR timestamp NOT GLOB
+            '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9].[0-9][0-9][0-9][0-9][0-9][0-9]'
+    """).fetchall()
+    updates = []
+    for row_id, value in rows:
+        try:
+            updates.append((normalize_price_timestamp(str(value)), row_id))
+        except (TypeError, ValueError):
+            failed += 1
+    if updates:
+        cursor.executemany("UPDATE spot_price SET timestamp = ? WHERE id = ?", updates)
+        normalized = len(updates)
+        logger.info(f"spot_price: {normalized} Zeitstempel auf das Format {TIMESTAMP_FORMAT} gebracht")
+    if failed:
+        logger.warning(f"spot_price: {failed} Zeitstempel nicht lesbar - unverändert belassen")
+
+    cursor.execute(f"""
+        DELETE FROM spot_price WHERE id NOT IN (
+            SELECT MAX(id) FROM spot_price GROUP BY {', '.join(PRICE_KEY_EXPRESSIONS)}
+        )
+    """)
+    logger.warning(
+        f"spot_price: Migration auf eindeutigen Preis-Schlüssel - {cursor.rowcount} doppelte "
+        f"Preis-Datensätze entfernt (jeweils jüngster Eintrag behalten)"
+    )
+    cursor.execute(
+        f"CREATE UNIQUE INDEX {PRICE_UNIQUE_INDEX} ON spot_price ({', '.join(PRICE_KEY_EXPRESSIONS)})"
+    )
+    conn.commit()
+
+
+def upsert_spot_prices(conn: sqlite3.Connection, records: Iterable[Dict[str, Any]],
+                       source: str = None, region: str = 'AT', price_type: str = 'day_ahead',
+                       commit: bool = True) -> Dict[str, int]:
+    """Schreibt einen Preis-Batch per ``INSERT ... ON CONFLICT DO UPDATE WHERE Preis geändert``.
+
+    Args:
+        conn: SQLite-Verbindung auf die Hauptdatenbank
+        records: Dicts mit ``timestamp`` und ``price_eur_mwh`` (oder ``price``), optional
+            ``source``, ``region``, ``price_type``
+        source, region, price_type: Standardwerte für fehlende Felder
+
+    Returns:
+        Dict mit inserted, updated, unchanged und skipped
+    """
+    db_key = conn.execute('PRAGMA database_list').fetchone()[2]
+    if db_key not in _schema_ready:
+        ensure_price_schema(conn)
+        _schema_ready.add(db_key)
+
+    now = datetime.utcnow().strftime(TIMESTAMP_FORMAT)
+    rows: List[tuple] = []
+    skipped = 0
+    for record in records:
+        price = record.get('price_eur_mwh', record.get('price'))
+        record_source = record.get('source') or source
+        try:
+            timestamp = normalize_price_timestamp(record.get('timestamp'))
+        except (TypeError, ValueError):
+            timestamp = None
+        if timestamp is None or price is None or not record_source:
+            skipped += 1
+            continue
+        rows.append((
+            record.get('region') or region,
+            record_source,
+            record.get('price_type') or price_type,
+            timestamp,
+            float(price),
+        ))
+
+    result = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': skipped}
+    if not rows:
+        return result
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} (
+            region TEXT, source TEXT, price_type TEXT, timestamp TEXT, price_eur_mwh REAL,
+            PRIMARY KEY (region, source, price_type, timestamp)
+        )
+    """)
+    cursor.execute(f"DELETE FROM {_STAGING_TABLE}")
+    # Letzter Wert pro Schlüssel gewinnt (wie bei sequentieller Verarbeitung)
+    cursor.executemany(f"INSERT OR REPLACE INTO {_STAGING_TABLE} VALUES (?, ?, ?, ?, ?)", rows)
+
+    staged = cursor.execute(f"SELECT COUNT(*) FROM {_STAGING_TABLE}").fetchone()[0]
+    existing, unchanged = cursor.execute(f"""
+        SELECT COUNT(*), COALESCE(SUM(s.price_eur_mwh = p.price_eur_mwh), 0)
+        FROM {_STAGING_TABLE} s
+        JOIN spot_price p
+          ON COALESCE(p.region, '') = s.region AND COALESCE(p.source, '') = s.source
+         AND COALESCE(p.price_type, '') = s.price_type AND p.timestamp = s.timestamp
+    """).fetchone()
+
+    # "WHERE true" löst die Parser-Mehrdeutigkeit von INSERT ... SELECT ... ON CONFLICT
+    cursor.execute(f"""
+        INSERT INTO spot_price (region, source, price_type, timestamp, price_eur_mwh, created_at)
+        SELECT region, source, price_type, timestamp, price_eur_mwh, ? FROM {_STAGING_TABLE} WHERE true
+        ON CONFLICT ({', '.join(PRICE_KEY_EXPRESSIONS)}) DO UPDATE SET
+            price_eur_mwh = excluded.price_eur_mwh,
+            created_at = excluded.created_at
+        WHERE spot_price.price_eur_mwh IS NOT excluded.price_eur_mwh
+    """, (now,))
+    cursor.execute(f"DELETE FROM {_STAGING_TABLE}")
+
+    if commit:
+        conn.commit()
+
+    result.update({
+        'inserted': staged - existing,
+        'updated': existing - unchanged,
+        'unchanged': unchanged,
+    })
+    logger.info(
+        f"Preis-Ingestion: {result['inserted']} neu, {result['updated']} aktualisiert, "
+        f"{result['unchanged']} unverändert, {skipped} übersprungen"
+    )
+    return result
@@ -0,0 +1,139 @@
+"""
+Vorberechnete Zeilenzahlen je Lastprofil
+Die Tabelle load_profile_stats wird per Trigger bei INSERT/DELETE der Messwerte
+aktuell gehalten, damit Listen keine COUNT(*)-Unterabfrage pro Profil brauchen
+"""
+
+import sqlite3
+import logging
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+STATS_TABLE = 'load_profile_stats'
+
+# Quelle -> (Profil-Tabelle, Werte-Tabelle); Fremdschlüssel heißt jeweils load_profile_id
+PROFILE_SOURCES = {
+    'load_profile': ('load_profile', 'load_value'),
+    'load_profiles': ('load_profiles', 'load_profile_data'),
+}
+
+_schema_ready = set()
+
+
+def _table_exists(cursor: sqlite3.Cursor, name: str, kind: str = 'table') -> bool:
+    return cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (kind, name)
+    ).fetchone() is not None
+
+
+def _create_triggers(cursor: sqlite3.Cursor, source: str, profile_table: str, value_table: str):
+    increment = f"""
+        INSERT INTO {STATS_TABLE} (source, profile_id, row_count, updated_at)
+        VALUES ('{source}', NEW.load_profile_id, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT (source, profile_id) DO UPDATE SET
+            row_count = row_count + 1,
+            updated_at = CURRENT_TIMESTAMP;
+    """
+    decrement = f"""
+        UPDATE {STATS_TABLE} SET row_count = MAX(row_count - 1, 0), updated_at = CURRENT_TIMESTAMP
+        WHERE source = '{source}' AND profile_id = OLD.load_profile_id;
+    """
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{value_table}_stats_insert
+        AFTER INSERT ON {value_table} WHEN NEW.load_profile_id IS NOT NULL
+        BEGIN {increment} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{value_table}_stats_delete
+        AFTER DELETE ON {value_table} WHEN OLD.load_profile_id IS NOT NULL
+        BEGIN {decrement} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{value_table}_stats_move
+        AFTER UPDATE OF load_profile_id ON {value_table}
+        WHEN OLD.load_profile_id IS NOT NEW.load_profile_id
+        BEGIN {decrement} {increment} END
+    """)
+    if _table_exists(cursor, profile_table):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{profile_table}_stats_cleanup
+            AFTER DELETE ON {profile_table}
+            BEGIN
+                DELETE FROM {STATS_TABLE} WHERE source = '{source}' AND profile_id = OLD.id;
+            END
+        """)
+
+
+def _rebuild_source(cursor: sqlite3.Cursor, source: str, value_table: str):
+    cursor.execute(f"DELETE FROM {STATS_TABLE} WHERE source = ?", (source,))
+    cursor.execute(f"""
+        INSERT INTO {STATS_TABLE} (source, profile_id, row_count, updated_at)
+        SELECT ?, load_profile_id, COUNT(*), CURRENT_TIMESTAMP
+        FROM {value_table}
+        WHERE load_profile_id IS NOT NULL
+        GROUP BY load_profile_id
+    """, (source,))
+
+
+def ensure_profile_stats_schema(conn: sqlite3.Connection):
+    """Legt load_profile_stats samt Triggern an und füllt sie einmalig aus den Bestandsdaten
+
+    Trigger und Erstbefüllung laufen in einer Transaktion, damit keine Zeile
+    doppelt oder gar nicht gezählt wird. Fehlende Werte-Tabellen werden übersprungen
+    und beim nächsten Aufruf nachgezogen.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+            source TEXT NOT NULL,
+            profile_id INTEGER NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, profile_id)
+        )
+    """)
+    for source, (profile_table, value_table) in PROFILE_SOURCES.items():
+        if not _table_exists(cursor, value_table):
+            continue
+        if _table_exists(cursor, f"trg_{value_table}_stats_insert", 'trigger'):
+            continue
+        _create_triggers(cursor, source, profile_table, value_table)
+        _rebuild_source(cursor, source, value_table)
+        logger.info(f"{STATS_TABLE}: Zeilenzahlen für {value_table} initialisiert")
+    conn.commit()
+
+
+def refresh_profile_stats(conn: sqlite3.Connection):
+    """Alle Zeilenzahlen neu berechnen (Wartung, z.B. nach Massenlöschungen ohne Trigger)"""
+    ensure_profile_stats_schema(conn)
+    cursor = conn.cursor()
+    for source, (_, value_table) in PROFILE_SOURCES.items():
+        if _table_exists(cursor, value_table):
+            _rebuild_source(cursor, source, value_table)
+    conn.commit()
+
+
+def ensure_profile_stats_ready(conn: sqlite3.Connection):
+    """ensure_profile_stats_schema einmal je Datenbankdatei (für Request-Pfade)"""
+    db_key = conn.execute('PRAGMA database_list').fetchone()[2]
+    # In-Memory-Datenbanken (leerer Pfad) werden nicht gemerkt
+    if not db_key or db_key not in _schema_ready:
+        ensure_profile_stats_schema(conn)
+        if db_key:
+            _schema_ready.add(db_key)
+
+
+def profile_row_counts(conn: sqlite3.Connection, source: str = 'load_profile',
+                       profile_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+    """Zeilenzahlen je Profil-ID in einer Abfrage (fehlende Profile haben 0 Zeilen)"""
+    ensure_profile_stats_ready(conn)
+    sql = f"SELECT profile_id, row_count FROM {STATS_TABLE} WHERE source = ?"
+    params = [source]
+    if profile_ids is not None:
+        profile_ids = list(profile_ids)
+        if not profile_ids:
+            return {}
+        sql += f" AND profile_id IN ({', '.join('?' for _ in profile_ids)})"
+        params.extend(profile_ids)
+    return {profile_id: count for profile_id, count in conn.execute(sql, params).fetchall()}
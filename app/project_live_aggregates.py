@@ -0,0 +1,341 @@
+"""
+Inkrementelle Projekt-Aggregate für Live BESS Daten
+Energiedurchsatz, Rainflow-Zyklen, SoC-Min/Max und Alarmzähler pro Projekt -
+aktualisiert bei jedem Telemetrie-Event und periodisch persistiert
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+from .telemetry_rollups import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_TABLE = 'project_live_aggregate'
+
+# Lücken über diesem Wert werden nicht integriert (Verbindungsabbruch)
+MAX_INTEGRATION_GAP_SECONDS = 900
+
+
+class StreamingRainflow:
+    """Rainflow-Zählung (Vier-Punkt-Verfahren) auf einem SoC-Datenstrom.
+
+    Es werden nur Umkehrpunkte gespeichert; abgeschlossene Vollzyklen werden sofort
+    gezählt, der Rest-Stack liefert die offenen Halbzyklen.
+    """
+
+    def __init__(self, hysteresis: float = 0.5, state: Dict[str, Any] = None):
+        self.hysteresis = hysteresis
+        state = state or {}
+        self.stack: List[float] = state.get('stack', [])
+        self.last_value: Optional[float] = state.get('last_value')
+        self.direction: int = state.get('direction', 0)
+        self.full_cycles: int = state.get('full_cycles', 0)
+        self.full_cycle_depth: float = state.get('full_cycle_depth', 0.0)  # Summe der Zyklustiefen in %
+
+    def add(self, value: float):
+        if self.last_value is None:
+            self.last_value = value
+            self.stack.append(value)
+            return
+
+        delta = value - self.last_value
+        if abs(delta) < self.hysteresis and self.direction != 0:
+            # Rauschen unterhalb der Hysterese nur in Laufrichtung übernehmen
+            if delta * self.direction > 0:
+                self.last_value = value
+            return
+
+        direction = 1 if delta > 0 else -1 if delta < 0 else 0
+        if direction == 0:
+            return
+        if self.direction != 0 and direction != self.direction:
+            # Umkehrpunkt erreicht
+            self._push_reversal(self.last_value)
+        self.direction = direction
+        self.last_value = value
+
+    def _push_reversal(self, value: float):
+        if self.stack and self.stack[-1] == value:
+            return
+        self.stack.append(value)
+        # Vier-Punkt-Kriterium: innerer Hub <= beide äußeren Hübe -> geschlossener Zyklus
+        while len(self.stack) >= 4:
+            outer_left = abs(self.stack[-3] - self.stack[-4])
+            inner = abs(self.stack[-2] - self.stack[-3])
+            outer_right = abs(self.stack[-1] - self.stack[-2])
+            if inner > outer_left or inner > outer_right:
+                break
+            self.full_cycles += 1
+            self.full_cycle_depth += inner
+            del self.stack[-3:-1]
+
+    def residual_depth(self) -> float:
+        points = self.stack + ([self.last_value] if self.last_value is not None else [])
+        return sum(abs(b - a) for a, b in zip(points, points[1:])) / 2.0
+
+    def equivalent_full_cycles(self) -> float:
+        """Tiefen-gewichtete Äquivalent-Vollzyklen (100 % SoC-Hub = 1 Zyklus)"""
+        return (self.full_cycle_depth + self.residual_depth()) / 100.0
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            'stack': self.stack,
+            'last_value': self.last_value,
+            'direction': self.direction,
+            'full_cycles': self.full_cycles,
+            'full_cycle_depth': self.full_cycle_depth,
+        }
+
+
+class DeviceAggregate:
+    """Laufende Kennzahlen eines BESS-Geräts"""
+
+    def __init__(self, state: Dict[str, Any] = None):
+        state = state or {}
+        self.energy_charged_kwh = state.get('energy_charged_kwh', 0.0)
+        self.energy_discharged_kwh = state.get('energy_discharged_kwh', 0.0)
+        self.min_soc = state.get('min_soc')
+        self.max_soc = state.get('max_soc')
+        self.alarm_events = state.get('alarm_events', 0)
+        self.message_count = state.get('message_count', 0)
+        self.last_ts = state.get('last_ts')
+        self.last_power = state.get('last_power')
+        self.latest = state.get('latest', {})
+        self.rainflow = StreamingRainflow(state=state.get('rainflow'))
+
+    def update(self, data: Dict[str, Any]):
+        ts = parse_timestamp(data.get('timestamp'))
+        power = data.get('power')
+        soc = data.get('soc')
+
+        # Energiedurchsatz (Links-Rechteck-Integration, negativ = Laden)
+        if self.last_ts is not None and self.last_power is not None and ts > self.last_ts:
+            dt = ts - self.last_ts
+            if dt <= MAX_INTEGRATION_GAP_SECONDS:
+                energy = abs(self.last_power) * dt / 3600.0
+                if self.last_power < 0:
+                    self.energy_charged_kwh += energy
+                else:
+                    self.energy_discharged_kwh += energy
+
+        if self.last_ts is None or ts >= self.last_ts:
+            self.last_ts = ts
+            if power is not None:
+                self.last_power = power
+
+        if soc is not None:
+            self.min_soc = soc if self.min_soc is None else min(self.min_soc, soc)
+            self.max_soc = soc if self.max_soc is None else max(self.max_soc, soc)
+            self.rainflow.add(soc)
+
+        alarms = data.get('alarms')
+        if alarms and alarms != '[]':
+            self.alarm_events += 1
+
+        self.message_count += 1
+        self.latest = {
+            'timestamp': data.get('timestamp'),
+            'soc': soc,
+            'power': power,
+            'temperature': data.get('temperature_max'),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'energy_charged_kwh': round(self.energy_charged_kwh, 3),
+            'energy_discharged_kwh': round(self.energy_discharged_kwh, 3),
+            'energy_throughput_kwh': round(self.energy_charged_kwh + self.energy_discharged_kwh, 3),
+            'min_soc': self.min_soc,
+            'max_soc': self.max_soc,
+            'full_cycles': self.rainflow.full_cycles,
+            'equivalent_full_cycles': round(self.rainflow.equivalent_full_cycles(), 3),
+            'alarm_events': self.alarm_events,
+            'message_count': self.message_count,
+            'latest': self.latest,
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            'energy_charged_kwh': self.energy_charged_kwh,
+            'energy_discharged_kwh': self.energy_discharged_kwh,
+            'min_soc': self.min_soc,
+            'max_soc': self.max_soc,
+            'alarm_events': self.alarm_events,
+            'message_count': self.message_count,
+            'last_ts': self.last_ts,
+            'last_power': self.last_power,
+            'latest': self.latest,
+            'rainflow': self.rainflow.to_state(),
+        }
+
+
+class ProjectLiveAggregator:
+    """Hält pro Projekt die Geräte-Aggregate und persistiert sie periodisch"""
+
+    def __init__(self, db_path: str = None, main_db_path: str = None,
+                 persist_interval: float = 60.0, mapping_refresh_interval: float = 60.0):
+        self.db_path = db_path or os.getenv('LIVE_BESS_DB_PATH', 'live/data/bess.db')
+        self.main_db_path = main_db_path or 'instance/bess.db'
+        self.persist_interval = persist_interval
+        self.mapping_refresh_interval = mapping_refresh_interval
+
+        self.lock = threading.Lock()
+        self.projects: Dict[int, Dict[str, DeviceAggregate]] = {}
+        self.device_projects: Dict[Tuple[str, str], int] = {}
+        self.dirty = set()
+        self.last_persist = time.monotonic()
+        self.last_mapping_refresh = 0.0
+        self.loaded = False
+
+    # ------------------------------------------------------------------
+    # Mapping (site/device -> Projekt)
+    # ------------------------------------------------------------------
+
+    def set_mappings(self, mappings: List[Tuple[str, str, int]]):
+        with self.lock:
+            self.device_projects = {(site, device): project_id for site, device, project_id in mappings}
+            self.last_mapping_refresh = time.monotonic()
+
+    def refresh_mappings(self):
+        """Lädt aktive BESSProjectMapping-Einträge direkt aus der Hauptdatenbank"""
+        if not os.path.exists(self.main_db_path):
+            return
+        try:
+            conn = sqlite3.connect(self.main_db_path)
+            try:
+                rows = conn.execute(
+                    "SELECT site, device, project_id FROM bess_project_mapping WHERE is_active = 1"
+                ).fetchall()
+            finally:
+                conn.close()
+            self.set_mappings(rows)
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der BESS-Mappings: {e}")
+            self.last_mapping_refresh = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Event-Verarbeitung
+    # ------------------------------------------------------------------
+
+    def on_telemetry(self, data: Dict[str, Any]):
+        """Daten-Callback für ``BESSMQTTBridge.add_data_callback``"""
+        if not self.loaded:
+            self.load()
+        if time.monotonic() - self.last_mapping_refresh > self.mapping_refresh_interval:
+            self.refresh_mappings()
+
+        key = (data.get('site'), data.get('device'))
+        with self.lock:
+            project_id = self.device_projects.get(key)
+            if project_id is None:
+                return
+            devices = self.projects.setdefault(project_id, {})
+            aggregate = devices.get(f"{key[0]}/{key[1]}")
+            if aggregate is None:
+                aggregate = devices[f"{key[0]}/{key[1]}"] = DeviceAggregate()
+            aggregate.update(data)
+            self.dirty.add(project_id)
+
+        if time.monotonic() - self.last_persist > self.persist_interval:
+            self.persist()
+
+    def get_project_summary(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """O(1)-Zusammenfassung eines Projekts (unabhängig von der Historienlänge)"""
+        if not self.loaded:
+            self.load()
+        with self.lock:
+            devices = self.projects.get(project_id)
+            if not devices:
+                return None
+            device_summaries = {name: aggregate.summary() for name, aggregate in devices.items()}
+
+        soc_min = [d['min_soc'] for d in device_summaries.values() if d['min_soc'] is not None]
+        soc_max = [d['max_soc'] for d in device_summaries.values() if d['max_soc'] is not None]
+        return {
+            'project_id': project_id,
+            'energy_charged_kwh': round(sum(d['energy_charged_kwh'] for d in device_summaries.values()), 3),
+            'energy_discharged_kwh': round(sum(d['energy_discharged_kwh'] for d in device_summaries.values()), 3),
+            'energy_throughput_kwh': round(sum(d['energy_throughput_kwh'] for d in device_summaries.values()), 3),
+            'equivalent_full_cycles': round(sum(d['equivalent_full_cycles'] for d in device_summaries.values()), 3),
+            'min_soc': min(soc_min) if soc_min else None,
+            'max_soc': max(soc_max) if soc_max else None,
+            'alarm_events': sum(d['alarm_events'] for d in device_summaries.values()),
+            'message_count': sum(d['message_count'] for d in device_summaries.values()),
+            'devices': device_summaries,
+        }
+
+    # ------------------------------------------------------------------
+    # Persistenz
+    # ------------------------------------------------------------------
+
+    def _ensure_table(self, conn: sqlite3.Connection):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {AGGREGATE_TABLE} (
+                project_id INTEGER PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+
+    def load(self):
+        """Stellt den persistierten Zustand nach einem Neustart wieder her"""
+        self.loaded = True
+        if not os.path.exists(self.db_path):
+            return
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                self._ensure_table(conn)
+                rows = conn.execute(f"SELECT project_id, state FROM {AGGREGATE_TABLE}").fetchall()
+            finally:
+                conn.close()
+            with self.lock:
+                for project_id, state in rows:
+                    self.projects[project_id] = {
+                        name: DeviceAggregate(device_state)
+                        for name, device_state in json.loads(state).items()
+                    }
+            logger.info(f"Projekt-Aggregate geladen: {len(rows)} Projekte")
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Projekt-Aggregate: {e}")
+
+    def persist(self):
+        """Schreibt geänderte Projekte in die Live-Datenbank"""
+        with self.lock:
+            dirty = list(self.dirty)
+            self.dirty.clear()
+            self.last_persist = time.monotonic()
+            payload = [
+                (project_id,
+                 json.dumps({name: agg.to_state() for name, agg in self.projects[project_id].items()}),
+                 datetime.now().isoformat())
+                for project_id in dirty
+            ]
+        if not payload:
+            return
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                self._ensure_table(conn)
+                conn.executemany(f"""
+                    INSERT INTO {AGGREGATE_TABLE} (project_id, state, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(project_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at
+                """, payload)
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Fehler beim Persistieren der Projekt-Aggregate: {e}")
+            with self.lock:
+                self.dirty.update(dirty)
+
+
+# Globale Aggregator-Instanz
+project_live_aggregator = ProjectLiveAggregator()
@@ -0,0 +1,573 @@
+"""
+Request-Profiling für BESS-Simulation
+Latenz-Histogramme je Endpunkt mit festem Speicherbedarf (HDR-artige Buckets), SQL-Anzahl und
+SQL-Zeit je Request (SQLAlchemy- und sqlite3-Hooks) sowie Stichproben-Profile langsamer
+Requests (pyinstrument, sonst cProfile) unter instance/profiles
+
+Steuerung über BESS_PROFILING:
+    off      - keine Messung
+    metrics  - Histogramme und SQL-Zähler (Standard)
+    profile  - zusätzlich Profile langsamer Requests
+"""
+
+import os
+import io
+import json
+import time
+import glob
+import math
+import random
+import pstats
+import sqlite3
+import logging
+import cProfile
+import threading
+from array import array
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    from pyinstrument import Profiler as _PyinstrumentProfiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+try:
+    from sqlalchemy import event as _sa_event
+    from sqlalchemy.engine import Engine as _SAEngine
+    SQLALCHEMY_AVAILABLE = True
+except ImportError:
+    SQLALCHEMY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PROFILING_MODE = os.environ.get('BESS_PROFILING', 'metrics').strip().lower()
+
+# Requests ab dieser Dauer gelten als langsam (Millisekunden)
+SLOW_REQUEST_MS = float(os.environ.get('BESS_PROFILE_SLOW_MS', '1000'))
+# Anteil zufällig profilierter Requests; langsame Endpunkte werden zusätzlich beim nächsten Aufruf profiliert
+PROFILE_SAMPLE_RATE = float(os.environ.get('BESS_PROFILE_SAMPLE', '0.01'))
+# Höchstens ein gezieltes Profil je Endpunkt in diesem Zeitraum (Sekunden)
+PROFILE_COOLDOWN = float(os.environ.get('BESS_PROFILE_COOLDOWN', '300'))
+# Gespeicherte Profile (älteste werden gelöscht)
+PROFILE_KEEP = int(os.environ.get('BESS_PROFILE_KEEP', '200'))
+# Wie oft jeder Worker seine Endpunkt-Statistik für die Zusammenführung ablegt (Sekunden)
+STATS_DUMP_INTERVAL = 60
+# Abgelegte Stände älter als dieses Fenster werden nicht mehr zusammengeführt und beim Ablegen gelöscht
+STATS_MAX_AGE = 3600
+
+
+# ----------------------------------------------------------------------
+# Histogramm
+# ----------------------------------------------------------------------
+
+class LatencyHistogram:
+    """Histogramm mit logarithmisch-linearen Buckets wie HdrHistogram
+
+    Werte in Mikrosekunden; je Zweierpotenz ``2 ** (sub_bucket_bits - 1)`` lineare Buckets,
+    d.h. relative Auflösung ca. 3 % bei 5 Bits. Speicherbedarf fest (einige KB), unabhängig
+    von der Anzahl der Messungen.
+    """
+
+    def __init__(self, max_value_us: int = 3600 * 1000 * 1000, sub_bucket_bits: int = 5):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.max_value = max_value_us
+        self.counts = array('Q', bytes(8 * (self._index(max_value_us) + 1)))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return (shift + 1) * self.half_count + (value >> shift) - self.half_count
+
+    def _bucket_range(self, index: int):
+        if index < self.sub_bucket_count:
+            return index, index
+        shift = index // self.half_count - 1
+        sub = index % self.half_count + self.half_count
+        return sub << shift, ((sub + 1) << shift) - 1
+
+    def record(self, value_us: float):
+        value = min(max(int(value_us), 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> int:
+        """Wert (obere Bucket-Grenze, höchstens Maximum), unter dem p Prozent der Messungen liegen"""
+        if not self.count:
+            return 0
+        target = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                seen += bucket_count
+                if seen >= target:
+                    return min(self._bucket_range(index)[1], self.max)
+        return self.max
+
+    def merge(self, other: 'LatencyHistogram'):
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self) -> Dict[str, Any]:
+        """Kennzahlen in Millisekunden"""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count / 1000, 2) if self.count else 0,
+            'min_ms': round((self.min or 0) / 1000, 2),
+            'p50_ms': round(self.percentile(50) / 1000, 2),
+            'p90_ms': round(self.percentile(90) / 1000, 2),
+            'p99_ms': round(self.percentile(99) / 1000, 2),
+            'max_ms': round(self.max / 1000, 2),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Kompakte Darstellung (nur belegte Buckets) für die Ablage je Worker"""
+        return {
+            'bits': self.sub_bucket_bits, 'max_value': self.max_value,
+            'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max,
+            'buckets': {str(index): n for index, n in enumerate(self.counts) if n},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        histogram = cls(data['max_value'], data['bits'])
+        for index, bucket_count in data['buckets'].items():
+            histogram.counts[int(index)] = bucket_count
+        histogram.count, histogram.total = data['count'], data['total']
+        histogram.min, histogram.max = data['min'], data['max']
+        return histogram
+
+
+# ----------------------------------------------------------------------
+# SQL-Zähler je Request
+# ----------------------------------------------------------------------
+
+class RequestStats:
+    __slots__ = ('sql_count', 'sql_time')
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar('bess_request_stats', default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+def _count_sql(started: float, executed: bool = True):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.sql_time += time.perf_counter() - started
+        if executed:
+            stats.sql_count += 1
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor, der Anweisungen und Abrufzeit dem laufenden Request zurechnet"""
+
+    def execute(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().execute(*args, **kwargs)
+        finally:
+            _count_sql(started)
+
+    def executemany(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().executemany(*args, **kwargs)
+        finally:
+            _count_sql(started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            _count_sql(started, executed=False)
+
+    def fetchmany(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(*args, **kwargs)
+        finally:
+            _count_sql(started, executed=False)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """sqlite3-Verbindung mit ProfiledCursor (für ``sqlite3.connect(..., factory=...)``)"""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        return self.cursor().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self.cursor().executemany(*args, **kwargs)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('bess_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('bess_query_start')
+    if starts:
+        _count_sql(starts.pop())
+
+
+_sqlalchemy_hooked = False
+
+
+def install_sqlalchemy_hooks():
+    """SQL-Zählung für alle SQLAlchemy-Engines (einmalig je Prozess)"""
+    global _sqlalchemy_hooked
+    if SQLALCHEMY_AVAILABLE and not _sqlalchemy_hooked:
+        _sa_event.listen(_SAEngine, 'before_cursor_execute', _before_cursor_execute)
+        _sa_event.listen(_SAEngine, 'after_cursor_execute', _after_cursor_execute)
+        _sqlalchemy_hooked = True
+
+
+# ----------------------------------------------------------------------
+# Endpunkt-Statistik
+# ----------------------------------------------------------------------
+
+class EndpointStats:
+    """Latenz-, SQL-Anzahl- und SQL-Zeit-Histogramme eines Endpunkts"""
+
+    __slots__ = ('latency', 'sql_count', 'sql_time', 'errors')
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        # SQL-Anzahl als "Mikrosekunden" erfasst: exakt bis 32, darüber ca. 3 %
+        self.sql_count = LatencyHistogram(max_value_us=1000 * 1000)
+        self.sql_time = LatencyHistogram()
+        self.errors = 0
+
+    def merge(self, other: 'EndpointStats'):
+        self.latency.merge(other.latency)
+        self.sql_count.merge(other.sql_count)
+        self.sql_time.merge(other.sql_time)
+        self.errors += other.errors
+
+    def summary(self) -> Dict[str, Any]:
+        data = self.latency.summary()
+        data.update({
+            'errors': self.errors,
+            'sql_per_request_p50': self.sql_count.percentile(50),
+            'sql_per_request_max': self.sql_count.max,
+            'sql_ms_p90': round(self.sql_time.percentile(90) / 1000, 2),
+            'sql_ms_mean': round(self.sql_time.total / self.sql_time.count / 1000, 2) if self.sql_time.count else 0,
+        })
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'latency': self.latency.to_dict(), 'sql_count': self.sql_count.to_dict(),
+                'sql_time': self.sql_time.to_dict(), 'errors': self.errors}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EndpointStats':
+        stats = cls()
+        stats.latency = LatencyHistogram.from_dict(data['latency'])
+        stats.sql_count = LatencyHistogram.from_dict(data['sql_count'])
+        stats.sql_time = LatencyHistogram.from_dict(data['sql_time'])
+        stats.errors = data['errors']
+        return stats
+
+
+class RequestProfiler:
+    """Flask-Hooks: SQL-Zähler je Request, Endpunkt-Histogramme, Profile langsamer Requests"""
+
+    def __init__(self, mode: str = PROFILING_MODE, slow_ms: float = SLOW_REQUEST_MS,
+                 sample_rate: float = PROFILE_SAMPLE_RATE, profile_dir: Optional[str] = None):
+        self.mode = mode
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        self.profile_dir = profile_dir
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+        # Endpunkte, deren nächster Request profiliert wird, und letzte Profilzeit je Endpunkt
+        self._armed = set()
+        self._last_profiled: Dict[str, float] = {}
+        self._last_dump = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ('metrics', 'profile')
+
+    def init_app(self, app):
+        if not self.enabled:
+            return
+        from flask import g, request
+
+        self.profile_dir = self.profile_dir or os.path.join(app.instance_path, 'profiles')
+        install_sqlalchemy_hooks()
+
+        @app.before_request
+        def _start_request_profiling():
+            g.bess_profile_started = time.perf_counter()
+            g.bess_profile_token = _current_stats.set(RequestStats())
+            g.bess_profiler = self._start_profiler(request.endpoint) if self.mode == 'profile' else None
+
+        @app.after_request
+        def _finish_request_profiling(response):
+            started = g.pop('bess_profile_started', None)
+            stats = _current_stats.get()
+            if started is None or stats is None:
+                return response
+            duration = time.perf_counter() - started
+            endpoint = request.endpoint or 'unbekannt'
+            self.record(endpoint, duration, stats, response.status_code)
+
+            profiler = g.pop('bess_profiler', None)
+            if profiler is not None:
+                self._finish_profiler(profiler, endpoint, duration, stats, response.status_code)
+            elif self.mode == 'profile' and duration * 1000 >= self.slow_ms:
+                self._arm(endpoint)
+
+            response.headers['Server-Timing'] = (
+                f'app;dur={duration * 1000:.1f}, '
+                f'sql;dur={stats.sql_time * 1000:.1f};desc="{stats.sql_count} Abfragen"'
+            )
+            return response
+
+        @app.teardown_request
+        def _reset_request_profiling(exc=None):
+            profiler = g.pop('bess_profiler', None)
+            if profiler is not None:
+                _stop_profiler(profiler)
+            token = g.pop('bess_profile_token', None)
+            if token is not None:
+                _current_stats.reset(token)
+
+    # --- Statistik ----------------------------------------------------------
+
+    def record(self, endpoint: str, duration: float, stats: RequestStats, status_code: int = 200):
+        with self._lock:
+            endpoint_stats = self.endpoints.get(endpoint)
+            if endpoint_stats is None:
+                endpoint_stats = self.endpoints[endpoint] = EndpointStats()
+            endpoint_stats.latency.record(duration * 1e6)
+            endpoint_stats.sql_count.record(stats.sql_count)
+            endpoint_stats.sql_time.record(stats.sql_time * 1e6)
+            if status_code >= 500:
+                endpoint_stats.errors += 1
+        if time.monotonic() - self._last_dump > STATS_DUMP_INTERVAL:
+            self.dump_stats()
+
+    def dump_stats(self):
+        """Statistik dieses Workers ablegen, damit /monitoring/endpoints alle Worker zusammenführt"""
+        self._last_dump = time.monotonic()
+        if not self.profile_dir:
+            return
+        with self._lock:
+            data = {'pid': os.getpid(), 'updated': time.time(),
+                    'endpoints': {name: stats.to_dict() for name, stats in self.endpoints.items()}}
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, f'stats_{os.getpid()}.json')
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.warning('Endpunkt-Statistik konnte nicht gespeichert werden: %s', e)
+        self._remove_stale_stats()
+
+    def _remove_stale_stats(self, max_age: float = STATS_MAX_AGE):
+        """Stände beendeter Worker löschen (jeder Neustart hinterlässt eine Datei je PID)"""
+        cutoff = time.time() - max_age
+        for path in glob.glob(os.path.join(self.profile_dir, 'stats_*.json*')):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def merged_stats(self, max_age: float = STATS_MAX_AGE) -> Dict[str, EndpointStats]:
+        """Statistik aller Worker (abgelegte Stände anderer Prozesse plus eigener Live-Stand)"""
+        merged: Dict[str, EndpointStats] = {}
+        own = f'stats_{os.getpid()}.json'
+        for path in glob.glob(os.path.join(self.profile_dir or '', 'stats_*.json')):
+            if os.path.basename(path) == own:
+                continue
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if time.time() - data.get('updated', 0) > max_age:
+                continue
+            for name, raw in data['endpoints'].items():
+                stats = EndpointStats.from_dict(raw)
+                if name in merged:
+                    merged[name].merge(stats)
+                else:
+                    merged[name] = stats
+        with self._lock:
+            for name, stats in self.endpoints.items():
+                merged.setdefault(name, EndpointStats()).merge(stats)
+        return merged
+
+    def endpoint_report(self, sort: str = 'p99_ms', limit: int = 50, all_workers: bool = True) -> List[Dict[str, Any]]:
+        if all_workers:
+            source = self.merged_stats()
+        else:
+            with self._lock:
+                source = dict(self.endpoints)
+        rows = [dict(endpoint=name, **stats.summary()) for name, stats in source.items()]
+        rows.sort(key=lambda row: row.get(sort, 0) or 0, reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+
+    # --- Profile ------------------------------------------------------------
+
+    def _arm(self, endpoint: str):
+        if time.monotonic() - self._last_profiled.get(endpoint, -PROFILE_COOLDOWN) >= PROFILE_COOLDOWN:
+            self._armed.add(endpoint)
+
+    def _start_profiler(self, endpoint: Optional[str]):
+        if endpoint in self._armed:
+            self._armed.discard(endpoint)
+        elif random.random() >= self.sample_rate:
+            return None
+        self._last_profiled[endpoint] = time.monotonic()
+        try:
+            if PYINSTRUMENT_AVAILABLE:
+                profiler = _PyinstrumentProfiler(async_mode='disabled')
+                profiler.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+        except (RuntimeError, ValueError) as e:
+            # z.B. bereits laufender Profiler im selben Thread
+            logger.debug('Profiler nicht gestartet: %s', e)
+            return None
+        return profiler
+
+    def _finish_profiler(self, profiler, endpoint: str, duration: float, stats: RequestStats, status_code: int):
+        _stop_profiler(profiler)
+        # Nur langsame Requests aufheben; schnelle Stichproben verwerfen
+        if duration * 1000 < self.slow_ms:
+            return
+        from flask import request
+
+        meta = {
+            'endpoint': endpoint,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'status_code': status_code,
+            'duration_ms': round(duration * 1000, 1),
+            'sql_count': stats.sql_count,
+            'sql_ms': round(stats.sql_time * 1000, 1),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'pid': os.getpid(),
+        }
+        try:
+            save_profile(self.profile_dir, meta, profiler)
+        except OSError as e:
+            logger.warning('Profil konnte nicht gespeichert werden: %s', e)
+
+
+def _stop_profiler(profiler):
+    try:
+        if PYINSTRUMENT_AVAILABLE and isinstance(profiler, _PyinstrumentProfiler):
+            if profiler.is_running:
+                profiler.stop()
+        else:
+            profiler.disable()
+    except RuntimeError:
+        pass
+
+
+def save_profile(profile_dir: str, meta: Dict[str, Any], profiler) -> str:
+    """Profil als HTML (pyinstrument) bzw. pstats-Text (cProfile) samt Metadaten ablegen"""
+    os.makedirs(profile_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    safe_endpoint = ''.join(c if c.isalnum() or c in '._-' else '_' for c in meta['endpoint'])
+    profile_id = f"{stamp}_{safe_endpoint}"
+
+    if PYINSTRUMENT_AVAILABLE and isinstance(profiler, _PyinstrumentProfiler):
+        meta['format'], extension = 'html', 'html'
+        content = profiler.output_html()
+    else:
+        meta['format'], extension = 'text', 'txt'
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(60)
+        content = buffer.getvalue()
+
+    with open(os.path.join(profile_dir, f"{profile_id}.{extension}"), 'w', encoding='utf-8') as f:
+        f.write(content)
+    with open(os.path.join(profile_dir, f"{profile_id}.json"), 'w', encoding='utf-8') as f:
+        json.dump(dict(meta, id=profile_id), f)
+    _prune_profiles(profile_dir)
+    logger.info('Profil %s gespeichert (%s ms, %s SQL-Abfragen)', profile_id, meta['duration_ms'], meta['sql_count'])
+    return profile_id
+
+
+def _prune_profiles(profile_dir: str, keep: int = PROFILE_KEEP):
+    metas = sorted(glob.glob(os.path.join(profile_dir, '2*.json')))
+    for meta_path in metas[:max(0, len(metas) - keep)]:
+        base = meta_path[:-len('.json')]
+        for path in (meta_path, base + '.html', base + '.txt'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def list_profiles(profile_dir: str, endpoint: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Gespeicherte Profile, neueste zuerst"""
+    profiles = []
+    for meta_path in sorted(glob.glob(os.path.join(profile_dir, '2*.json')), reverse=True):
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if endpoint and meta.get('endpoint') != endpoint:
+            continue
+        profiles.append(meta)
+        if len(profiles) >= limit:
+            break
+    return profiles
+
+
+def profile_path(profile_dir: str, profile_id: str) -> Optional[str]:
+    """Pfad zur Profil-Datei (nur IDs aus list_profiles, keine Pfadangaben)"""
+    if os.path.basename(profile_id) != profile_id or profile_id.startswith('.'):
+        return None
+    for extension in ('html', 'txt'):
+        path = os.path.join(profile_dir, f"{profile_id}.{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+request_profiler = RequestProfiler()
+
+
+def init_request_profiling(app) -> RequestProfiler:
+    request_profiler.init_app(app)
+    return request_profiler
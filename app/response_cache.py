@@ -0,0 +1,327 @@
+"""
+HTTP-Response-Cache für lesezugriffslastige API-Endpunkte
+Starke ETags aus Datenversionszählern (per Trigger je Tabelle gepflegt), 304 bei
+If-None-Match/If-Modified-Since und serverseitiger Cache, der bei Schreibzugriffen
+über die Versionen automatisch ungültig wird
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = 'data_version'
+
+# Tabellen mit Versionszähler (Tag = Tabellenname)
+TRACKED_TABLES = (
+    'project', 'customer', 'load_profile', 'spot_price', 'use_case',
+    'revenue_model', 'grid_tariff', 'legal_charges', 'market_price_config',
+)
+
+# Wie lange ein Worker gelesene Versionen wiederverwendet, bevor er SQLite erneut fragt.
+# Schreibzugriffe im selben Worker verwerfen sie sofort; andere Worker sehen sie nach spätestens VERSION_TTL.
+VERSION_TTL = float(os.environ.get('BESS_VERSION_TTL', '2.0'))
+
+# Einträge im lokalen Response-Cache je Worker
+LOCAL_CACHE_SIZE = int(os.environ.get('BESS_RESPONSE_CACHE_SIZE', '256'))
+
+# Nach einem Fehler des gemeinsamen Caches (Redis) so lange nur lokal cachen
+SHARED_RETRY_SECONDS = 60
+
+_schema_ready = set()
+_versions: Dict[str, Tuple[float, int, Optional[str]]] = {}
+_versions_lock = threading.Lock()
+
+
+def _db_path() -> str:
+    return os.path.join('instance', 'bess.db')
+
+
+def _table_exists(cursor: sqlite3.Cursor, name: str) -> bool:
+    return cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def ensure_version_schema(conn: sqlite3.Connection, tables: Iterable[str] = TRACKED_TABLES):
+    """Legt data_version samt INSERT/UPDATE/DELETE-Triggern je Tabelle an
+
+    Die Trigger erhöhen den Zähler der Tabelle bei jeder Änderung - auch bei
+    Schreibzugriffen außerhalb der App (Scheduler, Import-Skripte).
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+            tag TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    for table in tables:
+        if not _table_exists(cursor, table):
+            continue
+        cursor.execute(
+            f"INSERT OR IGNORE INTO {VERSION_TABLE} (tag, version, updated_at) VALUES (?, 0, CURRENT_TIMESTAMP)",
+            (table,)
+        )
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE {VERSION_TABLE} SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE tag = '{table}';
+                END
+            """)
+    conn.commit()
+
+
+def _connect(conn: Optional[sqlite3.Connection]) -> Tuple[sqlite3.Connection, bool]:
+    if conn is not None:
+        return conn, False
+    return sqlite3.connect(_db_path()), True
+
+
+def read_versions(tags: Sequence[str], conn: Optional[sqlite3.Connection] = None) -> Dict[str, Tuple[int, Optional[str]]]:
+    """Versionen und Änderungszeitpunkte der Tags direkt aus der Datenbank"""
+    conn, owned = _connect(conn)
+    try:
+        db_key = conn.execute('PRAGMA database_list').fetchone()[2]
+        if not db_key or db_key not in _schema_ready:
+            ensure_version_schema(conn)
+            if db_key:
+                _schema_ready.add(db_key)
+        placeholders = ', '.join('?' for _ in tags)
+        rows = conn.execute(
+            f"SELECT tag, version, updated_at FROM {VERSION_TABLE} WHERE tag IN ({placeholders})", tuple(tags)
+        ).fetchall()
+    finally:
+        if owned:
+            conn.close()
+    found = {tag: (version, updated_at) for tag, version, updated_at in rows}
+    return {tag: found.get(tag, (0, None)) for tag in tags}
+
+
+def data_versions(tags: Sequence[str]) -> Dict[str, Tuple[int, Optional[str]]]:
+    """Versionen der Tags, innerhalb von VERSION_TTL aus dem Worker-Speicher"""
+    if not tags:
+        return {}
+    now = time.monotonic()
+    with _versions_lock:
+        cached = {tag: _versions.get(tag) for tag in tags}
+    if all(entry and now - entry[0] < VERSION_TTL for entry in cached.values()):
+        return {tag: (entry[1], entry[2]) for tag, entry in cached.items()}
+
+    versions = read_versions(tags)
+    with _versions_lock:
+        for tag, (version, updated_at) in versions.items():
+            _versions[tag] = (now, version, updated_at)
+    return versions
+
+
+def forget_versions():
+    """Gemerkte Versionen verwerfen (nach Schreibzugriffen in diesem Worker)"""
+    with _versions_lock:
+        _versions.clear()
+
+
+def invalidate(*tags: str, conn: Optional[sqlite3.Connection] = None):
+    """Tags explizit hochzählen, z.B. für Daten ohne Trigger-Tabelle"""
+    conn, owned = _connect(conn)
+    try:
+        ensure_version_schema(conn, ())
+        for tag in tags:
+            conn.execute(f"""
+                INSERT INTO {VERSION_TABLE} (tag, version, updated_at) VALUES (?, 1, CURRENT_TIMESTAMP)
+                ON CONFLICT (tag) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+            """, (tag,))
+        conn.commit()
+    finally:
+        if owned:
+            conn.close()
+    forget_versions()
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Änderungszeit und Größe einer Datei als Versionsbestandteil (None wenn nicht vorhanden)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def compute_etag(*parts: Any) -> str:
+    """Starker ETag über alle Bestandteile, die den Response-Body bestimmen"""
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def last_modified(versions: Dict[str, Tuple[int, Optional[str]]], files: Sequence[str] = ()) -> Optional[datetime]:
+    """Jüngster Änderungszeitpunkt aus Versionstabelle (UTC) und Dateien"""
+    stamps = []
+    for _, updated_at in versions.values():
+        if updated_at:
+            try:
+                stamps.append(datetime.fromisoformat(str(updated_at)).replace(tzinfo=timezone.utc))
+            except ValueError:
+                pass
+    for path in files:
+        stamp = file_stamp(path)
+        if stamp:
+            stamps.append(datetime.fromtimestamp(stamp[0] / 1e9, tz=timezone.utc))
+    return max(stamps) if stamps else None
+
+
+# ----------------------------------------------------------------------
+# Serverseitiger Speicher: lokaler LRU je Worker, optional gemeinsamer Cache
+# ----------------------------------------------------------------------
+
+class ResponseStore:
+    """LRU im Worker-Speicher plus gemeinsamer Flask-Cache (Redis), sofern erreichbar
+
+    Schlüssel sind ETags; da diese die Datenversionen enthalten, veralten Einträge
+    nach Schreibzugriffen nie, sie werden nur nicht mehr abgefragt.
+    """
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_SIZE, shared=None):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._local: 'OrderedDict[str, Tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared_disabled_until = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _shared_ok(self) -> bool:
+        return self.shared is not None and time.monotonic() >= self._shared_disabled_until
+
+    def _shared_failed(self, e: Exception):
+        logger.warning('Gemeinsamer Response-Cache nicht erreichbar, nutze lokalen Cache: %s', e)
+        self._shared_disabled_until = time.monotonic() + SHARED_RETRY_SECONDS
+
+    def get(self, key: str) -> Optional[Tuple]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+        if entry is None and self._shared_ok():
+            try:
+                entry = self.shared.get(f"response:{key}")
+            except Exception as e:
+                self._shared_failed(e)
+            if entry is not None:
+                self._remember(key, tuple(entry))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: Tuple, timeout: int = 300):
+        self._remember(key, entry)
+        if self._shared_ok():
+            try:
+                self.shared.set(f"response:{key}", entry, timeout=timeout)
+            except Exception as e:
+                self._shared_failed(e)
+
+    def _remember(self, key: str, entry: Tuple):
+        with self._lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._local), 'hits': self.hits, 'misses': self.misses}
+
+
+response_store = ResponseStore()
+
+
+def init_response_cache(app, shared_cache=None):
+    """Versionstabelle anlegen, gemeinsamen Cache setzen und Versionen nach Schreib-Requests verwerfen"""
+    from flask import request
+
+    response_store.shared = shared_cache
+    db_path = os.path.join(app.instance_path, 'bess.db')
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            ensure_version_schema(conn)
+        finally:
+            conn.close()
+
+    @app.after_request
+    def _forget_versions_after_write(response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            forget_versions()
+        return response
+
+
+def cached_response(*tags: str, files: Sequence[str] = (), per_day: bool = False, timeout: int = 300):
+    """Decorator für GET-Endpunkte, deren Antwort nur von ``tags`` (Tabellen) und ``files`` abhängt
+
+    - ETag aus Endpunkt, URL-Parametern, Datenversionen und Dateistempeln
+      (``per_day`` zusätzlich mit dem Datum für Abfragen relativ zu ``now``)
+    - passender If-None-Match bzw. If-Modified-Since: 304 ohne Berechnung
+    - sonst Body aus dem serverseitigen Cache, erst bei Fehlschlag wird die View ausgeführt
+    Nur 200-Antworten werden gespeichert; bei Datenbankfehlern läuft die View ungecacht.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import Response, make_response, request
+
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+            try:
+                versions = data_versions(tags)
+            except sqlite3.Error as e:
+                logger.warning('Datenversionen nicht lesbar, Response ungecacht: %s', e)
+                return view(*args, **kwargs)
+
+            etag = compute_etag(
+                view.__module__, view.__name__, kwargs, sorted(request.args.items(multi=True)),
+                {tag: version for tag, (version, _) in versions.items()},
+                [file_stamp(path) for path in files],
+                datetime.now().date().isoformat() if per_day else None,
+            )
+            modified = last_modified(versions, files)
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                entry = response_store.get(etag)
+                if entry is not None:
+                    body, status, mimetype = entry
+                    response = Response(body, status=status, mimetype=mimetype)
+                    response.headers['X-Cache-Status'] = 'HIT'
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    response_store.set(etag, (response.get_data(), response.status_code, response.mimetype), timeout)
+                    response.headers['X-Cache-Status'] = 'MISS'
+
+            response.set_etag(etag)
+            if modified is not None:
+                response.last_modified = modified
+            # Browser dürfen speichern, müssen aber jedes Mal per ETag nachfragen
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
@@ -3,25 +3,50 @@ from flask_login import login_required, current_user
 from app import db, get_db
 from datetime import datetime
 from collections import Counter
+from contextlib import closing
 import sys
 import os
 from pathlib import Path
 import sqlite3
-import pandas as pd
 import time
+import logging
 import requests
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import Project, LoadProfile, LoadValue, Customer, InvestmentCost, ReferencePrice, SpotPrice, UseCase, RevenueModel, RevenueActivation, GridTariff, LegalCharges, RenewableSubsidy, BatteryDegradation, RegulatoryChanges, GridConstraints, LoadShiftingPlan, LoadShiftingValue, BatteryConfig, MarketPriceConfig, NetworkRestrictions, BatteryDegradationAdvanced, SecondLifeConfig, OptimizationStrategyConfig, WindData, WindValue
 from datetime import datetime, timedelta
 import random
 import math
-import numpy as np
-from geosphere.geosphere_wind_engine import run_wind_pipeline
-from data_importers import WindProfileImporter
+from .lazy_imports import import_available, lazy_import
 from .notification_routes import create_notification, send_simulation_complete_notification, send_system_alert_notification, send_welcome_notification
-from .roadmap_stufe1_integration import load_network_restrictions, load_degradation_model, calculate_degradation_for_year, get_second_life_cost_reduction
-from .roadmap_stufe2_integration import load_co_location_config, calculate_co_location_benefits_for_simulation
-from .roadmap_stufe2_2_integration import load_optimization_config, optimize_dispatch_for_period, get_optimization_statistics
+from .downsampling import downsample_columns, downsample_records, downsampling_params
+from .series_formats import negotiate_format, series_response
+from .pagination import KeysetQuery, keyset_response, page_request
+from .profile_stats import profile_row_counts, ensure_profile_stats_ready
+from .response_cache import cached_response
+from .dashboard_summary import dashboard_charts, dashboard_summary
+from .jobs import background_job, report_progress
+from .logging_config import RowSampler
+from .telemetry_decoder import assign_device_profile, get_device_profile, load_device_profiles, telemetry_decoder
+
+logger = logging.getLogger(__name__)
+
+# Schwere Abhängigkeiten (pandas/NumPy, Fetcher, Optimierer) erst beim ersten Zugriff laden,
+# damit Worker-Start und Reload nicht auf sie warten
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+run_wind_pipeline = lazy_import('geosphere.geosphere_wind_engine', 'run_wind_pipeline')
+WindProfileImporter = lazy_import('data_importers', 'WindProfileImporter')
+
+# Roadmap-Integrationen
+load_network_restrictions = lazy_import('.roadmap_stufe1_integration', 'load_network_restrictions', __package__)
+load_degradation_model = lazy_import('.roadmap_stufe1_integration', 'load_degradation_model', __package__)
+calculate_degradation_for_year = lazy_import('.roadmap_stufe1_integration', 'calculate_degradation_for_year', __package__)
+get_second_life_cost_reduction = lazy_import('.roadmap_stufe1_integration', 'get_second_life_cost_reduction', __package__)
+load_co_location_config = lazy_import('.roadmap_stufe2_integration', 'load_co_location_config', __package__)
+calculate_co_location_benefits_for_simulation = lazy_import('.roadmap_stufe2_integration', 'calculate_co_location_benefits_for_simulation', __package__)
+load_optimization_config = lazy_import('.roadmap_stufe2_2_integration', 'load_optimization_config', __package__)
+optimize_dispatch_for_period = lazy_import('.roadmap_stufe2_2_integration', 'optimize_dispatch_for_period', __package__)
+get_optimization_statistics = lazy_import('.roadmap_stufe2_2_integration', 'get_optimization_statistics', __package__)
 
 def generate_legacy_demo_water_levels(start_date, end_date):
     """Generiert Legacy Demo-Wasserpegel-Daten für Fallback"""
@@ -54,43 +79,38 @@ def generate_legacy_demo_water_levels(start_date, end_date):
     
     return demo_data
 
-# EHYD Data Fetcher importieren
-from ehyd_data_fetcher import EHYDDataFetcher
+# EHYD Data Fetcher (verzögert)
+EHYDDataFetcher = lazy_import('ehyd_data_fetcher', 'EHYDDataFetcher')
 
-# PVGIS Data Fetcher importieren
-from pvgis_data_fetcher import PVGISDataFetcher
+# PVGIS Data Fetcher (verzögert)
+PVGISDataFetcher = lazy_import('pvgis_data_fetcher', 'PVGISDataFetcher')
 
-# BESS Sizing Optimizer importieren
-from bess_sizing_optimizer import BESSSizingOptimizer, PSLLConstraints, SizingResult
+# BESS Sizing Optimizer (verzögert)
+BESSSizingOptimizer = lazy_import('bess_sizing_optimizer', 'BESSSizingOptimizer')
+PSLLConstraints = lazy_import('bess_sizing_optimizer', 'PSLLConstraints')
+SizingResult = lazy_import('bess_sizing_optimizer', 'SizingResult')
 
-# aWattar Data Fetcher importieren
-from awattar_data_fetcher import awattar_fetcher
+# aWattar Data Fetcher (verzögert)
+awattar_fetcher = lazy_import('awattar_data_fetcher', 'awattar_fetcher')
 
 # Auth-Module importieren
 from auth_module import bess_auth, auth_optional
 from permissions import login_required
 from .live_data_service import live_bess_service
 
-# Dispatch-Integration importieren
-try:
-    from app.dispatch_integration import dispatch_integration
-    DISPATCH_AVAILABLE = True
-except ImportError:
-    DISPATCH_AVAILABLE = False
-    print("Warnung: Dispatch-Integration nicht verfügbar")
-
-# Intraday-Arbitrage und österreichische Marktdaten Integration
-try:
-    from src.intraday import (
-        theoretical_revenue, spread_based_revenue, thresholds_based_revenue, _ensure_price_kwh
-    )
-    from src.markets import ATMarketIntegrator, BESSSpec
-    INTRADAY_AVAILABLE = True
-    AT_MARKET_AVAILABLE = True
-except ImportError:
-    INTRADAY_AVAILABLE = False
-    AT_MARKET_AVAILABLE = False
-    print("Warnung: Intraday-Arbitrage oder österreichische Marktdaten-Module nicht verfügbar")
+# Dispatch-Integration (verzögert; Import und Verfügbarkeitsprüfung beim ersten Zugriff,
+# Importfehler werden dann als Warnung geloggt)
+DISPATCH_AVAILABLE = import_available('app.dispatch_integration')
+dispatch_integration = lazy_import('app.dispatch_integration', 'dispatch_integration')
+
+# Intraday-Arbitrage und österreichische Marktdaten Integration (verzögert)
+INTRADAY_AVAILABLE = AT_MARKET_AVAILABLE = import_available('src.intraday', 'src.markets')
+theoretical_revenue = lazy_import('src.intraday', 'theoretical_revenue')
+spread_based_revenue = lazy_import('src.intraday', 'spread_based_revenue')
+thresholds_based_revenue = lazy_import('src.intraday', 'thresholds_based_revenue')
+_ensure_price_kwh = lazy_import('src.intraday', '_ensure_price_kwh')
+ATMarketIntegrator = lazy_import('src.markets', 'ATMarketIntegrator')
+BESSSpec = lazy_import('src.markets', 'BESSSpec')
 
 main_bp = Blueprint('main', __name__)
 
@@ -395,46 +415,25 @@ def button_funktioniert():
 @main_bp.route('/api/projects')
 @login_required
 def api_projects():
+    """Projektliste mit Kundennamen (sortiert nach Name)
+
+    Optional: limit/cursor für Keyset-Pagination (Cursor im Header X-Next-Cursor)
+    oder stream=ndjson für zeilenweises Streaming
+    """
     try:
-        print("🚀 API /api/projects aufgerufen")
-        
-        # Einfache SQLAlchemy-Abfrage
-        projects = Project.query.order_by(Project.name.asc()).all()
-        print(f"📊 {len(projects)} Projekte aus DB geladen")
-        
-        # Vereinfachte Datenstruktur mit Kunden-Information
-        projects_data = []
-        for project in projects:
-            # Kunden-Name laden
-            customer_name = None
-            if project.customer:
-                customer_name = project.customer.name
-                print(f"✅ Projekt '{project.name}' hat Kunde: {customer_name}")
-            elif project.customer_id:
-                # Fallback: Kunde direkt laden falls relationship nicht funktioniert
-                customer = Customer.query.get(project.customer_id)
-                customer_name = customer.name if customer else None
-                print(f"🔄 Projekt '{project.name}' - Kunde über ID {project.customer_id}: {customer_name}")
-            else:
-                print(f"⚠️ Projekt '{project.name}' hat keinen Kunden (customer_id: {project.customer_id})")
-            
-            projects_data.append({
-                'id': project.id,
-                'name': project.name,
-                'location': project.location or 'Kein Standort',
-                'bess_size': project.bess_size,
-                'bess_power': project.bess_power,
-                'pv_power': project.pv_power,
-                'current_electricity_cost': project.current_electricity_cost,
-                'customer_id': project.customer_id,
-                'customer_name': customer_name
-            })
-        
-        print(f"✅ {len(projects_data)} Projekte für API vorbereitet")
-        return jsonify(projects_data)
+        # Kundenname per JOIN statt Nachladen je Projekt
+        query = KeysetQuery("""
+            SELECT p.id, p.name,
+                   COALESCE(NULLIF(p.location, ''), 'Kein Standort') AS location,
+                   p.bess_size, p.bess_power, p.pv_power, p.current_electricity_cost,
+                   p.customer_id, c.name AS customer_name
+            FROM project p
+            LEFT JOIN customer c ON c.id = p.customer_id
+        """, key_columns=('name', 'id'))
+        return keyset_response(query, get_db)
         
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Projekte: {e}")
+        logger.error('❌ Fehler beim Laden der Projekte: %s', e)
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
@@ -521,22 +520,22 @@ def api_create_project():
 def api_get_project(project_id):
     project = Project.query.get_or_404(project_id)
     
-    print(f"=== DEBUG: Projekt laden ===")
-    print(f"Projekt ID: {project_id}")
-    print(f"Projekt Name: {project.name}")
-    print(f"BESS Size: {project.bess_size}")
-    print(f"BESS Power: {project.bess_power}")
-    print(f"PV Power: {project.pv_power}")
-    print(f"Current Electricity Cost: {project.current_electricity_cost}")
-    print(f"Daily Cycles: {getattr(project, 'daily_cycles', 'NICHT GESETZT')}")
-    print(f"Customer ID: {project.customer_id}")
+    logger.debug('=== DEBUG: Projekt laden ===')
+    logger.debug('Projekt ID: %s', project_id)
+    logger.debug('Projekt Name: %s', project.name)
+    logger.debug('BESS Size: %s', project.bess_size)
+    logger.debug('BESS Power: %s', project.bess_power)
+    logger.debug('PV Power: %s', project.pv_power)
+    logger.debug('Current Electricity Cost: %s', project.current_electricity_cost)
+    logger.debug('Daily Cycles: %s', getattr(project, 'daily_cycles', 'NICHT GESETZT'))
+    logger.debug('Customer ID: %s', project.customer_id)
     
     # Lade Investitionskosten aus der InvestmentCost Tabelle
     investment_costs = InvestmentCost.query.filter_by(project_id=project_id).all()
     costs_dict = {}
     for cost in investment_costs:
         costs_dict[cost.component_type] = cost.cost_eur
-        print(f"Investment Cost {cost.component_type}: {cost.cost_eur} €")
+        logger.debug('Investment Cost %s: %s €', cost.component_type, cost.cost_eur)
     
     # Lade BatteryConfig-Daten
     battery_configs = BatteryConfig.query.filter_by(project_id=project_id).all()
@@ -553,7 +552,7 @@ def api_get_project(project_id):
             'temp_derate_charge': config.temp_derate_charge,
             'temp_derate_discharge': config.temp_derate_discharge
         })
-        print(f"Battery Config: C_chg={config.C_chg_rate}, C_dis={config.C_dis_rate}")
+        logger.debug('Battery Config: C_chg=%s, C_dis=%s', config.C_chg_rate, config.C_dis_rate)
     
     return jsonify({
         'id': project.id,
@@ -591,13 +590,13 @@ def api_update_project(project_id):
         project = Project.query.get_or_404(project_id)
         data = request.get_json()
         
-        print(f"=== DEBUG: Projekt Update ===")
-        print(f"Projekt ID: {project_id}")
-        print(f"Empfangene Daten: {data}")
+        logger.debug('=== DEBUG: Projekt Update ===')
+        logger.debug('Projekt ID: %s', project_id)
+        logger.debug('Empfangene Daten: %s', data)
         
         # Validierung der erforderlichen Felder
         if not data or not data.get('name'):
-            print(f"Fehler: Kein Name angegeben")
+            logger.error('Fehler: Kein Name angegeben')
             return jsonify({'error': 'Projektname ist erforderlich'}), 400
         
         # Sichere Datentyp-Konvertierung
@@ -607,7 +606,7 @@ def api_update_project(project_id):
             
             # Customer ID - MIT FOREIGN KEY VALIDIERUNG
             customer_id_raw = data.get('customer_id')
-            print(f"DEBUG: customer_id raw: {customer_id_raw} (type: {type(customer_id_raw)})")
+            logger.debug('DEBUG: customer_id raw: %s (type: %s)', customer_id_raw, type(customer_id_raw))
             
             if customer_id_raw is None or customer_id_raw == '' or customer_id_raw == 'null':
                 project.customer_id = None
@@ -618,14 +617,14 @@ def api_update_project(project_id):
                     customer = Customer.query.get(customer_id)
                     if customer:
                         project.customer_id = customer_id
-                        print(f"DEBUG: Kunde gefunden: {customer.name}")
+                        logger.debug('DEBUG: Kunde gefunden: %s', customer.name)
                     else:
-                        print(f"DEBUG: Kunde mit ID {customer_id} nicht gefunden!")
+                        logger.debug('DEBUG: Kunde mit ID %s nicht gefunden!', customer_id)
                         return jsonify({'error': f'Kunde mit ID {customer_id} existiert nicht'}), 422
                 except (ValueError, TypeError):
                     project.customer_id = None
             
-            print(f"DEBUG: customer_id final: {project.customer_id}")
+            logger.debug('DEBUG: customer_id final: %s', project.customer_id)
             
             # Datum sicher parsen
             if data.get('date') and str(data['date']).strip():
@@ -645,19 +644,19 @@ def api_update_project(project_id):
             project.hydro_power = float(data['hydro_power']) if data.get('hydro_power') and str(data['hydro_power']).strip() else None
             project.other_power = float(data['other_power']) if data.get('other_power') and str(data['other_power']).strip() else None
             project.daily_cycles = float(data['daily_cycles']) if data.get('daily_cycles') and str(data['daily_cycles']).strip() else 1.2
-            print(f"  Daily Cycles: {project.daily_cycles}")
+            logger.debug('  Daily Cycles: %s', project.daily_cycles)
             project.current_electricity_cost = float(data['current_electricity_cost']) if data.get('current_electricity_cost') and str(data['current_electricity_cost']).strip() else 12.5
             
-            print(f"Verarbeitete Daten:")
-            print(f"  Name: {project.name}")
-            print(f"  Location: {project.location}")
-            print(f"  Customer ID: {project.customer_id}")
-            print(f"  Date: {project.date}")
-            print(f"  BESS Size: {project.bess_size}")
-            print(f"  BESS Power: {project.bess_power}")
-            print(f"  PV Power: {project.pv_power}")
-            print(f"  Other Power: {project.other_power}")
-            print(f"  Daily Cycles: {project.daily_cycles}")
+            logger.debug('Verarbeitete Daten:')
+            logger.debug('  Name: %s', project.name)
+            logger.debug('  Location: %s', project.location)
+            logger.debug('  Customer ID: %s', project.customer_id)
+            logger.debug('  Date: %s', project.date)
+            logger.debug('  BESS Size: %s', project.bess_size)
+            logger.debug('  BESS Power: %s', project.bess_power)
+            logger.debug('  PV Power: %s', project.pv_power)
+            logger.debug('  Other Power: %s', project.other_power)
+            logger.debug('  Daily Cycles: %s', project.daily_cycles)
             
             # Investitionskosten verarbeiten
             cost_fields = ['bess_cost', 'pv_cost', 'hp_cost', 'wind_cost', 'hydro_cost', 'other_cost']
@@ -677,7 +676,7 @@ def api_update_project(project_id):
                         
                         if existing_cost:
                             existing_cost.cost_eur = cost_eur
-                            print(f"  {cost_type} Kosten aktualisiert: {cost_eur} €")
+                            logger.debug('  %s Kosten aktualisiert: %s €', cost_type, cost_eur)
                         else:
                             new_cost = InvestmentCost(
                                 project_id=project_id,
@@ -686,21 +685,21 @@ def api_update_project(project_id):
                                 description=f'{cost_type.upper()} Investitionskosten'
                             )
                             db.session.add(new_cost)
-                            print(f"  {cost_type} Kosten hinzugefügt: {cost_eur} €")
+                            logger.debug('  %s Kosten hinzugefügt: %s €', cost_type, cost_eur)
                     except (ValueError, TypeError):
-                        print(f"  Warnung: Ungültiger Kostenwert für {cost_type}: {cost_value}")
+                        logger.warning('  Warnung: Ungültiger Kostenwert für %s: %s', cost_type, cost_value)
             
             db.session.commit()
-            print(f"✅ Projekt und Investitionskosten erfolgreich aktualisiert")
+            logger.debug('✅ Projekt und Investitionskosten erfolgreich aktualisiert')
             return jsonify({'success': True, 'message': 'Projekt erfolgreich aktualisiert'})
             
         except (ValueError, TypeError) as e:
-            print(f"Datentyp-Fehler: {str(e)}")
+            logger.error('Datentyp-Fehler: %s', str(e))
             return jsonify({'error': f'Ungültige Daten: {str(e)}'}), 400
             
     except Exception as e:
         db.session.rollback()
-        print(f"Allgemeiner Fehler beim Aktualisieren des Projekts: {str(e)}")
+        logger.error('Allgemeiner Fehler beim Aktualisieren des Projekts: %s', str(e))
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/projects/<int:project_id>', methods=['DELETE'])
@@ -712,22 +711,35 @@ def api_delete_project(project_id):
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'error': str(e)}), 400
+
+def _pvgis_location_names():
+    """PVGIS-Standortkatalog als Schlüssel -> Anzeigename"""
+    try:
+        locations = PVGISDataFetcher().get_available_locations()
+    except Exception as e:
+        logger.warning('[WARN] Fehler beim Abrufen der Standort-Informationen: %s', e)
+        return {}
+    return {key: location.get('name', key) for key, location in locations.items()}
+
 @main_bp.route('/api/projects/<int:project_id>/load-profiles')
 def api_load_profiles(project_id):
     """API-Endpoint für Lastprofile eines Projekts"""
     try:
-        print(f"[INFO] Lade Lastprofile fuer Projekt {project_id}...")
+        logger.debug('[INFO] Lade Lastprofile fuer Projekt %s...', project_id)
         
-        cursor = get_db().cursor()
+        conn = get_db()
+        # Zeilenzahlen aus load_profile_stats statt COUNT(*) je Profil (Schema einmal je Prozess)
+        ensure_profile_stats_ready(conn)
+        cursor = conn.cursor()
         profiles = []
         
         # 1. Alle Lastprofile aus der alten load_profile Tabelle abrufen
         cursor.execute("""
-            SELECT id, name, created_at, 
-                   (SELECT COUNT(*) FROM load_value WHERE load_profile_id = load_profile.id) as data_points
-            FROM load_profile 
-            WHERE project_id = ?
-            ORDER BY created_at DESC
+            SELECT lp.id, lp.name, lp.created_at, COALESCE(s.row_count, 0) as data_points
+            FROM load_profile lp
+            LEFT JOIN load_profile_stats s ON s.source = 'load_profile' AND s.profile_id = lp.id
+            WHERE lp.project_id = ?
+            ORDER BY lp.created_at DESC
         """, (project_id,))
         
         for row in cursor.fetchall():
@@ -741,12 +753,12 @@ def api_load_profiles(project_id):
         
         # 2. Alle Lastprofile aus der neuen load_profiles Tabelle abrufen
         cursor.execute("""
-            SELECT id, name, created_at, 
-                   (SELECT COUNT(*) FROM load_profile_data WHERE load_profile_id = load_profiles.id) as data_points,
-                   data_type
-            FROM load_profiles 
-            WHERE project_id = ?
-            ORDER BY created_at DESC
+            SELECT lp.id, lp.name, lp.created_at, COALESCE(s.row_count, 0) as data_points,
+                   lp.data_type
+            FROM load_profiles lp
+            LEFT JOIN load_profile_stats s ON s.source = 'load_profiles' AND s.profile_id = lp.id
+            WHERE lp.project_id = ?
+            ORDER BY lp.created_at DESC
         """, (project_id,))
         
         for row in cursor.fetchall():
@@ -760,41 +772,40 @@ def api_load_profiles(project_id):
             })
         
         # 3. PVGIS-Solar-Daten als virtuelle Lastprofile hinzufügen (nur wenn solar_data Tabelle existiert)
+        solar_profiles = []
         try:
             cursor.execute("""
                 SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='solar_data'
+                WHERE type='table' AND name IN ('solar_data', 'solar_data_header')
             """)
-            
-            if cursor.fetchone():
-                cursor.execute("""
-                    SELECT DISTINCT location_key, year, 
-                           (SELECT COUNT(*) FROM solar_data WHERE location_key = sd.location_key AND year = sd.year) as data_points
-                    FROM solar_data sd
-                    ORDER BY location_key, year DESC
-                """)
+            solar_tables = {row[0] for row in cursor.fetchall()}
+            
+            if 'solar_data' in solar_tables:
+                if 'solar_data_header' in solar_tables:
+                    # Zeilenzahl je Standort/Jahr steht im Header; nur Altbestände ohne Header zählen
+                    cursor.execute("""
+                        SELECT location_key, year, records FROM solar_data_header
+                        UNION ALL
+                        SELECT sd.location_key, sd.year, COUNT(*) FROM solar_data sd
+                        LEFT JOIN solar_data_header h ON h.location_key = sd.location_key AND h.year = sd.year
+                        WHERE h.location_key IS NULL
+                        GROUP BY sd.location_key, sd.year
+                        ORDER BY location_key, year DESC
+                    """)
+                else:
+                    cursor.execute("""
+                        SELECT location_key, year, COUNT(*) as data_points
+                        FROM solar_data
+                        GROUP BY location_key, year
+                        ORDER BY location_key, year DESC
+                    """)
+                solar_rows = cursor.fetchall()
                 
-                solar_profiles = []
-                for row in cursor.fetchall():
-                    location_key, year, data_points = row
-                    if data_points > 0:
-                        # Standort-Informationen abrufen
-                        try:
-                            fetcher = PVGISDataFetcher()
-                            locations = fetcher.get_available_locations()
-                            
-                            location_name = location_key
-                            for region, region_locations in locations.items():
-                                for loc in region_locations:
-                                    if loc['key'] == location_key:
-                                        location_name = loc['name']
-                                        break
-                                if location_name != location_key:
-                                    break
-                        except Exception as e:
-                            print(f"[WARN] Fehler beim Abrufen der Standort-Informationen: {e}")
-                            location_name = location_key
-                        
+                # Standort-Katalog einmal laden statt je Standort/Jahr
+                location_names = _pvgis_location_names() if solar_rows else {}
+                for location_key, year, data_points in solar_rows:
+                    if data_points and data_points > 0:
+                        location_name = location_names.get(location_key, location_key)
                         solar_profiles.append({
                             'id': f"pvgis_{location_key}_{year}",
                             'name': f"PVGIS Solar {location_name} ({year})",
@@ -807,18 +818,18 @@ def api_load_profiles(project_id):
                             'location_name': location_name
                         })
             else:
-                print("ℹ️ solar_data Tabelle nicht vorhanden, überspringe PVGIS-Daten")
-                solar_profiles = []
+                logger.debug('ℹ️ solar_data Tabelle nicht vorhanden, überspringe PVGIS-Daten')
         except Exception as e:
-            print(f"⚠️ Fehler beim Laden der PVGIS-Daten: {e}")
+            logger.warning('⚠️ Fehler beim Laden der PVGIS-Daten: %s', e)
             solar_profiles = []
         
         # Solar-Profile zu den normalen Profilen hinzufügen
         profiles.extend(solar_profiles)
         
-        print(f"📊 {len(profiles)} Lastprofile für Projekt {project_id} gefunden:")
-        for profile in profiles:
-            print(f"  - ID: {profile['id']}, Name: {profile['name']}, Datenpunkte: {profile['data_points']}, Quelle: {profile['source']}")
+        logger.debug('📊 %s Lastprofile für Projekt %s gefunden:', len(profiles), project_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            for profile in profiles:
+                logger.debug('  - ID: %s, Name: %s, Datenpunkte: %s, Quelle: %s', profile['id'], profile['name'], profile['data_points'], profile['source'])
         
         return jsonify({
             'success': True,
@@ -826,22 +837,32 @@ def api_load_profiles(project_id):
         })
         
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Lastprofile: {e}")
+        logger.error('❌ Fehler beim Laden der Lastprofile: %s', e)
         return jsonify({'success': False, 'error': str(e)})
 
 # API Routes für Kunden
 @main_bp.route('/api/customers')
 def api_customers():
-    customers = Customer.query.all()
-    return jsonify([{
-        'id': c.id,
-        'name': c.name,
-        'company': c.company,
-        'contact': c.contact,
-        'phone': c.phone,
-        'projects_count': len(c.projects),
-        'created_at': c.created_at if c.created_at else None
-    } for c in customers])
+    """Kundenliste mit Projektanzahl (limit/cursor bzw. stream=ndjson optional)"""
+    from werkzeug.http import http_date
+
+    def customer_row(row):
+        customer = dict(row)
+        # Gleiches Datumsformat wie bisher über jsonify(datetime)
+        if customer['created_at']:
+            customer['created_at'] = http_date(datetime.fromisoformat(customer['created_at']))
+        return customer
+
+    query = KeysetQuery("""
+        SELECT c.id, c.name, c.company, c.contact, c.phone,
+               COALESCE(pc.projects_count, 0) AS projects_count,
+               c.created_at
+        FROM customer c
+        LEFT JOIN (
+            SELECT customer_id, COUNT(*) AS projects_count FROM project GROUP BY customer_id
+        ) pc ON pc.customer_id = c.id
+    """)
+    return keyset_response(query, get_db, transform=customer_row)
 
 @main_bp.route('/api/customers', methods=['POST'])
 def api_create_customer():
@@ -867,7 +888,7 @@ def api_create_customer():
         
     except Exception as e:
         db.session.rollback()
-        print(f"Fehler beim Erstellen des Kunden: {str(e)}")
+        logger.error('Fehler beim Erstellen des Kunden: %s', str(e))
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/customers/<int:customer_id>')
@@ -888,9 +909,9 @@ def api_update_customer(customer_id):
         customer = Customer.query.get_or_404(customer_id)
         data = request.get_json()
         
-        print(f"=== DEBUG: Customer Update ===")
-        print(f"Customer ID: {customer_id}")
-        print(f"Empfangene Daten: {data}")
+        logger.debug('=== DEBUG: Customer Update ===')
+        logger.debug('Customer ID: %s', customer_id)
+        logger.debug('Empfangene Daten: %s', data)
         
         # Validierung
         if not data or not data.get('name'):
@@ -902,20 +923,20 @@ def api_update_customer(customer_id):
         customer.contact = str(data.get('contact', '')).strip() if data.get('contact') else None
         customer.phone = str(data.get('phone', '')).strip() if data.get('phone') else None
         
-        print(f"Verarbeitete Daten:")
-        print(f"  Name: {customer.name}")
-        print(f"  Company: {customer.company}")
-        print(f"  Contact: {customer.contact}")
-        print(f"  Phone: {customer.phone}")
+        logger.debug('Verarbeitete Daten:')
+        logger.debug('  Name: %s', customer.name)
+        logger.debug('  Company: %s', customer.company)
+        logger.debug('  Contact: %s', customer.contact)
+        logger.debug('  Phone: %s', customer.phone)
         
         db.session.commit()
-        print(f"Kunde erfolgreich aktualisiert!")
+        logger.debug('Kunde erfolgreich aktualisiert!')
         
         return jsonify({'success': True})
         
     except Exception as e:
         db.session.rollback()
-        print(f"Fehler beim Aktualisieren des Kunden: {str(e)}")
+        logger.error('Fehler beim Aktualisieren des Kunden: %s', str(e))
         # Stelle sicher, dass immer JSON zurückgegeben wird
         return jsonify({'error': f'Server-Fehler: {str(e)}'}), 500
 
@@ -948,87 +969,18 @@ def api_customer_projects(customer_id):
 
 # Dashboard-Statistiken API
 @main_bp.route('/api/dashboard/stats')
+@cached_response('project', 'customer', 'load_profile', 'spot_price')
 def api_dashboard_stats():
     try:
-        cursor = get_db().cursor()
-        
-        # Projekt-Anzahl
-        cursor.execute("SELECT COUNT(*) FROM project")
-        projects_count = cursor.fetchone()[0]
-        
-        # Kunden-Anzahl
-        cursor.execute("SELECT COUNT(*) FROM customer")
-        customers_count = cursor.fetchone()[0]
-        
-        # Load Profile Anzahl
-        cursor.execute("SELECT COUNT(*) FROM load_profile")
-        load_profiles_count = cursor.fetchone()[0]
-        
-        # Spot Price Datensätze
-        cursor.execute("SELECT COUNT(*) FROM spot_price")
-        spot_prices_count = cursor.fetchone()[0]
-        
-        # Letzte Aktivitäten (letzte 5 Projekte)
-        cursor.execute("""
-            SELECT p.name, p.location, p.created_at, c.name as customer_name
-            FROM project p 
-            LEFT JOIN customer c ON p.customer_id = c.id
-            ORDER BY p.created_at DESC 
-            LIMIT 5
-        """)
-        recent_activities = cursor.fetchall()
-        
-        # Aktive Projekte (Projekte mit Load Profiles)
-        cursor.execute("""
-            SELECT COUNT(DISTINCT p.id) 
-            FROM project p 
-            INNER JOIN load_profile lp ON p.id = lp.project_id
-        """)
-        active_projects_count = cursor.fetchone()[0]
-        
-        # Gesamte BESS-Kapazität
-        cursor.execute("SELECT SUM(bess_size) FROM project WHERE bess_size IS NOT NULL")
-        total_bess_capacity = cursor.fetchone()[0] or 0
-        
-        # Gesamte PV-Kapazität
-        cursor.execute("SELECT SUM(pv_power) FROM project WHERE pv_power IS NOT NULL")
-        total_pv_capacity = cursor.fetchone()[0] or 0
-        
-        # Durchschnittliche Stromkosten
-        cursor.execute("SELECT AVG(current_electricity_cost) FROM project WHERE current_electricity_cost IS NOT NULL")
-        avg_electricity_cost = cursor.fetchone()[0] or 0
-        
-        stats = {
-            'projects_count': projects_count,
-            'customers_count': customers_count,
-            'load_profiles_count': load_profiles_count,
-            'spot_prices_count': spot_prices_count,
-            'active_projects_count': active_projects_count,
-            'total_bess_capacity': round(total_bess_capacity, 1),
-            'total_pv_capacity': round(total_pv_capacity, 1),
-            'avg_electricity_cost': round(avg_electricity_cost, 2),
-            'recent_activities': [{
-                'name': activity[0],
-                'location': activity[1],
-                'created_at': activity[2] if activity[2] else None,
-                'customer_name': activity[3]
-            } for activity in recent_activities]
-        }
-        
-        print(f"📊 Dashboard-Statistiken geladen:")
-        print(f"   - Projekte: {projects_count}")
-        print(f"   - Kunden: {customers_count}")
-        print(f"   - Load Profiles: {load_profiles_count}")
-        print(f"   - Spot Prices: {spot_prices_count}")
-        print(f"   - Aktive Projekte: {active_projects_count}")
-        print(f"   - Gesamte BESS-Kapazität: {total_bess_capacity} kWh")
-        print(f"   - Gesamte PV-Kapazität: {total_pv_capacity} kW")
-        
+        with closing(get_db()) as conn:
+            stats = _dashboard_stats(conn.cursor())
         return jsonify(stats)
         
     except Exception as e:
-        print(f"Fehler beim Laden der Dashboard-Statistiken: {e}")
+        # 500 statt 200: cached_response speichert die Null-Antwort nicht
+        logger.error('Fehler beim Laden der Dashboard-Statistiken: %s', e)
         return jsonify({
+            'error': str(e),
             'projects_count': 0,
             'customers_count': 0,
             'load_profiles_count': 0,
@@ -1038,86 +990,74 @@ def api_dashboard_stats():
             'total_pv_capacity': 0,
             'avg_electricity_cost': 0,
             'recent_activities': []
-        })
+        }), 500
+
+
+def _dashboard_stats(cursor):
+    """Kennzahlen und letzte Aktivitäten für das Dashboard"""
+    # Kennzahlen aus dashboard_summary (per Trigger gepflegt)
+    summary = dashboard_summary(cursor.connection)
+    projects_count = summary['projects_count']
+    customers_count = summary['customers_count']
+    load_profiles_count = summary['load_profiles_count']
+    spot_prices_count = summary['spot_prices_count']
+    active_projects_count = summary['active_projects_count']
+    total_bess_capacity = summary['total_bess_capacity']
+    total_pv_capacity = summary['total_pv_capacity']
+    avg_electricity_cost = summary['avg_electricity_cost']
+    
+    # Letzte Aktivitäten (letzte 5 Projekte)
+    cursor.execute("""
+        SELECT p.name, p.location, p.created_at, c.name as customer_name
+        FROM project p 
+        LEFT JOIN customer c ON p.customer_id = c.id
+        ORDER BY p.created_at DESC 
+        LIMIT 5
+    """)
+    recent_activities = cursor.fetchall()
+    
+    stats = {
+        'projects_count': projects_count,
+        'customers_count': customers_count,
+        'load_profiles_count': load_profiles_count,
+        'spot_prices_count': spot_prices_count,
+        'active_projects_count': active_projects_count,
+        'total_bess_capacity': round(total_bess_capacity, 1),
+        'total_pv_capacity': round(total_pv_capacity, 1),
+        'avg_electricity_cost': round(avg_electricity_cost, 2),
+        'recent_activities': [{
+            'name': activity[0],
+            'location': activity[1],
+            'created_at': activity[2] if activity[2] else None,
+            'customer_name': activity[3]
+        } for activity in recent_activities]
+    }
+    
+    logger.debug('📊 Dashboard-Statistiken geladen:')
+    logger.debug('   - Projekte: %s', projects_count)
+    logger.debug('   - Kunden: %s', customers_count)
+    logger.debug('   - Load Profiles: %s', load_profiles_count)
+    logger.debug('   - Spot Prices: %s', spot_prices_count)
+    logger.debug('   - Aktive Projekte: %s', active_projects_count)
+    logger.debug('   - Gesamte BESS-Kapazität: %s kWh', total_bess_capacity)
+    logger.debug('   - Gesamte PV-Kapazität: %s kW', total_pv_capacity)
+    
+    return stats
 
 # Neue API für Chart-Daten
 @main_bp.route('/api/dashboard/charts')
+@cached_response('project', per_day=True)
 def api_dashboard_charts():
     """API für Dashboard-Chart-Daten"""
     try:
         cursor = get_db().cursor()
         
-        # Projekt-Wachstum (letzte 12 Monate)
-        cursor.execute("""
-            SELECT 
-                strftime('%Y-%m', created_at) as month,
-                COUNT(*) as count
-            FROM project 
-            WHERE created_at >= date('now', '-12 months')
-            GROUP BY strftime('%Y-%m', created_at)
-            ORDER BY month
-        """)
-        project_growth = cursor.fetchall()
-        
-        # Regionale Verteilung
-        cursor.execute("""
-            SELECT 
-                CASE 
-                    WHEN location LIKE '%Oberösterreich%' OR location LIKE '%OÖ%' THEN 'Oberösterreich'
-                    WHEN location LIKE '%Niederösterreich%' OR location LIKE '%NÖ%' THEN 'Niederösterreich'
-                    WHEN location LIKE '%Wien%' OR location LIKE '%W%' THEN 'Wien'
-                    WHEN location LIKE '%Steiermark%' OR location LIKE '%S%' THEN 'Steiermark'
-                    WHEN location LIKE '%Tirol%' OR location LIKE '%T%' THEN 'Tirol'
-                    WHEN location LIKE '%Vorarlberg%' OR location LIKE '%V%' THEN 'Vorarlberg'
-                    WHEN location LIKE '%Kärnten%' OR location LIKE '%K%' THEN 'Kärnten'
-                    WHEN location LIKE '%Salzburg%' OR location LIKE '%S%' THEN 'Salzburg'
-                    WHEN location LIKE '%Burgenland%' OR location LIKE '%B%' THEN 'Burgenland'
-                    ELSE 'Sonstige'
-                END as region,
-                COUNT(*) as count
-            FROM project 
-            WHERE location IS NOT NULL
-            GROUP BY region
-            ORDER BY count DESC
-        """)
-        regional_distribution = cursor.fetchall()
-        
-        # Kapazitäts-Verteilung
-        cursor.execute("""
-            SELECT 
-                SUM(bess_size) as total_bess,
-                SUM(pv_power) as total_pv
-            FROM project 
-            WHERE bess_size IS NOT NULL OR pv_power IS NOT NULL
-        """)
-        capacity_data = cursor.fetchone()
-        
-        # Stromkosten-Trend (letzte 4 Quartale)
-        cursor.execute("""
-            SELECT 
-                strftime('%Y-Q%m/3', created_at) as quarter,
-                AVG(current_electricity_cost) as avg_cost
-            FROM project 
-            WHERE current_electricity_cost IS NOT NULL 
-            AND created_at >= date('now', '-12 months')
-            GROUP BY strftime('%Y-Q%m/3', created_at)
-            ORDER BY quarter
-        """)
-        electricity_cost_trend = cursor.fetchall()
-        
-        return jsonify({
-            'success': True,
-            'project_growth': [{'month': row[0], 'count': row[1]} for row in project_growth],
-            'regional_distribution': [{'region': row[0], 'count': row[1]} for row in regional_distribution],
-            'capacity_distribution': {
-                'bess': capacity_data[0] or 0,
-                'pv': capacity_data[1] or 0
-            },
-            'electricity_cost_trend': [{'quarter': row[0], 'avg_cost': row[1]} for row in electricity_cost_trend]
-        })
+        # Vorberechnet in dashboard_summary, neu bei Projektänderungen und Tageswechsel
+        charts = dashboard_charts(cursor.connection)
+        return jsonify({'success': True, **charts})
         
     except Exception as e:
-        print(f"Fehler beim Laden der Chart-Daten: {e}")
+        logger.error('Fehler beim Laden der Chart-Daten: %s', e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # API für Performance-Metriken
@@ -1174,7 +1114,7 @@ def api_dashboard_performance():
         })
         
     except Exception as e:
-        print(f"Fehler beim Laden der Performance-Metriken: {e}")
+        logger.error('Fehler beim Laden der Performance-Metriken: %s', e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # API für Real-time Updates
@@ -1212,7 +1152,7 @@ def api_dashboard_realtime():
         })
         
     except Exception as e:
-        print(f"Fehler beim Laden der Real-time-Daten: {e}")
+        logger.error('Fehler beim Laden der Real-time-Daten: %s', e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # API für Projekt-Standorte (für interaktive Karte)
@@ -1258,7 +1198,7 @@ def api_dashboard_locations():
         })
         
     except Exception as e:
-        print(f"Fehler beim Laden der Projekt-Standorte: {e}")
+        logger.error('Fehler beim Laden der Projekt-Standorte: %s', e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # Auto-Save API Routes
@@ -1299,7 +1239,7 @@ def api_auto_save_project():
         session['auto_save_data'] = project_data
         session['auto_save_timestamp'] = datetime.now().isoformat()
         
-        print(f"💾 Auto-Save für neues Projekt: {project_data['name']}")
+        logger.debug('💾 Auto-Save für neues Projekt: %s', project_data['name'])
         
         return jsonify({
             'success': True,
@@ -1308,7 +1248,7 @@ def api_auto_save_project():
         })
         
     except Exception as e:
-        print(f"❌ Auto-Save Fehler: {e}")
+        logger.error('❌ Auto-Save Fehler: %s', e)
         return jsonify({'success': False, 'error': str(e)})
 
 @main_bp.route('/api/projects/<int:project_id>/auto-save', methods=['PUT'])
@@ -1360,7 +1300,7 @@ def api_auto_save_edit_project(project_id):
         }
         session[f'auto_save_timestamp_{project_id}'] = datetime.now().isoformat()
         
-        print(f"💾 Auto-Save für Projekt {project_id}: {project.name}")
+        logger.debug('💾 Auto-Save für Projekt %s: %s', project_id, project.name)
         
         return jsonify({
             'success': True,
@@ -1369,7 +1309,7 @@ def api_auto_save_edit_project(project_id):
         })
         
     except Exception as e:
-        print(f"❌ Auto-Save Fehler für Projekt {project_id}: {e}")
+        logger.error('❌ Auto-Save Fehler für Projekt %s: %s', project_id, e)
         return jsonify({'success': False, 'error': str(e)})
 
 @main_bp.route('/api/projects/auto-save/restore', methods=['GET'])
@@ -1509,7 +1449,7 @@ def api_reference_prices():
         return jsonify(prices)
         
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Referenzpreise: {e}")
+        logger.error('❌ Fehler beim Laden der Referenzpreise: %s', e)
         return jsonify({'error': str(e)}), 400
 @main_bp.route('/api/reference-prices', methods=['POST'])
 def api_create_reference_price():
@@ -1519,13 +1459,13 @@ def api_create_reference_price():
         cursor = conn.cursor()
         
         # Debug-Ausgabe
-        print(f"🆕 Neuer Referenzpreis:")
-        print(f"   Name: {data.get('name')}")
-        print(f"   Type: {data.get('price_type')}")
-        print(f"   Price: {data.get('price_eur_mwh')}")
-        print(f"   Region: {data.get('region')}")
-        print(f"   Valid from: {data.get('valid_from')}")
-        print(f"   Valid to: {data.get('valid_to')}")
+        logger.debug('🆕 Neuer Referenzpreis:')
+        logger.debug('   Name: %s', data.get('name'))
+        logger.debug('   Type: %s', data.get('price_type'))
+        logger.debug('   Price: %s', data.get('price_eur_mwh'))
+        logger.debug('   Region: %s', data.get('region'))
+        logger.debug('   Valid from: %s', data.get('valid_from'))
+        logger.debug('   Valid to: %s', data.get('valid_to'))
         
         cursor.execute("""
             INSERT INTO reference_price 
@@ -1544,11 +1484,11 @@ def api_create_reference_price():
         conn.commit()
         price_id = cursor.lastrowid
         
-        print(f"✅ Neuer Referenzpreis mit ID {price_id} erstellt")
+        logger.debug('✅ Neuer Referenzpreis mit ID %s erstellt', price_id)
         return jsonify({'success': True, 'id': price_id}), 201
         
     except Exception as e:
-        print(f"❌ Fehler beim Erstellen: {e}")
+        logger.error('❌ Fehler beim Erstellen: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/reference-prices/<int:price_id>')
@@ -1587,13 +1527,13 @@ def api_update_reference_price(price_id):
         cursor = conn.cursor()
         
         # Debug-Ausgabe
-        print(f"🔄 Update Referenzpreis ID {price_id}:")
-        print(f"   Name: {data.get('name')}")
-        print(f"   Type: {data.get('price_type')}")
-        print(f"   Price: {data.get('price_eur_mwh')}")
-        print(f"   Region: {data.get('region')}")
-        print(f"   Valid from: {data.get('valid_from')}")
-        print(f"   Valid to: {data.get('valid_to')}")
+        logger.debug('🔄 Update Referenzpreis ID %s:', price_id)
+        logger.debug('   Name: %s', data.get('name'))
+        logger.debug('   Type: %s', data.get('price_type'))
+        logger.debug('   Price: %s', data.get('price_eur_mwh'))
+        logger.debug('   Region: %s', data.get('region'))
+        logger.debug('   Valid from: %s', data.get('valid_from'))
+        logger.debug('   Valid to: %s', data.get('valid_to'))
         
         cursor.execute("""
             UPDATE reference_price 
@@ -1613,14 +1553,14 @@ def api_update_reference_price(price_id):
         conn.commit()
         
         if cursor.rowcount > 0:
-            print(f"✅ Referenzpreis ID {price_id} erfolgreich aktualisiert")
+            logger.debug('✅ Referenzpreis ID %s erfolgreich aktualisiert', price_id)
             return jsonify({'success': True})
         else:
-            print(f"❌ Referenzpreis ID {price_id} nicht gefunden")
+            logger.error('❌ Referenzpreis ID %s nicht gefunden', price_id)
             return jsonify({'error': 'Referenzpreis nicht gefunden'}), 404
             
     except Exception as e:
-        print(f"❌ Fehler beim Update: {e}")
+        logger.error('❌ Fehler beim Update: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/reference-prices/<int:price_id>', methods=['DELETE'])
@@ -1634,14 +1574,14 @@ def api_delete_reference_price(price_id):
         conn.commit()
         
         if cursor.rowcount > 0:
-            print(f"✅ Referenzpreis ID {price_id} erfolgreich gelöscht")
+            logger.debug('✅ Referenzpreis ID %s erfolgreich gelöscht', price_id)
             return jsonify({'success': True})
         else:
-            print(f"❌ Referenzpreis ID {price_id} nicht gefunden")
+            logger.error('❌ Referenzpreis ID %s nicht gefunden', price_id)
             return jsonify({'error': 'Referenzpreis nicht gefunden'}), 404
             
     except Exception as e:
-        print(f"❌ Fehler beim Löschen: {e}")
+        logger.error('❌ Fehler beim Löschen: %s', e)
         return jsonify({'error': str(e)}), 400
 
 # API Routes für Spot-Preise
@@ -1666,7 +1606,7 @@ def api_spot_prices():
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=7)
         except ValueError as e:
-            print(f"❌ Datum-Parsing Fehler: {e}")
+            logger.error('❌ Datum-Parsing Fehler: %s', e)
             return jsonify({
                 'success': False,
                 'error': f'Ungültiges Datumsformat: {str(e)}',
@@ -1685,13 +1625,13 @@ def api_spot_prices():
 
         now = datetime.now()
         if effective_end > now:
-            print(f"ℹ️ Enddatum ({effective_end}) liegt in der Zukunft – begrenze auf {now}")
+            logger.debug('ℹ️ Enddatum (%s) liegt in der Zukunft – begrenze auf %s', effective_end, now)
             effective_end = now
         if start_date > effective_end:
             start_date = effective_end - timedelta(days=7)
-            print(f"ℹ️ Startdatum angepasst auf {start_date}, da es größer als Enddatum war")
+            logger.debug('ℹ️ Startdatum angepasst auf %s, da es größer als Enddatum war', start_date)
         
-        print(f"🔍 Lade Spot-Preise für {start_date} bis {effective_end} (Quelle: {data_source.upper()})")
+        logger.debug('🔍 Lade Spot-Preise für %s bis %s (Quelle: %s)', start_date, effective_end, data_source.upper())
         
         cursor = get_db().cursor()
         
@@ -1704,8 +1644,45 @@ def api_spot_prices():
             source_filters = ['aWATTAR%']
         # combined -> keine Filter, alle Daten
         
+        def _categorize_source(source_value: str) -> str:
+            source_lower = (source_value or '').lower()
+            if 'entso' in source_lower:
+                return 'entsoe'
+            if 'awattar' in source_lower:
+                return 'awattar'
+            if 'apg' in source_lower:
+                return 'apg'
+            if 'demo' in source_lower:
+                return 'demo'
+            return 'other' if source_value else 'unknown'
+
+        def _label_for_category(category: str) -> str:
+            return {
+                'entsoe': 'ENTSO-E',
+                'apg': 'APG',
+                'awattar': 'aWATTar',
+                'demo': 'Demo',
+                'other': 'Weitere Quelle',
+                'unknown': 'Unbekannt'
+            }.get(category, 'Weitere Quelle')
+
+        def _price_entry(row) -> dict:
+            source_value = row[2] or ''
+            if source_value.lower().startswith('awattar'):
+                source_value = 'aWATTAR (Live API)'
+            category = _categorize_source(source_value)
+            return {
+                'timestamp': row[0],
+                'price': float(row[1]),
+                'source': source_value,
+                'region': row[3] or ('AT' if source_value.startswith('aWATTAR') else None),
+                'market': row[4] or ('day_ahead' if source_value.startswith('aWATTAR') else None),
+                'source_category': category,
+                'source_label': _label_for_category(category)
+            }
+        
         query = """
-            SELECT timestamp, price_eur_mwh, source, region, price_type
+            SELECT timestamp, price_eur_mwh, source, region, price_type, id
             FROM spot_price
             WHERE timestamp >= ? AND timestamp < ?
         """
@@ -1715,18 +1692,35 @@ def api_spot_prices():
             query += " AND (" + " OR ".join(["source LIKE ?"] * len(source_filters)) + ")"
             params.extend(source_filters)
         
+        # Optional: Keyset-Pagination (limit/cursor) oder NDJSON-Streaming aller Preise
+        try:
+            page = page_request(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        price_query = KeysetQuery(query, params, key_columns=('timestamp', 'id'))
+        if page.stream:
+            return keyset_response(price_query, get_db, transform=_price_entry, params=data)
+        
+        next_cursor = None
         query += " ORDER BY timestamp ASC"
-        cursor.execute(query, params)
-        db_data = cursor.fetchall()
+        
+        def _load_rows():
+            nonlocal next_cursor
+            if page.paginated:
+                rows, next_cursor = price_query.page(cursor.connection, page.page_size, page.cursor)
+                return rows
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        
+        db_data = _load_rows()
         
         if (not db_data or len(db_data) == 0) and data_source == 'entsoe':
-            print("ℹ️ Keine ENTSO-E Datensätze gefunden – starte Live-Abruf...")
+            logger.debug('ℹ️ Keine ENTSO-E Datensätze gefunden – starte Live-Abruf...')
             try:
                 fetched = fetch_and_store_entsoe_prices(start_date, effective_end, country_code, price_type)
                 if fetched > 0:
-                    cursor.execute(query, params)
-                    db_data = cursor.fetchall()
-                    print(f"✅ {fetched} ENTSO-E Datensätze gespeichert")
+                    db_data = _load_rows()
+                    logger.debug('✅ %s ENTSO-E Datensätze gespeichert', fetched)
             except ValueError as ve:
                 error_msg = str(ve)
                 if 'Token' in error_msg or 'token' in error_msg:
@@ -1741,7 +1735,7 @@ def api_spot_prices():
                 }), 400
             except Exception as entsoe_error:
                 error_str = str(entsoe_error)
-                print(f"❌ ENTSO-E Abruf fehlgeschlagen: {entsoe_error}")
+                logger.error('❌ ENTSO-E Abruf fehlgeschlagen: %s', entsoe_error)
                 
                 # Spezifischere Fehlermeldungen
                 if '401' in error_str or 'Unauthorized' in error_str:
@@ -1762,7 +1756,7 @@ def api_spot_prices():
                     'message': message
                 }), 500
         elif (not db_data or len(db_data) == 0) and data_source == 'awattar':
-            print("ℹ️ Keine aWATTAR Datensätze in der Datenbank – starte Live-Abruf...")
+            logger.debug('ℹ️ Keine aWATTAR Datensätze in der Datenbank – starte Live-Abruf...')
             try:
                 from awattar_data_fetcher import AWattarDataFetcher
                 aw_fetcher = AWattarDataFetcher()
@@ -1771,10 +1765,9 @@ def api_spot_prices():
                     end_date=effective_end
                 )
                 if fetch_result.get('success'):
-                    cursor.execute(query, params)
-                    db_data = cursor.fetchall()
+                    db_data = _load_rows()
                     saved = fetch_result['save_result'].get('saved_count', 0)
-                    print(f"✅ {saved} aWATTAR Datensätze gespeichert")
+                    logger.debug('✅ %s aWATTAR Datensätze gespeichert', saved)
                 else:
                     return jsonify({
                         'success': False,
@@ -1783,7 +1776,7 @@ def api_spot_prices():
                         'message': 'aWATTAR Daten konnten nicht geladen werden.'
                     }), 500
             except Exception as aw_error:
-                print(f"❌ aWATTAR Abruf fehlgeschlagen: {aw_error}")
+                logger.error('❌ aWATTAR Abruf fehlgeschlagen: %s', aw_error)
                 return jsonify({
                     'success': False,
                     'data_source': 'awattar',
@@ -1814,54 +1807,16 @@ def api_spot_prices():
                     'message': 'Keine Spot-Preise gefunden.'
                 }), 404
         
-        def _categorize_source(source_value: str) -> str:
-            source_lower = (source_value or '').lower()
-            if 'entso' in source_lower:
-                return 'entsoe'
-            if 'awattar' in source_lower:
-                return 'awattar'
-            if 'apg' in source_lower:
-                return 'apg'
-            if 'demo' in source_lower:
-                return 'demo'
-            return 'other' if source_value else 'unknown'
-
-        def _label_for_category(category: str) -> str:
-            return {
-                'entsoe': 'ENTSO-E',
-                'apg': 'APG',
-                'awattar': 'aWATTar',
-                'demo': 'Demo',
-                'other': 'Weitere Quelle',
-                'unknown': 'Unbekannt'
-            }.get(category, 'Weitere Quelle')
-
         unique_entries = {}
         for row in db_data:
-            source_value = row[2] or ''
-            if source_value.lower().startswith('awattar'):
-                source_value = 'aWATTAR (Live API)'
-            region_value = row[3] or ('AT' if source_value.startswith('aWATTAR') else None)
-            market_value = row[4] or ('day_ahead' if source_value.startswith('aWATTAR') else None)
-
-            category = _categorize_source(source_value)
-            source_label = _label_for_category(category)
-
+            entry = _price_entry(row)
             key = (
-                row[0],
-                source_value or '',
-                region_value or '',
-                market_value or ''
+                entry['timestamp'],
+                entry['source'] or '',
+                entry['region'] or '',
+                entry['market'] or ''
             )
-            unique_entries[key] = {
-                'timestamp': row[0],
-                'price': float(row[1]),
-                'source': source_value,
-                'region': region_value,
-                'market': market_value,
-                'source_category': category,
-                'source_label': source_label
-            }
+            unique_entries[key] = entry
 
         prices = [
             unique_entries[key]
@@ -1883,7 +1838,7 @@ def api_spot_prices():
         source_summary.sort(key=lambda item: item['label'])
         
         sources = {entry['source'] or '' for entry in prices}
-        print(f"🔍 Gefundene Datenquellen: {sources}")
+        logger.debug('🔍 Gefundene Datenquellen: %s', sources)
         
         if data_source == 'entsoe':
             source_meta = {
@@ -1955,7 +1910,7 @@ def api_spot_prices():
             status_details = f" ({total_points} Werte)" if total_points else ''
             status_info = {'tone': 'success', 'text': f'✅ APG-Daten aus Datenbank{status_details}'}
         
-        return jsonify({
+        response_data = {
             'success': True,
             'data': prices,
             'data_source': data_source,
@@ -1963,10 +1918,14 @@ def api_spot_prices():
             'status_info': status_info,
             'message': f'{len(prices)} Spot-Preise geladen',
             'source_summary': source_summary
-        })
+        }
+        if page.paginated:
+            response_data['next_cursor'] = next_cursor
+            response_data['limit'] = page.page_size
+        return jsonify(response_data)
         
     except Exception as e:
-        print(f"❌ Fehler in Spot-Preis-API: {e}")
+        logger.error('❌ Fehler in Spot-Preis-API: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/spot-prices/import', methods=['POST'])
@@ -1976,10 +1935,10 @@ def api_import_spot_prices():
     mode = request.form.get('mode', 'entsoe')
     
     if mode == 'entsoe':
-        area = request.form.get('area', ENTSOE_DEFAULT_AREA)
-        region = request.form.get('region', ENTSOE_DEFAULT_REGION)
-        source_label = request.form.get('source', ENTSOE_DEFAULT_SOURCE)
-        price_type = request.form.get('price_type', ENTSOE_DEFAULT_PRICE_TYPE)
+        area = request.form.get('area', entsoe_import.DEFAULT_AREA)
+        region = request.form.get('region', entsoe_import.DEFAULT_REGION)
+        source_label = request.form.get('source', entsoe_import.DEFAULT_SOURCE)
+        price_type = request.form.get('price_type', entsoe_import.DEFAULT_PRICE_TYPE)
         pattern = request.form.get('pattern', 'GUI_ENERGY_PRICES_*.csv')
         base_dir = Path(request.form.get('base_dir', 'TP_export'))
         
@@ -1991,7 +1950,7 @@ def api_import_spot_prices():
             }), 400
         
         try:
-            price_series = entsoe_combine_series(paths, area=area)
+            price_series = entsoe_import.combine_series(paths, area=area)
             if price_series.empty:
                 return jsonify({
                     'success': False,
@@ -2049,71 +2008,40 @@ def api_import_spot_prices():
 
 def save_apg_data_to_db(apg_data):
     """Speichert APG-Daten in der Datenbank"""
-    try:
+    from .price_ingestion import upsert_spot_prices
+    
+    records = [{
+        'timestamp': price_entry['timestamp'],
+        'price_eur_mwh': price_entry['price'],
+        'source': price_entry.get('source', 'ENTSO-E (Live)'),
+        'region': price_entry.get('region', 'AT'),
+        'price_type': price_entry.get('market', 'Day-Ahead')
+    } for price_entry in apg_data]
+    
+    # Commit mit Retry-Logik
+    max_retries = 3
+    for attempt in range(max_retries):
         conn = get_db()
-        cursor = conn.cursor()
-        
-        # Prüfe ob Tabelle existiert
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS spot_price (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                price_eur_mwh REAL NOT NULL,
-                source TEXT,
-                region TEXT,
-                price_type TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Lösche alte Daten für den gleichen Zeitraum (optional)
-        # cursor.execute("DELETE FROM spot_price WHERE source = 'ENTSO-E (Live)'")
-        
-        # Füge neue Daten hinzu
-        for price_entry in apg_data:
-            timestamp = price_entry['timestamp']
-            price = price_entry['price']
-            source = price_entry.get('source', 'ENTSO-E (Live)')
-            market = price_entry.get('market', 'Day-Ahead')
-            region = price_entry.get('region', 'AT')
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO spot_price 
-                (timestamp, price_eur_mwh, source, region, price_type)
-                VALUES (?, ?, ?, ?, ?)
-            """, (timestamp, price, source, region, market))
-        
-        # Commit mit Retry-Logik
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                conn.commit()
-                print(f"✅ {len(apg_data)} APG-Daten erfolgreich in Datenbank gespeichert")
-                break
-            except Exception as e:
-                if "database is locked" in str(e) and attempt < max_retries - 1:
-                    print(f"⚠️ Datenbank gesperrt, Versuch {attempt + 1}/{max_retries}...")
-                    time.sleep(0.5)  # Kurze Pause
-                    continue
-                else:
-                    print(f"❌ Fehler beim Speichern der APG-Daten: {e}")
-                    break
-                    
-    except Exception as e:
-        print(f"❌ Fehler beim Speichern der APG-Daten: {e}")
-        # Fallback: Versuche Verbindung neu aufzubauen
         try:
+            result = upsert_spot_prices(conn, records)
+            logger.debug('✅ APG-Daten gespeichert: %s neu, %s aktualisiert, %s unverändert', result['inserted'], result['updated'], result['unchanged'])
+            return result
+        except Exception as e:
+            conn.rollback()
+            if "database is locked" in str(e) and attempt < max_retries - 1:
+                logger.warning('⚠️ Datenbank gesperrt, Versuch %s/%s...', attempt + 1, max_retries)
+                time.sleep(0.5)  # Kurze Pause
+                continue
+            logger.error('❌ Fehler beim Speichern der APG-Daten: %s', e)
+            return None
+        finally:
             conn.close()
-            conn = get_db()
-            conn.commit()
-        except:
-            pass
 
 @main_bp.route('/api/spot-prices/refresh', methods=['POST'])
 def api_refresh_spot_prices():
     """Manueller Refresh der APG-Daten - Versuche aWattar API"""
     try:
-        print("[INFO] Manueller APG-Daten-Refresh gestartet...")
+        logger.debug('[INFO] Manueller APG-Daten-Refresh gestartet...')
         
         # Versuche zuerst aWattar API (funktioniert besser)
         from awattar_data_fetcher import AWattarDataFetcher
@@ -2162,7 +2090,7 @@ def api_refresh_spot_prices():
             })
         
         # Letzter Fallback: Realistische Demo-Daten
-        print("[WARN] Keine echten APIs verfuegbar, verwende realistische Demo-Daten")
+        logger.warning('[WARN] Keine echten APIs verfuegbar, verwende realistische Demo-Daten')
         demo_data = generate_realistic_2024_prices()
         save_demo_data_to_db(demo_data)
         
@@ -2175,7 +2103,7 @@ def api_refresh_spot_prices():
         })
             
     except Exception as e:
-        print(f"[ERROR] Fehler beim APG-Refresh: {e}")
+        logger.error('[ERROR] Fehler beim APG-Refresh: %s', e)
         return jsonify({
             'success': False,
             'error': f'Fehler beim Laden der Daten: {str(e)}'
@@ -2183,89 +2111,58 @@ def api_refresh_spot_prices():
 
 def save_awattar_data_to_db(spot_prices):
     """Speichert aWattar-Daten in der Datenbank"""
+    from .price_ingestion import upsert_spot_prices
+    
+    if not spot_prices:
+        logger.debug('ℹ️ Keine aWATTAR Daten zum Speichern erhalten')
+        return
+    
+    region_default = spot_prices[0].get('region') or 'AT'
+    market_default = spot_prices[0].get('price_type') or 'day_ahead'
+    
+    records = []
+    for price in spot_prices:
+        source = price.get('source') or 'aWATTAR (Live API)'
+        records.append({
+            'timestamp': price.get('timestamp'),
+            'price_eur_mwh': price.get('price_eur_mwh'),
+            'source': source if source.startswith('aWATTAR') else 'aWATTAR (Live API)',
+            'region': price.get('region') or region_default,
+            'price_type': price.get('price_type') or market_default
+        })
+    
+    conn = get_db()
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-
-        if not spot_prices:
-            print("ℹ️ Keine aWATTAR Daten zum Speichern erhalten")
-            return
-
-        timestamps = [
-            price.get('timestamp')
-            for price in spot_prices
-            if isinstance(price.get('timestamp'), datetime)
-        ]
-
-        region_default = (spot_prices[0].get('region') or 'AT') if spot_prices else 'AT'
-        market_default = (spot_prices[0].get('price_type') or 'day_ahead') if spot_prices else 'day_ahead'
-
-        if timestamps:
-            start_ts = min(timestamps)
-            end_ts = max(timestamps)
-
-            cursor.execute("""
-                DELETE FROM spot_price
-                WHERE source LIKE 'aWATTAR%'
-                  AND timestamp BETWEEN ? AND ?
-                  AND COALESCE(region, ?) = ?
-                  AND COALESCE(price_type, ?) = ?
-            """, (start_ts, end_ts, region_default, region_default, market_default, market_default))
-            print(f"🧹 Alte aWATTAR Datensätze zwischen {start_ts} und {end_ts} entfernt")
-        
-        for price in spot_prices:
-            timestamp = price.get('timestamp')
-            value = price.get('price_eur_mwh')
-            source = price.get('source') or 'aWATTAR (Live API)'
-            region_value = price.get('region') or region_default
-            market_value = price.get('price_type') or market_default
-
-            if not timestamp or value is None:
-                print(f"⚠️ Überspringe ungültigen aWATTAR Datensatz: {price}")
-                continue
-
-            cursor.execute("""
-                INSERT INTO spot_price 
-                (timestamp, price_eur_mwh, source, region, price_type, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                timestamp,
-                value,
-                source if source.startswith('aWATTAR') else 'aWATTAR (Live API)',
-                region_value,
-                market_value,
-                datetime.utcnow()
-            ))
-        
-        conn.commit()
-        print(f"✅ {len(spot_prices)} aWattar-Preise in DB gespeichert")
+        result = upsert_spot_prices(conn, records)
+        if result['skipped']:
+            logger.warning('⚠️ %s ungültige aWATTAR Datensätze übersprungen', result['skipped'])
+        logger.debug('✅ aWattar-Preise gespeichert: %s neu, %s aktualisiert, %s unverändert', result['inserted'], result['updated'], result['unchanged'])
+        return result
         
     except Exception as e:
-        print(f"❌ Fehler beim Speichern der aWattar-Daten: {e}")
+        logger.error('❌ Fehler beim Speichern der aWattar-Daten: %s', e)
+    finally:
+        conn.close()
 
 def save_demo_data_to_db(demo_data):
     """Speichert Demo-Daten in der Datenbank"""
+    from .price_ingestion import upsert_spot_prices
+    
+    # Demo-Preise ohne Region und Preisart (Schlüssel wie bisher mit NULL)
+    records = [{
+        'timestamp': price['timestamp'],
+        'price_eur_mwh': price['price_eur_mwh'],
+        'source': price['source']
+    } for price in demo_data]
+    
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        for price in demo_data:
-            cursor.execute("""
-                INSERT OR REPLACE INTO spot_price 
-                (timestamp, price_eur_mwh, source, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (
-                price['timestamp'],
-                price['price_eur_mwh'],
-                price['source'],
-                datetime.now()
-            ))
-        
-        conn.commit()
-        print(f"✅ {len(demo_data)} Demo-Preise in DB gespeichert")
+        with closing(get_db()) as conn:
+            result = upsert_spot_prices(conn, records, region=None, price_type=None)
+        logger.debug('✅ %s Demo-Preise in DB gespeichert', len(demo_data) - result['skipped'])
+        return result
         
     except Exception as e:
-        print(f"❌ Fehler beim Speichern der Demo-Daten: {e}")
+        logger.error('❌ Fehler beim Speichern der Demo-Daten: %s', e)
 
 def generate_realistic_2024_prices():
     """Generiert realistische Demo-Preise basierend auf 2024-Mustern"""
@@ -2363,11 +2260,12 @@ def api_load_profile_data_range(load_profile_id):
 def api_load_profile_data_range_string(profile_id):
     """API-Endpoint für Lastprofil-Daten mit String-IDs (new_2, old_3, etc.)"""
     try:
-        print(f"📊 Lade Daten für Lastprofil: {profile_id}")
+        logger.debug('📊 Lade Daten für Lastprofil: %s', profile_id)
         
         data = request.get_json()
         start_date = datetime.fromisoformat(data['start_date'])
         end_date = datetime.fromisoformat(data['end_date'])
+        max_points, sampling_method = downsampling_params(data)
         
         # Präfix entfernen und echte ID extrahieren
         if profile_id.startswith('pvgis_'):
@@ -2387,7 +2285,9 @@ def api_load_profile_data_range_string(profile_id):
                     ORDER BY datetime
                 """, (location_key, year, start_date, end_date))
                 
-                data_points = cursor.fetchall()
+                data_points, downsampling = downsample_records(
+                    cursor.fetchall(), [1], max_points, sampling_method, x_key=0
+                )
                 
                 if data_points:
                     formatted_data = []
@@ -2398,13 +2298,16 @@ def api_load_profile_data_range_string(profile_id):
                             'temperature': float(row[2]) if row[2] is not None else 0.0
                         })
                     
-                    return jsonify({
+                    response_data = {
                         'success': True,
                         'data': formatted_data,
                         'source': f'PVGIS Solar {location_key} ({year})',
                         'count': len(formatted_data),
                         'data_type': 'solar'
-                    })
+                    }
+                    if downsampling:
+                        response_data['downsampling'] = downsampling
+                    return series_response(response_data, ['value', 'temperature'], fmt=negotiate_format(data))
                 else:
                     return jsonify({'error': f'Keine Solar-Daten für {location_key} ({year}) verfügbar'}), 404
             else:
@@ -2457,7 +2360,7 @@ def api_load_profile_data_range_string(profile_id):
         data_points = cursor.fetchall()
         
         if not data_points:
-            print(f"⚠️ Keine Daten für Zeitraum {start_date} bis {end_date}")
+            logger.warning('⚠️ Keine Daten für Zeitraum %s bis %s', start_date, end_date)
             # Fallback: Dummy-Daten generieren
             dummy_data = []
             current_time = start_date
@@ -2475,7 +2378,8 @@ def api_load_profile_data_range_string(profile_id):
                 'count': len(dummy_data)
             })
         
-        # Echte Daten formatieren
+        # Echte Daten formatieren (optional auf max_points reduziert)
+        data_points, downsampling = downsample_records(data_points, [1], max_points, sampling_method, x_key=0)
         formatted_data = []
         for row in data_points:
             formatted_data.append({
@@ -2483,17 +2387,20 @@ def api_load_profile_data_range_string(profile_id):
                 'value': float(row[1]) if row[1] is not None else 0.0
             })
         
-        print(f"✅ {len(formatted_data)} Datenpunkte für Lastprofil {profile_id} geladen")
+        logger.debug('✅ %s Datenpunkte für Lastprofil %s geladen', len(formatted_data), profile_id)
         
-        return jsonify({
+        response_data = {
             'success': True,
             'data': formatted_data,
             'source': f'Echte Daten aus {table_name}',
             'count': len(formatted_data)
-        })
+        }
+        if downsampling:
+            response_data['downsampling'] = downsampling
+        return series_response(response_data, ['value'], fmt=negotiate_format(data))
         
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Lastprofil-Daten: {e}")
+        logger.error('❌ Fehler beim Laden der Lastprofil-Daten: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/load-profiles/<int:load_profile_id>')
@@ -2511,9 +2418,13 @@ def api_get_load_profile(load_profile_id):
         return jsonify({'error': str(e)}), 400
 @main_bp.route('/api/load-profiles/<string:profile_id>')
 def api_get_load_profile_string(profile_id):
-    """API-Endpoint für Lastprofile mit String-IDs (new_2, old_3, etc.)"""
+    """API-Endpoint für Lastprofile mit String-IDs (new_2, old_3, etc.)
+
+    Mit limit/cursor werden zusätzlich die Datenpunkte seitenweise unter ``values``
+    geliefert (``next_cursor`` für die Folgeseite), mit stream=ndjson alle Datenpunkte
+    """
     try:
-        print(f"🔍 Lade Lastprofil mit String-ID: {profile_id}")
+        logger.debug('🔍 Lade Lastprofil mit String-ID: %s', profile_id)
         
         # Präfix entfernen und echte ID extrahieren
         if profile_id.startswith('new_'):
@@ -2584,11 +2495,21 @@ def api_get_load_profile_string(profile_id):
             'table_source': table_name
         }
         
-        print(f"✅ Lastprofil geladen: {profile['name']} ({data_points} Datenpunkte)")
+        logger.debug('✅ Lastprofil geladen: %s (%s Datenpunkte)', profile['name'], data_points)
+        page = page_request()
+        if page.paginated or page.stream:
+            value_column = 'value' if data_table == 'load_profile_data' else 'power_kw'
+            values = KeysetQuery(f"""
+                SELECT rowid AS row_id, timestamp, {value_column} AS value
+                FROM {data_table}
+                WHERE load_profile_id = ?
+            """, (real_id,), key_columns=('timestamp', 'row_id'))
+            return keyset_response(values, get_db, envelope=profile, items_key='values',
+                                   transform=lambda row: {'timestamp': row['timestamp'], 'value': row['value']})
         return jsonify(profile)
         
     except Exception as e:
-        print(f"❌ Fehler beim Laden des Lastprofils: {e}")
+        logger.error('❌ Fehler beim Laden des Lastprofils: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/test-customer', methods=['POST'])
@@ -2614,10 +2535,10 @@ def api_economic_analysis(project_id):
         enhanced_analysis = request.args.get('enhanced', 'true').lower() == 'true'
         use_case = request.args.get('use_case', 'hybrid')
         
-        print(f"🔍 Starte {analysis_type} Analyse für Projekt {project_id}")
-        print(f"📊 Intelligente Analyse: {intelligent_analysis}")
-        print(f"🚀 Erweiterte Analyse: {enhanced_analysis}")
-        print(f"🎯 Use Case: {use_case}")
+        logger.debug('🔍 Starte %s Analyse für Projekt %s', analysis_type, project_id)
+        logger.debug('📊 Intelligente Analyse: %s', intelligent_analysis)
+        logger.debug('🚀 Erweiterte Analyse: %s', enhanced_analysis)
+        logger.debug('🎯 Use Case: %s', use_case)
         
         project = Project.query.get(project_id)
         if not project:
@@ -2666,14 +2587,14 @@ def api_economic_analysis(project_id):
         corrected_payback_years = total_investment / total_annual_benefit if total_annual_benefit > 0 else 0
         corrected_roi_percent = (total_annual_benefit * 20 - total_investment) / total_investment * 100 if total_investment > 0 else 0
         
-        print(f"🔍 Amortisationszeit-Berechnung:")
-        print(f"   - Total Investment: {total_investment:,.0f} €")
-        print(f"   - Base Annual Savings: {simulation_results['annual_savings']:,.0f} €")
-        print(f"   - Intelligent Revenues: {intelligent_revenues['total_revenue']:,.0f} €")
-        print(f"   - Total Annual Benefit: {total_annual_benefit:,.0f} €")
-        print(f"   - Payback Period: {corrected_payback_years:.1f} Jahre")
-        print(f"   - Analysis Type: {analysis_type}")
-        print(f"   - Intelligent Analysis: {intelligent_analysis}")
+        logger.debug('🔍 Amortisationszeit-Berechnung:')
+        logger.debug('   - Total Investment: %s €', format(total_investment, ',.0f'))
+        logger.debug('   - Base Annual Savings: %s €', format(simulation_results['annual_savings'], ',.0f'))
+        logger.debug('   - Intelligent Revenues: %s €', format(intelligent_revenues['total_revenue'], ',.0f'))
+        logger.debug('   - Total Annual Benefit: %s €', format(total_annual_benefit, ',.0f'))
+        logger.debug('   - Payback Period: %.1f Jahre', corrected_payback_years)
+        logger.debug('   - Analysis Type: %s', analysis_type)
+        logger.debug('   - Intelligent Analysis: %s', intelligent_analysis)
         
         # Analysetyp-spezifische Berechnungen
         if analysis_type == 'quick':
@@ -2861,14 +2782,14 @@ def api_economic_analysis(project_id):
                     # Use Cases aus der Datenbank laden (NUR für dieses Projekt!)
                     from models import UseCase
                     db_use_cases = UseCase.query.filter_by(project_id=project_id).all()
-                    print(f"OK: {len(db_use_cases)} Use Cases fuer Projekt {project_id} (Name: {project.name}) aus der Datenbank geladen")
+                    logger.debug('OK: %s Use Cases fuer Projekt %s (Name: %s) aus der Datenbank geladen', len(db_use_cases), project_id, project.name)
                     
                     # Debug: Zeige alle gefundenen Use Cases
                     if db_use_cases:
                         for uc in db_use_cases:
-                            print(f"  - Use Case: {uc.name} (ID: {uc.id}, Projekt-ID: {uc.project_id})")
+                            logger.debug('  - Use Case: %s (ID: %s, Projekt-ID: %s)', uc.name, uc.id, uc.project_id)
                     else:
-                        print(f"WARNUNG: Keine Use Cases fuer Projekt {project_id} gefunden! Verwende Standard-Use Cases als Fallback.")
+                        logger.warning('WARNUNG: Keine Use Cases fuer Projekt %s gefunden! Verwende Standard-Use Cases als Fallback.', project_id)
                     
                     # WICHTIG: db_use_cases explizit als Liste uebergeben (auch wenn leer)
                     if db_use_cases is None:
@@ -2893,16 +2814,16 @@ def api_economic_analysis(project_id):
                             'energy_neutrality': use_case_data['energy_neutrality']
                         }
                     
-                    print(f"✅ Erweiterte CursorAI-Analyse erfolgreich integriert")
+                    logger.debug('✅ Erweiterte CursorAI-Analyse erfolgreich integriert')
                     
                 except ImportError as e:
-                    print(f"⚠️ Erweiterte Analyse nicht verfügbar: {e}")
+                    logger.warning('⚠️ Erweiterte Analyse nicht verfügbar: %s', e)
                     response['enhanced_analysis'] = {
                         'error': 'Erweiterte Analyse nicht verfügbar',
                         'message': 'Enhanced Economic Analysis Module konnte nicht geladen werden'
                     }
                 except Exception as e:
-                    print(f"⚠️ Fehler bei erweiterter Analyse: {e}")
+                    logger.warning('⚠️ Fehler bei erweiterter Analyse: %s', e)
                     response['enhanced_analysis'] = {
                         'error': 'Fehler bei erweiterter Analyse',
                         'message': str(e)
@@ -2937,7 +2858,7 @@ def api_economic_analysis(project_id):
             
             # Prüfe Größe
             if len(json_str) > 10000000:  # 10MB Limit
-                print(f"⚠️ JSON zu groß ({len(json_str)} bytes), reduziere Daten...")
+                logger.warning('⚠️ JSON zu groß (%s bytes), reduziere Daten...', len(json_str))
                 # Entferne detaillierte Daten
                 if 'enhanced_analysis' in cleaned_response:
                     cleaned_response['enhanced_analysis'] = {
@@ -2946,11 +2867,11 @@ def api_economic_analysis(project_id):
                     }
                 json_str = json.dumps(cleaned_response, ensure_ascii=False, default=str)
             
-            print(f"✅ JSON erfolgreich serialisiert ({len(json_str)} bytes)")
+            logger.debug('✅ JSON erfolgreich serialisiert (%s bytes)', len(json_str))
             return json_str, 200, {'Content-Type': 'application/json; charset=utf-8'}
             
         except Exception as json_error:
-            print(f"❌ JSON-Serialisierungsfehler: {json_error}")
+            logger.error('❌ JSON-Serialisierungsfehler: %s', json_error)
             return jsonify({
                 'error': 'JSON-Serialisierungsfehler',
                 'message': str(json_error),
@@ -2961,7 +2882,7 @@ def api_economic_analysis(project_id):
                 }
             }), 500
     except Exception as e:
-        print(f"Fehler in Wirtschaftlichkeitsanalyse: {e}")
+        logger.error('Fehler in Wirtschaftlichkeitsanalyse: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/enhanced-economic-analysis/<int:project_id>', methods=['GET'])
@@ -2972,7 +2893,7 @@ def api_enhanced_economic_analysis(project_id):
         if not project:
             return jsonify({'error': 'Projekt nicht gefunden'}), 404
         
-        print(f"🚀 Starte erweiterte CursorAI-Analyse für Projekt {project_id}")
+        logger.debug('🚀 Starte erweiterte CursorAI-Analyse für Projekt %s', project_id)
         
         # Investitionskosten laden
         investment_costs = InvestmentCost.query.filter_by(project_id=project_id).all()
@@ -3004,15 +2925,15 @@ def api_enhanced_economic_analysis(project_id):
         # Use Cases aus der Datenbank laden (NUR für dieses Projekt!)
         from models import UseCase
         db_use_cases = UseCase.query.filter_by(project_id=project_id).all()
-        print(f"OK: {len(db_use_cases)} Use Cases fuer Projekt {project_id} (Name: {project.name}) aus der Datenbank geladen")
+        logger.debug('OK: %s Use Cases fuer Projekt %s (Name: %s) aus der Datenbank geladen', len(db_use_cases), project_id, project.name)
         
         # Debug: Zeige alle gefundenen Use Cases
         if db_use_cases:
             for uc in db_use_cases:
-                print(f"  - Use Case: {uc.name} (ID: {uc.id}, Projekt-ID: {uc.project_id})")
+                logger.debug('  - Use Case: %s (ID: %s, Projekt-ID: %s)', uc.name, uc.id, uc.project_id)
         else:
-            print(f"WARNUNG: Keine Use Cases fuer Projekt {project_id} gefunden! Verwende Standard-Use Cases als Fallback.")
-            print(f"TIP: Erstellen Sie projektspezifische Use Cases im Use Case Manager fuer genauere Ergebnisse.")
+            logger.warning('WARNUNG: Keine Use Cases fuer Projekt %s gefunden! Verwende Standard-Use Cases als Fallback.', project_id)
+            logger.debug('TIP: Erstellen Sie projektspezifische Use Cases im Use Case Manager fuer genauere Ergebnisse.')
         
         # WICHTIG: db_use_cases explizit als Liste uebergeben (auch wenn leer)
         # Dies stellt sicher, dass die Logik in generate_comprehensive_analysis korrekt funktioniert
@@ -3053,17 +2974,17 @@ def api_enhanced_economic_analysis(project_id):
                 response['monthly_analysis'][use_case_name] = first_year['monthly_data']
                 response['kpi_summary'][use_case_name] = first_year['kpis']
         
-        print(f"✅ Erweiterte CursorAI-Analyse erfolgreich abgeschlossen")
+        logger.debug('✅ Erweiterte CursorAI-Analyse erfolgreich abgeschlossen')
         return jsonify(response)
         
     except ImportError as e:
-        print(f"⚠️ Erweiterte Analyse nicht verfügbar: {e}")
+        logger.warning('⚠️ Erweiterte Analyse nicht verfügbar: %s', e)
         return jsonify({
             'error': 'Erweiterte Analyse nicht verfügbar',
             'message': 'Enhanced Economic Analysis Module konnte nicht geladen werden'
         }), 500
     except Exception as e:
-        print(f"⚠️ Fehler bei erweiterter Analyse: {e}")
+        logger.warning('⚠️ Fehler bei erweiterter Analyse: %s', e)
         return jsonify({
             'error': 'Fehler bei erweiterter Analyse',
             'message': str(e)
@@ -3086,7 +3007,7 @@ def api_economic_simulation(project_id):
         })
         
     except Exception as e:
-        print(f"Fehler in Wirtschaftlichkeitssimulation: {e}")
+        logger.error('Fehler in Wirtschaftlichkeitssimulation: %s', e)
         return jsonify({'error': str(e)}), 400
 
 def calculate_annual_savings(project, reference_prices):
@@ -3118,7 +3039,7 @@ def calculate_annual_savings(project, reference_prices):
         return round(base_savings, 2)
         
     except Exception as e:
-        print(f"Fehler bei Ersparnis-Berechnung: {e}")
+        logger.error('Fehler bei Ersparnis-Berechnung: %s', e)
         return 0
 
 def run_economic_simulation(project, use_case='hybrid'):
@@ -3152,7 +3073,7 @@ def run_economic_simulation(project, use_case='hybrid'):
         }
         
     except Exception as e:
-        print(f"Fehler bei Wirtschaftlichkeitssimulation: {e}")
+        logger.error('Fehler bei Wirtschaftlichkeitssimulation: %s', e)
         return {
             'total_investment': 0,
             'annual_savings': 0,
@@ -3184,7 +3105,7 @@ def calculate_peak_shaving_savings(project):
         spot_prices = cursor.fetchall()
         
         if not spot_prices:
-            print("⚠️ Keine Spot-Preise verfügbar, verwende Fallback-Werte")
+            logger.warning('⚠️ Keine Spot-Preise verfügbar, verwende Fallback-Werte')
             # Fallback: Vereinfachte Berechnung
             peak_reduction_kw = project.bess_power * 0.15
             peak_price_eur_mwh = 150
@@ -3219,16 +3140,16 @@ def calculate_peak_shaving_savings(project):
             peak_hours_per_year / 1000  # kW zu MW
         )
         
-        print(f"📊 Peak-Shaving-Berechnung mit echten Daten:")
-        print(f"   - Durchschnittspreis: {avg_price:.2f} €/MWh")
-        print(f"   - Durchschnittlicher Peak-Preis: {avg_peak_price:.2f} €/MWh")
-        print(f"   - Peak-Premium: {peak_premium_eur_mwh:.2f} €/MWh")
-        print(f"   - Peak-Shaving-Ersparnisse: {peak_shaving_savings:.2f} €/Jahr")
+        logger.debug('📊 Peak-Shaving-Berechnung mit echten Daten:')
+        logger.debug('   - Durchschnittspreis: %.2f €/MWh', avg_price)
+        logger.debug('   - Durchschnittlicher Peak-Preis: %.2f €/MWh', avg_peak_price)
+        logger.debug('   - Peak-Premium: %.2f €/MWh', peak_premium_eur_mwh)
+        logger.debug('   - Peak-Shaving-Ersparnisse: %.2f €/Jahr', peak_shaving_savings)
         
         return peak_shaving_savings
         
     except Exception as e:
-        print(f"❌ Fehler bei Peak-Shaving-Berechnung: {e}")
+        logger.error('❌ Fehler bei Peak-Shaving-Berechnung: %s', e)
         # Fallback-Werte
         peak_reduction_kw = project.bess_power * 0.15
         peak_price_eur_mwh = 150
@@ -3256,7 +3177,7 @@ def calculate_arbitrage_savings(project):
         spot_prices = cursor.fetchall()
         
         if not spot_prices:
-            print("⚠️ Keine Spot-Preise verfügbar, verwende Fallback-Werte")
+            logger.warning('⚠️ Keine Spot-Preise verfügbar, verwende Fallback-Werte')
                     # Fallback: OPTIMIERTE Berechnung
         daily_cycles = 2  # Erhöht von 1
         price_spread_eur_mwh = 80  # Erhöht von 50
@@ -3287,16 +3208,16 @@ def calculate_arbitrage_savings(project):
             days_per_year / 1000  # kWh zu MWh
         )
         
-        print(f"📊 Arbitrage-Berechnung mit echten Daten:")
-        print(f"   - Min Preis: {min_price:.2f} €/MWh")
-        print(f"   - Max Preis: {max_price:.2f} €/MWh")
-        print(f"   - Durchschnittlicher Spread: {avg_spread_eur_mwh:.2f} €/MWh")
-        print(f"   - Arbitrage-Erlös: {arbitrage_revenue:.2f} €/Jahr")
+        logger.debug('📊 Arbitrage-Berechnung mit echten Daten:')
+        logger.debug('   - Min Preis: %.2f €/MWh', min_price)
+        logger.debug('   - Max Preis: %.2f €/MWh', max_price)
+        logger.debug('   - Durchschnittlicher Spread: %.2f €/MWh', avg_spread_eur_mwh)
+        logger.debug('   - Arbitrage-Erlös: %.2f €/Jahr', arbitrage_revenue)
         
         return arbitrage_revenue
         
     except Exception as e:
-        print(f"❌ Fehler bei Arbitrage-Berechnung: {e}")
+        logger.error('❌ Fehler bei Arbitrage-Berechnung: %s', e)
         # Fallback-Werte
         daily_cycles = 1
         price_spread_eur_mwh = 50
@@ -3340,12 +3261,12 @@ def calculate_pv_self_consumption_savings(project):
     
     savings = annual_production_kwh * self_consumption_rate * electricity_price_eur_kwh
     
-    print(f"📊 PV Eigenverbrauch-Berechnung:")
-    print(f"  - PV Power: {pv_power_kw} kW")
-    print(f"  - BESS Size: {project.bess_size} kWh")
-    print(f"  - Eigenverbrauchsquote: {self_consumption_rate * 100:.1f}%")
-    print(f"  - Strompreis: {electricity_price_eur_kwh:.3f} €/kWh")
-    print(f"  - Ersparnisse: {savings:,.0f} €/Jahr")
+    logger.debug('📊 PV Eigenverbrauch-Berechnung:')
+    logger.debug('  - PV Power: %s kW', pv_power_kw)
+    logger.debug('  - BESS Size: %s kWh', project.bess_size)
+    logger.debug('  - Eigenverbrauchsquote: %.1f%%', self_consumption_rate * 100)
+    logger.debug('  - Strompreis: %.3f €/kWh', electricity_price_eur_kwh)
+    logger.debug('  - Ersparnisse: %s €/Jahr', format(savings, ',.0f'))
     
     return savings
 def calculate_hp_efficiency_savings(project):
@@ -3391,12 +3312,12 @@ def calculate_self_consumption_rate(annual_consumption, annual_generation, bess_
     # Begrenzen auf maximal 85% (realistisch)
     total_rate = min(total_rate, 0.85)
     
-    print(f"📊 Eigenverbrauchsquote-Berechnung:")
-    print(f"  - Jährliche Erzeugung: {annual_generation:.1f} MWh")
-    print(f"  - BESS-Größe: {bess_size_mwh:.1f} MWh")
-    print(f"  - Basis-Quote: {base_rate * 100:.1f}%")
-    print(f"  - BESS-Boost: {bess_boost * 100:.1f}%")
-    print(f"  - Gesamt-Quote: {total_rate * 100:.1f}%")
+    logger.debug('📊 Eigenverbrauchsquote-Berechnung:')
+    logger.debug('  - Jährliche Erzeugung: %.1f MWh', annual_generation)
+    logger.debug('  - BESS-Größe: %.1f MWh', bess_size_mwh)
+    logger.debug('  - Basis-Quote: %.1f%%', base_rate * 100)
+    logger.debug('  - BESS-Boost: %.1f%%', bess_boost * 100)
+    logger.debug('  - Gesamt-Quote: %.1f%%', total_rate * 100)
     
     return total_rate * 100  # Als Prozent zurückgeben
 
@@ -3470,11 +3391,11 @@ def generate_decision_metrics(project, total_investment, total_annual_benefit):
     corrected_roi_percent = (total_annual_benefit * 20 - total_investment) / total_investment * 100 if total_investment > 0 else 0
     corrected_payback_years = total_investment / total_annual_benefit if total_annual_benefit > 0 else 0
     
-    print(f"🔍 Entscheidungsmetriken Debug:")
-    print(f"  - Total Investment: {total_investment:,.0f} €")
-    print(f"  - Total Annual Benefit: {total_annual_benefit:,.0f} €")
-    print(f"  - Korrigierter ROI: {corrected_roi_percent:.1f}%")
-    print(f"  - Korrigierte Amortisationszeit: {corrected_payback_years:.1f} Jahre")
+    logger.debug('🔍 Entscheidungsmetriken Debug:')
+    logger.debug('  - Total Investment: %s €', format(total_investment, ',.0f'))
+    logger.debug('  - Total Annual Benefit: %s €', format(total_annual_benefit, ',.0f'))
+    logger.debug('  - Korrigierter ROI: %.1f%%', corrected_roi_percent)
+    logger.debug('  - Korrigierte Amortisationszeit: %.1f Jahre', corrected_payback_years)
     
     # Investitionsempfehlung - Realistischere Schwellenwerte
     if corrected_roi_percent > 12 and corrected_payback_years < 8:
@@ -3484,7 +3405,7 @@ def generate_decision_metrics(project, total_investment, total_annual_benefit):
     else:
         investment_recommendation = 'Nicht empfohlen'
     
-    print(f"  - Investitionsempfehlung: {investment_recommendation}")
+    logger.debug('  - Investitionsempfehlung: %s', investment_recommendation)
     
     # Finanzierungsempfehlung
     if total_investment > 500000:
@@ -3543,49 +3464,50 @@ def generate_roi_comparison(project_roi):
 def api_import_data():
     """API-Endpoint für Datenimport - Erweitert für alle Datentypen"""
     try:
-        print("=" * 50)
-        print("🚀 IMPORT-START")
-        print("=" * 50)
+        logger.debug('%s', '=' * 50)
+        logger.debug('🚀 IMPORT-START')
+        logger.debug('%s', '=' * 50)
         
         data = request.get_json()
-        print(f"📥 Empfangene API-Daten: {data}")
+        logger.debug('📥 Empfangene API-Daten: %s', data)
         
         data_type = data.get('data_type')
         data_points = data.get('data', [])  # Verwende 'data' statt 'data_points'
         profile_name = data.get('profile_name')
         project_id = data.get('project_id', 1)  # Default-Projekt-ID
 
-        print(f"📊 API-Parameter:")
-        print(f"  - data_type: {data_type}")
-        print(f"  - data_points count: {len(data_points) if data_points else 0}")
-        print(f"  - profile_name: {profile_name}")
-        print(f"  - project_id: {project_id}")
+        logger.debug('📊 API-Parameter:')
+        logger.debug('  - data_type: %s', data_type)
+        logger.debug('  - data_points count: %s', len(data_points) if data_points else 0)
+        logger.debug('  - profile_name: %s', profile_name)
+        logger.debug('  - project_id: %s', project_id)
 
         if not data_type:
-            print("❌ Kein data_type angegeben")
+            logger.error('❌ Kein data_type angegeben')
             return jsonify({'success': False, 'error': 'Kein Datentyp angegeben'})
             
         if not data_points or len(data_points) == 0:
-            print("❌ Keine Datenpunkte vorhanden")
+            logger.error('❌ Keine Datenpunkte vorhanden')
             return jsonify({'success': False, 'error': 'Keine Daten zum Importieren'})
 
-        print(f"📥 Importiere {len(data_points)} Datensätze vom Typ: {data_type}")
+        logger.debug('📥 Importiere %s Datensätze vom Typ: %s', len(data_points), data_type)
         if profile_name:
-            print(f"📝 Profilname: {profile_name}")
+            logger.debug('📝 Profilname: %s', profile_name)
 
         # Erste paar Datenpunkte anzeigen
-        print(f"📋 Erste 3 Datenpunkte:")
-        for i, point in enumerate(data_points[:3]):
-            print(f"  {i+1}: {point}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('📋 Erste 3 Datenpunkte:')
+            for i, point in enumerate(data_points[:3]):
+                logger.debug('  %s: %s', i + 1, point)
 
         cursor = get_db().cursor()
 
         # Intelligente Datenverarbeitung je nach Datentyp
         if data_type in ['load_profile', 'load']:
             result = import_load_profile(cursor, project_id, data_points, profile_name)
-            print("=" * 50)
-            print("✅ IMPORT-ERFOLGREICH")
-            print("=" * 50)
+            logger.debug('%s', '=' * 50)
+            logger.debug('✅ IMPORT-ERFOLGREICH')
+            logger.debug('%s', '=' * 50)
             return result
         elif data_type in ['solar', 'einstrahlung']:
             return import_solar_data(cursor, project_id, data_points, profile_name)
@@ -3596,14 +3518,14 @@ def api_import_data():
         elif data_type in ['weather', 'wetterdaten']:
             return import_weather_data(cursor, project_id, data_points, profile_name)
         else:
-            print(f"❌ Unbekannter Datentyp: {data_type}")
+            logger.error('❌ Unbekannter Datentyp: %s', data_type)
             return jsonify({'success': False, 'error': f'Unbekannter Datentyp: {data_type}'})
 
     except Exception as e:
-        print("=" * 50)
-        print("❌ IMPORT-FEHLER")
-        print("=" * 50)
-        print(f"❌ Import-Fehler: {str(e)}")
+        logger.debug('%s', '=' * 50)
+        logger.error('❌ IMPORT-FEHLER')
+        logger.debug('%s', '=' * 50)
+        logger.error('❌ Import-Fehler: %s', str(e))
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': f'Import-Fehler: {str(e)}'})
@@ -3611,7 +3533,7 @@ def api_import_data():
 def import_load_profile(cursor, project_id, data_points, profile_name):
     """Lastprofil-Import"""
     try:
-        print("🔄 Starte Lastprofil-Import...")
+        logger.debug('🔄 Starte Lastprofil-Import...')
         
         # Profilname verwenden oder Standard-Name generieren
         if profile_name:
@@ -3619,9 +3541,9 @@ def import_load_profile(cursor, project_id, data_points, profile_name):
         else:
             profile_display_name = f"Importiertes Lastprofil {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         
-        print(f"📋 Erstelle Lastprofil: {profile_display_name}")
-        print(f"📊 Projekt-ID: {project_id}")
-        print(f"📊 Anzahl Datenpunkte: {len(data_points)}")
+        logger.debug('📋 Erstelle Lastprofil: %s', profile_display_name)
+        logger.debug('📊 Projekt-ID: %s', project_id)
+        logger.debug('📊 Anzahl Datenpunkte: %s', len(data_points))
         
         # Prüfe ob Projekt existiert
         cursor.execute("SELECT id FROM project WHERE id = ?", (project_id,))
@@ -3629,7 +3551,7 @@ def import_load_profile(cursor, project_id, data_points, profile_name):
         if not project_exists:
             raise Exception(f"Projekt mit ID {project_id} existiert nicht")
         
-        print(f"✅ Projekt {project_id} existiert")
+        logger.debug('✅ Projekt %s existiert', project_id)
         
         # Lastprofil erstellen
         cursor.execute("""
@@ -3638,23 +3560,23 @@ def import_load_profile(cursor, project_id, data_points, profile_name):
         """, (profile_display_name, project_id))
         load_profile_id = cursor.lastrowid
         
-        print(f"✅ Lastprofil erstellt mit ID: {load_profile_id}")
+        logger.debug('✅ Lastprofil erstellt mit ID: %s', load_profile_id)
         
         # Daten importieren
-        print(f"🔄 Starte Import von {len(data_points)} Datenpunkten...")
+        logger.debug('🔄 Starte Import von %s Datenpunkten...', len(data_points))
         valid_data_points = import_data_points(cursor, load_profile_id, data_points, 'load')
         
-        print(f"✅ Import abgeschlossen: {valid_data_points} Datenpunkte importiert")
+        logger.debug('✅ Import abgeschlossen: %s Datenpunkte importiert', valid_data_points)
         
         # Transaktion explizit committen
-        print("💾 Committe Datenbank-Transaktion...")
+        logger.debug('💾 Committe Datenbank-Transaktion...')
         get_db().commit()
-        print(f"✅ Datenbank-Transaktion erfolgreich committet")
+        logger.debug('✅ Datenbank-Transaktion erfolgreich committet')
         
         # Überprüfung nach Commit
         cursor.execute("SELECT COUNT(*) FROM load_value WHERE load_profile_id = ?", (load_profile_id,))
         actual_count = cursor.fetchone()[0]
-        print(f"📊 Tatsächliche Datenpunkte in DB: {actual_count}")
+        logger.debug('📊 Tatsächliche Datenpunkte in DB: %s', actual_count)
         
         return jsonify({
             'success': True,
@@ -3664,9 +3586,9 @@ def import_load_profile(cursor, project_id, data_points, profile_name):
         })
         
     except Exception as e:
-        print(f"❌ Fehler beim Lastprofil-Import: {str(e)}")
+        logger.error('❌ Fehler beim Lastprofil-Import: %s', str(e))
         get_db().rollback()
-        print(f"🔄 Datenbank-Transaktion zurückgerollt")
+        logger.debug('🔄 Datenbank-Transaktion zurückgerollt')
         raise e
 
 def import_solar_data(cursor, project_id, data_points, profile_name):
@@ -3677,7 +3599,7 @@ def import_solar_data(cursor, project_id, data_points, profile_name):
         else:
             profile_display_name = f"Einstrahlungsdaten {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         
-        print(f"☀️ Erstelle Einstrahlungsprofil: {profile_display_name}")
+        logger.debug('☀️ Erstelle Einstrahlungsprofil: %s', profile_display_name)
         
         cursor.execute("""
             INSERT INTO load_profile (name, project_id, data_type, created_at)
@@ -3709,7 +3631,7 @@ def import_hydro_data(cursor, project_id, data_points, profile_name):
         else:
             profile_display_name = f"Pegelstände {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         
-        print(f"💧 Erstelle Pegelstandsprofil: {profile_display_name}")
+        logger.debug('💧 Erstelle Pegelstandsprofil: %s', profile_display_name)
         
         cursor.execute("""
             INSERT INTO load_profile (name, project_id, data_type, created_at)
@@ -3741,7 +3663,7 @@ def import_pvsol_data(cursor, project_id, data_points, profile_name):
         else:
             profile_display_name = f"PVSol-Ertrag {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         
-        print(f"☀️ Erstelle PVSol-Profil: {profile_display_name}")
+        logger.debug('☀️ Erstelle PVSol-Profil: %s', profile_display_name)
         
         cursor.execute("""
             INSERT INTO load_profile (name, project_id, data_type, created_at)
@@ -3773,7 +3695,7 @@ def import_weather_data(cursor, project_id, data_points, profile_name):
         else:
             profile_display_name = f"Wetterdaten {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         
-        print(f"🌤️ Erstelle Wetterprofil: {profile_display_name}")
+        logger.debug('🌤️ Erstelle Wetterprofil: %s', profile_display_name)
         
         cursor.execute("""
             INSERT INTO load_profile (name, project_id, data_type, created_at)
@@ -3800,7 +3722,10 @@ def import_weather_data(cursor, project_id, data_points, profile_name):
 def import_data_points(cursor, profile_id, data_points, data_type):
     """Gemeinsame Datenpunkt-Import-Funktion"""
     valid_data_points = 0
-    print(f"🔄 Importiere {len(data_points)} Datenpunkte für Profil {profile_id}")
+    logger.debug('🔄 Importiere %s Datenpunkte für Profil %s', len(data_points), profile_id)
+    # Pro-Zeile-Meldungen gedrosselt: Debug nur für die ersten Punkte, Warnungen begrenzt
+    trace_row = RowSampler(logger, logging.DEBUG, first=3, every=1000)
+    warn_row = RowSampler(logger, logging.WARNING, first=10, every=1000)
     
     for i, point in enumerate(data_points):
         try:
@@ -3808,7 +3733,7 @@ def import_data_points(cursor, profile_id, data_points, data_type):
             timestamp = point['timestamp']
             value = point['value']
             
-            print(f"  📊 Verarbeite Punkt {i+1}: timestamp={timestamp}, value={value}")
+            trace_row('  📊 Verarbeite Punkt %s: timestamp=%s, value=%s', i + 1, timestamp, value)
             
             # Prüfen ob Timestamp ein gültiges Datum ist
             if isinstance(timestamp, str):
@@ -3837,7 +3762,7 @@ def import_data_points(cursor, profile_id, data_points, data_type):
                 
                 # Excel-Datum-Korrektur
                 if parsed_date and parsed_date.year < 2000:
-                    print(f"   ✅ Excel-Datum korrigiert: {timestamp} -> {parsed_date.year} -> 2024")
+                    trace_row('   ✅ Excel-Datum korrigiert: %s -> %s -> 2024', timestamp, parsed_date.year)
                     parsed_date = datetime(2024, parsed_date.month, parsed_date.day, 
                                         parsed_date.hour, parsed_date.minute, parsed_date.second)
                 
@@ -3865,16 +3790,16 @@ def import_data_points(cursor, profile_id, data_points, data_type):
                                 
                                 parsed_date = datetime(year, month, day, hour, minute, second)
                     except Exception as e:
-                        print(f"   ❌ Excel-Datum-Parsing fehlgeschlagen: {e}")
+                        warn_row('   ❌ Excel-Datum-Parsing fehlgeschlagen: %s', e)
                 
                 if parsed_date is None:
-                    print(f"⚠️ Ungültiges Datum in Zeile {i+1}: {timestamp}")
+                    warn_row('⚠️ Ungültiges Datum in Zeile %s: %s', i + 1, timestamp)
                     continue
                     
             elif isinstance(timestamp, datetime):
                 parsed_date = timestamp
             else:
-                print(f"⚠️ Ungültiger Timestamp-Typ in Zeile {i+1}: {type(timestamp)}")
+                warn_row('⚠️ Ungültiger Timestamp-Typ in Zeile %s: %s', i + 1, type(timestamp))
                 continue
             
             # Wert validieren
@@ -3884,13 +3809,13 @@ def import_data_points(cursor, profile_id, data_points, data_type):
                 try:
                     value = float(value_clean)
                 except ValueError:
-                    print(f"⚠️ Ungültiger Wert in Zeile {i+1}: {value}")
+                    warn_row('⚠️ Ungültiger Wert in Zeile %s: %s', i + 1, value)
                     continue
             elif not isinstance(value, (int, float)):
-                print(f"⚠️ Ungültiger Wert-Typ in Zeile {i+1}: {type(value)}")
+                warn_row('⚠️ Ungültiger Wert-Typ in Zeile %s: %s', i + 1, type(value))
                 continue
             
-            print(f"  ✅ Punkt {i+1} validiert: {parsed_date} = {value}")
+            trace_row('  ✅ Punkt %s validiert: %s = %s', i + 1, parsed_date, value)
             
             # Datenpunkt in Datenbank speichern
             cursor.execute("""
@@ -3903,23 +3828,32 @@ def import_data_points(cursor, profile_id, data_points, data_type):
             # Alle 100 Punkte einen Commit machen
             if valid_data_points % 100 == 0:
                 get_db().commit()
-                print(f"  💾 Zwischencommit nach {valid_data_points} Punkten")
+                logger.debug('  💾 Zwischencommit nach %s Punkten', valid_data_points)
             
         except Exception as e:
-            print(f"❌ Fehler beim Importieren von Datenpunkt {i+1}: {e}")
+            warn_row('❌ Fehler beim Importieren von Datenpunkt %s: %s', i + 1, e)
             continue
     
-    print(f"✅ {valid_data_points} von {len(data_points)} Datenpunkten erfolgreich importiert")
+    trace_row.summary()
+    warn_row.summary('Warnungen zu ungültigen Zeilen')
+    logger.info('✅ %s von %s Datenpunkten erfolgreich importiert', valid_data_points, len(data_points))
     return valid_data_points
 
 @main_bp.route('/api/projects/<int:project_id>/data/<data_type>', methods=['POST'])
 def get_project_data(project_id, data_type):
-    """API-Endpoint für projekt- und datentyp-spezifische Daten"""
+    """API-Endpoint für projekt- und datentyp-spezifische Daten
+
+    Optional im Body: max_points bzw. width (Chartbreite in Pixel) und
+    downsample=lttb|minmax für serverseitig reduzierte Chart-Daten sowie
+    format=json|columns|msgpack|arrow (alternativ per Accept-Header)
+    """
     try:
         data = request.get_json()
         time_range = data.get('time_range', 'all')
         start_date = data.get('start_date')
         end_date = data.get('end_date')
+        max_points, sampling_method = downsampling_params(data)
+        response_format = negotiate_format(data)
         
         # Zeitbereich-Filter erstellen
         time_filter = ""
@@ -4003,11 +3937,12 @@ def get_project_data(project_id, data_type):
             
             # Verwende >= und < statt BETWEEN für inklusives Ende
             time_filter = f"AND timestamp >= '{start_date_sql}' AND timestamp < '{end_date_sql}'"
-            print(f"🔍 Zeitfilter für benutzerdefinierten Zeitraum: {start_date_sql} bis {end_date_sql} (exklusiv)")
+            logger.debug('🔍 Zeitfilter für benutzerdefinierten Zeitraum: %s bis %s (exklusiv)', start_date_sql, end_date_sql)
         
         # Spezielle Behandlung für Overlay-Daten
         if data_type == 'overlay':
-            return get_overlay_data(project_id, time_range, start_date, end_date)
+            return get_overlay_data(project_id, time_range, start_date, end_date, max_points, sampling_method,
+                                    response_format)
         
         # Datenart-spezifische Tabellen
         table_mapping = {
@@ -4045,7 +3980,7 @@ def get_project_data(project_id, data_type):
             """
             cursor = get_db().cursor()
             cursor.execute(query, (project_id,))
-            rows = cursor.fetchall()
+            rows, downsampling = downsample_records(cursor.fetchall(), [1], max_points, sampling_method, x_key=0)
             
             # Daten formatieren und PV-Energie berechnen
             data = []
@@ -4063,12 +3998,15 @@ def get_project_data(project_id, data_type):
                     'pv_capacity_kw': pv_capacity_kw  # PV-Kapazität für Frontend
                 })
             
-            return jsonify({
+            response_data = {
                 'success': True,
                 'data': data,
                 'count': len(data),
                 'pv_capacity_kw': pv_capacity_kw  # PV-Kapazität für Frontend
-            })
+            }
+            if downsampling:
+                response_data['downsampling'] = downsampling
+            return series_response(response_data, ['value', 'pv_energy_kwh'], fmt=response_format)
         elif data_type == 'water_level':
             # Hydro-Power-Parameter aus Projekt holen
             project = Project.query.get(project_id)
@@ -4086,7 +4024,7 @@ def get_project_data(project_id, data_type):
             """
             cursor = get_db().cursor()
             cursor.execute(query, (project_id,))
-            rows = cursor.fetchall()
+            rows, downsampling = downsample_records(cursor.fetchall(), [1], max_points, sampling_method, x_key=0)
             
             # Daten formatieren und Hydro-Energie berechnen
             data = []
@@ -4118,14 +4056,17 @@ def get_project_data(project_id, data_type):
                     'hydro_efficiency': hydro_efficiency  # Wirkungsgrad für Frontend
                 })
             
-            return jsonify({
+            response_data = {
                 'success': True,
                 'data': data,
                 'count': len(data),
                 'hydro_power_kw': hydro_power_kw,  # Hydro-Kapazität für Frontend
                 'hydro_head_m': hydro_head_m,  # Fallhöhe für Frontend
                 'hydro_efficiency': hydro_efficiency  # Wirkungsgrad für Frontend
-            })
+            }
+            if downsampling:
+                response_data['downsampling'] = downsampling
+            return series_response(response_data, ['value', 'hydro_energy_kwh'], fmt=response_format)
         elif data_type == 'weather':
             query = f"""
             SELECT timestamp, temperature_2m as value 
@@ -4141,8 +4082,8 @@ def get_project_data(project_id, data_type):
             WHERE wd.project_id = ? {time_filter}
             ORDER BY wv.timestamp
             """
-            print(f"🌬️ Winddaten-Query für Projekt {project_id}: {query}")
-            print(f"🌬️ Zeitfilter: {time_filter}")
+            logger.debug('🌬️ Winddaten-Query für Projekt %s: %s', project_id, query)
+            logger.debug('🌬️ Zeitfilter: %s', time_filter)
         else:
             query = f"""
             SELECT timestamp, value 
@@ -4155,7 +4096,8 @@ def get_project_data(project_id, data_type):
         cursor.execute(query, (project_id,))
         rows = cursor.fetchall()
         
-        print(f"📊 Gefundene Datensätze: {len(rows)}")
+        logger.debug('📊 Gefundene Datensätze: %s', len(rows))
+        rows, downsampling = downsample_records(rows, [1], max_points, sampling_method, x_key=0)
         
         # Wenn keine Daten gefunden, prüfe verfügbaren Zeitraum
         available_range = None
@@ -4176,8 +4118,8 @@ def get_project_data(project_id, data_type):
                         'max': debug_row[2],
                         'count': debug_row[0]
                     }
-                    print(f"🔍 Debug: Gesamt {debug_row[0]} Winddaten für Projekt {project_id}")
-                    print(f"🔍 Debug: Verfügbarer Zeitraum: {debug_row[1]} bis {debug_row[2]}")
+                    logger.debug('🔍 Debug: Gesamt %s Winddaten für Projekt %s', debug_row[0], project_id)
+                    logger.debug('🔍 Debug: Verfügbarer Zeitraum: %s bis %s', debug_row[1], debug_row[2])
             elif data_type == 'solar_radiation':
                 debug_query = """
                 SELECT COUNT(*) as count, MIN(timestamp) as min_ts, MAX(timestamp) as max_ts
@@ -4224,16 +4166,18 @@ def get_project_data(project_id, data_type):
             'data': data,
             'count': len(data)
         }
+        if downsampling:
+            response_data['downsampling'] = downsampling
         
         # Verfügbaren Zeitraum in Response hinzufügen, wenn keine Daten gefunden
         if len(data) == 0 and available_range:
             response_data['available_range'] = available_range
             response_data['message'] = f"Keine Daten für den gewählten Zeitraum gefunden. Verfügbarer Zeitraum: {available_range['min']} bis {available_range['max']} ({available_range['count']} Datensätze)"
         
-        return jsonify(response_data)
+        return series_response(response_data, ['value', 'energy_kwh'], fmt=response_format)
         
     except Exception as e:
-        print(f"Fehler beim Laden der Daten: {e}")
+        logger.error('Fehler beim Laden der Daten: %s', e)
         return jsonify({'success': False, 'error': str(e)})
 
 
@@ -4332,9 +4276,9 @@ def get_load_profile_analysis(project_id):
             
             # Verwende >= und < statt BETWEEN für inklusives Ende
             time_filter = f"AND timestamp >= '{start_date_sql}' AND timestamp < '{end_date_sql}'"
-            print(f"🔍 DEBUG Zeitfilter: {time_filter}")
-            print(f"   Start: {start_date_sql}")
-            print(f"   Ende (exklusiv): {end_date_sql}")
+            logger.debug('🔍 DEBUG Zeitfilter: %s', time_filter)
+            logger.debug('   Start: %s', start_date_sql)
+            logger.debug('   Ende (exklusiv): %s', end_date_sql)
         
         # Lastprofil-Daten laden
         query = f"""
@@ -4345,11 +4289,11 @@ def get_load_profile_analysis(project_id):
         ORDER BY lv.timestamp
         """
         
-        print(f"🔍 DEBUG SQL-Query: {query}")
+        logger.debug('🔍 DEBUG SQL-Query: %s', query)
         cursor = get_db().cursor()
         cursor.execute(query, (project_id,))
         rows = cursor.fetchall()
-        print(f"🔍 DEBUG SQL-Ergebnis: {len(rows)} Zeilen gefunden")
+        logger.debug('🔍 DEBUG SQL-Ergebnis: %s Zeilen gefunden', len(rows))
         
         if len(rows) == 0:
             return jsonify({
@@ -4366,15 +4310,15 @@ def get_load_profile_analysis(project_id):
             })
         
         # Debug: Prüfe geladene Daten
-        print(f"🔍 DEBUG: {len(load_data)} Datenpunkte geladen")
+        logger.debug('🔍 DEBUG: %s Datenpunkte geladen', len(load_data))
         if len(load_data) > 0:
-            print(f"   Erster Timestamp: {load_data[0]['timestamp']}")
-            print(f"   Letzter Timestamp: {load_data[-1]['timestamp']}")
+            logger.debug('   Erster Timestamp: %s', load_data[0]['timestamp'])
+            logger.debug('   Letzter Timestamp: %s', load_data[-1]['timestamp'])
             # Prüfe Sonntagsdaten
             sunday_timestamps = [d['timestamp'] for d in load_data if '2024-04-28' in str(d['timestamp'])]
-            print(f"   Sonntagsdaten (28.04.2024): {len(sunday_timestamps)} gefunden")
+            logger.debug('   Sonntagsdaten (28.04.2024): %s gefunden', len(sunday_timestamps))
             if len(sunday_timestamps) > 0:
-                print(f"   Erste 3 Sonntags-Timestamps: {sunday_timestamps[:3]}")
+                logger.debug('   Erste 3 Sonntags-Timestamps: %s', sunday_timestamps[:3])
         
         # Zusätzliche Daten für BESS-Potenzial-Analyse laden
         p_limit_kw = None
@@ -4386,15 +4330,15 @@ def get_load_profile_analysis(project_id):
             network_restrictions = NetworkRestrictionsModel.query.filter_by(project_id=project_id).first()
             if network_restrictions and network_restrictions.export_limit_kw:
                 p_limit_kw = float(network_restrictions.export_limit_kw)
-                print(f"🔍 Export-Limit gefunden: {p_limit_kw} kW")
+                logger.debug('🔍 Export-Limit gefunden: %s kW', p_limit_kw)
             else:
                 # Fallback: Aus Projekt-Power schätzen (80% der BESS-Power)
                 project = Project.query.get(project_id)
                 if project and project.bess_power:
                     p_limit_kw = float(project.bess_power) * 0.8
-                    print(f"🔍 Export-Limit geschätzt (80% BESS-Power): {p_limit_kw} kW")
+                    logger.debug('🔍 Export-Limit geschätzt (80%% BESS-Power): %s kW', p_limit_kw)
         except Exception as e:
-            print(f"⚠️ Fehler beim Laden des Export-Limits: {e}")
+            logger.warning('⚠️ Fehler beim Laden des Export-Limits: %s', e)
         
         # 2. Spot-Preise für den gleichen Zeitraum laden
         try:
@@ -4426,11 +4370,11 @@ def get_load_profile_analysis(project_id):
                         price_data_df['timestamp'] = pd.to_datetime(price_data_df['timestamp'])
                         price_data_df = price_data_df.set_index('timestamp')
                     
-                    print(f"🔍 {len(spot_prices)} Spot-Preise für Zeitraum geladen")
+                    logger.debug('🔍 %s Spot-Preise für Zeitraum geladen', len(spot_prices))
                 else:
-                    print(f"⚠️ Keine Spot-Preise für Zeitraum gefunden ({first_timestamp} bis {last_timestamp})")
+                    logger.warning('⚠️ Keine Spot-Preise für Zeitraum gefunden (%s bis %s)', first_timestamp, last_timestamp)
         except Exception as e:
-            print(f"⚠️ Fehler beim Laden der Spot-Preise: {e}")
+            logger.warning('⚠️ Fehler beim Laden der Spot-Preise: %s', e)
             import traceback
             traceback.print_exc()
         
@@ -4456,9 +4400,9 @@ def get_load_profile_analysis(project_id):
                     
                     # Ergebnisse aktualisieren
                     results['analyses']['bess_potential'] = bess_potential
-                    print(f"✅ BESS-Potenzial-Analyse mit p_limit_kw={p_limit_kw} und {len(price_data_df) if price_data_df is not None else 0} Preis-Datenpunkten aktualisiert")
+                    logger.debug('✅ BESS-Potenzial-Analyse mit p_limit_kw=%s und %s Preis-Datenpunkten aktualisiert', p_limit_kw, len(price_data_df) if price_data_df is not None else 0)
         except Exception as analyze_error:
-            print(f"❌ Fehler in analyze_load_profile: {analyze_error}")
+            logger.error('❌ Fehler in analyze_load_profile: %s', analyze_error)
             import traceback
             traceback.print_exc()
             return jsonify({
@@ -4472,7 +4416,7 @@ def get_load_profile_analysis(project_id):
             # Test-Serialisierung um Fehler früh zu erkennen
             json.dumps(results, default=str)
         except (TypeError, ValueError) as json_error:
-            print(f"❌ JSON-Serialisierungsfehler: {json_error}")
+            logger.error('❌ JSON-Serialisierungsfehler: %s', json_error)
             import traceback
             traceback.print_exc()
             return jsonify({
@@ -4487,13 +4431,13 @@ def get_load_profile_analysis(project_id):
         })
         
     except ImportError as e:
-        print(f"⚠️ Fehler beim Import der Analyse-Module: {e}")
+        logger.warning('⚠️ Fehler beim Import der Analyse-Module: %s', e)
         return jsonify({
             'success': False,
             'error': f'Analyse-Module nicht verfügbar: {str(e)}'
         }), 500
     except Exception as e:
-        print(f"❌ Fehler bei Lastprofil-Analyse: {e}")
+        logger.error('❌ Fehler bei Lastprofil-Analyse: %s', e)
         import traceback
         traceback.print_exc()
         return jsonify({
@@ -4541,7 +4485,7 @@ def get_network_restrictions(project_id):
             })
             
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Netzrestriktionen: {e}")
+        logger.error('❌ Fehler beim Laden der Netzrestriktionen: %s', e)
         import traceback
         traceback.print_exc()
         return jsonify({
@@ -4602,7 +4546,7 @@ def update_network_restrictions(project_id):
         
         db.session.commit()
         
-        print(f"✅ Netzrestriktionen für Projekt {project_id} gespeichert: export_limit_kw={network_restrictions.export_limit_kw} kW")
+        logger.debug('✅ Netzrestriktionen für Projekt %s gespeichert: export_limit_kw=%s kW', project_id, network_restrictions.export_limit_kw)
         
         return jsonify({
             'success': True,
@@ -4616,7 +4560,7 @@ def update_network_restrictions(project_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Fehler beim Speichern der Netzrestriktionen: {e}")
+        logger.error('❌ Fehler beim Speichern der Netzrestriktionen: %s', e)
         import traceback
         traceback.print_exc()
         return jsonify({
@@ -4625,7 +4569,8 @@ def update_network_restrictions(project_id):
         }), 500
 
 
-def get_overlay_data(project_id, time_range, start_date, end_date):
+def get_overlay_data(project_id, time_range, start_date, end_date, max_points=None, sampling_method='lttb',
+                     response_format='json'):
     """Lädt alle relevanten Daten für das Last & Erzeugung Overlay"""
     try:
         # Zeitbereich-Filter erstellen
@@ -4709,7 +4654,7 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
             
             # Verwende >= und < statt BETWEEN für inklusives Ende
             time_filter = f"AND timestamp >= '{start_date_sql}' AND timestamp < '{end_date_sql}'"
-            print(f"🔍 Overlay Zeitfilter für benutzerdefinierten Zeitraum: {start_date_sql} bis {end_date_sql} (exklusiv)")
+            logger.debug('🔍 Overlay Zeitfilter für benutzerdefinierten Zeitraum: %s bis %s (exklusiv)', start_date_sql, end_date_sql)
         
         cursor = get_db().cursor()
         
@@ -4724,8 +4669,8 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
         try:
             cursor.execute(load_query, (project_id,))
             load_data = cursor.fetchall()
-            print(f"📊 Overlay: {len(load_data)} Lastprofil-Daten gefunden für Projekt {project_id}")
-            print(f"📊 Overlay: Zeitfilter: {time_filter}")
+            logger.debug('📊 Overlay: %s Lastprofil-Daten gefunden für Projekt %s', len(load_data), project_id)
+            logger.debug('📊 Overlay: Zeitfilter: %s', time_filter)
             if len(load_data) == 0:
                 # Prüfe ob überhaupt Lastprofil-Daten für dieses Projekt existieren
                 check_query = """
@@ -4737,11 +4682,11 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
                 cursor.execute(check_query, (project_id,))
                 check_row = cursor.fetchone()
                 if check_row:
-                    print(f"🔍 Overlay Debug: Gesamt {check_row[0]} Lastprofil-Daten für Projekt {project_id}")
+                    logger.debug('🔍 Overlay Debug: Gesamt %s Lastprofil-Daten für Projekt %s', check_row[0], project_id)
                     if check_row[0] > 0:
-                        print(f"🔍 Overlay Debug: Verfügbarer Zeitraum: {check_row[1]} bis {check_row[2]}")
+                        logger.debug('🔍 Overlay Debug: Verfügbarer Zeitraum: %s bis %s', check_row[1], check_row[2])
         except Exception as e:
-            print(f"❌ Overlay Fehler beim Laden der Lastprofil-Daten: {e}")
+            logger.error('❌ Overlay Fehler beim Laden der Lastprofil-Daten: %s', e)
             import traceback
             traceback.print_exc()
             load_data = []
@@ -4759,9 +4704,9 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
             """
             cursor.execute(pv_query, (project_id,))
             pv_data = cursor.fetchall()
-            print(f"📊 Overlay: {len(pv_data)} PV-Daten aus pvsol_export gefunden")
+            logger.debug('📊 Overlay: %s PV-Daten aus pvsol_export gefunden', len(pv_data))
         except Exception as e:
-            print(f"⚠️ Overlay: pvsol_export nicht verfügbar, versuche solar_data: {e}")
+            logger.warning('⚠️ Overlay: pvsol_export nicht verfügbar, versuche solar_data: %s', e)
             # Fallback: Verwende solar_data und berechne PV-Leistung
             try:
                 project = Project.query.get(project_id)
@@ -4776,9 +4721,9 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
                     """
                     cursor.execute(pv_query, (project_id,))
                     pv_data = cursor.fetchall()
-                    print(f"📊 Overlay: {len(pv_data)} PV-Daten aus solar_data berechnet")
+                    logger.debug('📊 Overlay: %s PV-Daten aus solar_data berechnet', len(pv_data))
             except Exception as e2:
-                print(f"⚠️ Overlay: Auch solar_data nicht verfügbar: {e2}")
+                logger.warning('⚠️ Overlay: Auch solar_data nicht verfügbar: %s', e2)
         
         # 3. Wasserkraft-Daten laden (falls vorhanden)
         hydro_data = []
@@ -4792,9 +4737,9 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
             """
             cursor.execute(hydro_query, (project_id,))
             hydro_data = cursor.fetchall()
-            print(f"📊 Overlay: {len(hydro_data)} Hydro-Daten aus hydro_power gefunden")
+            logger.debug('📊 Overlay: %s Hydro-Daten aus hydro_power gefunden', len(hydro_data))
         except Exception as e:
-            print(f"⚠️ Overlay: hydro_power nicht verfügbar, versuche hydro_data: {e}")
+            logger.warning('⚠️ Overlay: hydro_power nicht verfügbar, versuche hydro_data: %s', e)
             # Fallback: Verwende hydro_data und berechne Hydro-Leistung
             try:
                 project = Project.query.get(project_id)
@@ -4812,9 +4757,9 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
                     """
                     cursor.execute(hydro_query, (project_id,))
                     hydro_data = cursor.fetchall()
-                    print(f"📊 Overlay: {len(hydro_data)} Hydro-Daten aus hydro_data berechnet")
+                    logger.debug('📊 Overlay: %s Hydro-Daten aus hydro_data berechnet', len(hydro_data))
             except Exception as e2:
-                print(f"⚠️ Overlay: Auch hydro_data nicht verfügbar: {e2}")
+                logger.warning('⚠️ Overlay: Auch hydro_data nicht verfügbar: %s', e2)
         
         # Daten zusammenführen
         overlay_data = []
@@ -4868,18 +4813,18 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
                 cursor.execute(debug_query, (project_id,))
                 debug_row = cursor.fetchone()
                 if debug_row:
-                    print(f"🔍 Overlay Debug: Gesamt {debug_row[0]} Lastprofil-Daten für Projekt {project_id}")
+                    logger.debug('🔍 Overlay Debug: Gesamt %s Lastprofil-Daten für Projekt %s', debug_row[0], project_id)
                     if debug_row[0] > 0:
                         available_range = {
                             'min': str(debug_row[1]) if debug_row[1] else None,
                             'max': str(debug_row[2]) if debug_row[2] else None,
                             'count': debug_row[0]
                         }
-                        print(f"🔍 Overlay Debug: Verfügbarer Zeitraum: {available_range['min']} bis {available_range['max']}")
+                        logger.debug('🔍 Overlay Debug: Verfügbarer Zeitraum: %s bis %s', available_range['min'], available_range['max'])
                     else:
-                        print(f"⚠️ Overlay Debug: Keine Lastprofil-Daten für Projekt {project_id} vorhanden")
+                        logger.warning('⚠️ Overlay Debug: Keine Lastprofil-Daten für Projekt %s vorhanden', project_id)
             except Exception as e:
-                print(f"⚠️ Overlay Debug-Fehler: {e}")
+                logger.warning('⚠️ Overlay Debug-Fehler: %s', e)
                 import traceback
                 traceback.print_exc()
             
@@ -4902,10 +4847,14 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
             else:
                 response_data['message'] = "Keine Overlay-Daten für den gewählten Zeitraum gefunden."
             
-            print(f"📤 Overlay Response: {response_data}")
+            logger.debug('📤 Overlay Response: %s', response_data)
             return jsonify(response_data)
         
-        return jsonify({
+        # Gemeinsame Auswahl über alle vier Reihen, damit Spitzen jeder Reihe erhalten bleiben
+        overlay_data, downsampling = downsample_records(
+            overlay_data, ['load', 'pv_generation', 'hydro_generation', 'net_load'], max_points, sampling_method
+        )
+        response_data = {
             'success': True,
             'data': overlay_data,
             'count': len(overlay_data),
@@ -4914,10 +4863,16 @@ def get_overlay_data(project_id, time_range, start_date, end_date):
                 'pv_available': len(pv_data) > 0,
                 'hydro_available': len(hydro_data) > 0
             }
-        })
+        }
+        if downsampling:
+            response_data['downsampling'] = downsampling
+        return series_response(
+            response_data, ['load', 'pv_generation', 'hydro_generation', 'total_generation', 'net_load'],
+            fmt=response_format
+        )
         
     except Exception as e:
-        print(f"Fehler beim Laden der Overlay-Daten: {e}")
+        logger.error('Fehler beim Laden der Overlay-Daten: %s', e)
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)})
@@ -4952,7 +4907,7 @@ def api_data_overview(project_id):
                 """, (project_id,))
                 return cursor.fetchone()[0]
             except Exception as e:
-                print(f"⚠️ Fehler beim Zählen von {table_name}: {e}")
+                logger.warning('⚠️ Fehler beim Zählen von %s: %s', table_name, e)
                 return 0
         
         # Lastprofile zählen
@@ -4973,13 +4928,13 @@ def api_data_overview(project_id):
         # PVSol-Daten sind die gleichen wie Solar-Daten
         pvsol_data = solar_data
         
-        print(f"📊 Datenübersicht für Projekt {project_id}:")
-        print(f"  - Lastprofile: {load_profiles}")
-        print(f"  - Solar-Daten: {solar_data}")
-        print(f"  - Hydro-Daten: {hydro_data}")
-        print(f"  - Wetter-Daten: {weather_data}")
-        print(f"  - Wind-Daten: {wind_data}")
-        print(f"  - PVSol-Daten: {pvsol_data}")
+        logger.debug('📊 Datenübersicht für Projekt %s:', project_id)
+        logger.debug('  - Lastprofile: %s', load_profiles)
+        logger.debug('  - Solar-Daten: %s', solar_data)
+        logger.debug('  - Hydro-Daten: %s', hydro_data)
+        logger.debug('  - Wetter-Daten: %s', weather_data)
+        logger.debug('  - Wind-Daten: %s', wind_data)
+        logger.debug('  - PVSol-Daten: %s', pvsol_data)
         
         return jsonify({
             'success': True,
@@ -4992,7 +4947,7 @@ def api_data_overview(project_id):
         })
         
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Datenübersicht: {e}")
+        logger.error('❌ Fehler beim Laden der Datenübersicht: %s', e)
         return jsonify({'success': False, 'error': str(e)})
 
 @main_bp.route('/api/load-profiles/<int:profile_id>', methods=['DELETE'])
@@ -5024,9 +4979,9 @@ def api_delete_load_profile(profile_id):
         
         get_db().commit()
         
-        print(f"🗑️ Lastprofil '{profile_name}' (ID: {profile_id}) gelöscht")
-        print(f"   - {deleted_values} Datenpunkte gelöscht")
-        print(f"   - {deleted_profile} Profil-Eintrag gelöscht")
+        logger.debug("🗑️ Lastprofil '%s' (ID: %s) gelöscht", profile_name, profile_id)
+        logger.debug('   - %s Datenpunkte gelöscht', deleted_values)
+        logger.debug('   - %s Profil-Eintrag gelöscht', deleted_profile)
         
         return jsonify({
             'success': True,
@@ -5036,14 +4991,14 @@ def api_delete_load_profile(profile_id):
         })
         
     except Exception as e:
-        print(f"❌ Fehler beim Löschen des Lastprofils: {e}")
+        logger.error('❌ Fehler beim Löschen des Lastprofils: %s', e)
         return jsonify({'success': False, 'error': str(e)})
 
 @main_bp.route('/api/load-profiles/<string:profile_id>', methods=['DELETE'])
 def api_delete_load_profile_string(profile_id):
     """API-Endpoint zum Löschen eines Lastprofils mit String-ID (new_2, old_3, etc.)"""
     try:
-        print(f"🗑️ Lösche Lastprofil mit String-ID: {profile_id}")
+        logger.debug('🗑️ Lösche Lastprofil mit String-ID: %s', profile_id)
         
         # Präfix entfernen und echte ID extrahieren
         if profile_id.startswith('new_'):
@@ -5082,9 +5037,9 @@ def api_delete_load_profile_string(profile_id):
         
         get_db().commit()
         
-        print(f"🗑️ Lastprofil '{profile_name}' (ID: {profile_id}) aus {table_name} gelöscht")
-        print(f"   - {deleted_values} Datenpunkte aus {data_table} gelöscht")
-        print(f"   - {deleted_profile} Profil-Eintrag gelöscht")
+        logger.debug("🗑️ Lastprofil '%s' (ID: %s) aus %s gelöscht", profile_name, profile_id, table_name)
+        logger.debug('   - %s Datenpunkte aus %s gelöscht', deleted_values, data_table)
+        logger.debug('   - %s Profil-Eintrag gelöscht', deleted_profile)
         
         return jsonify({
             'success': True,
@@ -5095,7 +5050,7 @@ def api_delete_load_profile_string(profile_id):
         })
         
     except Exception as e:
-        print(f"❌ Fehler beim Löschen des Lastprofils: {e}")
+        logger.error('❌ Fehler beim Löschen des Lastprofils: %s', e)
         return jsonify({'success': False, 'error': str(e)}) 
 
 @main_bp.route('/api/ehyd-water-levels', methods=['POST'])
@@ -5116,18 +5071,18 @@ def api_ehyd_water_levels():
             start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
             end_date = start_date + timedelta(days=1)
         
-        print(f"🌊 Lade EHYD-Pegelstände für {start_date} bis {end_date}")
+        logger.debug('🌊 Lade EHYD-Pegelstände für %s bis %s', start_date, end_date)
         
         # EHYD Data Fetcher verwenden
         try:
             fetcher = EHYDDataFetcher()
             
             # Versuche echte EHYD-Daten zu laden
-            print("🌊 Versuche echte EHYD-Daten von ehyd.gv.at zu holen...")
+            logger.debug('🌊 Versuche echte EHYD-Daten von ehyd.gv.at zu holen...')
             ehyd_data = fetcher.fetch_current_levels()
             
             if ehyd_data and len(ehyd_data) > 0:
-                print(f"✅ {len(ehyd_data)} echte EHYD-Pegelstände erfolgreich geladen!")
+                logger.debug('✅ %s echte EHYD-Pegelstände erfolgreich geladen!', len(ehyd_data))
                 # Echte EHYD-Daten verfügbar - in Datenbank speichern
                 save_ehyd_data_to_db(ehyd_data)
                 return jsonify({
@@ -5137,7 +5092,7 @@ def api_ehyd_water_levels():
                     'message': f'{len(ehyd_data)} echte österreichische Pegelstände geladen'
                 })
             else:
-                print("⚠️ Keine echten EHYD-Daten verfügbar, verwende intelligente Demo-Daten")
+                logger.warning('⚠️ Keine echten EHYD-Daten verfügbar, verwende intelligente Demo-Daten')
                 # Fallback: Intelligente Demo-Daten basierend auf EHYD-Mustern
                 demo_data = fetcher.get_demo_data_based_on_ehyd(start_date, end_date)
                 return jsonify({
@@ -5148,7 +5103,7 @@ def api_ehyd_water_levels():
                 })
                 
         except ImportError as e:
-            print(f"❌ EHYD Data Fetcher nicht verfügbar: {e}")
+            logger.error('❌ EHYD Data Fetcher nicht verfügbar: %s', e)
             # Fallback: Alte Demo-Daten
             demo_data = generate_legacy_demo_water_levels(start_date, end_date)
             return jsonify({
@@ -5159,57 +5114,26 @@ def api_ehyd_water_levels():
             })
             
     except Exception as e:
-        print(f"❌ Fehler in EHYD-Pegelstände-API: {e}")
+        logger.error('❌ Fehler in EHYD-Pegelstände-API: %s', e)
         return jsonify({'error': str(e)}), 400
 
 def save_ehyd_data_to_db(ehyd_data):
-    """Speichert EHYD-Daten in der Datenbank"""
-    try:
-        cursor = get_db().cursor()
-        
-        for level_entry in ehyd_data:
-            timestamp = datetime.fromisoformat(level_entry['timestamp'])
-            water_level = level_entry['water_level_m']
-            flow_rate = level_entry.get('flow_rate_m3s', 0)
-            river_name = level_entry.get('river_name', 'Unbekannt')
-            station_name = level_entry.get('station_name', 'Unbekannt')
-            source = level_entry.get('source', 'EHYD')
-            region = level_entry.get('region', 'AT')
-            
-            # Prüfe ob Eintrag bereits existiert
-            cursor.execute("""
-                SELECT id FROM hydro_data 
-                WHERE timestamp = ? AND river_name = ? AND station_name = ?
-            """, (timestamp, river_name, station_name))
-            
-            existing = cursor.fetchone()
+    """Speichert EHYD-Daten in hydro_data (ein Batch statt SELECT/UPDATE/INSERT pro Messwert)"""
+    from .hydro_data import save_hydro_data
+    with closing(get_db()) as conn:
+        try:
+            result = save_hydro_data(conn, ehyd_data)
+            logger.debug('💾 %s EHYD-Daten in Datenbank gespeichert (%s neu, %s aktualisiert)', len(ehyd_data), result['inserted'], result['updated'])
             
-            if existing:
-                # Update existierenden Eintrag
-                cursor.execute("""
-                    UPDATE hydro_data 
-                    SET water_level_m = ?, flow_rate_m3s = ?, source = ?, region = ?, created_at = datetime('now')
-                    WHERE id = ?
-                """, (water_level, flow_rate, source, region, existing[0]))
-            else:
-                # Neuen Eintrag erstellen
-                cursor.execute("""
-                    INSERT INTO hydro_data (timestamp, water_level_m, flow_rate_m3s, river_name, station_name, source, region, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                """, (timestamp, water_level, flow_rate, river_name, station_name, source, region))
-        
-        get_db().commit()
-        print(f"💾 {len(ehyd_data)} EHYD-Daten in Datenbank gespeichert")
-        
-    except Exception as e:
-        print(f"❌ Fehler beim Speichern der EHYD-Daten: {e}")
-        get_db().rollback()
+        except Exception as e:
+            logger.error('❌ Fehler beim Speichern der EHYD-Daten: %s', e)
+            conn.rollback()
 
 @main_bp.route('/api/ehyd-water-levels/refresh', methods=['POST'])
 def api_refresh_ehyd_water_levels():
     """Manueller Refresh der EHYD-Daten"""
     try:
-        print("🔄 Manueller EHYD-Daten-Refresh gestartet...")
+        logger.debug('🔄 Manueller EHYD-Daten-Refresh gestartet...')
         
         fetcher = EHYDDataFetcher()
         
@@ -5234,7 +5158,7 @@ def api_refresh_ehyd_water_levels():
             })
             
     except Exception as e:
-        print(f"❌ Fehler beim EHYD-Refresh: {e}")
+        logger.error('❌ Fehler beim EHYD-Refresh: %s', e)
         return jsonify({
             'success': False,
             'error': f'Fehler beim Laden der EHYD-Daten: {str(e)}'
@@ -5301,9 +5225,9 @@ def fetch_ehyd_data():
                 'error': 'Flussschlüssel erforderlich'
             }), 400
         
-        print(f"🌊 Lade EHYD-Daten für Fluss: {river_key}")
-        print(f"📅 Zeitraum: {start_date} bis {end_date}")
-        print(f"📋 Projekt: {project_id}, Profil: {profile_name}")
+        logger.debug('🌊 Lade EHYD-Daten für Fluss: %s', river_key)
+        logger.debug('📅 Zeitraum: %s bis %s', start_date, end_date)
+        logger.debug('📋 Projekt: %s, Profil: %s', project_id, profile_name)
         
         fetcher = EHYDDataFetcher()
         
@@ -5319,42 +5243,26 @@ def fetch_ehyd_data():
             river_data = fetcher.get_demo_data(river_key, days)
         
         if not river_data or not river_data['water_levels']:
-            print("⚠️ Keine echten EHYD-Daten verfügbar, verwende Demo-Daten")
+            logger.warning('⚠️ Keine echten EHYD-Daten verfügbar, verwende Demo-Daten')
             # Fallback: Demo-Daten
             days = 30 if not start_date else (datetime.strptime(end_date, "%Y-%m-%d") - datetime.strptime(start_date, "%Y-%m-%d")).days
             river_data = fetcher.get_demo_data(river_key, days)
         
         if river_data and river_data['water_levels']:
-            # Daten in Datenbank speichern
-            conn = get_db()
-            cursor = conn.cursor()
-            
-            saved_count = 0
-            for level in river_data['water_levels']:
-                try:
-                    cursor.execute('''
-                        INSERT INTO water_level 
-                        (timestamp, water_level_cm, station_id, station_name, river_name, project_id, profile_name, source)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        level['timestamp'],
-                        level['water_level_cm'],
-                        level['station_id'],
-                        level['station_name'],
-                        level['river_name'],
-                        project_id,
-                        profile_name,
-                        'EHYD (Live)' if not river_data.get('demo') else 'EHYD (Demo)'
-                    ))
-                    saved_count += 1
-                except Exception as e:
-                    print(f"⚠️ Fehler beim Speichern von Datenpunkt: {e}")
-                    continue
-            
-            conn.commit()
-            conn.close()
+            # Daten in Datenbank speichern (ein Bulk-UPSERT statt INSERT pro Messwert)
+            from .hydro_data import sync_station_catalogue, upsert_water_levels
+            source = 'EHYD (Live)' if not river_data.get('demo') else 'EHYD (Demo)'
+            with closing(get_db()) as conn:
+                sync_station_catalogue(conn, fetcher.rivers, commit=False)
+                result = upsert_water_levels(
+                    conn,
+                    ({**level, 'source': source} for level in river_data['water_levels']),
+                    project_id=project_id,
+                    profile_name=profile_name,
+                )
+            saved_count = result['inserted'] + result['updated'] + result['unchanged']
             
-            print(f"✅ {saved_count} Pegelstanddaten in Datenbank gespeichert")
+            logger.debug('✅ %s Pegelstanddaten in Datenbank gespeichert', saved_count)
             
             return jsonify({
                 'success': True,
@@ -5378,7 +5286,7 @@ def fetch_ehyd_data():
             }), 404
             
     except Exception as e:
-        print(f"❌ Fehler beim Laden der EHYD-Daten: {e}")
+        logger.error('❌ Fehler beim Laden der EHYD-Daten: %s', e)
         return jsonify({
             'success': False,
             'error': f'Fehler beim Laden der EHYD-Daten: {str(e)}'
@@ -5386,57 +5294,32 @@ def fetch_ehyd_data():
 
 @main_bp.route('/api/water-levels')
 def get_water_levels():
-    """Gibt Pegelstanddaten aus der Datenbank zurück"""
+    """Gibt Pegelstanddaten aus der Datenbank zurück
+    
+    Query-Parameter: start_date, end_date, river_name, station_id, project_id,
+    format=columns|msgpack|arrow (oder Accept-Header) für spaltenweise Arrays statt
+    einer Liste von Datensätzen und max_points bzw. width mit downsample=lttb|minmax
+    (pro Station) für Charts
+    """
     try:
-        # Parameter aus Query-String
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
-        river_name = request.args.get('river_name')
-        project_id = request.args.get('project_id')
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        # SQL-Query aufbauen
-        query = "SELECT timestamp, water_level_cm, station_name, river_name, source FROM water_level WHERE 1=1"
-        params = []
-        
-        if start_date:
-            query += " AND timestamp >= ?"
-            params.append(start_date)
+        from .hydro_data import query_water_levels
         
-        if end_date:
-            query += " AND timestamp <= ?"
-            params.append(end_date + " 23:59:59")
-        
-        if river_name:
-            query += " AND river_name LIKE ?"
-            params.append(f"%{river_name}%")
-        
-        if project_id:
-            query += " AND project_id = ?"
-            params.append(project_id)
-        
-        query += " ORDER BY timestamp ASC"
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        # Daten formatieren
-        water_levels = []
-        for row in rows:
-            water_levels.append({
-                'timestamp': row[0],
-                'water_level_cm': float(row[1]),
-                'station_name': row[2],
-                'river_name': row[3],
-                'source': row[4]
-            })
-        
-        conn.close()
+        with closing(get_db()) as conn:
+            columns = query_water_levels(
+                conn,
+                start=request.args.get('start_date'),
+                end=request.args.get('end_date'),
+                river_name=request.args.get('river_name'),
+                station_id=request.args.get('station_id'),
+                project_id=request.args.get('project_id'),
+            )
+        columns, downsampling = downsample_columns(
+            columns, ['water_level_cm'], *downsampling_params(request.args), group_key='station_id'
+        )
+        count = len(columns['timestamp'])
         
         # Bestimme Datenquelle
-        sources = set(row[4] for row in rows) if rows else set()
+        sources = set(columns['source'])
         if 'EHYD (Live)' in sources:
             source_info = "EHYD (Austrian Power Grid) - Echte österreichische Pegelstände"
         elif 'EHYD (Demo)' in sources:
@@ -5444,20 +5327,98 @@ def get_water_levels():
         else:
             source_info = "Datenbank - Importierte Pegelstanddaten"
         
-        return jsonify({
+        response_format = negotiate_format()
+        if response_format != 'json':
+            data = {
+                'timestamp': columns['timestamp'],
+                'water_level_cm': columns['water_level_cm'].tolist(),
+                'station_id': columns['station_id'],
+                'station_name': columns['station_name'],
+                'river_name': columns['river_name'],
+                'source': columns['source'],
+            }
+        else:
+            data = [
+                {
+                    'timestamp': ts,
+                    'water_level_cm': level,
+                    'station_name': station_name,
+                    'river_name': river_name,
+                    'source': source,
+                }
+                for ts, level, station_name, river_name, source in zip(
+                    columns['timestamp'], columns['water_level_cm'].tolist(),
+                    columns['station_name'], columns['river_name'], columns['source'],
+                )
+            ]
+        
+        response_data = {
             'success': True,
-            'data': water_levels,
+            'data': data,
             'source': source_info,
-            'message': f'{len(water_levels)} Pegelstanddaten geladen'
-        })
+            'message': f'{count} Pegelstanddaten geladen'
+        }
+        if downsampling:
+            response_data['downsampling'] = downsampling
+        return series_response(response_data, ['water_level_cm'], fmt=response_format)
         
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Pegelstanddaten: {e}")
+        logger.error('❌ Fehler beim Laden der Pegelstanddaten: %s', e)
         return jsonify({
             'success': False,
             'error': f'Fehler beim Laden der Pegelstanddaten: {str(e)}'
         }), 500
 
+@main_bp.route('/api/hydro/power-profile')
+def get_hydro_power_profile():
+    """Wasserkraft-Leistungsprofil einer Station (spaltenweise)
+    
+    Query-Parameter: station_id (Pflicht), start_date, end_date sowie Anlagenkennlinie
+    rated_power_kw, head_m, efficiency, rating_a, rating_b, rating_h0_m, residual_flow_m3s
+    """
+    try:
+        from .hydro_data import HydroPlantCurve, hydro_power_profile
+        
+        station_id = request.args.get('station_id')
+        if not station_id:
+            return jsonify({'success': False, 'error': 'station_id ist erforderlich'}), 400
+        
+        plant_args = {
+            name: request.args.get(name, type=float)
+            for name in ('rated_power_kw', 'head_m', 'efficiency', 'rating_a', 'rating_b',
+                         'rating_h0_m', 'design_flow_m3s', 'min_turbine_flow_m3s', 'residual_flow_m3s')
+            if request.args.get(name) is not None
+        }
+        plant = HydroPlantCurve(**plant_args)
+        with closing(get_db()) as conn:
+            profile = hydro_power_profile(
+                conn, plant, station_id,
+                start=request.args.get('start_date'),
+                end=request.args.get('end_date'),
+            )
+        
+        return jsonify({
+            'success': True,
+            'station_id': station_id,
+            'records': len(profile['timestamp']),
+            'total_energy_kwh': profile['total_energy_kwh'],
+            'full_load_hours': profile['full_load_hours'],
+            'data': {
+                'timestamp': profile['timestamp'],
+                'water_level_cm': profile['water_level_cm'].tolist(),
+                'flow_m3s': profile['flow_m3s'].round(3).tolist(),
+                'power_kw': profile['power_kw'].round(2).tolist(),
+                'energy_kwh': profile['energy_kwh'].round(3).tolist(),
+            }
+        })
+        
+    except Exception as e:
+        logger.error('❌ Fehler beim Berechnen des Wasserkraft-Profils: %s', e)
+        return jsonify({
+            'success': False,
+            'error': f'Fehler beim Berechnen des Wasserkraft-Profils: {str(e)}'
+        }), 500
+
 @main_bp.route('/api/test-db', methods=['GET'])
 def test_db():
     """Test-Funktion für Datenbank-Verbindung"""
@@ -5525,10 +5486,11 @@ def export_economic_analysis_pdf(project_id):
         })
         
     except Exception as e:
-        print(f"Fehler beim PDF-Export: {e}")
+        logger.error('Fehler beim PDF-Export: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/economic-analysis/<int:project_id>/export-excel', methods=['POST'])
+@background_job('export_economic_excel')
 def export_economic_analysis_excel(project_id):
     """Exportiert Wirtschaftlichkeitsanalyse als Excel"""
     try:
@@ -5563,7 +5525,7 @@ def export_economic_analysis_excel(project_id):
         })
         
     except Exception as e:
-        print(f"Fehler beim Excel-Export: {e}")
+        logger.error('Fehler beim Excel-Export: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/economic-analysis/<int:project_id>/share', methods=['POST'])
@@ -5591,7 +5553,7 @@ def share_economic_analysis(project_id):
         })
         
     except Exception as e:
-        print(f"Fehler beim Teilen des Berichts: {e}")
+        logger.error('Fehler beim Teilen des Berichts: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/economic-analysis/<int:project_id>/10year-report')
@@ -5604,7 +5566,7 @@ def api_10year_revenue_potential(project_id):
         
         use_case = request.args.get('use_case', 'hybrid')
         
-        print(f"📊 Berechne 10-Jahres-Erlöspotenzial für Projekt {project_id} (Use Case: {use_case})")
+        logger.debug('📊 Berechne 10-Jahres-Erlöspotenzial für Projekt %s (Use Case: %s)', project_id, use_case)
         
         report_data = calculate_10_year_revenue_potential(project, use_case)
         
@@ -5620,7 +5582,7 @@ def api_10year_revenue_potential(project_id):
         })
         
     except Exception as e:
-        print(f"❌ Fehler bei 10-Jahres-Berechnung: {e}")
+        logger.error('❌ Fehler bei 10-Jahres-Berechnung: %s', e)
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
@@ -5737,6 +5699,7 @@ def api_get_wind_profiles(project_id):
 
 @main_bp.route('/api/geosphere/wind/import', methods=['POST'])
 @login_required
+@background_job('geosphere_wind_import')
 def api_geosphere_wind_import():
     """Importiert GeoSphere-Winddaten als Windprofil für ein Projekt."""
     try:
@@ -5751,12 +5714,16 @@ def api_geosphere_wind_import():
         if not project_id:
             return jsonify({'error': 'project_id wird benötigt.'}), 400
 
-        if not data.get('geosphere') or not data.get('wind_turbine') or not data.get('time_resolution'):
-            return jsonify({'error': 'geosphere, wind_turbine und time_resolution Konfiguration sind erforderlich.'}), 400
+        wind_park = data.get('wind_park')
+        if not data.get('geosphere') or not (data.get('wind_turbine') or wind_park) or not data.get('time_resolution'):
+            return jsonify({'error': 'geosphere, wind_turbine (oder wind_park) und time_resolution Konfiguration sind erforderlich.'}), 400
 
         # Validierung: Pflichtfelder in geosphere-Config prüfen
         geosphere = data.get('geosphere', {})
-        if not geosphere.get('station_id') or not geosphere.get('station_id').strip():
+        if wind_park:
+            if not wind_park.get('stations') or not wind_park.get('turbines'):
+                return jsonify({'error': 'wind_park benötigt stations und turbines.'}), 400
+        elif not geosphere.get('station_id') or not geosphere.get('station_id').strip():
             return jsonify({'error': 'station_id ist erforderlich (z.B. 11035).'}), 400
         if not geosphere.get('start') or not geosphere.get('start').strip():
             return jsonify({'error': 'start (ISO8601) ist erforderlich (z.B. 2024-01-01T00:00:00Z).'}), 400
@@ -5839,6 +5806,7 @@ def api_geosphere_wind_import():
             meta={
                 'geosphere': data.get('geosphere'),
                 'wind_turbine': data.get('wind_turbine'),
+                'wind_park': wind_park,
                 'time_resolution': data.get('time_resolution'),
                 'kpis': kpis,
             },
@@ -5859,6 +5827,7 @@ def api_geosphere_wind_import():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @main_bp.route('/api/economic-analysis/<int:project_id>/export-10year-pdf')
+@background_job('export_10year_pdf')
 def export_10year_pdf(project_id):
     """Exportiert 10-Jahres-Erlöspotenzial-Report als PDF"""
     try:
@@ -5896,7 +5865,7 @@ def export_10year_pdf(project_id):
         )
         
     except Exception as e:
-        print(f"❌ Fehler beim 10-Jahres-PDF-Export: {e}")
+        logger.error('❌ Fehler beim 10-Jahres-PDF-Export: %s', e)
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
@@ -5931,7 +5900,7 @@ def export_10year_excel(project_id):
         )
         
     except Exception as e:
-        print(f"❌ Fehler beim 10-Jahres-Excel-Export: {e}")
+        logger.error('❌ Fehler beim 10-Jahres-Excel-Export: %s', e)
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
@@ -5958,7 +5927,7 @@ def get_market_prices_api(project_id):
             'config_id': config.id if config else None
         })
     except Exception as e:
-        print(f"Fehler beim Laden der Marktpreise: {e}")
+        logger.error('Fehler beim Laden der Marktpreise: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/market-prices/<int:project_id>', methods=['POST', 'PUT'])
@@ -6009,10 +5978,11 @@ def save_market_prices_api(project_id):
         })
     except Exception as e:
         db.session.rollback()
-        print(f"Fehler beim Speichern der Marktpreise: {e}")
+        logger.error('Fehler beim Speichern der Marktpreise: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/market-prices/global', methods=['GET'])
+@cached_response('market_price_config', 'project')
 def get_global_market_prices_api():
     """Holt globale Marktpreis-Konfiguration"""
     try:
@@ -6026,7 +5996,7 @@ def get_global_market_prices_api():
             'config_id': config.id if config else None
         })
     except Exception as e:
-        print(f"Fehler beim Laden der globalen Marktpreise: {e}")
+        logger.error('Fehler beim Laden der globalen Marktpreise: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/market-prices/global', methods=['POST', 'PUT'])
@@ -6073,7 +6043,7 @@ def save_global_market_prices_api():
         })
     except Exception as e:
         db.session.rollback()
-        print(f"Fehler beim Speichern der globalen Marktpreise: {e}")
+        logger.error('Fehler beim Speichern der globalen Marktpreise: %s', e)
         return jsonify({'error': str(e)}), 400
 
 @main_bp.route('/api/download/<filename>')
@@ -6093,7 +6063,7 @@ def download_export(filename):
         )
         
     except Exception as e:
-        print(f"Fehler beim Download: {e}")
+        logger.error('Fehler beim Download: %s', e)
         return jsonify({'error': str(e)}), 400
 
 def get_economic_analysis_data(project_id):
@@ -6181,7 +6151,7 @@ def get_economic_analysis_data(project_id):
         }
         
     except Exception as e:
-        print(f"Fehler beim Laden der Wirtschaftlichkeitsanalyse-Daten: {e}")
+        logger.error('Fehler beim Laden der Wirtschaftlichkeitsanalyse-Daten: %s', e)
         return None
 def generate_economic_analysis_pdf(project, analysis_data):
     """Generiert PDF-Bericht für Wirtschaftlichkeitsanalyse"""
@@ -6344,7 +6314,7 @@ def generate_economic_analysis_pdf(project, analysis_data):
         return buffer.getvalue()
         
     except Exception as e:
-        print(f"Fehler beim PDF-Generieren: {e}")
+        logger.error('Fehler beim PDF-Generieren: %s', e)
         return None
 
 def generate_economic_analysis_excel(project, analysis_data):
@@ -6501,7 +6471,7 @@ def generate_economic_analysis_excel(project, analysis_data):
         return buffer.getvalue()
         
     except Exception as e:
-        print(f"Fehler beim Excel-Generieren: {e}")
+        logger.error('Fehler beim Excel-Generieren: %s', e)
         return None
 
 def share_economic_analysis_report(project, analysis_data, share_method, recipient):
@@ -6523,7 +6493,7 @@ def share_economic_analysis_report(project, analysis_data, share_method, recipie
             return "Unbekannte Share-Methode"
             
     except Exception as e:
-        print(f"Fehler beim Teilen des Berichts: {e}")
+        logger.error('Fehler beim Teilen des Berichts: %s', e)
         return f"Fehler beim Teilen: {str(e)}"
 
 # ===== NEUE INTELLIGENTE ERLÖSBERECHNUNGSFUNKTIONEN =====
@@ -6568,7 +6538,7 @@ def calculate_intelligent_revenues(project):
         }
         
     except Exception as e:
-        print(f"Fehler bei intelligenter Erlösberechnung: {e}")
+        logger.error('Fehler bei intelligenter Erlösberechnung: %s', e)
         return {
             'renewable_energy': {'photovoltaik': {}, 'windkraft': {}, 'wasserkraft': {}, 'total': 0},
             'bess_applications': {'peak_shaving': {}, 'intraday_trading': {}, 'secondary_market': {}, 'total': 0},
@@ -6774,7 +6744,7 @@ def get_market_prices(project_id=None):
                 'reference_year': global_config.reference_year if global_config.reference_year is not None else default_prices['reference_year']
             }
     except Exception as e:
-        print(f"⚠️ Fehler beim Laden der Marktpreis-Konfiguration: {e}")
+        logger.warning('⚠️ Fehler beim Laden der Marktpreis-Konfiguration: %s', e)
     
     # Fallback auf Standardwerte
     return default_prices
@@ -7311,7 +7281,7 @@ def generate_10year_report_pdf(project, report_data, use_case='hybrid'):
         return buffer.getvalue()
         
     except Exception as e:
-        print(f"❌ Fehler bei PDF-Generierung: {e}")
+        logger.error('❌ Fehler bei PDF-Generierung: %s', e)
         import traceback
         traceback.print_exc()
         return None
@@ -7550,7 +7520,7 @@ def generate_10year_report_excel(project, report_data, use_case='hybrid'):
         return filepath
         
     except Exception as e:
-        print(f"❌ Fehler bei Excel-Generierung: {e}")
+        logger.error('❌ Fehler bei Excel-Generierung: %s', e)
         import traceback
         traceback.print_exc()
         return None
@@ -7558,6 +7528,7 @@ def generate_10year_report_excel(project, report_data, use_case='hybrid'):
 # === NEUE API-ROUTES FÜR BESS-SIMULATION ERWEITERUNG ===
 
 @main_bp.route('/api/use-cases')
+@cached_response('use_case')
 def api_use_cases():
     """Alle Use Cases abrufen (projektabhängig)"""
     try:
@@ -7800,10 +7771,10 @@ def create_default_use_cases_for_project(project):
     
     try:
         db.session.commit()
-        print(f"✅ Standard-Use Cases für Projekt {project.id} ({project.name}) erstellt")
+        logger.debug('✅ Standard-Use Cases für Projekt %s (%s) erstellt', project.id, project.name)
     except Exception as e:
         db.session.rollback()
-        print(f"⚠️ Fehler beim Erstellen der Use Cases: {e}")
+        logger.warning('⚠️ Fehler beim Erstellen der Use Cases: %s', e)
     
     return use_cases
 
@@ -7861,12 +7832,12 @@ def api_create_use_case():
         db.session.add(use_case)
         db.session.commit()
         
-        print(f"✅ Use Case erfolgreich erstellt: ID={use_case.id}, Name={use_case.name}, Projekt={project_id}")
+        logger.debug('✅ Use Case erfolgreich erstellt: ID=%s, Name=%s, Projekt=%s', use_case.id, use_case.name, project_id)
         return jsonify({'success': True, 'id': use_case.id}), 201
     except Exception as e:
         db.session.rollback()
         error_msg = str(e)
-        print(f"❌ Fehler beim Erstellen des Use Cases: {error_msg}")
+        logger.error('❌ Fehler beim Erstellen des Use Cases: %s', error_msg)
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': f'Fehler beim Erstellen des Use Cases: {error_msg}'}), 500
@@ -7945,6 +7916,7 @@ def api_delete_use_case(use_case_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @main_bp.route('/api/revenue-models')
+@cached_response('revenue_model')
 def api_revenue_models():
     """Alle Erlösmodelle abrufen"""
     try:
@@ -8006,7 +7978,7 @@ def api_run_simulation():
         bess_size_mwh = bess_size / 1000  # kWh zu MWh
         bess_power_mw = bess_power / 1000  # kW zu MW
         
-        print(f"📊 BESS-Parameter: {bess_size} kWh = {bess_size_mwh} MWh, {bess_power} kW = {bess_power_mw} MW")
+        logger.debug('📊 BESS-Parameter: %s kWh = %s MWh, %s kW = %s MW', bess_size, bess_size_mwh, bess_power, bess_power_mw)
         
         # Use Case-spezifische Parameter basierend auf tatsächlichen Projektdaten
         use_case_config = {
@@ -8080,9 +8052,9 @@ def api_run_simulation():
                         if wind_values:
                             annual_wind_generation = sum([v.energy_kwh or 0 for v in wind_values]) / 1000.0
                     
-                    print(f"🌬️ Windprofil geladen: {wind_data.name}, Jahresertrag: {annual_wind_generation:.2f} MWh")
+                    logger.debug('🌬️ Windprofil geladen: %s, Jahresertrag: %.2f MWh', wind_data.name, annual_wind_generation)
             except Exception as e:
-                print(f"⚠️ Fehler beim Laden des Windprofils: {e}")
+                logger.warning('⚠️ Fehler beim Laden des Windprofils: %s', e)
         
         annual_generation = annual_pv_generation + annual_hydro_generation + annual_wind_generation
         
@@ -8164,11 +8136,11 @@ def api_run_simulation():
                 min_spot_price = min(prices)
                 max_spot_price = max(prices)
                 
-                print(f"📊 BESS-Simulation mit echten Spot-Preisen für {simulation_year}:")
-                print(f"   - Durchschnittspreis: {avg_spot_price:.2f} €/MWh")
-                print(f"   - Min Preis: {min_spot_price:.2f} €/MWh")
-                print(f"   - Max Preis: {max_spot_price:.2f} €/MWh")
-                print(f"   - Anzahl Datenpunkte: {len(prices)}")
+                logger.debug('📊 BESS-Simulation mit echten Spot-Preisen für %s:', simulation_year)
+                logger.debug('   - Durchschnittspreis: %.2f €/MWh', avg_spot_price)
+                logger.debug('   - Min Preis: %.2f €/MWh', min_spot_price)
+                logger.debug('   - Max Preis: %.2f €/MWh', max_spot_price)
+                logger.debug('   - Anzahl Datenpunkte: %s', len(prices))
                 
                 # Spot-Preis Szenario Anpassung basierend auf echten Daten
                 spot_price_scenarios = {
@@ -8178,7 +8150,7 @@ def api_run_simulation():
                 }
                 base_spot_price = spot_price_scenarios.get(spot_price_scenario, avg_spot_price)
             else:
-                print("⚠️ Keine Spot-Preise für Simulationsjahr verfügbar, verwende Fallback")
+                logger.warning('⚠️ Keine Spot-Preise für Simulationsjahr verfügbar, verwende Fallback')
                 # Fallback: Vereinfachte Szenarien - OPTIMISTISCHER
                 spot_price_scenarios = {
                     'current': 100.0,  # 100 €/MWh (erhöht von 80)
@@ -8188,7 +8160,7 @@ def api_run_simulation():
                 base_spot_price = spot_price_scenarios.get(spot_price_scenario, 100.0)
                 
         except Exception as e:
-            print(f"❌ Fehler beim Laden der Spot-Preise: {e}")
+            logger.error('❌ Fehler beim Laden der Spot-Preise: %s', e)
             # Fallback: Vereinfachte Szenarien - OPTIMISTISCHER
             spot_price_scenarios = {
                 'current': 100.0,  # 100 €/MWh (erhöht von 80)
@@ -8228,7 +8200,7 @@ def api_run_simulation():
         energy_stored = current_capacity_mwh * annual_cycles * bess_efficiency
         energy_discharged = energy_stored * bess_efficiency
         
-        print(f"📊 BESS-Berechnung: {annual_cycles} Zyklen, {energy_stored:.1f} MWh gespeichert, {energy_discharged:.1f} MWh entladen")
+        logger.debug('📊 BESS-Berechnung: %s Zyklen, %.1f MWh gespeichert, %.1f MWh entladen', annual_cycles, energy_stored, energy_discharged)
         
         # Erlösberechnung mit echten Spot-Preisen
         spot_price_eur_mwh = base_spot_price * mode_config['spot_price_multiplier']
@@ -8296,9 +8268,9 @@ def api_run_simulation():
                     'max_price_eur_mwh': round(max_spot_price, 2)
                 }
                 
-                print(f"✅ Optimierung aktiviert: {optimization_config.preferred_strategy} (+{(optimization_benefit - 1.0) * 100:.1f}% Erlös)")
+                logger.debug('✅ Optimierung aktiviert: %s (+%.1f%% Erlös)', optimization_config.preferred_strategy, (optimization_benefit - 1.0) * 100)
             except Exception as e:
-                print(f"⚠️ Fehler bei Optimierungs-Berechnung: {e}")
+                logger.warning('⚠️ Fehler bei Optimierungs-Berechnung: %s', e)
                 import traceback
                 traceback.print_exc()
                 optimization_benefit = 1.0
@@ -8348,7 +8320,7 @@ def api_run_simulation():
                     network_restrictions = NetworkRestrictions.query.filter_by(project_id=project_id).first()
                     export_limit_kw = network_restrictions.export_limit_kw if network_restrictions and network_restrictions.export_limit_kw else (bess_power * 0.8)
             except Exception as e:
-                print(f"⚠️ Fehler beim Laden des Export-Limits: {e}")
+                logger.warning('⚠️ Fehler beim Laden des Export-Limits: %s', e)
                 export_limit_kw = bess_power * 0.8  # Fallback
             bess_charge_capacity_kw = bess_power * 0.9  # 90% der Leistung für Ladekapazität
             bess_discharge_capacity_kw = bess_power * 0.9  # 90% der Leistung für Entladekapazität
@@ -8370,7 +8342,7 @@ def api_run_simulation():
                 pv_feed_in_revenue += co_location_benefits.get('revenue_increase_eur', 0.0)
                 # Grid-Fee-Ersparnis wird später von Kosten abgezogen
             except Exception as e:
-                print(f"⚠️ Fehler bei Co-Location-Berechnung: {e}")
+                logger.warning('⚠️ Fehler bei Co-Location-Berechnung: %s', e)
                 import traceback
                 traceback.print_exc()
                 # Fallback: Keine Co-Location-Vorteile
@@ -8426,8 +8398,7 @@ def api_run_simulation():
             base_investment = result[0] if result and result[0] else (bess_size_mwh * 120000)  # Fallback (drastisch reduziert von 200k)
             # ROADMAP STUFE 1: Second-Life Kostenvorteil anwenden
             total_investment = base_investment * (1 - second_life_cost_reduction / 100.0) if second_life_cost_reduction > 0 else base_investment
-            print(f"📊 UC1: Nur BESS-Investitionskosten: {total_investment:,.0f} €" + 
-                  (f" (Second-Life: -{second_life_cost_reduction:.0f}%)" if second_life_cost_reduction > 0 else ""))
+            logger.debug('%s', f'📊 UC1: Nur BESS-Investitionskosten: {total_investment:,.0f} €' + (f' (Second-Life: -{second_life_cost_reduction:.0f}%)' if second_life_cost_reduction > 0 else ''))
             
         elif use_case == 'UC2':
             # UC2: BESS + PV-Investitionskosten
@@ -8438,7 +8409,7 @@ def api_run_simulation():
             """, (project_id,))
             result = cursor.fetchone()
             total_investment = result[0] if result and result[0] else (bess_size_mwh * 200000 + config['pv_power_mwp'] * 600000)  # Fallback (reduziert)
-            print(f"📊 UC2: BESS + PV-Investitionskosten: {total_investment:,.0f} €")
+            logger.debug('📊 UC2: BESS + PV-Investitionskosten: %s €', format(total_investment, ',.0f'))
             
         elif use_case == 'UC3':
             # UC3: Alle Investitionskosten (BESS + PV + Hydro + Other)
@@ -8449,7 +8420,7 @@ def api_run_simulation():
             """, (project_id,))
             result = cursor.fetchone()
             total_investment = result[0] if result and result[0] else (bess_size_mwh * 200000)  # Fallback (reduziert)
-            print(f"📊 UC3: Alle Investitionskosten: {total_investment:,.0f} €")
+            logger.debug('📊 UC3: Alle Investitionskosten: %s €', format(total_investment, ',.0f'))
             
         else:
             # Fallback: Nur BESS-Investitionskosten
@@ -8657,7 +8628,7 @@ def api_ml_price_forecast():
         if not project_id:
             return jsonify({'error': 'Projekt-ID erforderlich'}), 400
         
-        print(f"🔮 Erstelle Preis-Prognose für Projekt {project_id}, {forecast_hours} Stunden")
+        logger.debug('🔮 Erstelle Preis-Prognose für Projekt %s, %s Stunden', project_id, forecast_hours)
         
         # Projekt abrufen
         project = Project.query.get(project_id)
@@ -8680,7 +8651,7 @@ def api_ml_price_forecast():
         historical_data = cursor.fetchall()
         
         if not historical_data:
-            print("⚠️ Keine historischen Daten für Prognose verfügbar")
+            logger.warning('⚠️ Keine historischen Daten für Prognose verfügbar')
             return jsonify({
                 'success': False,
                 'error': 'Keine historischen Preis-Daten für Prognose verfügbar',
@@ -8710,7 +8681,7 @@ def api_ml_price_forecast():
         })
         
     except Exception as e:
-        print(f"❌ Fehler bei Preis-Prognose: {e}")
+        logger.error('❌ Fehler bei Preis-Prognose: %s', e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 def generate_price_forecast(historical_data, forecast_hours):
@@ -8771,6 +8742,7 @@ def generate_price_forecast(historical_data, forecast_hours):
     return forecast_data
 
 @main_bp.route('/api/simulation/10-year-analysis', methods=['POST'])
+@background_job('10_year_analysis')
 def api_10_year_analysis():
     """10-Jahres-Analyse mit Batterie-Degradation und BESS-Modus"""
     try:
@@ -8976,8 +8948,8 @@ def n8n_webhook_trigger():
         
         # Hier würde der Webhook an n8n gesendet werden
         # Für jetzt loggen wir das Event
-        print(f"🔗 n8n Webhook Event: {event_type}")
-        print(f"📊 Event Data: {event_data}")
+        logger.debug('🔗 n8n Webhook Event: %s', event_type)
+        logger.debug('📊 Event Data: %s', event_data)
         
         # Simuliere n8n-Aufruf
         webhook_url = "http://localhost:5678/webhook/bess-events"  # n8n Standard-Port
@@ -8989,8 +8961,8 @@ def n8n_webhook_trigger():
         }
         
         # Hier würde requests.post(webhook_url, json=payload) aufgerufen werden
-        print(f"📤 Würde an n8n senden: {webhook_url}")
-        print(f"📦 Payload: {payload}")
+        logger.debug('📤 Würde an n8n senden: %s', webhook_url)
+        logger.debug('📦 Payload: %s', payload)
         
         return jsonify({
             'success': True,
@@ -9000,7 +8972,7 @@ def n8n_webhook_trigger():
         })
         
     except Exception as e:
-        print(f"❌ Fehler beim n8n Webhook: {e}")
+        logger.error('❌ Fehler beim n8n Webhook: %s', e)
         return jsonify({'success': False, 'error': str(e)}), 500
 @main_bp.route('/api/load-shifting/optimize', methods=['POST'])
 def api_optimize_load_shifting():
@@ -9051,6 +9023,7 @@ def api_optimize_load_shifting():
         return jsonify({'error': f'Fehler bei der Load-Shifting-Optimierung: {str(e)}'}), 500
 
 @main_bp.route('/api/grid-tariffs')
+@cached_response('grid_tariff')
 def api_grid_tariffs():
     """Netzentgelte abrufen"""
     try:
@@ -9069,6 +9042,7 @@ def api_grid_tariffs():
         return jsonify({'error': f'Fehler beim Abrufen der Netzentgelte: {str(e)}'}), 500
 
 @main_bp.route('/api/legal-charges')
+@cached_response('legal_charges')
 def api_legal_charges():
     """Gesetzliche Abgaben abrufen"""
     try:
@@ -9148,6 +9122,7 @@ def api_pvgis_locations():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @main_bp.route('/api/pvgis/fetch-solar-data', methods=['POST'])
+@background_job('pvgis_fetch')
 def api_pvgis_fetch_solar_data():
     """Solar-Daten von PVGIS abrufen und in Datenbank speichern"""
     try:
@@ -9183,7 +9158,7 @@ def api_pvgis_get_solar_data(location_key, year):
     """Solar-Daten aus Datenbank abrufen"""
     conn = None
     try:
-        print(f"🔄 Lade Solar-Daten für {location_key}, Jahr {year}...")
+        logger.debug('🔄 Lade Solar-Daten für %s, Jahr %s...', location_key, year)
         
         # Prüfe ob solar_data Tabelle existiert und welche Struktur sie hat
         conn = get_db()
@@ -9207,16 +9182,16 @@ def api_pvgis_get_solar_data(location_key, year):
         columns = cursor.fetchall()
         column_names = [col[1] for col in columns]
         
-        print(f"📊 solar_data Tabelle Spalten: {column_names}")
+        logger.debug('📊 solar_data Tabelle Spalten: %s', column_names)
         
         # Prüfe ob location_key Spalte existiert - wenn nicht, korrigiere die Tabelle automatisch
         if 'location_key' not in column_names:
-            print(f"⚠️ solar_data Tabelle hat falsche Struktur (SQLAlchemy-Modell). Korrigiere automatisch...")
+            logger.warning('⚠️ solar_data Tabelle hat falsche Struktur (SQLAlchemy-Modell). Korrigiere automatisch...')
             try:
                 # Alte Tabelle umbenennen (Backup)
                 cursor.execute("ALTER TABLE solar_data RENAME TO solar_data_old_sqlalchemy")
                 conn.commit()
-                print(f"✅ Alte Tabelle umbenannt zu 'solar_data_old_sqlalchemy'")
+                logger.debug("✅ Alte Tabelle umbenannt zu 'solar_data_old_sqlalchemy'")
                 
                 # Neue Tabelle mit korrekter PVGIS-Struktur erstellen
                 cursor.execute('''
@@ -9237,7 +9212,7 @@ def api_pvgis_get_solar_data(location_key, year):
                     )
                 ''')
                 conn.commit()
-                print(f"✅ Neue solar_data Tabelle mit korrekter Struktur erstellt")
+                logger.debug('✅ Neue solar_data Tabelle mit korrekter Struktur erstellt')
             except Exception as e:
                 conn.rollback()
                 if conn:
@@ -9258,7 +9233,7 @@ def api_pvgis_get_solar_data(location_key, year):
             conn.close()
         
         if not df.empty:
-            print(f"✅ {len(df)} Datensätze gefunden")
+            logger.debug('✅ %s Datensätze gefunden', len(df))
             
             # Daten für JSON-Serialisierung vorbereiten
             data = []
@@ -9281,14 +9256,14 @@ def api_pvgis_get_solar_data(location_key, year):
                 'data': data
             })
         else:
-            print(f"❌ Keine Daten gefunden für {location_key} ({year})")
+            logger.error('❌ Keine Daten gefunden für %s (%s)', location_key, year)
             return jsonify({
                 'success': False,
                 'error': f'Keine Solar-Daten gefunden für {location_key}, Jahr {year}. Bitte laden Sie zuerst die Solar-Daten über "Solar-Daten laden".'
             }), 404
             
     except pd.errors.DatabaseError as db_error:
-        print(f"❌ Datenbankfehler beim Laden der Solar-Daten: {db_error}")
+        logger.error('❌ Datenbankfehler beim Laden der Solar-Daten: %s', db_error)
         import traceback
         traceback.print_exc()
         if conn:
@@ -9298,7 +9273,7 @@ def api_pvgis_get_solar_data(location_key, year):
             'error': f'Datenbankfehler: {str(db_error)}'
         }), 500
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Solar-Daten: {e}")
+        logger.error('❌ Fehler beim Laden der Solar-Daten: %s', e)
         import traceback
         traceback.print_exc()
         if conn:
@@ -9369,7 +9344,7 @@ def api_pvgis_add_location():
 def api_pvgis_solar_statistics(location_key, year):
     """Statistiken für Solar-Daten berechnen"""
     try:
-        print(f"🔄 Berechne Solar-Statistiken für {location_key} ({year})")
+        logger.debug('🔄 Berechne Solar-Statistiken für %s (%s)', location_key, year)
         
         # Prüfe ob die Tabelle existiert
         conn = get_db()
@@ -9383,7 +9358,7 @@ def api_pvgis_solar_statistics(location_key, year):
         
         if not cursor.fetchone():
             # Demo-Daten zurückgeben wenn keine Tabelle existiert
-            print(f"⚠️ Solar-Daten Tabelle nicht gefunden - verwende Demo-Daten")
+            logger.warning('⚠️ Solar-Daten Tabelle nicht gefunden - verwende Demo-Daten')
             demo_statistics = {
                 'avg_irradiance': 450.5,
                 'max_irradiance': 1050.2,
@@ -9410,7 +9385,7 @@ def api_pvgis_solar_statistics(location_key, year):
         data_count = cursor.fetchone()[0]
         if data_count == 0:
             # Demo-Daten zurückgeben wenn keine Daten existieren
-            print(f"⚠️ Keine Solar-Daten für {location_key} ({year}) - verwende Demo-Daten")
+            logger.warning('⚠️ Keine Solar-Daten für %s (%s) - verwende Demo-Daten', location_key, year)
             demo_statistics = {
                 'avg_irradiance': 450.5,
                 'max_irradiance': 1050.2,
@@ -9458,7 +9433,7 @@ def api_pvgis_solar_statistics(location_key, year):
             'total_annual_kwh': round(float(df['global_irradiance'].sum() / 1000), 2) if 'global_irradiance' in df.columns else 0
         }
         
-        print(f"✅ Solar-Statistiken berechnet: {len(df)} Datensätze")
+        logger.debug('✅ Solar-Statistiken berechnet: %s Datensätze', len(df))
         
         return jsonify({
             'success': True,
@@ -9470,7 +9445,7 @@ def api_pvgis_solar_statistics(location_key, year):
         })
         
     except Exception as e:
-        print(f"❌ Fehler bei Solar-Statistiken: {e}")
+        logger.error('❌ Fehler bei Solar-Statistiken: %s', e)
         return jsonify({
             'success': False, 
             'error': f'Fehler bei der Solar-Potential Berechnung: {str(e)}'
@@ -9494,7 +9469,7 @@ def api_bess_simulation_with_solar():
         if not location_key:
             return jsonify({'success': False, 'error': 'location_key fehlt'}), 400
         
-        print(f"🔄 BESS-Simulation mit Solar-Daten: {location_key}, {pv_capacity} kWp, {bess_size} kWh, {bess_power} kW")
+        logger.debug('🔄 BESS-Simulation mit Solar-Daten: %s, %s kWp, %s kWh, %s kW', location_key, pv_capacity, bess_size, bess_power)
         
         # Solar-Daten abrufen
         conn = get_db()
@@ -9506,7 +9481,7 @@ def api_bess_simulation_with_solar():
                 ORDER BY datetime
             ''', conn, params=(location_key, year))
         except Exception as db_error:
-            print(f"❌ Datenbankfehler: {db_error}")
+            logger.error('❌ Datenbankfehler: %s', db_error)
             import traceback
             traceback.print_exc()
             if conn:
@@ -9602,7 +9577,7 @@ def api_bess_simulation_with_solar():
         })
         
     except ValueError as ve:
-        print(f"❌ Wertfehler bei BESS-Simulation: {ve}")
+        logger.error('❌ Wertfehler bei BESS-Simulation: %s', ve)
         import traceback
         traceback.print_exc()
         return jsonify({
@@ -9610,7 +9585,7 @@ def api_bess_simulation_with_solar():
             'error': f'Ungültige Eingabewerte: {str(ve)}'
         }), 400
     except Exception as e:
-        print(f"❌ Fehler bei BESS-Simulation: {e}")
+        logger.error('❌ Fehler bei BESS-Simulation: %s', e)
         import traceback
         traceback.print_exc()
         error_msg = str(e)
@@ -9813,6 +9788,7 @@ def api_calculate_austrian_market_revenue():
         }), 500
 
 @main_bp.route('/api/intraday/config', methods=['GET'])
+@cached_response(files=('config_enhanced.yaml',))
 def api_get_intraday_config():
     """
     Gibt die aktuelle Intraday-Konfiguration zurück
@@ -9841,7 +9817,7 @@ def api_get_intraday_config():
             'success': True,
             'config': intraday_config,
             'available_modes': ['theoretical', 'spread', 'threshold'],
-            'module_available': INTRADAY_AVAILABLE
+            'module_available': bool(INTRADAY_AVAILABLE)
         })
         
     except Exception as e:
@@ -9851,6 +9827,7 @@ def api_get_intraday_config():
         }), 500
 
 @main_bp.route('/api/austrian-markets/config', methods=['GET'])
+@cached_response(files=('config_enhanced.yaml',))
 def api_get_austrian_markets_config():
     """
     Gibt die aktuelle österreichische Markt-Konfiguration zurück
@@ -9885,7 +9862,7 @@ def api_get_austrian_markets_config():
         return jsonify({
             'success': True,
             'config': markets_config,
-            'module_available': AT_MARKET_AVAILABLE
+            'module_available': bool(AT_MARKET_AVAILABLE)
         })
         
     except Exception as e:
@@ -10210,13 +10187,21 @@ def api_get_dispatch_history(project_id):
                 'error': 'Dispatch-Integration nicht verfügbar'
             }), 503
         
+        envelope = {'success': True, 'project_id': project_id}
+        page = page_request()
+        if page.paginated or page.stream:
+            # Gesamte Historie seitenweise (neueste zuerst)
+            query = KeysetQuery("""
+                SELECT id, simulation_date, dispatch_mode, time_resolution_minutes,
+                       total_revenue, total_cost, net_cashflow, created_at
+                FROM dispatch_simulation
+                WHERE project_id = ?
+            """, (project_id,), key_columns=('simulation_date', 'id'), descending=True)
+            return keyset_response(query, get_db, envelope=envelope, items_key='dispatch_history')
+        
         history = dispatch_integration.get_dispatch_history(project_id)
         
-        return jsonify({
-            'success': True,
-            'project_id': project_id,
-            'dispatch_history': history
-        })
+        return jsonify(dict(envelope, dispatch_history=history))
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -10248,7 +10233,7 @@ def api_dispatch_status():
     """Status der Dispatch-Integration abrufen"""
     return jsonify({
         'success': True,
-        'dispatch_available': DISPATCH_AVAILABLE,
+        'dispatch_available': bool(DISPATCH_AVAILABLE),
         'status': 'active' if DISPATCH_AVAILABLE else 'unavailable',
         'timestamp': datetime.now().isoformat()
     })
@@ -10348,17 +10333,23 @@ def api_awattar_range():
                 'error': 'start_date und end_date Parameter sind erforderlich'
             }), 400
         
-        # Datumsbereich-Preise aus Datenbank abrufen
-        prices = awattar_fetcher.get_prices_for_range(start_date, end_date)
+        # Datumsbereich-Preise aus Datenbank abrufen (optional max_points/width für Charts)
+        prices, downsampling = downsample_records(
+            awattar_fetcher.get_prices_for_range(start_date, end_date),
+            ['price_eur_mwh'], *downsampling_params(request.args)
+        )
         
-        return jsonify({
+        response_data = {
             'success': True,
             'data': prices,
             'count': len(prices),
             'start_date': start_date,
             'end_date': end_date,
             'timestamp': datetime.now().isoformat()
-        })
+        }
+        if downsampling:
+            response_data['downsampling'] = downsampling
+        return series_response(response_data, ['price_eur_mwh'])
         
     except Exception as e:
         return jsonify({
@@ -10487,8 +10478,8 @@ def awattar_import_working_page():
 # WETTER-API ROUTES
 # ============================================================================
 
-# Weather API Fetcher importieren
-from weather_api_fetcher import WeatherAPIFetcher
+# Weather API Fetcher (verzögert)
+WeatherAPIFetcher = lazy_import('weather_api_fetcher', 'WeatherAPIFetcher')
 
 @main_bp.route('/api/weather/fetch', methods=['POST'])
 def api_weather_fetch():
@@ -10499,7 +10490,7 @@ def api_weather_fetch():
         lon = float(data.get('longitude', 16.3738))
         location_name = data.get('location_name', '')
         
-        print(f"🌤️ Wetterdaten-Request: {location_name} ({lat}, {lon})")
+        logger.debug('🌤️ Wetterdaten-Request: %s (%s, %s)', location_name, lat, lon)
         
         fetcher = WeatherAPIFetcher()
         weather_data = fetcher.get_weather_for_location(lat, lon, location_name)
@@ -10511,7 +10502,7 @@ def api_weather_fetch():
         })
         
     except Exception as e:
-        print(f"❌ Wetterdaten-Fetch Fehler: {e}")
+        logger.error('❌ Wetterdaten-Fetch Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -10551,7 +10542,7 @@ def api_weather_current():
             }), 404
             
     except Exception as e:
-        print(f"❌ Aktuelle Wetterdaten Fehler: {e}")
+        logger.error('❌ Aktuelle Wetterdaten Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -10594,7 +10585,7 @@ def api_weather_forecast():
             }), 404
             
     except Exception as e:
-        print(f"❌ Wettervorhersage Fehler: {e}")
+        logger.error('❌ Wettervorhersage Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -10638,7 +10629,7 @@ def api_weather_historical():
             }), 404
             
     except Exception as e:
-        print(f"❌ Historische Wetterdaten Fehler: {e}")
+        logger.error('❌ Historische Wetterdaten Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -10662,7 +10653,7 @@ def api_weather_status():
         })
         
     except Exception as e:
-        print(f"❌ Wetter-API Status Fehler: {e}")
+        logger.error('❌ Wetter-API Status Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -10692,7 +10683,7 @@ def api_weather_test():
         })
         
     except Exception as e:
-        print(f"❌ Wetter-API Test Fehler: {e}")
+        logger.error('❌ Wetter-API Test Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -10709,16 +10700,10 @@ def weather_import_page():
 # ENTSO-E API ROUTES
 # ============================================================================
 
-# ENTSO-E API Fetcher importieren
-from entsoe_api_fetcher import ENTSOEAPIFetcher
+# ENTSO-E API Fetcher und FTP-Import (verzögert)
+ENTSOEAPIFetcher = lazy_import('entsoe_api_fetcher', 'ENTSOEAPIFetcher')
 from app.services.entsoe_token_service import get_active_entsoe_token
-from import_entsoe_prices import (
-    combine_series as entsoe_combine_series,
-    DEFAULT_SOURCE as ENTSOE_DEFAULT_SOURCE,
-    DEFAULT_REGION as ENTSOE_DEFAULT_REGION,
-    DEFAULT_PRICE_TYPE as ENTSOE_DEFAULT_PRICE_TYPE,
-    DEFAULT_AREA as ENTSOE_DEFAULT_AREA,
-)
+entsoe_import = lazy_import('import_entsoe_prices')
 
 
 def _create_entsoe_fetcher():
@@ -10728,7 +10713,7 @@ def _create_entsoe_fetcher():
         if current_user.is_authenticated:
             user_token = get_active_entsoe_token(current_user.id)
     except Exception as exc:
-        print(f"⚠️ Fehler beim Laden des Benutzer-Tokens: {exc}")
+        logger.warning('⚠️ Fehler beim Laden des Benutzer-Tokens: %s', exc)
         user_token = None
     
     # Fallback auf Token aus config.py, wenn kein Benutzer-Token vorhanden
@@ -10737,9 +10722,9 @@ def _create_entsoe_fetcher():
             import config
             user_token = getattr(config, 'ENTSOE_API_TOKEN', None)
             if user_token:
-                print("ℹ️ Verwende ENTSO-E Token aus config.py")
+                logger.debug('ℹ️ Verwende ENTSO-E Token aus config.py')
         except Exception as exc:
-            print(f"⚠️ Fehler beim Laden des Config-Tokens: {exc}")
+            logger.warning('⚠️ Fehler beim Laden des Config-Tokens: %s', exc)
             user_token = None
     
     fetcher = ENTSOEAPIFetcher(api_key=user_token)
@@ -10747,59 +10732,29 @@ def _create_entsoe_fetcher():
     return fetcher, token_source
 def save_entsoe_prices_to_db(entsoe_prices, country_code='AT', price_type='day_ahead'):
     """Speichert ENTSO-E Preise in der Datenbank."""
+    from .price_ingestion import upsert_spot_prices
+    
     if not entsoe_prices:
         return 0
     
+    source_label = f"ENTSO-E ({price_type.replace('_', ' ').title()})"
+    records = [{
+        'timestamp': record.timestamp,
+        'price_eur_mwh': record.price_eur_mwh,
+        'region': record.country_code or country_code
+    } for record in entsoe_prices]
+    
+    conn = get_db()
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        timestamps = []
-        for record in entsoe_prices:
-            ts = record.timestamp
-            if ts.tzinfo:
-                ts = ts.replace(tzinfo=None)
-            timestamps.append(ts)
-        
-        if timestamps:
-            start_ts = min(timestamps)
-            end_ts = max(timestamps)
-            cursor.execute(
-                """
-                DELETE FROM spot_price
-                WHERE source LIKE 'ENTSO-E%%'
-                  AND timestamp BETWEEN ? AND ?
-                """,
-                (start_ts, end_ts)
-            )
-        
-        inserted = 0
-        source_label = f"ENTSO-E ({price_type.replace('_', ' ').title()})"
-        
-        for record, ts in zip(entsoe_prices, timestamps):
-            cursor.execute(
-                """
-                INSERT INTO spot_price
-                (timestamp, price_eur_mwh, source, region, price_type, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    ts,
-                    float(record.price_eur_mwh),
-                    source_label,
-                    record.country_code or country_code,
-                    price_type,
-                    datetime.utcnow()
-                )
-            )
-            inserted += 1
-        
-        conn.commit()
-        print(f"✅ {inserted} ENTSO-E Preise in DB gespeichert ({price_type})")
-        return inserted
+        result = upsert_spot_prices(conn, records, source=source_label, region=country_code, price_type=price_type)
+        stored = result['inserted'] + result['updated'] + result['unchanged']
+        logger.debug('✅ %s ENTSO-E Preise in DB gespeichert (%s): %s neu, %s aktualisiert, %s unverändert', stored, price_type, result['inserted'], result['updated'], result['unchanged'])
+        return stored
     except Exception as e:
-        print(f"❌ Fehler beim Speichern der ENTSO-E Daten: {e}")
+        logger.error('❌ Fehler beim Speichern der ENTSO-E Daten: %s', e)
         return 0
+    finally:
+        conn.close()
 
 
 def fetch_and_store_entsoe_prices(start_date, end_date, country_code='AT', price_type='day_ahead'):
@@ -10830,7 +10785,7 @@ def api_entsoe_fetch():
         data_type = data.get('data_type', 'day_ahead')
         hours = int(data.get('hours', 24))
         
-        print(f"🌍 ENTSO-E Request: {country_code} ({data_type}) - {hours}h")
+        logger.debug('🌍 ENTSO-E Request: %s (%s) - %sh', country_code, data_type, hours)
         
         fetcher = ENTSOEAPIFetcher()
         market_data = fetcher.get_market_data(country_code, data_type, hours)
@@ -10842,7 +10797,7 @@ def api_entsoe_fetch():
         })
         
     except Exception as e:
-        print(f"❌ ENTSO-E Fetch Fehler: {e}")
+        logger.error('❌ ENTSO-E Fetch Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -10860,9 +10815,8 @@ def api_entsoe_day_ahead():
         prices = fetcher.get_day_ahead_prices(country_code)
         
         if prices:
-            return jsonify({
-                'success': True,
-                'data': [
+            data, downsampling = downsample_records(
+                [
                     {
                         'timestamp': p.timestamp.isoformat(),
                         'price_eur_mwh': p.price_eur_mwh,
@@ -10872,8 +10826,16 @@ def api_entsoe_day_ahead():
                     }
                     for p in prices
                 ],
-                'count': len(prices)
-            })
+                ['price_eur_mwh'], *downsampling_params(request.args)
+            )
+            response_data = {
+                'success': True,
+                'data': data,
+                'count': len(data)
+            }
+            if downsampling:
+                response_data['downsampling'] = downsampling
+            return series_response(response_data, ['price_eur_mwh'])
         else:
             return jsonify({
                 'success': False,
@@ -10881,7 +10843,7 @@ def api_entsoe_day_ahead():
             }), 404
             
     except Exception as e:
-        print(f"❌ ENTSO-E Day-Ahead Fehler: {e}")
+        logger.error('❌ ENTSO-E Day-Ahead Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -10919,7 +10881,7 @@ def api_entsoe_intraday():
             }), 404
             
     except Exception as e:
-        print(f"❌ ENTSO-E Intraday Fehler: {e}")
+        logger.error('❌ ENTSO-E Intraday Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -10957,7 +10919,7 @@ def api_entsoe_generation():
             }), 404
             
     except Exception as e:
-        print(f"❌ ENTSO-E Generation Fehler: {e}")
+        logger.error('❌ ENTSO-E Generation Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -10980,7 +10942,7 @@ def api_entsoe_status():
         })
         
     except Exception as e:
-        print(f"❌ ENTSO-E Status Fehler: {e}")
+        logger.error('❌ ENTSO-E Status Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11009,7 +10971,7 @@ def api_entsoe_test():
         })
         
     except Exception as e:
-        print(f"❌ ENTSO-E Test Fehler: {e}")
+        logger.error('❌ ENTSO-E Test Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -11026,8 +10988,8 @@ def entsoe_import_page():
 # BLOCKCHAIN-ENERGIEHANDEL API ROUTES
 # ============================================================================
 
-# Blockchain Energy Fetcher importieren
-from blockchain_energy_fetcher import BlockchainEnergyFetcher
+# Blockchain Energy Fetcher (verzögert)
+BlockchainEnergyFetcher = lazy_import('blockchain_energy_fetcher', 'BlockchainEnergyFetcher')
 
 @main_bp.route('/api/blockchain/fetch', methods=['POST'])
 def api_blockchain_fetch():
@@ -11037,7 +10999,7 @@ def api_blockchain_fetch():
         hours = int(data.get('hours', 24))
         platform = data.get('platform', 'all')
         
-        print(f"🔗 Blockchain Request: {platform} - {hours}h")
+        logger.debug('🔗 Blockchain Request: %s - %sh', platform, hours)
         
         fetcher = BlockchainEnergyFetcher()
         
@@ -11078,7 +11040,7 @@ def api_blockchain_fetch():
         })
         
     except Exception as e:
-        print(f"❌ Blockchain Fetch Fehler: {e}")
+        logger.error('❌ Blockchain Fetch Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -11122,7 +11084,7 @@ def api_blockchain_power_ledger():
             }), 404
             
     except Exception as e:
-        print(f"❌ Power Ledger Fehler: {e}")
+        logger.error('❌ Power Ledger Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11165,7 +11127,7 @@ def api_blockchain_wepower():
             }), 404
             
     except Exception as e:
-        print(f"❌ WePower Fehler: {e}")
+        logger.error('❌ WePower Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11208,7 +11170,7 @@ def api_blockchain_grid_plus():
             }), 404
             
     except Exception as e:
-        print(f"❌ Grid+ Fehler: {e}")
+        logger.error('❌ Grid+ Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11251,7 +11213,7 @@ def api_blockchain_energy_web():
             }), 404
             
     except Exception as e:
-        print(f"❌ Energy Web Fehler: {e}")
+        logger.error('❌ Energy Web Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11294,7 +11256,7 @@ def api_blockchain_solarcoin():
             }), 404
             
     except Exception as e:
-        print(f"❌ SolarCoin Fehler: {e}")
+        logger.error('❌ SolarCoin Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11317,7 +11279,7 @@ def api_blockchain_status():
         })
         
     except Exception as e:
-        print(f"❌ Blockchain Status Fehler: {e}")
+        logger.error('❌ Blockchain Status Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11347,7 +11309,7 @@ def api_blockchain_test():
         })
         
     except Exception as e:
-        print(f"❌ Blockchain Test Fehler: {e}")
+        logger.error('❌ Blockchain Test Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -11364,8 +11326,8 @@ def blockchain_import_page():
 # SMART GRID API ROUTES
 # ============================================================================
 
-# Smart Grid Fetcher importieren
-from smart_grid_fetcher import SmartGridFetcher
+# Smart Grid Fetcher (verzögert)
+SmartGridFetcher = lazy_import('smart_grid_fetcher', 'SmartGridFetcher')
 
 @main_bp.route('/api/smart-grid/fetch', methods=['POST'])
 def api_smart_grid_fetch():
@@ -11375,7 +11337,7 @@ def api_smart_grid_fetch():
         hours = int(data.get('hours', 24))
         service_type = data.get('service_type', 'all')
         
-        print(f"🔌 Smart Grid Request: {service_type} - {hours}h")
+        logger.debug('🔌 Smart Grid Request: %s - %sh', service_type, hours)
         
         fetcher = SmartGridFetcher()
         
@@ -11416,7 +11378,7 @@ def api_smart_grid_fetch():
         })
         
     except Exception as e:
-        print(f"❌ Smart Grid Fetch Fehler: {e}")
+        logger.error('❌ Smart Grid Fetch Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -11461,7 +11423,7 @@ def api_smart_grid_fcr():
             }), 404
             
     except Exception as e:
-        print(f"❌ FCR Fehler: {e}")
+        logger.error('❌ FCR Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11505,7 +11467,7 @@ def api_smart_grid_afrr():
             }), 404
             
     except Exception as e:
-        print(f"❌ aFRR Fehler: {e}")
+        logger.error('❌ aFRR Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11548,7 +11510,7 @@ def api_smart_grid_mfrr():
             }), 404
             
     except Exception as e:
-        print(f"❌ mFRR Fehler: {e}")
+        logger.error('❌ mFRR Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11592,7 +11554,7 @@ def api_smart_grid_voltage():
             }), 404
             
     except Exception as e:
-        print(f"❌ Voltage Control Fehler: {e}")
+        logger.error('❌ Voltage Control Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11636,7 +11598,7 @@ def api_smart_grid_demand_response():
             }), 404
             
     except Exception as e:
-        print(f"❌ Demand Response Fehler: {e}")
+        logger.error('❌ Demand Response Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11677,7 +11639,7 @@ def api_smart_grid_stability():
             }), 404
             
     except Exception as e:
-        print(f"❌ Grid Stability Fehler: {e}")
+        logger.error('❌ Grid Stability Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11700,7 +11662,7 @@ def api_smart_grid_status():
         })
         
     except Exception as e:
-        print(f"❌ Smart Grid Status Fehler: {e}")
+        logger.error('❌ Smart Grid Status Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11730,7 +11692,7 @@ def api_smart_grid_test():
         })
         
     except Exception as e:
-        print(f"❌ Smart Grid Test Fehler: {e}")
+        logger.error('❌ Smart Grid Test Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -11747,8 +11709,8 @@ def smart_grid_import_page():
 # IOT SENSOR API ROUTES
 # ============================================================================
 
-# IoT Sensor Fetcher importieren
-from iot_sensor_fetcher import IoTSensorFetcher
+# IoT Sensor Fetcher (verzögert)
+IoTSensorFetcher = lazy_import('iot_sensor_fetcher', 'IoTSensorFetcher')
 
 @main_bp.route('/api/iot/fetch', methods=['POST'])
 def api_iot_fetch():
@@ -11758,7 +11720,7 @@ def api_iot_fetch():
         hours = int(data.get('hours', 24))
         sensor_type = data.get('sensor_type', 'all')
         
-        print(f"📡 IoT Request: {sensor_type} - {hours}h")
+        logger.debug('📡 IoT Request: %s - %sh', sensor_type, hours)
         
         fetcher = IoTSensorFetcher()
         
@@ -11797,7 +11759,7 @@ def api_iot_fetch():
         })
         
     except Exception as e:
-        print(f"❌ IoT Fetch Fehler: {e}")
+        logger.error('❌ IoT Fetch Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -11842,7 +11804,7 @@ def api_iot_battery():
             }), 404
             
     except Exception as e:
-        print(f"❌ Battery Sensor Fehler: {e}")
+        logger.error('❌ Battery Sensor Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11885,7 +11847,7 @@ def api_iot_pv():
             }), 404
             
     except Exception as e:
-        print(f"❌ PV Sensor Fehler: {e}")
+        logger.error('❌ PV Sensor Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11928,7 +11890,7 @@ def api_iot_grid():
             }), 404
             
     except Exception as e:
-        print(f"❌ Grid Sensor Fehler: {e}")
+        logger.error('❌ Grid Sensor Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11969,7 +11931,7 @@ def api_iot_environmental():
             }), 404
             
     except Exception as e:
-        print(f"❌ Environmental Sensor Fehler: {e}")
+        logger.error('❌ Environmental Sensor Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -11993,7 +11955,7 @@ def api_iot_status():
         })
         
     except Exception as e:
-        print(f"❌ IoT Status Fehler: {e}")
+        logger.error('❌ IoT Status Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -12023,7 +11985,7 @@ def api_iot_test():
         })
         
     except Exception as e:
-        print(f"❌ IoT Test Fehler: {e}")
+        logger.error('❌ IoT Test Fehler: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -12040,6 +12002,7 @@ def iot_import_page():
 
 @main_bp.route('/api/sizing/ps-ll-optimization', methods=['POST'])
 @login_required
+@background_job('ps_ll_sizing')
 def ps_ll_sizing_optimization():
     """PS/LL-Sizing mit Exhaustionsmethode"""
     try:
@@ -12048,8 +12011,8 @@ def ps_ll_sizing_optimization():
         sizing_strategy = data.get('sizing_strategy', 'ps_ll')
         constraints_data = data.get('constraints', {})
         
-        print(f"🎯 Optimierungsstrategie: {sizing_strategy}")
-        print(f"📊 Constraints: {constraints_data}")
+        logger.debug('🎯 Optimierungsstrategie: %s', sizing_strategy)
+        logger.debug('📊 Constraints: %s', constraints_data)
         
         if not project_id:
             return jsonify({'error': 'Projekt-ID erforderlich'}), 400
@@ -12064,23 +12027,21 @@ def ps_ll_sizing_optimization():
         if not load_profiles:
             return jsonify({'error': 'Kein Lastprofil für Projekt gefunden'}), 400
         
-        # Wähle das Lastprofil mit den meisten Lastwerten
-        best_profile = None
-        max_values = 0
-        for profile in load_profiles:
-            value_count = LoadValue.query.filter_by(load_profile_id=profile.id).count()
-            if value_count > max_values:
-                max_values = value_count
-                best_profile = profile
-        
-        load_profile = best_profile
-        print(f"📊 Verwende Lastprofil: {load_profile.name} mit {max_values} Lastwerten")
+        # Wähle das Lastprofil mit den meisten Lastwerten (Zeilenzahlen aus load_profile_stats)
+        conn = get_db()
+        try:
+            value_counts = profile_row_counts(conn, 'load_profile', [profile.id for profile in load_profiles])
+        finally:
+            conn.close()
+        load_profile = max(load_profiles, key=lambda profile: value_counts.get(profile.id, 0))
+        max_values = value_counts.get(load_profile.id, 0)
+        logger.debug('📊 Verwende Lastprofil: %s mit %s Lastwerten', load_profile.name, max_values)
         
         # Lastwerte laden
         load_values = LoadValue.query.filter_by(load_profile_id=load_profile.id).all()
         if not load_values:
             # Demo-Lastwerte erstellen falls keine vorhanden
-            print("⚠️ Keine Lastwerte gefunden - erstelle Demo-Lastwerte")
+            logger.warning('⚠️ Keine Lastwerte gefunden - erstelle Demo-Lastwerte')
             import datetime
             
             # Demo-Lastwerte für einen Monat (Januar 2024)
@@ -12105,7 +12066,7 @@ def ps_ll_sizing_optimization():
             # Demo-Werte in Datenbank speichern
             db.session.add_all(demo_load_values)
             db.session.commit()
-            print(f"✅ {len(demo_load_values)} Demo-Lastwerte erstellt")
+            logger.debug('✅ %s Demo-Lastwerte erstellt', len(demo_load_values))
             
             # Lastwerte erneut laden
             load_values = LoadValue.query.filter_by(load_profile_id=load_profile.id).all()
@@ -12133,10 +12094,10 @@ def ps_ll_sizing_optimization():
         market_df = pd.DataFrame(market_data)
         if not market_df.empty:
             market_df.set_index('timestamp', inplace=True)
-            print(f"📊 {len(market_data)} Spot-Preise geladen")
+            logger.debug('📊 %s Spot-Preise geladen', len(market_data))
         else:
             # Demo-Marktdaten erstellen falls keine vorhanden
-            print("⚠️ Keine Spot-Preise gefunden - erstelle Demo-Marktdaten")
+            logger.warning('⚠️ Keine Spot-Preise gefunden - erstelle Demo-Marktdaten')
             market_df = pd.DataFrame({
                 'timestamp': load_df.index,
                 'spot_price_eur_mwh': 50 + 30 * np.sin(2 * np.pi * np.arange(len(load_df)) / 96)
@@ -12155,7 +12116,7 @@ def ps_ll_sizing_optimization():
             'annual_consumption_mwh': annual_consumption_mwh
         }
         
-        print(f"📊 Jährlicher Verbrauch berechnet: {annual_consumption_mwh:.1f} MWh")
+        logger.debug('📊 Jährlicher Verbrauch berechnet: %.1f MWh', annual_consumption_mwh)
         
         # Constraints
         constraints = PSLLConstraints(
@@ -12171,11 +12132,11 @@ def ps_ll_sizing_optimization():
         )
         
         # Optimizer erstellen und ausführen
-        print("🚀 Starte PS/LL-Optimierung...")
+        logger.debug('🚀 Starte PS/LL-Optimierung...')
         
         # Für bessere Performance: Nur einen Monat der Daten verwenden
         if len(load_df) > 720:  # Mehr als 30 Tage * 24h
-            print("⚠️ Zu viele Daten - verwende nur Januar 2024 für Demo")
+            logger.warning('⚠️ Zu viele Daten - verwende nur Januar 2024 für Demo')
             load_df_sample = load_df.head(720)  # Erste 30 Tage
             market_df_sample = market_df.head(720) if len(market_df) > 720 else market_df
         else:
@@ -12184,8 +12145,8 @@ def ps_ll_sizing_optimization():
         
         try:
             # ECHTE BESS-Sizing-Optimierung mit Exhaustionsmethode
-            print(f"🔄 Führe {sizing_strategy.upper()}-Optimierung durch...")
-            print("📊 Schritt 1: Suche nach machbarem BESS-Parameterraum")
+            logger.debug('🔄 Führe %s-Optimierung durch...', sizing_strategy.upper())
+            logger.debug('📊 Schritt 1: Suche nach machbarem BESS-Parameterraum')
             
             # Strategie-spezifische Parameter
             if sizing_strategy == 'ps_ll':
@@ -12212,27 +12173,30 @@ def ps_ll_sizing_optimization():
             
             # Schritt 1: Machbarer Parameterraum
             feasible_combinations = []
-            print(f"🔍 Teste {len(p_range)}x{len(q_range)} = {len(p_range)*len(q_range)} Kombinationen...")
+            logger.debug('🔍 Teste %sx%s = %s Kombinationen...', len(p_range), len(q_range), len(p_range) * len(q_range))
             
-            for p_ess in p_range:
+            for i, p_ess in enumerate(p_range):
+                report_progress(0.5 * i / len(p_range), 'Machbarer Parameterraum')
                 for q_ess in q_range:
                     # Strategie-spezifische Anforderungen prüfen
                     if check_function(load_df_sample, p_ess, q_ess):
                         feasible_combinations.append((p_ess, q_ess))
             
-            print(f"✅ {len(feasible_combinations)} machbare Kombinationen gefunden")
+            logger.debug('✅ %s machbare Kombinationen gefunden', len(feasible_combinations))
             
             if not feasible_combinations:
-                print("⚠️ Keine machbaren Kombinationen - verwende Fallback")
+                logger.warning('⚠️ Keine machbaren Kombinationen - verwende Fallback')
                 optimal_power = min(project.bess_power or 1000, constraints.grid_connection_mw * 1000)
                 optimal_capacity = min(project.bess_size or 2000, optimal_power * 2)
             else:
                 # Schritt 2: Optimaler Punkt basierend auf Kostenvorteil
-                print("📊 Schritt 2: Suche nach optimalem Punkt im machbaren Raum")
+                logger.debug('📊 Schritt 2: Suche nach optimalem Punkt im machbaren Raum')
                 best_combination = None
                 best_cost_advantage = -float('inf')
                 
-                for p_ess, q_ess in feasible_combinations:
+                for i, (p_ess, q_ess) in enumerate(feasible_combinations):
+                    if i % 10 == 0:
+                        report_progress(0.5 + 0.5 * i / len(feasible_combinations), 'Kostenvorteil je Kombination')
                     cost_advantage = _calculate_cost_advantage(
                         load_df_sample, market_df_sample, p_ess, q_ess, 
                         project.current_electricity_cost or 0.12
@@ -12242,8 +12206,8 @@ def ps_ll_sizing_optimization():
                         best_combination = (p_ess, q_ess)
                 
                 optimal_power, optimal_capacity = best_combination
-                print(f"🎯 Optimale Kombination: {optimal_power} kW, {optimal_capacity} kWh")
-                print(f"💰 Kostenvorteil: {best_cost_advantage:,.0f} €/Jahr")
+                logger.debug('🎯 Optimale Kombination: %s kW, %s kWh', optimal_power, optimal_capacity)
+                logger.debug('💰 Kostenvorteil: %s €/Jahr', format(best_cost_advantage, ',.0f'))
             
             # Kostenberechnung
             investment_cost_per_kw = 800  # €/kW
@@ -12286,7 +12250,7 @@ def ps_ll_sizing_optimization():
             feasible_region.sort(key=lambda x: x['cost_advantage_eur'], reverse=True)
             
             # ECHTE Heatmap-Daten aus Optimierungsergebnissen generieren
-            print("📊 Generiere echte ROI Heatmap...")
+            logger.debug('📊 Generiere echte ROI Heatmap...')
             
             # Erstelle Heatmap-Matrix für alle getesteten Kombinationen
             heatmap_p_values = sorted(list(set([p for p, q in feasible_combinations])))
@@ -12313,12 +12277,12 @@ def ps_ll_sizing_optimization():
                 'z': z_matrix
             }
             
-            print(f"🔥 ECHTE Heatmap-Daten erstellt:")
-            print(f"   X-Werte: {len(heatmap_p_values)} Punkte von {min(heatmap_p_values)} bis {max(heatmap_p_values)} kW")
-            print(f"   Y-Werte: {len(heatmap_q_values)} Punkte von {min(heatmap_q_values)} bis {max(heatmap_q_values)} kWh")
-            print(f"   Z-Matrix: {len(z_matrix)}x{len(z_matrix[0])} mit echten Kostenvorteilen")
-            print(f"   Erste Z-Zeile: {z_matrix[0] if z_matrix else 'Leer'}")
-            print(f"   Max Kostenvorteil: {max([max(row) for row in z_matrix]) if z_matrix else 0:,.0f} €/Jahr")
+            logger.debug('🔥 ECHTE Heatmap-Daten erstellt:')
+            logger.debug('   X-Werte: %s Punkte von %s bis %s kW', len(heatmap_p_values), min(heatmap_p_values), max(heatmap_p_values))
+            logger.debug('   Y-Werte: %s Punkte von %s bis %s kWh', len(heatmap_q_values), min(heatmap_q_values), max(heatmap_q_values))
+            logger.debug('   Z-Matrix: %sx%s mit echten Kostenvorteilen', len(z_matrix), len(z_matrix[0]))
+            logger.debug('   Erste Z-Zeile: %s', z_matrix[0] if z_matrix else 'Leer')
+            logger.debug('   Max Kostenvorteil: %s €/Jahr', format(max([max(row) for row in z_matrix]) if z_matrix else 0, ',.0f'))
             
             strategy_comparison = {
                 'ps_ll': {
@@ -12353,10 +12317,10 @@ def ps_ll_sizing_optimization():
                 strategy_comparison=strategy_comparison
             )
             
-            print("✅ ECHTE BESS-Sizing-Optimierung erfolgreich abgeschlossen")
+            logger.debug('✅ ECHTE BESS-Sizing-Optimierung erfolgreich abgeschlossen')
         except Exception as e:
-            print(f"⚠️ Optimizer-Fehler: {e}")
-            print("🔄 Verwende Demo-Ergebnis...")
+            logger.warning('⚠️ Optimizer-Fehler: %s', e)
+            logger.debug('🔄 Verwende Demo-Ergebnis...')
             # Fallback: Realistische Demo-Ergebnisse
             # Demo Feasible Region und Heatmap
             feasible_region = []
@@ -12398,11 +12362,11 @@ def ps_ll_sizing_optimization():
             }
             
             # Debug-Ausgabe
-            print(f"🔥 FALLBACK-TEST-Heatmap-Daten erstellt:")
-            print(f"   X-Werte: {test_x}")
-            print(f"   Y-Werte: {test_y}") 
-            print(f"   Z-Matrix: {len(test_z)}x{len(test_z[0])}")
-            print(f"   Erste Z-Zeile: {test_z[0]}")
+            logger.debug('🔥 FALLBACK-TEST-Heatmap-Daten erstellt:')
+            logger.debug('   X-Werte: %s', test_x)
+            logger.debug('   Y-Werte: %s', test_y) 
+            logger.debug('   Z-Matrix: %sx%s', len(test_z), len(test_z[0]))
+            logger.debug('   Erste Z-Zeile: %s', test_z[0])
             
             strategy_comparison = {
                 'ps_ll': {
@@ -12438,13 +12402,13 @@ def ps_ll_sizing_optimization():
             )
         
         # Debug: Was wird an Frontend gesendet?
-        print(f"📤 Sende Ergebnis an Frontend:")
-        print(f"   Heatmap-Daten Typ: {type(result.cost_heatmap_data)}")
-        print(f"   Heatmap-Daten Keys: {list(result.cost_heatmap_data.keys()) if result.cost_heatmap_data else 'None'}")
+        logger.debug('📤 Sende Ergebnis an Frontend:')
+        logger.debug('   Heatmap-Daten Typ: %s', type(result.cost_heatmap_data))
+        logger.debug('   Heatmap-Daten Keys: %s', list(result.cost_heatmap_data.keys()) if result.cost_heatmap_data else 'None')
         if result.cost_heatmap_data:
-            print(f"   X-Werte: {len(result.cost_heatmap_data.get('x', []))} Punkte")
-            print(f"   Y-Werte: {len(result.cost_heatmap_data.get('y', []))} Punkte")
-            print(f"   Z-Matrix: {len(result.cost_heatmap_data.get('z', []))} Zeilen")
+            logger.debug('   X-Werte: %s Punkte', len(result.cost_heatmap_data.get('x', [])))
+            logger.debug('   Y-Werte: %s Punkte', len(result.cost_heatmap_data.get('y', [])))
+            logger.debug('   Z-Matrix: %s Zeilen', len(result.cost_heatmap_data.get('z', [])))
         
         # Ergebnis-Objekt erstellen
         result_data = {
@@ -12460,8 +12424,8 @@ def ps_ll_sizing_optimization():
             'strategy_comparison': result.strategy_comparison
         }
         
-        print(f"📤 Result-Objekt erstellt mit {len(result_data)} Feldern")
-        print(f"📤 Heatmap-Daten im Result: {result_data.get('heatmap_data', 'FEHLT')}")
+        logger.debug('📤 Result-Objekt erstellt mit %s Feldern', len(result_data))
+        logger.debug('📤 Heatmap-Daten im Result: %s', result_data.get('heatmap_data', 'FEHLT'))
         
         # Ergebnis als JSON zurückgeben
         return jsonify({
@@ -12471,7 +12435,7 @@ def ps_ll_sizing_optimization():
         })
         
     except Exception as e:
-        print(f"❌ PS/LL-Sizing-Optimierung fehlgeschlagen: {e}")
+        logger.error('❌ PS/LL-Sizing-Optimierung fehlgeschlagen: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -12535,7 +12499,7 @@ def sizing_strategy_comparison():
         })
         
     except Exception as e:
-        print(f"Strategievergleich fehlgeschlagen: {e}")
+        logger.error('Strategievergleich fehlgeschlagen: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -12585,7 +12549,7 @@ def get_sizing_heatmap_data():
         })
         
     except Exception as e:
-        print(f"Heatmap-Daten-Generierung fehlgeschlagen: {e}")
+        logger.error('Heatmap-Daten-Generierung fehlgeschlagen: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -12609,9 +12573,9 @@ def bess_sizing_simple():
 def debug_projects():
     """Debug-Route für Projekte"""
     try:
-        print("🔍 Debug API aufgerufen")
+        logger.debug('🔍 Debug API aufgerufen')
         projects = Project.query.all()
-        print(f"📊 {len(projects)} Projekte gefunden")
+        logger.debug('📊 %s Projekte gefunden', len(projects))
         
         result = {
             'total_projects': len(projects),
@@ -12624,10 +12588,10 @@ def debug_projects():
             ]
         }
         
-        print(f"✅ Debug API Response: {result}")
+        logger.debug('✅ Debug API Response: %s', result)
         return jsonify(result)
     except Exception as e:
-        print(f"❌ Debug API Fehler: {e}")
+        logger.error('❌ Debug API Fehler: %s', e)
         return jsonify({'error': str(e)}), 500
 
 def _check_ps_ll_requirements(load_df, p_ess, q_ess):
@@ -12648,7 +12612,7 @@ def _check_ps_ll_requirements(load_df, p_ess, q_ess):
         
         return ps_feasible and ll_feasible
     except Exception as e:
-        print(f"⚠️ Fehler bei PS/LL-Prüfung: {e}")
+        logger.warning('⚠️ Fehler bei PS/LL-Prüfung: %s', e)
         return False
 
 def _check_arbitrage_requirements(load_df, p_ess, q_ess):
@@ -12667,7 +12631,7 @@ def _check_arbitrage_requirements(load_df, p_ess, q_ess):
         
         return power_feasible and capacity_feasible
     except Exception as e:
-        print(f"⚠️ Fehler bei Arbitrage-Prüfung: {e}")
+        logger.warning('⚠️ Fehler bei Arbitrage-Prüfung: %s', e)
         return False
 
 def _check_grid_services_requirements(load_df, p_ess, q_ess):
@@ -12686,7 +12650,7 @@ def _check_grid_services_requirements(load_df, p_ess, q_ess):
         
         return power_feasible and capacity_feasible
     except Exception as e:
-        print(f"⚠️ Fehler bei Grid Services-Prüfung: {e}")
+        logger.warning('⚠️ Fehler bei Grid Services-Prüfung: %s', e)
         return False
 
 def _check_hybrid_requirements(load_df, p_ess, q_ess):
@@ -12707,7 +12671,7 @@ def _check_hybrid_requirements(load_df, p_ess, q_ess):
         
         return ps_feasible and ll_feasible
     except Exception as e:
-        print(f"⚠️ Fehler bei Hybrid-Prüfung: {e}")
+        logger.warning('⚠️ Fehler bei Hybrid-Prüfung: %s', e)
         return False
 
 def _calculate_cost_advantage(load_df, market_df, p_ess, q_ess, electricity_cost):
@@ -12732,7 +12696,7 @@ def _calculate_cost_advantage(load_df, market_df, p_ess, q_ess, electricity_cost
         
         return total_cost_advantage
     except Exception as e:
-        print(f"⚠️ Fehler bei Kostenvorteil-Berechnung: {e}")
+        logger.warning('⚠️ Fehler bei Kostenvorteil-Berechnung: %s', e)
         return 0.0
 
 # ============================================================================
@@ -12800,11 +12764,57 @@ def api_live_data_chart():
     """API Endpoint für Chart-Daten"""
     try:
         hours = request.args.get('hours', 24, type=int)
-        chart_data = live_bess_service.get_chart_data(hours=hours)
+        # Auflösung an Fensterbreite koppeln (max. ein Punkt pro Pixel)
+        max_points = request.args.get('max_points', request.args.get('width', 300, type=int), type=int)
+        chart_data = live_bess_service.get_chart_data(hours=hours, max_points=max(10, min(max_points, 5000)))
         return jsonify(chart_data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@main_bp.route('/api/live-data/stream')
+@login_required
+def api_live_data_stream():
+    """Server-Sent-Events Push-Kanal für Live-Telemetrie (ersetzt Polling)"""
+    from flask import Response, stream_with_context
+    from .live_push import STREAM_RETRY_AFTER, live_telemetry_hub, resolve_project_devices
+    
+    try:
+        devices = None
+        project_id = request.args.get('project_id', type=int)
+        if project_id:
+            devices = resolve_project_devices(project_id)
+        
+        site = request.args.get('site')
+        device = request.args.get('device')
+        if site and device:
+            devices = {(site, device)} if devices is None else devices & {(site, device)}
+        
+        # Serverseitiges Rate-Limit pro Client (Sekunden zwischen zwei Events)
+        min_interval = max(0.2, min(request.args.get('min_interval', 1.0, type=float), 60.0))
+        
+        subscriber = live_telemetry_hub.subscribe(devices=devices, min_interval=min_interval)
+    except RuntimeError as e:
+        # Stream-Limit des Workers erreicht: Threads bleiben für normale Requests frei
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(STREAM_RETRY_AFTER)
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    response = Response(stream_with_context(live_telemetry_hub.stream(subscriber)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@main_bp.route('/api/live-data/stream/stats')
+@login_required
+def api_live_data_stream_stats():
+    """API Endpoint für Push-Kanal-Statistiken"""
+    from .live_push import live_telemetry_hub
+    return jsonify(live_telemetry_hub.get_statistics())
+
 @main_bp.route('/live-data/advanced')
 @login_required
 def live_data_dashboard_advanced():
@@ -12874,6 +12884,19 @@ def api_project_device_summary(project_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@main_bp.route('/api/live-data/project/<int:project_id>/aggregates')
+@login_required
+def api_project_live_aggregates(project_id):
+    """API Endpoint für laufende Projekt-Aggregate (Durchsatz, Zyklen, SoC, Alarme)"""
+    try:
+        from .project_live_aggregates import project_live_aggregator
+        aggregates = project_live_aggregator.get_project_summary(project_id)
+        if aggregates is None:
+            return jsonify({'project_id': project_id, 'devices': {}, 'message': 'Noch keine Live-Daten'})
+        return jsonify(aggregates)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @main_bp.route('/api/live-data/project/<int:project_id>/sync', methods=['POST'])
 @login_required
 def api_project_sync(project_id):
@@ -12898,13 +12921,43 @@ def admin_bess_mappings():
 
 @main_bp.route('/api/admin/bess-mappings')
 def api_admin_bess_mappings():
-    """API Endpoint für alle BESS-Mappings (Admin)"""
+    """API Endpoint für alle BESS-Mappings (Admin)
+
+    Optional: limit/cursor für Keyset-Pagination oder stream=ndjson
+    """
     # Demo-Modus: BESS-Zuordnung für alle Benutzer zugänglich
     # Keine Login-Prüfung für Demo-Zwecke
     
+    def mapping_row(row):
+        mapping = dict(row)
+        mapping['is_active'] = bool(mapping['is_active'])
+        mapping['auto_sync'] = bool(mapping['auto_sync'])
+        # Gleiches ISO-Format wie bisher über datetime.isoformat()
+        for field in ('last_sync', 'created_at'):
+            if mapping[field]:
+                mapping[field] = str(mapping[field]).replace(' ', 'T', 1)
+        return mapping
+    
+    try:
+        query = KeysetQuery("""
+            SELECT m.id, m.project_id, p.name AS project_name, m.site, m.device, m.bess_name,
+                   COALESCE(NULLIF(m.bess_name, ''), m.site || '/' || m.device) AS display_name,
+                   'bess/' || m.site || '/' || m.device || '/telemetry' AS mqtt_topic,
+                   m.is_active, m.auto_sync, m.sync_interval_minutes,
+                   m.description, m.location, m.manufacturer, m.model, m.rated_power_kw,
+                   m.rated_energy_kwh, m.last_sync, m.created_at
+            FROM bess_project_mapping m
+            JOIN project p ON p.id = m.project_id
+        """)
+        return keyset_response(query, get_db, transform=mapping_row)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@main_bp.route('/api/admin/telemetry-profiles')
+def api_admin_telemetry_profiles():
+    """Verfügbare Telemetrie-Profile für die Geräteregistrierung"""
     try:
-        mappings = live_bess_service.get_project_mappings()
-        return jsonify(mappings)
+        return jsonify({'profiles': load_device_profiles(), 'default': telemetry_decoder.default_profile.name})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -12939,6 +12992,11 @@ def api_create_bess_mapping():
         if existing:
             return jsonify({'error': 'Site/Device Kombination bereits vorhanden'}), 400
         
+        # Optionales Telemetrie-Profil (Feld-Mapping aus einer Modbus-Registerkarte)
+        telemetry_profile = data.get('telemetry_profile')
+        if telemetry_profile and telemetry_profile not in load_device_profiles():
+            return jsonify({'error': f'Unbekanntes Telemetrie-Profil {telemetry_profile}'}), 400
+        
         # Erstelle neue Mapping
         mapping = BESSProjectMapping(
             project_id=data['project_id'],
@@ -12961,9 +13019,13 @@ def api_create_bess_mapping():
         db.session.add(mapping)
         db.session.commit()
         
+        if telemetry_profile:
+            assign_device_profile(mapping.site, mapping.device, telemetry_profile)
+        
         return jsonify({
             'message': 'BESS-Mapping erfolgreich erstellt',
-            'mapping_id': mapping.id
+            'mapping_id': mapping.id,
+            'telemetry_profile': telemetry_profile
         }), 201
         
     except Exception as e:
@@ -12981,6 +13043,11 @@ def api_update_bess_mapping(mapping_id):
         
         mapping = BESSProjectMapping.query.get_or_404(mapping_id)
         data = request.get_json()
+        old_key = (mapping.site, mapping.device)
+        
+        telemetry_profile = data.get('telemetry_profile')
+        if telemetry_profile and telemetry_profile not in load_device_profiles():
+            return jsonify({'error': f'Unbekanntes Telemetrie-Profil {telemetry_profile}'}), 400
         
         # Aktualisiere Felder
         if 'project_id' in data:
@@ -13024,6 +13091,15 @@ def api_update_bess_mapping(mapping_id):
         
         db.session.commit()
         
+        # Profilzuordnung setzen bzw. bei geänderter Site/Device mitnehmen
+        new_key = (mapping.site, mapping.device)
+        if 'telemetry_profile' in data or new_key != old_key:
+            if 'telemetry_profile' not in data:
+                telemetry_profile = get_device_profile(*old_key)
+            if new_key != old_key:
+                assign_device_profile(*old_key, None)
+            assign_device_profile(*new_key, telemetry_profile)
+        
         return jsonify({'message': 'BESS-Mapping erfolgreich aktualisiert'})
         
     except Exception as e:
@@ -13048,6 +13124,7 @@ def api_delete_bess_mapping(mapping_id):
         # Lösche Mapping
         db.session.delete(mapping)
         db.session.commit()
+        assign_device_profile(mapping.site, mapping.device, None)
         
         return jsonify({'message': 'BESS-Mapping erfolgreich gelöscht'})
         
@@ -0,0 +1,246 @@
+"""
+Antwortformate für Zeitreihen-APIs
+Content-Negotiation zwischen JSON-Zeilen (Standard), kompaktem Spalten-JSON
+({t0, dt, values[]}), MessagePack und Arrow IPC; JSON über orjson, sofern installiert
+"""
+
+import json
+import logging
+from datetime import date, datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .lazy_imports import lazy_import, module_available
+
+logger = logging.getLogger(__name__)
+
+# Optionale schnelle Encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# pyarrow ist groß: nur die Verfügbarkeit prüfen, geladen wird beim ersten Arrow-Export
+ARROW_AVAILABLE = module_available('pyarrow')
+pa = lazy_import('pyarrow')
+pa_ipc = lazy_import('pyarrow.ipc')
+
+MIMETYPES = {
+    'json': 'application/json',
+    'columns': 'application/vnd.bess.columns+json',
+    'msgpack': 'application/x-msgpack',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+# Accept-Header-Varianten -> Format
+ACCEPT_FORMATS = {
+    'application/vnd.apache.arrow.stream': 'arrow',
+    'application/vnd.apache.arrow.file': 'arrow',
+    'application/x-msgpack': 'msgpack',
+    'application/msgpack': 'msgpack',
+    'application/vnd.msgpack': 'msgpack',
+    'application/vnd.bess.columns+json': 'columns',
+}
+
+
+def available_formats() -> List[str]:
+    formats = ['json', 'columns']
+    if MSGPACK_AVAILABLE:
+        formats.append('msgpack')
+    if ARROW_AVAILABLE:
+        formats.append('arrow')
+    return formats
+
+
+def format_from(params: Optional[Dict[str, Any]] = None, accept: str = '') -> str:
+    """Format aus Parameter ``format`` bzw. Accept-Header bestimmen (Standard json)"""
+    requested = str((params or {}).get('format') or '').lower()
+    if requested in MIMETYPES:
+        return requested
+    for part in (accept or '').split(','):
+        mimetype = part.split(';')[0].strip().lower()
+        if mimetype in ACCEPT_FORMATS:
+            return ACCEPT_FORMATS[mimetype]
+    return 'json'
+
+
+def negotiate_format(params: Optional[Dict[str, Any]] = None) -> str:
+    """Format für den aktuellen Request (JSON-Body, Query-Parameter, Accept-Header)"""
+    from flask import request
+
+    if params and params.get('format'):
+        return format_from(params)
+    return format_from(request.args, request.headers.get('Accept', ''))
+
+
+# ----------------------------------------------------------------------
+# Encoder
+# ----------------------------------------------------------------------
+
+def dumps_json(obj: Any) -> bytes:
+    """JSON-Serialisierung; orjson (inkl. NumPy-Arrays) falls vorhanden.
+
+    Datum/Decimal wie ``jsonify``: Datumswerte als HTTP-Datum (RFC 1123), Decimal als String.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_jsonify_default, option=(
+            orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        ))
+    return json.dumps(obj, default=_jsonify_default, separators=(',', ':')).encode('utf-8')
+
+
+def _jsonify_default(value):
+    """Wie Flasks DefaultJSONProvider; übrige Typen über _json_default"""
+    if isinstance(value, date):
+        if not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+    return _json_default(value)
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _float_list(values: Sequence[Any]) -> List[Optional[float]]:
+    """Werte als float, fehlende/NaN als None (null)"""
+    array = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return [None if np.isnan(v) else v for v in array.tolist()]
+
+
+def rows_to_columns(rows: Sequence[Dict[str, Any]], keys: Optional[Sequence[str]] = None) -> Dict[str, list]:
+    """Liste von Datensätzen in Spalten umwandeln (Schlüssel des ersten Datensatzes)"""
+    if isinstance(rows, dict):
+        return {key: values.tolist() if isinstance(values, np.ndarray) else list(values)
+                for key, values in rows.items() if keys is None or key in keys}
+    keys = list(keys or (rows[0].keys() if rows else []))
+    return {key: [row.get(key) for row in rows] for key in keys}
+
+
+def compact_columns(rows, value_keys: Sequence[str], x_key: str = 'timestamp') -> Dict[str, Any]:
+    """Kompaktes Spaltenformat ``{t0, dt, count, values[]}``
+
+    ``values`` enthält die erste Wertespalte, weitere Spalten liegen unter
+    ``series``. Bei unregelmäßigem Raster (z.B. nach Downsampling) ist ``dt``
+    None und die Zeitstempel stehen vollständig in ``timestamps``.
+    """
+    columns = rows_to_columns(rows)
+    timestamps = columns.get(x_key, [])
+    count = len(timestamps)
+    result: Dict[str, Any] = {'t0': timestamps[0] if count else None, 'dt': None, 'count': count}
+
+    try:
+        seconds = np.array([str(ts)[:19] for ts in timestamps], dtype='datetime64[s]').astype(np.int64)
+        steps = np.diff(seconds)
+        if len(steps) and steps[0] > 0 and np.all(steps == steps[0]):
+            result['dt'] = int(steps[0])
+    except (TypeError, ValueError):
+        pass
+    if result['dt'] is None and count > 1:
+        result['timestamps'] = [str(ts) for ts in timestamps]
+
+    value_keys = [key for key in value_keys if key in columns]
+    if value_keys:
+        result['values'] = _float_list(columns[value_keys[0]])
+        if len(value_keys) > 1:
+            result['series'] = {key: _float_list(columns[key]) for key in value_keys[1:]}
+    return result
+
+
+def encode_msgpack(obj: Any) -> bytes:
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError('MessagePack nicht verfügbar (msgpack fehlt)')
+    return msgpack.packb(obj, use_bin_type=True, default=_json_default)
+
+
+def encode_arrow(rows, x_key: str = 'timestamp', metadata: Optional[Dict[str, Any]] = None) -> bytes:
+    """Arrow-IPC-Stream mit einer Spalte je Feld; Zeitstempel als timestamp[s]"""
+    if not ARROW_AVAILABLE:
+        raise RuntimeError('Arrow nicht verfügbar (pyarrow fehlt)')
+
+    arrays = {}
+    for key, values in rows_to_columns(rows).items():
+        if key == x_key:
+            try:
+                arrays[key] = pa.array(np.array([str(v)[:19] for v in values], dtype='datetime64[s]'))
+                continue
+            except (TypeError, ValueError):
+                pass
+        if values and all(isinstance(v, (int, float, np.number)) or v is None for v in values):
+            arrays[key] = pa.array(values, type=pa.float64())
+        else:
+            arrays[key] = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+    table = pa.table(arrays)
+    if metadata:
+        table = table.replace_schema_metadata({'bess': dumps_json(metadata)})
+    sink = pa.BufferOutputStream()
+    with pa_ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_series(payload: Dict[str, Any], fmt: str, value_keys: Sequence[str],
+                  x_key: str = 'timestamp', data_key: str = 'data') -> bytes:
+    """Response-Dict (mit Zeilen oder Spalten unter ``data_key``) im gewünschten Format kodieren"""
+    if fmt == 'json':
+        return dumps_json(payload)
+
+    rows = payload.get(data_key) or []
+    meta = {key: value for key, value in payload.items() if key != data_key}
+    if fmt == 'arrow':
+        return encode_arrow(rows, x_key, meta)
+
+    # Bereits spaltenweise Daten (z.B. Pegel je Station) werden unverändert übernommen
+    columns = rows_to_columns(rows) if isinstance(rows, dict) else compact_columns(rows, value_keys, x_key)
+    compact = dict(meta, format='columns', **{data_key: columns})
+    if fmt == 'msgpack':
+        return encode_msgpack(compact)
+    return dumps_json(compact)
+
+
+def series_response(payload: Dict[str, Any], value_keys: Sequence[str], x_key: str = 'timestamp',
+                    data_key: str = 'data', fmt: Optional[str] = None, status: int = 200):
+    """Flask-Response für eine Zeitreihen-API nach Content-Negotiation
+
+    Standard bleibt die JSON-Zeilenliste (wie ``jsonify``); ``format=columns|msgpack|arrow``
+    bzw. der passende Accept-Header liefern die kompakten Varianten.
+    """
+    from flask import Response
+
+    fmt = fmt or negotiate_format()
+    if fmt not in available_formats():
+        body = dumps_json({
+            'success': False,
+            'error': f"Format '{fmt}' nicht verfügbar",
+            'available_formats': available_formats()
+        })
+        return Response(body, status=406, mimetype=MIMETYPES['json'])
+
+    try:
+        body = encode_series(payload, fmt, value_keys, x_key, data_key)
+    except Exception as e:
+        logger.error(f"Fehler beim Kodieren als {fmt}: {e}")
+        # Rückfall ohne orjson/Spezialtypen, damit die Antwort nicht selbst scheitert
+        body, fmt = json.dumps(payload, default=str).encode('utf-8'), 'json'
+
+    response = Response(body, status=status, mimetype=MIMETYPES[fmt])
+    response.headers['Vary'] = 'Accept'
+    return response
@@ -0,0 +1,283 @@
+"""
+Kompilierter Telemetrie-Decoder für Live BESS Daten
+Schneller JSON-Parser (orjson falls vorhanden), vorkompilierte Feld-Mappings pro
+Geräteprofil (gemeinsam mit der Modbus-Registerkarte) und spaltenweise Batch-Normalisierung
+"""
+
+import os
+import glob
+import json
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Schneller JSON-Parser (optional)
+try:
+    import orjson
+
+    def json_loads(payload):
+        return orjson.loads(payload)
+
+    def json_dumps(data) -> str:
+        return orjson.dumps(data).decode('utf-8')
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+    ORJSON_AVAILABLE = False
+
+# Spaltenreihenfolge von live_bess_telemetry (ohne id/created_at)
+TELEMETRY_COLUMNS = (
+    'site', 'device', 'timestamp', 'soc', 'power', 'power_charge', 'power_discharge',
+    'voltage_dc', 'current_dc', 'temperature_max', 'soh', 'alarms', 'raw_data'
+)
+
+# Standard-Mapping des MQTT-Payloads (siehe live/examples/mqtt_sample_publisher.py)
+DEFAULT_FIELD_MAP = {
+    'soc': 'soc',
+    'p': 'power',
+    'p_ch': 'power_charge',
+    'p_dis': 'power_discharge',
+    'v_dc': 'voltage_dc',
+    'i_dc': 'current_dc',
+    't_cell_max': 'temperature_max',
+    'soh': 'soh',
+}
+
+EMPTY_ALARMS = '[]'
+
+# Gerätezuordnung site/device -> Profilname (in der Live-BESS-Datenbank)
+PROFILE_TABLE = 'live_device_profile'
+
+# Registerkarten mit telemetry_field-Einträgen werden als Profile geladen
+REGISTER_MAP_DIR = os.getenv('LIVE_BESS_REGISTER_MAP_DIR', 'live/modbus/register_maps')
+
+
+class DeviceProfile:
+    """Vorkompiliertes Feld-Mapping: Quellschlüssel -> (Spalte, Skalierung)"""
+
+    def __init__(self, name: str, field_map: Dict[str, Any], timestamp_key: str = 'ts'):
+        self.name = name
+        self.timestamp_key = timestamp_key
+        entries = []
+        for source_key, target in field_map.items():
+            column, scale = target if isinstance(target, (tuple, list)) else (target, 1.0)
+            if column not in TELEMETRY_COLUMNS:
+                raise ValueError(f"Unbekannte Telemetrie-Spalte '{column}' im Profil {name}")
+            entries.append((source_key, column, float(scale)))
+        self.entries: Tuple[Tuple[str, str, float], ...] = tuple(entries)
+        self.mapped_columns = {column for _, column, _ in entries}
+
+    @classmethod
+    def from_register_map(cls, path: str, name: str = None) -> 'DeviceProfile':
+        """Erzeugt ein Profil aus einer Modbus-Registerkarte (Schlüssel ``telemetry_field``)"""
+        import yaml
+
+        with open(path, 'r', encoding='utf-8') as f:
+            register_map = yaml.safe_load(f) or {}
+
+        field_map = {}
+        for point_name, point in register_map.get('points', {}).items():
+            column = point.get('telemetry_field')
+            if column:
+                field_map[point_name] = (column, point.get('telemetry_scale', 1.0))
+
+        return cls(name or register_map.get('profile', path), field_map, timestamp_key='timestamp')
+
+
+class TelemetryDecoder:
+    """Dekodiert Telemetrie-Nachrichten einzeln oder als Batch in Spalten"""
+
+    def __init__(self):
+        self.default_profile = DeviceProfile('mqtt_default', DEFAULT_FIELD_MAP)
+        self.profiles: Dict[str, DeviceProfile] = {self.default_profile.name: self.default_profile}
+        self.device_profiles: Dict[Tuple[str, str], DeviceProfile] = {}
+
+    def register_profile(self, profile: DeviceProfile):
+        self.profiles[profile.name] = profile
+
+    def assign_profile(self, site: str, device: str, profile_name: Optional[str]):
+        """Ordnet einem Gerät ein registriertes Profil zu (None = Standardprofil)"""
+        if not profile_name or profile_name == self.default_profile.name:
+            self.device_profiles.pop((site, device), None)
+            return
+        if profile_name not in self.profiles:
+            raise ValueError(f"Unbekanntes Telemetrie-Profil '{profile_name}'")
+        self.device_profiles[(site, device)] = self.profiles[profile_name]
+
+    def load_register_maps(self, directory: str = None) -> List[str]:
+        """Registriert alle Registerkarten eines Verzeichnisses mit Telemetrie-Mapping"""
+        loaded = []
+        for path in sorted(glob.glob(os.path.join(directory or REGISTER_MAP_DIR, '*.yaml'))):
+            try:
+                profile = DeviceProfile.from_register_map(path)
+            except Exception as e:
+                logger.error(f"Fehler beim Laden der Registerkarte {path}: {e}")
+                continue
+            if profile.entries:
+                self.register_profile(profile)
+                loaded.append(profile.name)
+        return loaded
+
+    def init_schema(self, cursor: sqlite3.Cursor):
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {PROFILE_TABLE} (
+                site TEXT NOT NULL,
+                device TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (site, device)
+            )
+        """)
+
+    def save_assignment(self, conn: sqlite3.Connection, site: str, device: str, profile_name: Optional[str]):
+        """Speichert die Zuordnung dauerhaft und übernimmt sie in diesen Prozess"""
+        self.assign_profile(site, device, profile_name)
+        self.init_schema(conn.cursor())
+        if (site, device) in self.device_profiles:
+            conn.execute(f"""
+                INSERT INTO {PROFILE_TABLE} (site, device, profile) VALUES (?, ?, ?)
+                ON CONFLICT(site, device) DO UPDATE SET profile = excluded.profile,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (site, device, profile_name))
+        else:
+            conn.execute(f"DELETE FROM {PROFILE_TABLE} WHERE site = ? AND device = ?", (site, device))
+        conn.commit()
+
+    def load_assignments(self, conn: sqlite3.Connection) -> int:
+        """Lädt alle gespeicherten Zuordnungen (ersetzt den bisherigen Stand)"""
+        self.init_schema(conn.cursor())
+        assignments = {}
+        for site, device, profile_name in conn.execute(f"SELECT site, device, profile FROM {PROFILE_TABLE}"):
+            if profile_name in self.profiles:
+                assignments[(site, device)] = self.profiles[profile_name]
+            else:
+                logger.warning(f"Telemetrie-Profil '{profile_name}' für {site}/{device} nicht registriert")
+        self.device_profiles = assignments
+        return len(assignments)
+
+    def profile_name_for(self, site: str, device: str) -> Optional[str]:
+        profile = self.device_profiles.get((site, device))
+        return profile.name if profile else None
+
+    def profile_for(self, site: str, device: str) -> DeviceProfile:
+        return self.device_profiles.get((site, device), self.default_profile)
+
+    def decode_batch(self, messages: List[Tuple[str, str, Any]]) -> Dict[str, list]:
+        """Normalisiert (site, device, payload)-Tupel spaltenweise.
+
+        Der Payload kann JSON-Text/Bytes oder ein bereits geparstes Dict sein.
+        Das Ergebnis enthält eine Liste pro Spalte aus ``TELEMETRY_COLUMNS``.
+        """
+        parsed = []
+        raw = []
+        for _, _, payload in messages:
+            if isinstance(payload, dict):
+                parsed.append(payload)
+                raw.append(json_dumps(payload))
+            else:
+                parsed.append(json_loads(payload))
+                raw.append(payload.decode('utf-8') if isinstance(payload, bytes) else payload)
+
+        profiles = [self.profile_for(site, device) for site, device, _ in messages]
+        now = datetime.now().isoformat()
+
+        columns: Dict[str, list] = {
+            'site': [m[0] for m in messages],
+            'device': [m[1] for m in messages],
+            'timestamp': [data.get(profile.timestamp_key) or now for data, profile in zip(parsed, profiles)],
+            'raw_data': raw,
+        }
+        for column in TELEMETRY_COLUMNS:
+            if column not in columns and column != 'alarms':
+                columns[column] = [None] * len(messages)
+
+        # Ein Durchlauf pro Profil-Eintrag statt elf get()/float()-Paaren pro Nachricht
+        if all(profile is self.default_profile for profile in profiles):
+            for source_key, column, scale in self.default_profile.entries:
+                values = [data.get(source_key) for data in parsed]
+                if scale == 1.0:
+                    columns[column] = [None if v is None else float(v) for v in values]
+                else:
+                    columns[column] = [None if v is None else float(v) * scale for v in values]
+        else:
+            for i, (data, profile) in enumerate(zip(parsed, profiles)):
+                for source_key, column, scale in profile.entries:
+                    value = data.get(source_key)
+                    if value is not None:
+                        columns[column][i] = float(value) * scale
+
+        columns['alarms'] = [
+            EMPTY_ALARMS if not data.get('alarms') else json_dumps(data['alarms'])
+            for data in parsed
+        ]
+        return columns
+
+    def decode(self, site: str, device: str, payload: Any) -> Dict[str, Any]:
+        """Einzelne Nachricht als Dict (Format von normalize_telemetry_data)"""
+        columns = self.decode_batch([(site, device, payload)])
+        return {column: columns[column][0] for column in TELEMETRY_COLUMNS}
+
+    @staticmethod
+    def rows(columns: Dict[str, list]) -> List[tuple]:
+        """Spalten in Zeilen für ``executemany`` transponieren"""
+        return list(zip(*(columns[column] for column in TELEMETRY_COLUMNS)))
+
+    @staticmethod
+    def records(columns: Dict[str, list]) -> List[Dict[str, Any]]:
+        return [dict(zip(TELEMETRY_COLUMNS, row)) for row in TelemetryDecoder.rows(columns)]
+
+
+# Globale Decoder-Instanz
+telemetry_decoder = TelemetryDecoder()
+_register_maps_loaded = False
+
+
+def load_device_profiles():
+    """Registriert die Profile aus REGISTER_MAP_DIR einmalig für diesen Prozess"""
+    global _register_maps_loaded
+    if not _register_maps_loaded:
+        _register_maps_loaded = True
+        loaded = telemetry_decoder.load_register_maps()
+        if loaded:
+            logger.info(f"Telemetrie-Profile registriert: {', '.join(loaded)}")
+    return sorted(telemetry_decoder.profiles)
+
+
+def _live_db_path(db_path: str = None) -> str:
+    return db_path or os.getenv('LIVE_BESS_DB_PATH', 'live/data/bess.db')
+
+
+def get_device_profile(site: str, device: str, db_path: str = None) -> Optional[str]:
+    """Gespeicherter Profilname eines Geräts (None = Standardprofil)"""
+    db_path = _live_db_path(db_path)
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        telemetry_decoder.init_schema(conn.cursor())
+        row = conn.execute(
+            f"SELECT profile FROM {PROFILE_TABLE} WHERE site = ? AND device = ?", (site, device)
+        ).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def assign_device_profile(site: str, device: str, profile_name: Optional[str], db_path: str = None):
+    """Profilzuordnung bei der Geräteregistrierung (BESS-Mapping) speichern.
+
+    Andere Prozesse übernehmen die Zuordnung beim nächsten Abgleich im Ingest-Thread.
+    """
+    load_device_profiles()
+    db_path = _live_db_path(db_path)
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        telemetry_decoder.save_assignment(conn, site, device, profile_name)
+    finally:
+        conn.close()
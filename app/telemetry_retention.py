@@ -0,0 +1,247 @@
+"""
+Retention, Kompaktierung und Archivierung für Live-Telemetrie
+Hält live_bess_telemetry und bess_telemetry_data auf einer begrenzten Größe
+"""
+
+import os
+import json
+import sqlite3
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+
+from .telemetry_rollups import TelemetryRollupStore, ROLLUP_TABLE, ROLLUP_TIERS
+
+logger = logging.getLogger(__name__)
+
+LIVE_TELEMETRY_COLUMNS = (
+    'id', 'site', 'device', 'timestamp', 'soc', 'power', 'power_charge', 'power_discharge',
+    'voltage_dc', 'current_dc', 'temperature_max', 'soh', 'alarms', 'created_at'
+)
+
+PROJECT_TELEMETRY_COLUMNS = (
+    'id', 'bess_mapping_id', 'timestamp', 'soc_percent', 'power_kw', 'power_charge_kw',
+    'power_discharge_kw', 'voltage_dc_v', 'current_dc_a', 'temperature_max_c', 'soh_percent',
+    'alarms', 'data_quality', 'source', 'created_at'
+)
+
+DEFAULT_RETENTION_CONFIG = {
+    'raw_hot_days': int(os.getenv('TELEMETRY_RAW_HOT_DAYS', '30')),          # Rohdaten in live_bess_telemetry
+    'raw_data_strip_days': int(os.getenv('TELEMETRY_RAW_DATA_STRIP_DAYS', '7')),  # raw_data-JSON entfernen
+    'project_hot_days': int(os.getenv('TELEMETRY_PROJECT_HOT_DAYS', '90')),  # bess_telemetry_data
+    'rollup_retention_days': {60: 30, 900: 400, 3600: None},                 # None = unbegrenzt
+    'archive_enabled': os.getenv('TELEMETRY_ARCHIVE_ENABLED', 'true').lower() == 'true',
+    'archive_dir': os.getenv('TELEMETRY_ARCHIVE_DIR', 'archive/telemetry'),
+    'batch_size': 5000,
+    'vacuum_pages': 2000,
+    'migrate_auto_vacuum': False,  # Einmaliges VACUUM zum Umstellen auf INCREMENTAL (sperrt die DB)
+}
+
+
+class TelemetryRetentionManager:
+    """Wendet Retention-Regeln an, archiviert kalte Daten und gibt Speicher frei"""
+
+    def __init__(self, live_db_path: str = None, main_db_path: str = None,
+                 config: Dict[str, Any] = None, stats_file: str = os.path.join('instance', 'retention_stats.json')):
+        self.live_db_path = live_db_path or os.getenv('LIVE_BESS_DB_PATH', 'live/data/bess.db')
+        self.main_db_path = main_db_path or 'instance/bess.db'
+        self.config = dict(DEFAULT_RETENTION_CONFIG)
+        if config:
+            self.config.update(config)
+        self.stats_file = stats_file
+        self.rollups = TelemetryRollupStore(self.live_db_path)
+
+    # ------------------------------------------------------------------
+    # Öffentliche API
+    # ------------------------------------------------------------------
+
+    def run(self) -> Dict[str, Any]:
+        """Führt alle Retention-Schritte aus und liefert Metriken"""
+        started = time.time()
+        metrics: Dict[str, Any] = {'started_at': datetime.now().isoformat()}
+
+        if os.path.exists(self.live_db_path):
+            conn = sqlite3.connect(self.live_db_path)
+            try:
+                metrics['live_raw_data_stripped'] = self.strip_raw_data(conn)
+                metrics['live_rows_archived'] = self.expire_live_telemetry(conn)
+                metrics['rollup_rows_deleted'] = self.expire_rollups(conn)
+                metrics['live_bytes_freed'] = self.incremental_vacuum(conn)
+            finally:
+                conn.close()
+
+        if os.path.exists(self.main_db_path):
+            conn = sqlite3.connect(self.main_db_path)
+            try:
+                metrics['project_rows_archived'] = self.expire_project_telemetry(conn)
+                metrics['main_bytes_freed'] = self.incremental_vacuum(conn)
+            finally:
+                conn.close()
+
+        metrics['duration_seconds'] = round(time.time() - started, 3)
+        self._save_stats(metrics)
+        logger.info(f"Telemetrie-Retention abgeschlossen: {metrics}")
+        return metrics
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Letzte Laufmetriken (auch prozessübergreifend aus der Stats-Datei)"""
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"Fehler beim Laden der Retention-Statistiken: {e}")
+        return {}
+
+    # ------------------------------------------------------------------
+    # Einzelschritte
+    # ------------------------------------------------------------------
+
+    def strip_raw_data(self, conn: sqlite3.Connection) -> int:
+        """Entfernt das raw_data-JSON aus Zeilen, die älter als N Tage sind"""
+        cutoff = self._cutoff(self.config['raw_data_strip_days'])
+        total = 0
+        while True:
+            cursor = conn.execute("""
+                UPDATE live_bess_telemetry SET raw_data = NULL
+                WHERE id IN (
+                    SELECT id FROM live_bess_telemetry
+                    WHERE created_at < ? AND raw_data IS NOT NULL
+                    LIMIT ?
+                )
+            """, (cutoff, self.config['batch_size']))
+            conn.commit()
+            total += cursor.rowcount
+            if cursor.rowcount < self.config['batch_size']:
+                return total
+
+    def expire_live_telemetry(self, conn: sqlite3.Connection) -> int:
+        """Archiviert und löscht Rohzeilen außerhalb des Hot-Fensters.
+
+        Vor dem ersten Löschen werden alle Zeilen aus der Zeit vor Einführung
+        der Rollups vollständig in die Rollup-Stufen übernommen, damit keine
+        Stunde nur teilweise aggregiert wird. Neuere Zeilen sind bereits beim
+        Ingest erfasst.
+        """
+        if not self._table_exists(conn, 'live_bess_telemetry'):
+            return 0
+        self.rollups.init_schema(conn.cursor())
+        conn.commit()
+        self.rollups.backfill(conn, batch_size=self.config['batch_size'])
+
+        cutoff = self._cutoff(self.config['raw_hot_days'])
+        return self._expire_in_batches(
+            conn, 'live_bess_telemetry', LIVE_TELEMETRY_COLUMNS, 'created_at', cutoff
+        )
+
+    def expire_project_telemetry(self, conn: sqlite3.Connection) -> int:
+        """Archiviert und löscht projektbezogene Telemetrie (BESSTelemetryData)"""
+        cutoff = self._cutoff(self.config['project_hot_days'])
+        return self._expire_in_batches(
+            conn, 'bess_telemetry_data', PROJECT_TELEMETRY_COLUMNS, 'timestamp', cutoff
+        )
+
+    def expire_rollups(self, conn: sqlite3.Connection) -> int:
+        """Löscht feine Rollup-Stufen nach ihrer jeweiligen Aufbewahrungsdauer"""
+        deleted = 0
+        for tier in ROLLUP_TIERS:
+            days = self.config['rollup_retention_days'].get(tier)
+            if not days:
+                continue
+            cutoff_epoch = int(time.time() - days * 86400)
+            cursor = conn.execute(
+                f"DELETE FROM {ROLLUP_TABLE} WHERE tier_seconds = ? AND bucket_start < ?",
+                (tier, cutoff_epoch)
+            )
+            deleted += cursor.rowcount
+        conn.commit()
+        return deleted
+
+    def incremental_vacuum(self, conn: sqlite3.Connection) -> int:
+        """Gibt freie Seiten schrittweise an das Dateisystem zurück"""
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        free_before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        auto_vacuum = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+
+        if auto_vacuum != 2:
+            if not self.config['migrate_auto_vacuum']:
+                logger.info("auto_vacuum ist nicht INCREMENTAL - Speicher wird erst nach Migration freigegeben")
+                return 0
+            logger.info("Stelle auto_vacuum auf INCREMENTAL um (einmaliges VACUUM)")
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+        else:
+            # executescript läuft das Pragma vollständig durch (execute gibt nur eine Seite frei)
+            conn.executescript(f"PRAGMA incremental_vacuum({int(self.config['vacuum_pages'])});")
+
+        free_after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        return max(free_before - free_after, 0) * page_size
+
+    # ------------------------------------------------------------------
+    # Hilfsfunktionen
+    # ------------------------------------------------------------------
+
+    def _cutoff(self, days: int) -> str:
+        return (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _table_exists(self, conn: sqlite3.Connection, table: str) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        return row is not None
+
+    def _expire_in_batches(self, conn: sqlite3.Connection, table: str, columns, time_column: str,
+                           cutoff: str) -> int:
+        if not self._table_exists(conn, table):
+            return 0
+
+        total = 0
+        select_sql = f"""
+            SELECT {', '.join(columns)} FROM {table}
+            WHERE {time_column} < ? ORDER BY id LIMIT ?
+        """
+        while True:
+            rows = conn.execute(select_sql, (cutoff, self.config['batch_size'])).fetchall()
+            if not rows:
+                return total
+
+            if self.config['archive_enabled']:
+                self._archive_rows(table, columns, rows)
+
+            max_id = rows[-1][0]
+            conn.execute(f"DELETE FROM {table} WHERE id <= ? AND {time_column} < ?", (max_id, cutoff))
+            conn.commit()
+            total += len(rows)
+
+    def _archive_rows(self, table: str, columns, rows: List[tuple]):
+        """Schreibt Zeilen spaltenweise komprimiert (NumPy .npz) in das Archivverzeichnis"""
+        import numpy as np
+
+        os.makedirs(self.config['archive_dir'], exist_ok=True)
+        first_id, last_id = rows[0][0], rows[-1][0]
+        path = os.path.join(self.config['archive_dir'], f"{table}_{first_id}_{last_id}.npz")
+
+        arrays = {}
+        for i, name in enumerate(columns):
+            values = [row[i] for row in rows]
+            if all(isinstance(v, (int, float)) or v is None for v in values):
+                arrays[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                arrays[name] = np.array(['' if v is None else str(v) for v in values])
+        np.savez_compressed(path, **arrays)
+
+    def _save_stats(self, metrics: Dict[str, Any]):
+        try:
+            stats = self.get_stats()
+            stats['last_run'] = metrics
+            stats['total_runs'] = stats.get('total_runs', 0) + 1
+            stats['total_rows_archived'] = (
+                stats.get('total_rows_archived', 0)
+                + metrics.get('live_rows_archived', 0)
+                + metrics.get('project_rows_archived', 0)
+            )
+            with open(self.stats_file, 'w') as f:
+                json.dump(stats, f, indent=2)
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern der Retention-Statistiken: {e}")
@@ -0,0 +1,315 @@
+"""
+Kontinuierliche Telemetrie-Rollups für Live BESS Daten
+Inkrementell beim Ingest gepflegte 1-min/15-min/1-h Aggregate (min/max/avg/last)
+"""
+
+import sqlite3
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Aggregationsstufen in Sekunden (fein -> grob)
+ROLLUP_TIERS = (60, 900, 3600)
+
+# Aggregierte Messgrößen (Spaltennamen aus live_bess_telemetry)
+ROLLUP_FIELDS = ('soc', 'power', 'voltage_dc', 'current_dc', 'temperature_max')
+
+ROLLUP_TABLE = 'live_bess_telemetry_rollup'
+
+# Fortschritt der einmaligen Übernahme von Rohdaten aus der Zeit vor den Rollups
+BACKFILL_TABLE = 'live_bess_telemetry_rollup_backfill'
+
+RAW_TABLE = 'live_bess_telemetry'
+
+
+def parse_timestamp(value: Any) -> float:
+    """ISO-Zeitstempel (auch mit 'Z') in Epoch-Sekunden umwandeln"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def parse_utc(value: Any) -> Optional[datetime]:
+    """Epoch (s oder ms, auch als Text), ISO-Text oder datetime als aware UTC-datetime.
+
+    Naive Werte gelten als UTC (Gerätezeitstempel und BESSTelemetryData).
+    Liefert ``None`` für leere oder nicht lesbare Werte.
+    """
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            epoch = float(value)
+        except (TypeError, ValueError):
+            epoch = None
+        if epoch is not None:
+            if abs(epoch) > 1e11:  # Millisekunden
+                epoch /= 1000.0
+            return datetime.fromtimestamp(epoch, timezone.utc)
+        try:
+            parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def select_tier(window_seconds: float, max_points: int) -> int:
+    """Feinste Stufe, deren Bucket-Anzahl im Fenster max_points nicht überschreitet"""
+    for tier in ROLLUP_TIERS:
+        if window_seconds / tier <= max_points:
+            return tier
+    return ROLLUP_TIERS[-1]
+
+
+def _build_upsert_sql() -> str:
+    columns = ['tier_seconds', 'site', 'device', 'bucket_start', 'sample_count', 'last_ts']
+    updates = [
+        'sample_count = sample_count + 1',
+        'last_ts = MAX(last_ts, excluded.last_ts)'
+    ]
+    for field in ROLLUP_FIELDS:
+        columns += [f'{field}_min', f'{field}_max', f'{field}_sum', f'{field}_n', f'{field}_last']
+        updates += [
+            f'{field}_min = CASE WHEN {field}_min IS NULL OR excluded.{field}_min < {field}_min '
+            f'THEN COALESCE(excluded.{field}_min, {field}_min) ELSE {field}_min END',
+            f'{field}_max = CASE WHEN {field}_max IS NULL OR excluded.{field}_max > {field}_max '
+            f'THEN COALESCE(excluded.{field}_max, {field}_max) ELSE {field}_max END',
+            f'{field}_sum = COALESCE({field}_sum, 0) + COALESCE(excluded.{field}_sum, 0)',
+            f'{field}_n = {field}_n + excluded.{field}_n',
+            f'{field}_last = CASE WHEN excluded.last_ts >= last_ts AND excluded.{field}_last IS NOT NULL '
+            f'THEN excluded.{field}_last ELSE {field}_last END',
+        ]
+
+    placeholders = ', '.join('?' for _ in columns)
+    return (
+        f"INSERT INTO {ROLLUP_TABLE} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON CONFLICT(tier_seconds, site, device, bucket_start) DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+UPSERT_SQL = _build_upsert_sql()
+
+
+class TelemetryRollupStore:
+    """Pflegt und liest die Rollup-Tabelle in der Live-BESS-Datenbank"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def init_schema(self, cursor: sqlite3.Cursor):
+        """Erstellt die Rollup-Tabelle (idempotent)"""
+        field_columns = []
+        for field in ROLLUP_FIELDS:
+            field_columns += [
+                f'{field}_min REAL', f'{field}_max REAL', f'{field}_sum REAL',
+                f'{field}_n INTEGER NOT NULL DEFAULT 0', f'{field}_last REAL'
+            ]
+
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+                tier_seconds INTEGER NOT NULL,
+                site TEXT NOT NULL,
+                device TEXT NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                sample_count INTEGER NOT NULL DEFAULT 0,
+                last_ts REAL,
+                {', '.join(field_columns)},
+                PRIMARY KEY (tier_seconds, site, device, bucket_start)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_rollup_tier_bucket
+            ON {ROLLUP_TABLE}(tier_seconds, bucket_start)
+        """)
+
+    def rollup_rows(self, data: Dict[str, Any]) -> List[tuple]:
+        """Parameterzeilen für alle Stufen eines normalisierten Telemetrie-Datensatzes"""
+        ts = parse_timestamp(data.get('timestamp'))
+        values = []
+        for field in ROLLUP_FIELDS:
+            value = data.get(field)
+            present = 1 if value is not None else 0
+            values += [value, value, value, present, value]
+
+        return [
+            (tier, data['site'], data['device'], int(ts // tier) * tier, 1, ts, *values)
+            for tier in ROLLUP_TIERS
+        ]
+
+    def update(self, cursor: sqlite3.Cursor, data: Dict[str, Any]):
+        """Aktualisiert alle Stufen für einen Datensatz (innerhalb der Ingest-Transaktion)"""
+        cursor.executemany(UPSERT_SQL, self.rollup_rows(data))
+
+    def update_many(self, cursor: sqlite3.Cursor, records: List[Dict[str, Any]]):
+        """Batch-Variante von ``update`` für gesammelte Ingest-Batches"""
+        rows = []
+        for data in records:
+            rows.extend(self.rollup_rows(data))
+        cursor.executemany(UPSERT_SQL, rows)
+
+    def backfill(self, conn: sqlite3.Connection, batch_size: int = 5000) -> int:
+        """Übernimmt einmalig Rohdaten aus der Zeit vor Einführung der Rollups.
+
+        Beim ersten Aufruf werden die höchste Rohdaten-ID und der erste bereits
+        geschriebene 1-min-Bucket als Grenze festgehalten; nur ältere Zeilen
+        werden aggregiert. Jeder Batch läuft samt Fortschritt in einer eigenen
+        ``BEGIN IMMEDIATE``-Transaktion, damit parallele Läufe nichts doppelt
+        zählen; ein abgebrochener Lauf setzt beim nächsten Aufruf fort.
+        Aufgerufen vom Retention-Job, nicht beim Start der Web-Worker.
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RAW_TABLE,)
+        ).fetchone()
+        if not exists:
+            return 0
+
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {BACKFILL_TABLE} (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                boundary_id INTEGER NOT NULL,
+                before_ts REAL,
+                last_id INTEGER NOT NULL DEFAULT 0,
+                rows_backfilled INTEGER NOT NULL DEFAULT 0,
+                completed_at REAL
+            )
+        """)
+        conn.commit()
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute(f"""
+            INSERT OR IGNORE INTO {BACKFILL_TABLE} (id, boundary_id, before_ts)
+            SELECT 1, (SELECT COALESCE(MAX(id), 0) FROM {RAW_TABLE}),
+                   (SELECT MIN(bucket_start) FROM {ROLLUP_TABLE} WHERE tier_seconds = ?)
+        """, (ROLLUP_TIERS[0],))
+        conn.commit()
+
+        total = 0
+        columns = ('id', 'site', 'device', 'timestamp') + ROLLUP_FIELDS
+        while True:
+            # Lesen, Aggregieren und Fortschritt in einer Schreibtransaktion: ein zweiter
+            # Prozess sieht erst den neuen last_id und addiert keinen Batch doppelt
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                boundary_id, before_ts, last_id, completed_at = conn.execute(
+                    f"SELECT boundary_id, before_ts, last_id, completed_at FROM {BACKFILL_TABLE} WHERE id = 1"
+                ).fetchone()
+                if completed_at is not None:
+                    conn.commit()
+                    return total
+
+                rows = conn.execute(f"""
+                    SELECT id, site, device, timestamp, {', '.join(ROLLUP_FIELDS)}
+                    FROM {RAW_TABLE} WHERE id > ? AND id <= ? ORDER BY id LIMIT ?
+                """, (last_id, boundary_id, batch_size)).fetchall()
+                if not rows:
+                    conn.execute(f"UPDATE {BACKFILL_TABLE} SET completed_at = ? WHERE id = 1", (time.time(),))
+                    conn.commit()
+                    logger.info(f"Rollup-Backfill abgeschlossen: {total} Rohzeilen übernommen")
+                    return total
+
+                records = [dict(zip(columns, row)) for row in rows]
+                if before_ts is not None:
+                    # Zeilen ab dem ersten Rollup-Bucket sind bereits beim Ingest erfasst
+                    records = [r for r in records if parse_timestamp(r['timestamp']) < before_ts]
+
+                cursor = conn.cursor()
+                self.update_many(cursor, records)
+                cursor.execute(
+                    f"UPDATE {BACKFILL_TABLE} SET last_id = ?, rows_backfilled = rows_backfilled + ? WHERE id = 1",
+                    (rows[-1][0], len(records))
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            total += len(records)
+
+    def _filters(self, site: Optional[str], device: Optional[str]):
+        clause, params = '', []
+        if site:
+            clause += ' AND site = ?'
+            params.append(site)
+        if device:
+            clause += ' AND device = ?'
+            params.append(device)
+        return clause, params
+
+    def get_series(self, hours: float = 24, max_points: int = 300,
+                   site: str = None, device: str = None) -> Dict[str, Any]:
+        """Zeitreihe aus der feinsten Stufe mit höchstens max_points Buckets (Geräte werden pro Bucket zusammengefasst)"""
+        window = hours * 3600
+        tier = select_tier(window, max_points)
+        since = int((time.time() - window) // tier) * tier
+
+        aggregates = []
+        for field in ROLLUP_FIELDS:
+            aggregates += [
+                f'SUM({field}_sum) / NULLIF(SUM({field}_n), 0)',
+                f'MIN({field}_min)',
+                f'MAX({field}_max)',
+            ]
+
+        clause, params = self._filters(site, device)
+        query = f"""
+            SELECT bucket_start, SUM(sample_count), {', '.join(aggregates)}
+            FROM {ROLLUP_TABLE}
+            WHERE tier_seconds = ? AND bucket_start >= ?{clause}
+            GROUP BY bucket_start
+            ORDER BY bucket_start
+        """
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(query, [tier, since] + params).fetchall()
+        finally:
+            conn.close()
+
+        series = {
+            'tier_seconds': tier,
+            'timestamps': [row[0] for row in rows],
+            'sample_count': [row[1] for row in rows],
+        }
+        for i, field in enumerate(ROLLUP_FIELDS):
+            offset = 2 + i * 3
+            series[field] = {
+                'avg': [row[offset] for row in rows],
+                'min': [row[offset + 1] for row in rows],
+                'max': [row[offset + 2] for row in rows],
+            }
+        return series
+
+    def get_statistics(self, hours: float = 24, site: str = None, device: str = None) -> Optional[tuple]:
+        """Fenster-Statistik aus den Rollups (Spaltenfolge wie BESSMQTTBridge.get_statistics)"""
+        window = hours * 3600
+        tier = select_tier(window, 1500)
+        since = int((time.time() - window) // tier) * tier
+
+        clause, params = self._filters(site, device)
+        query = f"""
+            SELECT
+                SUM(sample_count),
+                SUM(soc_sum) / NULLIF(SUM(soc_n), 0), MIN(soc_min), MAX(soc_max),
+                SUM(power_sum) / NULLIF(SUM(power_n), 0), MIN(power_min), MAX(power_max),
+                SUM(voltage_dc_sum) / NULLIF(SUM(voltage_dc_n), 0), MIN(voltage_dc_min), MAX(voltage_dc_max),
+                SUM(temperature_max_sum) / NULLIF(SUM(temperature_max_n), 0),
+                MIN(temperature_max_min), MAX(temperature_max_max)
+            FROM {ROLLUP_TABLE}
+            WHERE tier_seconds = ? AND bucket_start >= ?{clause}
+        """
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(query, [tier, since] + params).fetchone()
+        finally:
+            conn.close()
@@ -12,6 +12,8 @@ from typing import List, Dict, Optional
 import logging
 from sqlalchemy import and_, or_
 from models import db, SpotPrice
+import data_sources
+from fetch_cache import fetch_cache, fetch_windowed
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,7 @@ class AWattarDataFetcher:
     
     def __init__(self):
         self.base_url = "https://api.awattar.at/v1/marketdata"
-        self.session = requests.Session()
+        self.session = data_sources.session()
         self.session.headers.update({
             'User-Agent': 'BESS-Simulation/2.1 (https://bess.instanet.at)',
             'Accept': 'application/json'
@@ -45,18 +47,28 @@ class AWattarDataFetcher:
             if not end_date:
                 end_date = start_date + timedelta(days=1)
             
-            # URL-Parameter für aWattar API
-            params = {
-                'start': int(start_date.timestamp() * 1000),  # Millisekunden
-                'end': int(end_date.timestamp() * 1000)
-            }
-            
             logger.info(f"Fetching aWattar data from {start_date} to {end_date}")
             
-            response = self.session.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
+            # Monatsfenster (die API akzeptiert monatsgroße Zeiträume): abgeschlossene
+            # Monate kommen aus dem Response-Cache, nur fehlende bzw. aktuelle werden angefragt
+            def fetch_window(window_start, window_end, immutable):
+                params = {
+                    'start': int(window_start.timestamp() * 1000),  # Millisekunden
+                    'end': int(window_end.timestamp() * 1000)
+                }
+                response = fetch_cache.get(self.base_url, params=params, session=self.session,
+                                           timeout=30, max_age=900, immutable=immutable)
+                response.raise_for_status()
+                return response.json().get('data', [])
+            
+            def merge(parts):
+                points = {}
+                for part in parts:
+                    for point in part:
+                        points.setdefault(point.get('start_timestamp'), point)
+                return {'object': 'list', 'data': [points[key] for key in sorted(points)]}
             
-            data = response.json()
+            data = fetch_windowed(start_date, end_date, fetch_window, merge, unit='month')
             logger.info(f"Successfully fetched {len(data.get('data', []))} price points")
             
             return {
@@ -148,70 +160,39 @@ class AWattarDataFetcher:
                 'saved_count': 0
             }
         
+        from app.price_ingestion import upsert_spot_prices
+        
+        conn = db.engine.raw_connection()
         try:
-            saved_count = 0
-            skipped_count = 0
-            error_count = 0
-            
-            for item in parsed_data:
-                try:
-                    # Prüfen ob Datensatz bereits existiert
-                    existing = SpotPrice.query.filter(
-                        and_(
-                            SpotPrice.timestamp == item['timestamp'],
-                            SpotPrice.source == item['source'],
-                            SpotPrice.region == item['region']
-                        )
-                    ).first()
-                    
-                    if existing:
-                        # Aktualisieren falls Preis sich geändert hat
-                        if existing.price_eur_mwh != item['price_eur_mwh']:
-                            existing.price_eur_mwh = item['price_eur_mwh']
-                            existing.created_at = datetime.utcnow()
-                            logger.debug(f"Updated price for {item['timestamp']}")
-                        else:
-                            skipped_count += 1
-                            continue
-                    else:
-                        # Neuen Datensatz erstellen
-                        spot_price = SpotPrice(
-                            timestamp=item['timestamp'],
-                            price_eur_mwh=item['price_eur_mwh'],
-                            source=item['source'],
-                            region=item['region'],
-                            price_type=item['price_type']
-                        )
-                        db.session.add(spot_price)
-                    
-                    saved_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Failed to save price data: {e}")
-                    error_count += 1
-                    continue
+            # Ein set-basierter UPSERT für den ganzen Batch
+            result = upsert_spot_prices(conn, parsed_data, source='aWATTAR (Live API)')
             
-            # Transaktion committen
-            db.session.commit()
+            saved_count = result['inserted'] + result['updated']
+            skipped_count = result['unchanged'] + result['skipped']
             
-            logger.info(f"Saved {saved_count} price points, skipped {skipped_count}, errors {error_count}")
+            logger.info(f"Saved {saved_count} price points, skipped {skipped_count}, errors 0")
             
             return {
                 'success': True,
                 'saved_count': saved_count,
                 'skipped_count': skipped_count,
-                'error_count': error_count,
+                'error_count': 0,
+                'inserted_count': result['inserted'],
+                'updated_count': result['updated'],
+                'unchanged_count': result['unchanged'],
                 'total_processed': len(parsed_data)
             }
             
         except Exception as e:
-            db.session.rollback()
+            conn.rollback()
             logger.error(f"Database transaction failed: {e}")
             return {
                 'success': False,
                 'error': f"Database transaction failed: {str(e)}",
                 'saved_count': 0
             }
+        finally:
+            conn.close()
     
     def fetch_and_save(self, start_date: Optional[datetime] = None,
                       end_date: Optional[datetime] = None,
@@ -3,6 +3,8 @@
 """
 aWattar Scheduler für BESS Simulation
 Automatischer Import von österreichischen Strompreisen
+
+Hinweis: Im Dauerbetrieb durch ingestion_scheduler.py ersetzt (ein Prozess für alle Quellen).
 """
 
 import schedule
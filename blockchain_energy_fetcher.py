@@ -31,6 +31,8 @@ import hmac
 from dataclasses import dataclass
 from decimal import Decimal
 
+import data_sources
+
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,6 +56,9 @@ class BlockchainEnergyFetcher:
     """Hauptklasse für Blockchain-Energiehandel Integration"""
     
     def __init__(self):
+        # HTTP-Session mit austauschbarer Datenquelle (live/record/replay)
+        self.session = data_sources.session()
+
         # API-Konfiguration
         self.api_keys = {
             'power_ledger': os.getenv('POWER_LEDGER_API_KEY', ''),
@@ -121,6 +126,8 @@ class BlockchainEnergyFetcher:
     
     def _rate_limit(self, platform: str):
         """Rate Limiting für API-Requests"""
+        if data_sources.is_replay():
+            return
         current_time = time.time()
         last_time = self.last_request_time.get(platform, 0)
         time_since_last = current_time - last_time
@@ -135,7 +142,7 @@ class BlockchainEnergyFetcher:
         """Sichere API-Request mit Fehlerbehandlung"""
         try:
             logger.info(f"🔗 Blockchain API-Request: {url}")
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = self.session.get(url, params=params, headers=headers, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -16,6 +16,8 @@ Unterstützt:
 
 Autor: Ing. Heinz Schlagintweit
 Datum: Januar 2025
+
+Hinweis: Im Dauerbetrieb durch ingestion_scheduler.py ersetzt (ein Prozess für alle Quellen).
 """
 
 import schedule
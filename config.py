@@ -8,6 +8,9 @@ class Config:
     
     # CSRF für API-Endpoints deaktivieren
     WTF_CSRF_ENABLED = False
+    
+    # Optionale Subsysteme: "all" (Standard), "core" oder Liste wie "ml,export,co2"
+    BESS_FEATURES = os.environ.get('BESS_FEATURES', 'all')
 
 # BESS Simulation Konfiguration
 
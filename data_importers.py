@@ -71,18 +71,11 @@ class WindProfileImporter(DataImporter):
             db.session.add(wind_data)
             db.session.flush()
 
-            # Werte importieren
-            created = 0
-            for ts, row in df.iterrows():
-                wind_value = WindValue(
-                    wind_data_id=wind_data.id,
-                    timestamp=ts.to_pydatetime(),
-                    wind_speed=float(row.get("v_hub", 0.0)),
-                    power_kw=float(row.get("P_net_kW", 0.0)),
-                    energy_kwh=float(row.get("E_kWh", 0.0)) if pd.notna(row.get("E_kWh")) else None,
-                )
-                db.session.add(wind_value)
-                created += 1
+            # Werte spaltenweise als ein executemany-Insert schreiben (statt ein ORM-Objekt pro Zeile)
+            records = self._wind_value_records(wind_data.id, df)
+            if records:
+                db.session.execute(WindValue.__table__.insert(), records)
+            created = len(records)
 
             db.session.commit()
             return (
@@ -94,6 +87,31 @@ class WindProfileImporter(DataImporter):
             db.session.rollback()
             return False, f"Fehler beim Wind-Import: {str(e)}", None
 
+    @staticmethod
+    def _wind_value_records(wind_data_id: int, df: pd.DataFrame) -> List[Dict]:
+        """Zeilen für WindValue aus den Spalten des DataFrames (NaN-Energie -> NULL)"""
+        n = len(df)
+        timestamps = df.index.to_pydatetime()
+        wind_speed = df["v_hub"].to_numpy(dtype=float) if "v_hub" in df.columns else np.zeros(n)
+        power_kw = df["P_net_kW"].to_numpy(dtype=float)
+        if "E_kWh" in df.columns:
+            energy = df["E_kWh"].astype(object).where(df["E_kWh"].notna(), None).tolist()
+        else:
+            energy = [None] * n
+
+        now = datetime.utcnow()
+        return [
+            {
+                "wind_data_id": wind_data_id,
+                "timestamp": ts,
+                "wind_speed": speed,
+                "power_kw": power,
+                "energy_kwh": e,
+                "created_at": now,
+            }
+            for ts, speed, power, e in zip(timestamps, wind_speed.tolist(), power_kw.tolist(), energy)
+        ]
+
 class LoadProfileImporter(DataImporter):
     """Importiert Lastprofile aus verschiedenen Formaten"""
     
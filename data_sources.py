@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Austauschbare Datenquellen für alle Fetcher (Live / Aufzeichnung / Wiedergabe)
+=============================================================================
+
+Alle Fetcher sprechen ihre APIs über eine requests-Session an (ENTSO-E, APG,
+aWATTar, eHYD, Smart Grid, IoT, Blockchain) bzw. über den Response-Cache
+(PVGIS, GeoSphere, Wetter). Auf diesen Sessions wird ein ``DataSource``-Adapter
+eingehängt, der die Transportebene austauscht:
+
+- ``live``:   normale HTTP-Abrufe (Standard, identisch zum bisherigen Verhalten)
+- ``record``: Live-Abruf, jede Antwort zusätzlich als komprimierte Fixture speichern
+- ``replay``: Antworten ausschließlich aus den Fixtures, ohne Netzwerk und ohne
+              Rate-Limits – für Offline-Lasttests und Benchmarks
+
+Fixtures liegen unter ``<fixture_dir>/<host>/<sha256>.json.gz``. Der Schlüssel
+besteht aus Methode, URL, sortierten Query-Parametern und einem Hash des
+Request-Bodys; API-Schlüssel (securityToken, appid, ...) fließen weder in den
+Schlüssel noch in die Datei ein, sodass Aufzeichnungen ohne Schlüssel
+wiedergegeben und weitergegeben werden können.
+
+Konfiguration: DATA_SOURCE_MODE (live|record|replay, Standard live),
+DATA_SOURCE_FIXTURES (Standard instance/fixtures),
+DATA_SOURCE_LATENCY (none|recorded, Standard none)
+
+Aufzeichnen und Benchmark über den Ingestion-Scheduler:
+    python data_sources.py record --run awattar_day_ahead entsoe_day_ahead
+    python data_sources.py bench --run awattar_day_ahead entsoe_day_ahead --repeat 5
+"""
+
+import os
+import json
+import gzip
+import time
+import base64
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+MODES = ('live', 'record', 'replay')
+
+# Parameter, die nie in Fixture-Schlüssel oder -Dateien geschrieben werden
+SECRET_PARAMS = {'appid', 'api_key', 'apikey', 'securitytoken', 'token', 'key'}
+
+# Header, die beim Aufzeichnen verworfen werden (Transport/Sitzung, nicht Inhalt)
+DROPPED_HEADERS = {'set-cookie', 'transfer-encoding', 'content-encoding', 'content-length', 'connection'}
+
+
+class FixtureMissingError(requests.exceptions.ConnectionError):
+    """Keine Aufzeichnung für diese Anfrage – verhält sich für Fetcher wie ein Netzwerkfehler"""
+
+
+def get_mode() -> str:
+    mode = os.getenv('DATA_SOURCE_MODE', 'live').lower()
+    if mode not in MODES:
+        logger.warning(f"Unbekannter DATA_SOURCE_MODE '{mode}', verwende live")
+        return 'live'
+    return mode
+
+
+def is_replay() -> bool:
+    """True, wenn Fetcher ohne Netzwerk aus Fixtures bedient werden (Rate-Limits entfallen)"""
+    return get_mode() == 'replay'
+
+
+def _to_bytes(body) -> bytes:
+    if body is None:
+        return b''
+    if isinstance(body, str):
+        return body.encode('utf-8')
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    # Generatoren/Datei-Objekte werden nicht gehasht
+    return b''
+
+
+def redact_url(url: str) -> str:
+    """Entfernt API-Schlüssel aus der Query und sortiert die übrigen Parameter"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k.lower() not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+class FixtureStore:
+    """Komprimierte Aufzeichnungen einzelner HTTP-Antworten auf der Platte"""
+
+    def __init__(self, fixture_dir: str = None):
+        self.fixture_dir = fixture_dir or os.getenv('DATA_SOURCE_FIXTURES', os.path.join('instance', 'fixtures'))
+
+    @staticmethod
+    def fixture_key(method: str, url: str, body=None) -> str:
+        raw = json.dumps([method.upper(), redact_url(url), hashlib.sha256(_to_bytes(body)).hexdigest()],
+                         separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path(self, url: str, key: str) -> str:
+        host = urlsplit(url).netloc.lower().replace(':', '_') or 'local'
+        return os.path.join(self.fixture_dir, host, f"{key}.json.gz")
+
+    def save(self, method: str, url: str, body, status_code: int, headers: Dict[str, str],
+             content: bytes, elapsed: float) -> str:
+        key = self.fixture_key(method, url, body)
+        path = self.path(url, key)
+        record = {
+            'method': method.upper(),
+            'url': redact_url(url),
+            'status_code': status_code,
+            'headers': {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS},
+            'body_b64': base64.b64encode(content).decode('ascii'),
+            'elapsed': round(elapsed, 4),
+            'recorded_at': datetime.now().isoformat(),
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, method: str, url: str, body=None) -> Optional[Dict[str, Any]]:
+        path = self.path(url, self.fixture_key(method, url, body))
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            record = json.load(f)
+        record['content'] = base64.b64decode(record.pop('body_b64'))
+        return record
+
+    def count(self) -> int:
+        total = 0
+        for _, _, files in os.walk(self.fixture_dir):
+            total += sum(1 for name in files if name.endswith('.json.gz'))
+        return total
+
+
+# ----------------------------------------------------------------------
+# requests-Adapter
+# ----------------------------------------------------------------------
+
+class DataSource(HTTPAdapter):
+    """Live-Datenquelle: unveränderter HTTP-Transport mit Zählern"""
+
+    mode = 'live'
+
+    def __init__(self, fixture_dir: str = None, latency: str = None, **pool_kwargs):
+        super().__init__(**pool_kwargs)
+        self.store = FixtureStore(fixture_dir)
+        self.latency = latency or os.getenv('DATA_SOURCE_LATENCY', 'none')
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'recorded': 0, 'replayed': 0, 'missing': 0}
+
+    def _count(self, name: str):
+        with self.lock:
+            self.stats[name] += 1
+
+    def send(self, request, **kwargs):
+        self._count('requests')
+        return super().send(request, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {'mode': self.mode, 'fixture_dir': self.store.fixture_dir, **self.stats}
+
+
+class RecordingSource(DataSource):
+    """Live-Abruf, Antworten zusätzlich als Fixture ablegen"""
+
+    mode = 'record'
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        try:
+            # content liest den Body einmal vollständig ein; requests puffert ihn danach
+            content = response.content
+            self.store.save(request.method, request.url, request.body, response.status_code,
+                            dict(response.headers), content, time.perf_counter() - started)
+            self._count('recorded')
+        except Exception as e:
+            logger.warning(f"Fixture für {redact_url(request.url)} nicht gespeichert: {e}")
+        return response
+
+
+class ReplaySource(DataSource):
+    """Antworten ausschließlich aus Fixtures – kein Netzwerkzugriff"""
+
+    mode = 'replay'
+
+    def send(self, request, **kwargs):
+        self._count('requests')
+        record = self.store.load(request.method, request.url, request.body)
+        if record is None:
+            self._count('missing')
+            raise FixtureMissingError(f"Keine Fixture für {request.method} {redact_url(request.url)}",
+                                      request=request)
+        if self.latency == 'recorded':
+            time.sleep(record.get('elapsed', 0))
+
+        response = requests.Response()
+        response.status_code = record['status_code']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response._content = record['content']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = 'Replayed'
+        response.elapsed = timedelta(0)
+        response.connection = self
+        self._count('replayed')
+        return response
+
+
+SOURCES = {'live': DataSource, 'record': RecordingSource, 'replay': ReplaySource}
+
+
+def create_source(mode: str = None, fixture_dir: str = None, **pool_kwargs) -> DataSource:
+    """Adapter für den konfigurierten Modus (pool_kwargs wie bei HTTPAdapter)"""
+    return SOURCES[mode or get_mode()](fixture_dir=fixture_dir, **pool_kwargs)
+
+
+def install(session: requests.Session, source: DataSource = None) -> requests.Session:
+    """Hängt die Datenquelle an eine bestehende Session"""
+    source = source or create_source()
+    session.mount('http://', source)
+    session.mount('https://', source)
+    return session
+
+
+def session(mode: str = None, fixture_dir: str = None, **pool_kwargs) -> requests.Session:
+    """Neue requests-Session mit eingehängter Datenquelle (Ersatz für requests.Session())"""
+    return install(requests.Session(), create_source(mode, fixture_dir, **pool_kwargs))
+
+
+# ----------------------------------------------------------------------
+# httpx-Transport (lokale API-Jobs des Ingestion-Schedulers)
+# ----------------------------------------------------------------------
+
+def async_transport(mode: str = None, fixture_dir: str = None, **transport_kwargs):
+    """httpx-Transport für den Modus; None im Live-Modus (httpx-Standard)"""
+    mode = mode or get_mode()
+    if mode == 'live':
+        return None
+
+    import httpx
+
+    store = FixtureStore(fixture_dir)
+
+    class FixtureTransport(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self.inner = httpx.AsyncHTTPTransport(**transport_kwargs) if mode == 'record' else None
+
+        async def handle_async_request(self, request):
+            body = await request.aread()
+            url = str(request.url)
+            if mode == 'replay':
+                record = store.load(request.method, url, body)
+                if record is None:
+                    raise httpx.ConnectError(f"Keine Fixture für {request.method} {redact_url(url)}",
+                                             request=request)
+                return httpx.Response(record['status_code'], headers=record['headers'],
+                                      content=record['content'], request=request)
+
+            started = time.perf_counter()
+            response = await self.inner.handle_async_request(request)
+            content = await response.aread()
+            store.save(request.method, url, body, response.status_code, dict(response.headers),
+                       content, time.perf_counter() - started)
+            return httpx.Response(response.status_code, headers=response.headers, content=content,
+                                  request=request)
+
+        async def aclose(self):
+            if self.inner is not None:
+                await self.inner.aclose()
+
+    return FixtureTransport()
+
+
+# ----------------------------------------------------------------------
+# Aufzeichnen / Benchmark über den Ingestion-Scheduler
+# ----------------------------------------------------------------------
+
+def _run_jobs(names, db_path: str, workers: int) -> Tuple[float, Dict[str, Any]]:
+    import asyncio
+    import tempfile
+    from ingestion_scheduler import IngestionScheduler, build_default_jobs
+
+    stats_file = os.path.join(tempfile.mkdtemp(prefix='data_sources_'), 'stats.json')
+    scheduler = IngestionScheduler(db_path=db_path, max_workers=workers, stats_file=stats_file)
+    for job in build_default_jobs():
+        if job.name in names:
+            scheduler.add_job(job)
+    unknown = [name for name in names if name not in scheduler.jobs]
+    if unknown:
+        raise SystemExit(f"Unbekannte Jobs: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    asyncio.run(scheduler.run_once(names))
+    return time.perf_counter() - started, scheduler.get_stats()['jobs']
+
+
+def main():
+    import argparse
+    import shutil
+    import tempfile
+
+    parser = argparse.ArgumentParser(description='Datenquellen aufzeichnen und offline wiedergeben')
+    parser.add_argument('command', choices=['record', 'bench', 'info'])
+    parser.add_argument('--run', nargs='+', metavar='JOB', default=[], help='Ingestion-Jobs')
+    parser.add_argument('--fixtures', help='Fixture-Verzeichnis (Standard DATA_SOURCE_FIXTURES)')
+    parser.add_argument('--db', help='Ziel-Datenbank (bench: temporäre Kopie)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)-8s | %(message)s')
+    if args.fixtures:
+        os.environ['DATA_SOURCE_FIXTURES'] = args.fixtures
+    store = FixtureStore()
+
+    if args.command == 'info':
+        print(f"📁 {store.fixture_dir}: {store.count()} Fixtures")
+        return
+
+    # Der Response-Cache würde Anfragen vor dem Adapter abfangen
+    os.environ['FETCH_CACHE_ENABLED'] = 'false'
+
+    if args.command == 'record':
+        os.environ['DATA_SOURCE_MODE'] = 'record'
+        duration, jobs = _run_jobs(args.run, args.db or 'instance/bess.db', args.workers)
+        for name, job in jobs.items():
+            status = '✅' if not job['failures'] and not job['timeouts'] else f"❌ {job['last_error']}"
+            print(f"🎙️  {name:28} {job['records_written']:>8} Datensätze  {status}")
+        print(f"✅ {store.count()} Fixtures in {store.fixture_dir} ({duration:.2f}s)")
+        return
+
+    os.environ['DATA_SOURCE_MODE'] = 'replay'
+    work_dir = tempfile.mkdtemp(prefix='data_sources_bench_')
+    try:
+        durations = []
+        records = 0
+        for i in range(args.repeat):
+            db_path = os.path.join(work_dir, f"bench_{i}.db")
+            if args.db and os.path.exists(args.db):
+                shutil.copy(args.db, db_path)
+            duration, jobs = _run_jobs(args.run, db_path, args.workers)
+            durations.append(duration)
+            records = sum(job['records_written'] for job in jobs.values())
+            failed = [name for name, job in jobs.items() if job['failures'] or job['timeouts']]
+            print(f"⏱️  Lauf {i + 1}: {duration:.3f}s, {records} Datensätze"
+                  + (f", fehlgeschlagen: {', '.join(failed)}" if failed else ''))
+        best = min(durations)
+        print(f"📊 Bester Lauf {best:.3f}s, Median {sorted(durations)[len(durations) // 2]:.3f}s, "
+              f"{records / best if best else 0:.0f} Datensätze/s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
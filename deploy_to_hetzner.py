@@ -127,7 +127,10 @@ User=www-data
 Group=www-data
 WorkingDirectory=/var/www/bess-simulation
 Environment="PATH=/var/www/bess-simulation/venv/bin"
-ExecStart=/var/www/bess-simulation/venv/bin/gunicorn --workers 3 --bind unix:bess-simulation.sock -m 007 wsgi_deployment:app
+# gthread: SSE-Verbindungen (/api/live-data/stream) belegen nur einen Thread statt eines
+# ganzen Sync-Workers; --timeout gilt bei gthread für den Worker-Heartbeat, nicht für
+# die Dauer eines Streams. Offene Streams je Worker sind durch --threads begrenzt.
+ExecStart=/var/www/bess-simulation/venv/bin/gunicorn --workers 3 --worker-class gthread --threads 16 --timeout 120 --bind unix:bess-simulation.sock -m 007 wsgi_deployment:app
 ExecReload=/bin/kill -s HUP $MAINPID
 KillMode=mixed
 TimeoutStopSec=5
@@ -6,17 +6,21 @@ EHYD (Elektronisches Hydrographisches Datenmanagement)
 
 import requests
 import json
-import random
 from datetime import datetime, timedelta
 import time
 
+import numpy as np
+
+import data_sources
+from fetch_cache import fetch_cache, fetch_windowed
+
 class EHYDDataFetcher:
     """EHYD Data Fetcher für österreichische Pegelstände"""
     
     def __init__(self):
         self.base_url = "https://ehyd.gv.at"
         self.api_url = "https://ehyd.gv.at/api"
-        self.session = requests.Session()
+        self.session = data_sources.session()
         self.session.headers.update({
             'User-Agent': 'BESS-Simulation/1.0 (https://github.com/HSchlagi/bess-simulation)'
         })
@@ -722,24 +726,34 @@ class EHYDDataFetcher:
             # EHYD API-Endpunkt für Pegelstände
             api_url = f"{self.api_url}/station/{ehyd_id}/measurements"
             
-            params = {
-                "start": start_date.strftime("%Y-%m-%d"),
-                "end": end_date.strftime("%Y-%m-%d"),
-                "type": "water_level",
-                "format": "json"
-            }
-            
             print(f"🌊 Lade echte EHYD-Daten für {station['name']} ({start_date} bis {end_date})")
             
-            response = self.session.get(api_url, params=params, timeout=30)
+            # Monatsfenster: abgeschlossene Monate kommen aus dem Response-Cache,
+            # angefragt werden nur fehlende bzw. noch offene Fenster
+            def fetch_window(window_start, window_end, immutable):
+                params = {
+                    "start": window_start.strftime("%Y-%m-%d"),
+                    "end": window_end.strftime("%Y-%m-%d"),
+                    "type": "water_level",
+                    "format": "json"
+                }
+                response = fetch_cache.get(api_url, params=params, session=self.session,
+                                           timeout=30, max_age=900, immutable=immutable)
+                if response.status_code != 200:
+                    raise RuntimeError(f"EHYD API Fehler: {response.status_code}")
+                return self._parse_ehyd_response(response.json(), station)
             
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✅ Echte EHYD-Daten geladen: {len(data)} Datenpunkte")
-                return self._parse_ehyd_response(data, station)
-            else:
-                print(f"❌ EHYD API Fehler: {response.status_code}")
-                return None
+            def merge(parts):
+                # Fenstergrenzen überlappen um einen Tag -> Duplikate je Zeitstempel entfernen
+                merged = {}
+                for part in parts:
+                    for entry in part:
+                        merged.setdefault(entry["timestamp"], entry)
+                return [merged[ts] for ts in sorted(merged)]
+            
+            water_levels = fetch_windowed(start_date, end_date, fetch_window, merge, unit="month")
+            print(f"✅ Echte EHYD-Daten geladen: {len(water_levels)} Datenpunkte")
+            return water_levels
                 
         except Exception as e:
             print(f"❌ Fehler beim Laden der echten EHYD-Daten: {e}")
@@ -768,21 +782,33 @@ class EHYDDataFetcher:
         
         return water_levels
     
-    def get_demo_data(self, river_key, days=7):
+    def _iter_stations(self, river):
+        """(station_id, station) für Flüsse mit Stations-Dict (Steyr) oder -Liste"""
+        stations = river["stations"]
+        if isinstance(stations, dict):
+            return list(stations.items())
+        return [
+            (station["id"], {**station, "ehyd_id": station.get("ehyd_id", station["id"])})
+            for station in stations
+        ]
+    
+    def get_demo_data(self, river_key, days=7, start_date=None, end_date=None):
         """Generiert Demo-Daten basierend auf echten Mustern"""
         if river_key not in self.rivers:
             return None
         
         river = self.rivers[river_key]
-        stations = river["stations"]
+        stations = self._iter_stations(river)
         
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        if end_date is None:
+            end_date = datetime.now()
+        if start_date is None:
+            start_date = end_date - timedelta(days=days)
         
         all_water_levels = []
         successful_stations = 0
         
-        for station_id, station in stations.items():
+        for station_id, station in stations:
             # Versuche zuerst echte Daten zu laden
             real_data = self.fetch_real_ehyd_data(station_id, start_date, end_date)
             
@@ -811,10 +837,7 @@ class EHYDDataFetcher:
         }
     
     def _generate_demo_data_for_station(self, station, start_date, end_date):
-        """Generiert realistische Demo-Daten für eine Station"""
-        water_levels = []
-        current_date = start_date
-        
+        """Generiert realistische Demo-Daten für eine Station (stündlich, vektorisiert)"""
         # Basis-Pegelstand je nach Station
         base_levels = {
             "Hinterstoder": 160,
@@ -824,30 +847,27 @@ class EHYDDataFetcher:
         
         base_level = base_levels.get(station["name"], 100)
         
-        while current_date <= end_date:
-            # Stündliche Messungen
-            for hour in range(24):
-                timestamp = current_date + timedelta(hours=hour)
-                
-                # Realistische Pegelstand-Variation
-                time_factor = hour / 24.0
-                seasonal_factor = 1.0 + 0.3 * abs(time_factor - 0.5)  # Höhere Werte am Tag
-                random_factor = random.uniform(0.95, 1.05)
-                
-                water_level = base_level * seasonal_factor * random_factor
-                
-                water_levels.append({
-                    "timestamp": timestamp.isoformat(),
-                    "station_id": station["ehyd_id"],
-                    "station_name": station["name"],
-                    "river_name": station["river"],
-                    "water_level_cm": round(water_level, 1),
-                    "source": "EHYD (Demo)"
-                })
-            
-            current_date += timedelta(days=1)
+        days = max((end_date - start_date).days + 1, 0)
+        hours = np.tile(np.arange(24), days)
+        offsets = np.arange(days * 24)
         
-        return water_levels
+        # Realistische Pegelstand-Variation: höhere Werte am Tag, ±5 % Zufall
+        seasonal_factor = 1.0 + 0.3 * np.abs(hours / 24.0 - 0.5)
+        random_factor = np.random.uniform(0.95, 1.05, len(hours))
+        water_levels = np.round(base_level * seasonal_factor * random_factor, 1).tolist()
+        
+        timestamps = [(start_date + timedelta(hours=int(h))).isoformat() for h in offsets]
+        return [
+            {
+                "timestamp": timestamp,
+                "station_id": station["ehyd_id"],
+                "station_name": station["name"],
+                "river_name": station["river"],
+                "water_level_cm": level,
+                "source": "EHYD (Demo)"
+            }
+            for timestamp, level in zip(timestamps, water_levels)
+        ]
     
     def fetch_data_for_year(self, river_key, year, project_id, profile_name):
         """Lädt Daten für ein spezifisches Jahr"""
@@ -855,11 +875,11 @@ class EHYDDataFetcher:
             return None
         
         start_date = datetime(year, 1, 1)
-        end_date = datetime(year, 12, 31)
+        end_date = datetime(year, 12, 31, 23)
         
         print(f"📅 Lade {year} Daten für {self.rivers[river_key]['name']}")
         
-        return self.get_demo_data(river_key, (end_date - start_date).days)
+        return self.get_demo_data(river_key, start_date=start_date, end_date=end_date)
 
 # Test-Funktion
 if __name__ == "__main__":
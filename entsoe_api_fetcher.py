@@ -14,13 +14,18 @@ Datum: Januar 2025
 import requests
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 import time
 import os
+import io
+import re
 import xml.etree.ElementTree as ET
+import numpy as np
 from dataclasses import dataclass
 
+import data_sources
+
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,7 +47,11 @@ class ENTSOEAPIFetcher:
         env_token = os.getenv('ENTSOE_API_KEY', '')
         self.api_key = api_key or env_token or ''
         self.demo_mode = not bool(self.api_key)
-        self.base_url = 'https://web-api.tp.entsoe.eu/api'
+        self.base_url = os.getenv('ENTSOE_BASE_URL', 'https://web-api.tp.entsoe.eu/api')
+        
+        # Persistente Session (HTTP Keep-Alive, Connection-Pool)
+        self.session = data_sources.session()
+        self.session.headers.update({'User-Agent': 'BESS-Simulation/2.1 (https://bess.instanet.at)'})
         
         # Rate Limiting
         self.last_request_time = 0
@@ -83,6 +92,8 @@ class ENTSOEAPIFetcher:
     
     def _rate_limit(self):
         """Rate Limiting für API-Requests"""
+        if data_sources.is_replay():
+            return
         current_time = time.time()
         time_since_last = current_time - self.last_request_time
         
@@ -98,7 +109,7 @@ class ENTSOEAPIFetcher:
             self._rate_limit()
             
             logger.info(f"🌍 ENTSO-E API-Request: {url}")
-            response = requests.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             
             logger.info(f"✅ ENTSO-E API-Response erfolgreich: {len(response.text)} Zeichen")
@@ -111,86 +122,176 @@ class ENTSOEAPIFetcher:
             logger.error(f"❌ Unerwarteter Fehler: {e}")
             return None
     
-    def _parse_xml_response(self, xml_content: str) -> List[ENTSOEData]:
-        """Parse ENTSO-E XML Response"""
+    def _parse_xml_series(self, xml_content, strict: bool = False) -> List[Dict]:
+        """Streaming-Parser für ENTSO-E XML (iterparse mit Element-Clearing).
+
+        Liefert pro TimeSeries/Period ein Dict mit ``timestamps`` (datetime64[s], UTC)
+        und ``values`` (float64) als NumPy-Arrays sowie country_code, market_type
+        und resolution. Bei Kurventyp A03 werden fehlende Positionen mit dem
+        vorherigen Wert aufgefüllt, sonst verworfen.
+
+        Mit ``strict=True`` (Backfill) werden Parse-Fehler weitergereicht statt
+        als leere Liste gemeldet, damit das Fenster nicht als erledigt gilt.
+        Ein Acknowledgement_MarketDocument gilt dann nur bei "No matching data
+        found" als leeres Ergebnis, sonst wird ein ValueError mit dem Grund geworfen.
+        """
+        source = io.BytesIO(xml_content.encode('utf-8')) if isinstance(xml_content, str) else (
+            io.BytesIO(xml_content) if isinstance(xml_content, bytes) else xml_content
+        )
+
+        series = []
+        ts_info: Dict = {}
+        period: Dict = {}
+        point: Dict = {}
+        in_interval = False
+        root_tag = None
+        reasons = []
+
         try:
-            root = ET.fromstring(xml_content)
-            data_points = []
-            
-            default_ns = root.tag.split('}')[0].strip('{')
-            ns = {'ns': default_ns}
-            
-            for timeseries in root.findall('.//ns:TimeSeries', ns):
-                market_type = 'unknown'
-                business = timeseries.find('.//ns:businessType', ns)
-                if business is not None and business.text:
-                    market_type = business.text
-                
-                country_code = 'AT'
-                bidding_zone = timeseries.find('.//ns:outBiddingZone_Domain.mRID', ns)
-                if bidding_zone is None:
-                    bidding_zone = timeseries.find('.//ns:in_Domain.mRID', ns)
-                if bidding_zone is not None and bidding_zone.text:
-                    zone_text = bidding_zone.text
-                    if zone_text.startswith('10Y') and '-' in zone_text:
-                        country_code = zone_text[2:4]
-                    elif len(zone_text) >= 2:
-                        country_code = zone_text[:2]
-                
-                periods = timeseries.findall('.//ns:Period', ns)
-                if not periods:
-                    periods = timeseries.findall('.//ns:period', ns)
-                
-                for period in periods:
-                    start_node = period.find('.//ns:start', ns)
-                    resolution_node = period.find('.//ns:resolution', ns)
-                    if start_node is None:
-                        continue
-                    start_dt = datetime.fromisoformat(start_node.text.replace('Z', '+00:00'))
-                    
-                    resolution = resolution_node.text if resolution_node is not None else 'PT60M'
-                    if resolution == 'PT15M':
-                        step = timedelta(minutes=15)
-                    elif resolution == 'PT30M':
-                        step = timedelta(minutes=30)
-                    else:
-                        step = timedelta(hours=1)
-                    
-                    points = period.findall('.//ns:Point', ns)
-                    for point in points:
-                        position_node = point.find('.//ns:position', ns)
-                        price_node = point.find('.//ns:price.amount', ns)
-                        quantity_node = point.find('.//ns:quantity', ns)
-                        
-                        price_text = None
-                        if price_node is not None and price_node.text:
-                            price_text = price_node.text
-                        elif quantity_node is not None and quantity_node.text:
-                            price_text = quantity_node.text
-                        
-                        if position_node is None or price_text is None:
-                            continue
-                        
-                        position = int(position_node.text)
-                        timestamp = start_dt + step * (position - 1)
-                        
-                        data_points.append(ENTSOEData(
-                            timestamp=timestamp,
-                            price_eur_mwh=float(price_text),
-                            country_code=country_code,
-                            market_type=market_type,
-                            data_type='price',
-                            source='ENTSO-E'
-                        ))
-            
-            return data_points
-            
+            context = ET.iterparse(source, events=('start', 'end'))
+            for event, elem in context:
+                tag = elem.tag.rsplit('}', 1)[-1]
+
+                if event == 'start':
+                    if root_tag is None:
+                        root_tag = tag
+                    if tag == 'TimeSeries':
+                        ts_info = {'market_type': 'unknown', 'country_code': 'AT', 'curve_type': 'A01'}
+                    elif tag in ('Period', 'period'):
+                        period = {'start': None, 'end': None, 'resolution': 'PT60M',
+                                  'positions': [], 'values': []}
+                    elif tag == 'timeInterval':
+                        in_interval = True
+                    elif tag == 'Point':
+                        point = {}
+                    continue
+
+                text = elem.text
+                if tag == 'businessType' and text:
+                    ts_info['market_type'] = text
+                elif tag == 'curveType' and text:
+                    ts_info['curve_type'] = text
+                elif tag in ('outBiddingZone_Domain.mRID', 'in_Domain.mRID') and text:
+                    if tag == 'outBiddingZone_Domain.mRID' or 'zone_set' not in ts_info:
+                        ts_info['country_code'] = self._zone_country(text)
+                        ts_info['zone_set'] = tag == 'outBiddingZone_Domain.mRID'
+                elif tag == 'start' and in_interval and period:
+                    period['start'] = text
+                elif tag == 'end' and in_interval and period:
+                    period['end'] = text
+                elif tag == 'timeInterval':
+                    in_interval = False
+                elif tag == 'resolution' and text and period:
+                    period['resolution'] = text
+                elif tag == 'position':
+                    point['position'] = text
+                elif tag == 'price.amount':
+                    point['price'] = text
+                elif tag == 'quantity' and 'price' not in point:
+                    point['price'] = text
+                elif tag == 'Point':
+                    if period and point.get('position') and point.get('price'):
+                        period['positions'].append(point['position'])
+                        period['values'].append(point['price'])
+                    elem.clear()
+                elif tag in ('Period', 'period'):
+                    built = self._build_period_arrays(period, ts_info)
+                    if built is not None:
+                        series.append(built)
+                    period = {}
+                    elem.clear()
+                elif tag == 'TimeSeries':
+                    elem.clear()
+                elif tag == 'text' and root_tag == 'Acknowledgement_MarketDocument' and text:
+                    reasons.append(text.strip())
+
+            if strict and root_tag == 'Acknowledgement_MarketDocument':
+                reason = '; '.join(reasons) or 'ohne Begründung'
+                if 'No matching data found' not in reason:
+                    raise ValueError(f"ENTSO-E Acknowledgement: {reason}")
+            return series
+
         except ET.ParseError as e:
             logger.error(f"❌ XML Parse Fehler: {e}")
+            if strict:
+                raise
             return []
         except Exception as e:
             logger.error(f"❌ Unerwarteter Fehler beim XML-Parsing: {e}")
+            if strict:
+                raise
             return []
+
+    def _zone_country(self, zone_text: str) -> str:
+        for code, zone in self.bidding_zones.items():
+            if zone == zone_text:
+                return code
+        if zone_text.startswith('10Y') and '-' in zone_text:
+            return zone_text[3:5]
+        return zone_text[:2] if len(zone_text) >= 2 else 'AT'
+
+    @staticmethod
+    def _resolution_minutes(resolution: str) -> int:
+        match = re.fullmatch(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?', resolution or '')
+        if not match or not any(match.groups()):
+            return 60
+        days, hours, minutes = (int(g) if g else 0 for g in match.groups())
+        return days * 1440 + hours * 60 + minutes
+
+    def _build_period_arrays(self, period: Dict, ts_info: Dict) -> Optional[Dict]:
+        """Positionen/Werte einer Period in vorbelegte Arrays übertragen (vektorisiert)"""
+        if not period or not period['start'] or not period['positions']:
+            return None
+
+        step_minutes = self._resolution_minutes(period['resolution'])
+        step = np.timedelta64(step_minutes, 'm')
+        start = np.datetime64(period['start'].replace('Z', ''), 'm')
+
+        positions = np.asarray(period['positions'], dtype=np.int64)
+        prices = np.asarray(period['values'], dtype=np.float64)
+
+        # Länge aus dem timeInterval, sonst aus der höchsten Position
+        if period['end']:
+            length = int((np.datetime64(period['end'].replace('Z', ''), 'm') - start) // step)
+        else:
+            length = int(positions.max())
+        valid = (positions >= 1) & (positions <= length)
+
+        values = np.full(length, np.nan, dtype=np.float64)
+        values[positions[valid] - 1] = prices[valid]
+
+        present = ~np.isnan(values)
+        if ts_info.get('curve_type') == 'A03':
+            # Lücken = unveränderter Wert seit der letzten Position (Forward-Fill)
+            index = np.where(present, np.arange(length), 0)
+            np.maximum.accumulate(index, out=index)
+            values = values[index]
+            present = ~np.isnan(values)
+
+        offsets = np.nonzero(present)[0]
+        return {
+            'country_code': ts_info.get('country_code', 'AT'),
+            'market_type': ts_info.get('market_type', 'unknown'),
+            'resolution': period['resolution'],
+            'timestamps': (start + offsets * step).astype('datetime64[s]'),
+            'values': values[present],
+        }
+
+    def _parse_xml_response(self, xml_content: str) -> List[ENTSOEData]:
+        """Parse ENTSO-E XML Response (ENTSOEData-Liste auf Basis von _parse_xml_series)"""
+        data_points = []
+        for item in self._parse_xml_series(xml_content):
+            epoch_seconds = item['timestamps'].astype(np.int64).tolist()
+            for epoch, value in zip(epoch_seconds, item['values'].tolist()):
+                data_points.append(ENTSOEData(
+                    timestamp=datetime.fromtimestamp(epoch, tz=timezone.utc),
+                    price_eur_mwh=value,
+                    country_code=item['country_code'],
+                    market_type=item['market_type'],
+                    data_type='price',
+                    source='ENTSO-E'
+                ))
+        return data_points
     
     def get_day_ahead_prices(self, country_code: str = 'AT', start_date: str = None, end_date: str = None) -> List[ENTSOEData]:
         """Day-Ahead Preise von ENTSO-E abrufen"""
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ENTSO-E Historischer Backfill für BESS Simulation
+================================================
+
+Teilt einen mehrjährigen Zeitraum in API-gerechte Fenster, lädt diese parallel
+(Token-Bucket, persistente Session, Retry mit Jitter) und schreibt jedes Fenster
+sofort über die Preis-Ingestion in spot_price. Abgeschlossene Fenster werden in
+einer Checkpoint-Datei vermerkt, ein abgebrochener Lauf setzt dort wieder auf.
+
+Beispiel:
+    python entsoe_backfill.py --country DE --start 2019-01-01 --end 2025-01-01
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from entsoe_api_fetcher import ENTSOEAPIFetcher
+import data_sources
+
+logger = logging.getLogger(__name__)
+
+PERIOD_FORMAT = '%Y%m%d%H%M'
+
+# HTTP-Status, bei denen ein erneuter Versuch sinnvoll ist
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+Window = Tuple[datetime, datetime]
+
+
+class TokenBucket:
+    """Thread-sicherer Token-Bucket (rate Tokens/s, Burst bis capacity)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class BackfillCheckpoint:
+    """Persistiert abgeschlossene Fenster als JSON (atomar per os.replace)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.completed = set()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.completed = set(json.load(f).get('completed', []))
+            except Exception as e:
+                logger.warning(f"⚠️ Checkpoint {path} nicht lesbar, starte neu: {e}")
+
+    @staticmethod
+    def key(window: Window) -> str:
+        return f"{window[0].strftime(PERIOD_FORMAT)}-{window[1].strftime(PERIOD_FORMAT)}"
+
+    def is_done(self, window: Window) -> bool:
+        return self.key(window) in self.completed
+
+    def mark_done(self, window: Window):
+        with self.lock:
+            self.completed.add(self.key(window))
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'completed': sorted(self.completed), 'updated_at': datetime.now().isoformat()}, f)
+            os.replace(tmp_path, self.path)
+
+
+def split_windows(start: datetime, end: datetime, window_days: int) -> List[Window]:
+    """Zerlegt [start, end) in Fenster von höchstens window_days Tagen"""
+    windows = []
+    cursor = start
+    step = timedelta(days=window_days)
+    while cursor < end:
+        window_end = min(cursor + step, end)
+        windows.append((cursor, window_end))
+        cursor = window_end
+    return windows
+
+
+class SpotPriceSink:
+    """Schreibt geparste ENTSO-E Serien über die gemeinsame Preis-Ingestion in spot_price"""
+
+    def __init__(self, db_path: str = 'instance/bess.db', price_type: str = 'day_ahead',
+                 region: str = 'AT'):
+        import sqlite3
+        from app.price_ingestion import upsert_spot_prices
+
+        self.upsert = upsert_spot_prices
+        self.conn = sqlite3.connect(db_path)
+        self.price_type = price_type
+        self.region = region
+        # Gleiches Quell-Label wie save_entsoe_prices_to_db in app/routes.py
+        self.source = f"ENTSO-E ({price_type.replace('_', ' ').title()})"
+
+    def __call__(self, series: List[Dict]) -> Dict[str, int]:
+        records = []
+        for item in series:
+            # datetime64[us] -> naive UTC datetime
+            timestamps = item['timestamps'].astype('datetime64[us]').tolist()
+            records.extend(
+                {'timestamp': ts, 'price_eur_mwh': value}
+                for ts, value in zip(timestamps, item['values'].tolist())
+            )
+        return self.upsert(self.conn, records, source=self.source,
+                           region=self.region, price_type=self.price_type)
+
+    def close(self):
+        self.conn.close()
+
+
+class ENTSOEBackfill:
+    """Paralleler, wiederaufnehmbarer Backfill für ENTSO-E Preise"""
+
+    def __init__(self, fetcher: ENTSOEAPIFetcher, sink: Callable[[List[Dict]], Dict[str, int]],
+                 country_code: str = 'AT', price_type: str = 'day_ahead',
+                 window_days: int = 31, max_workers: int = 4, requests_per_second: float = 5.0,
+                 max_retries: int = 5, backoff_base: float = 1.0, checkpoint_path: str = None):
+        self.fetcher = fetcher
+        self.sink = sink
+        self.country_code = country_code
+        self.price_type = price_type
+        self.window_days = window_days
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.bucket = TokenBucket(requests_per_second)
+        self.checkpoint = BackfillCheckpoint(
+            checkpoint_path or os.path.join('instance', 'backfill', f"entsoe_{country_code}_{price_type}.json")
+        )
+
+        # Connection-Pool passend zur Parallelität
+        adapter = data_sources.create_source(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.fetcher.session.mount('http://', adapter)
+        self.fetcher.session.mount('https://', adapter)
+
+    def _params(self, window: Window) -> Dict[str, str]:
+        zone = self.fetcher.bidding_zones.get(self.country_code, self.fetcher.bidding_zones['AT'])
+        return {
+            'securityToken': self.fetcher.api_key,
+            'documentType': self.fetcher.market_types[self.price_type],
+            'in_Domain': zone,
+            'out_Domain': zone,
+            'periodStart': window[0].strftime(PERIOD_FORMAT),
+            'periodEnd': window[1].strftime(PERIOD_FORMAT),
+        }
+
+    def _sleep_backoff(self, attempt: int, retry_after: Optional[str] = None):
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            # Exponentieller Backoff mit Full Jitter
+            delay = random.uniform(0, self.backoff_base * (2 ** attempt))
+        time.sleep(delay)
+
+    def fetch_window(self, window: Window) -> List[Dict]:
+        """Lädt und parst ein Fenster mit Retries; wirft nach max_retries eine Exception.
+
+        Eine Rückgabe (auch eine leere Liste) bedeutet erfolgreich geparst;
+        nur dann wird das Fenster im Checkpoint vermerkt.
+        """
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.fetcher.session.get(self.fetcher.base_url, params=self._params(window), timeout=60)
+            except requests.exceptions.RequestException as e:
+                last_error = e
+                self._sleep_backoff(attempt)
+                continue
+
+            if response.status_code in RETRY_STATUS:
+                last_error = RuntimeError(f"HTTP {response.status_code}")
+                self._sleep_backoff(attempt, response.headers.get('Retry-After'))
+                continue
+
+            # ENTSO-E meldet leere Zeiträume als Acknowledgement mit HTTP 400
+            if response.status_code == 400 and 'No matching data found' in response.text:
+                return []
+            response.raise_for_status()
+            try:
+                return self.fetcher._parse_xml_series(response.content, strict=True)
+            except ET.ParseError as e:
+                # Abgeschnittene/fehlerhafte Antwort: erneut versuchen, Fenster bleibt offen
+                last_error = e
+                self._sleep_backoff(attempt)
+                continue
+
+        raise RuntimeError(f"Fenster {BackfillCheckpoint.key(window)} fehlgeschlagen: {last_error}")
+
+    def run(self, start: datetime, end: datetime) -> Dict:
+        """Führt den Backfill aus und liefert Statistiken"""
+        started = time.time()
+        windows = split_windows(start, end, self.window_days)
+        pending = [w for w in windows if not self.checkpoint.is_done(w)]
+
+        stats = {
+            'country_code': self.country_code,
+            'price_type': self.price_type,
+            'windows_total': len(windows),
+            'windows_skipped': len(windows) - len(pending),
+            'windows_done': 0,
+            'windows_failed': [],
+            'data_points': 0,
+            'inserted': 0,
+            'updated': 0,
+            'unchanged': 0,
+        }
+        logger.info(f"🌍 ENTSO-E Backfill {self.country_code}/{self.price_type}: "
+                    f"{len(pending)} von {len(windows)} Fenstern offen")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch_window, window): window for window in pending}
+            # Schreiben erfolgt im Haupt-Thread, sobald ein Fenster fertig ist
+            for future in as_completed(futures):
+                window = futures[future]
+                try:
+                    series = future.result()
+                except Exception as e:
+                    # Fenster bleibt offen und wird beim nächsten Lauf erneut geladen
+                    logger.error(f"❌ Fenster {BackfillCheckpoint.key(window)}: {e}")
+                    stats['windows_failed'].append(BackfillCheckpoint.key(window))
+                    continue
+
+                if series:
+                    result = self.sink(series)
+                    for key in ('inserted', 'updated', 'unchanged'):
+                        stats[key] += result.get(key, 0)
+                    stats['data_points'] += sum(len(item['values']) for item in series)
+
+                self.checkpoint.mark_done(window)
+                stats['windows_done'] += 1
+
+        stats['duration_seconds'] = round(time.time() - started, 2)
+        logger.info(f"✅ ENTSO-E Backfill abgeschlossen: {stats}")
+        return stats
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ENTSO-E Historischer Backfill')
+    parser.add_argument('--country', default='AT')
+    parser.add_argument('--price-type', default='day_ahead', choices=['day_ahead', 'intraday'])
+    parser.add_argument('--start', required=True, help='Startdatum (YYYY-MM-DD, UTC)')
+    parser.add_argument('--end', default=datetime.utcnow().strftime('%Y-%m-%d'), help='Enddatum exklusiv')
+    parser.add_argument('--window-days', type=int, default=31)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rps', type=float, default=5.0, help='Requests pro Sekunde (Token-Bucket)')
+    parser.add_argument('--db', default='instance/bess.db')
+    parser.add_argument('--base-url', default=None, help='Alternative API-URL (z. B. lokaler Stand-in)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)-8s | %(message)s')
+
+    fetcher = ENTSOEAPIFetcher()
+    if fetcher.demo_mode:
+        raise SystemExit("ENTSOE_API_KEY nicht gesetzt - Backfill benötigt einen Token.")
+    if args.base_url:
+        fetcher.base_url = args.base_url
+
+    sink = SpotPriceSink(args.db, price_type=args.price_type, region=args.country)
+    try:
+        backfill = ENTSOEBackfill(fetcher, sink, country_code=args.country, price_type=args.price_type,
+                                  window_days=args.window_days, max_workers=args.workers,
+                                  requests_per_second=args.rps)
+        stats = backfill.run(_parse_date(args.start), _parse_date(args.end))
+    finally:
+        sink.close()
+
+    print(json.dumps(stats, indent=2))
+    if stats['windows_failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
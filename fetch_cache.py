@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokaler Response-Cache für externe Datenquellen
+==============================================
+
+Inhaltsadressierter HTTP-Cache auf der Platte für PVGIS, GeoSphere, eHYD,
+aWATTar und die Wetter-Fetcher:
+
+- Antwortkörper liegen unter ihrem SHA-256 (identische Antworten nur einmal)
+- Revalidierung per ETag / If-None-Match und Last-Modified / If-Modified-Since
+- abgeschlossene historische Zeitfenster gelten als unveränderlich und werden
+  ohne Netzwerkzugriff beantwortet
+- ``split_windows`` zerlegt Zeiträume in ausgerichtete Fenster, sodass nur
+  fehlende Fenster angefragt und die Ergebnisse zusammengeführt werden
+- LRU-/TTL-Begrenzung: Treffer aktualisieren die mtime des Index-Eintrags,
+  ``prune`` entfernt ungenutzte Einträge und verwaiste Blobs
+- Zähler werden pro Prozess unter ``stats/<pid>.json`` abgelegt und in
+  ``get_stats`` über alle Worker summiert
+
+Konfiguration: FETCH_CACHE_DIR (Standard instance/http_cache),
+FETCH_CACHE_ENABLED (Standard true), FETCH_CACHE_MAX_MB (Standard 512),
+FETCH_CACHE_MAX_AGE_DAYS (Standard 90)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+import data_sources
+
+logger = logging.getLogger(__name__)
+
+# Parameter, die nie in den Index geschrieben werden
+SECRET_PARAMS = data_sources.SECRET_PARAMS
+
+# Fenster, deren Ende länger als diese Zeit zurückliegt, gelten als abgeschlossen
+DEFAULT_SETTLE_TIME = timedelta(days=2)
+
+# Mindestabstand zwischen zwei automatischen Bereinigungen bzw. Statistik-Dumps (Sekunden)
+PRUNE_INTERVAL = 300
+STATS_FLUSH_INTERVAL = 10
+
+STAT_COUNTERS = ('hits', 'revalidated', 'misses', 'stale_served', 'bytes_saved', 'evicted')
+
+
+class CachedResponse:
+    """Minimale requests.Response-Schnittstelle für Antworten aus dem Cache"""
+
+    def __init__(self, content: bytes, headers: Dict[str, str], url: str,
+                 status_code: int = 200, from_cache: bool = True, revalidated: bool = False):
+        self.content = content
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.url = url
+        self.status_code = status_code
+        self.from_cache = from_cache
+        self.revalidated = revalidated
+        self.encoding = 'utf-8'
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"{self.status_code} für {self.url}", response=self)
+
+
+def split_windows(start: datetime, end: datetime, unit: str = 'month') -> List[Tuple[datetime, datetime]]:
+    """Zerlegt [start, end) in an Tag/Monat/Jahr ausgerichtete Fenster"""
+    def next_boundary(value: datetime) -> datetime:
+        if unit == 'day':
+            return value.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        if unit == 'month':
+            if value.month == 12:
+                return value.replace(year=value.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+            return value.replace(month=value.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        if unit == 'year':
+            return value.replace(year=value.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        raise ValueError(f"Unbekannte Fenstereinheit: {unit}")
+
+    windows = []
+    cursor = start
+    while cursor < end:
+        window_end = min(next_boundary(cursor), end)
+        windows.append((cursor, window_end))
+        cursor = window_end
+    return windows
+
+
+def window_is_settled(window_end: datetime, settle: timedelta = DEFAULT_SETTLE_TIME) -> bool:
+    """True, wenn das Fenster vollständig in der Vergangenheit liegt (Daten ändern sich nicht mehr)"""
+    now = datetime.now(window_end.tzinfo) if window_end.tzinfo else datetime.now()
+    return window_end <= now - settle
+
+
+class ResponseCache:
+    """Inhaltsadressierter HTTP-Response-Cache mit bedingten Requests"""
+
+    def __init__(self, cache_dir: str = None, enabled: bool = None,
+                 max_bytes: Optional[int] = None, max_age: Optional[float] = None):
+        self.cache_dir = cache_dir or os.getenv('FETCH_CACHE_DIR', os.path.join('instance', 'http_cache'))
+        if enabled is None:
+            enabled = os.getenv('FETCH_CACHE_ENABLED', 'true').lower() == 'true'
+        self.enabled = enabled
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('FETCH_CACHE_MAX_MB', '512')) * 1024 * 1024)
+        if max_age is None:
+            max_age = float(os.getenv('FETCH_CACHE_MAX_AGE_DAYS', '90')) * 86400
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.prune_lock = threading.Lock()
+        self.stats = {name: 0 for name in STAT_COUNTERS}
+        self._last_prune = 0.0
+        self._last_flush = 0.0
+        self._session: Optional[requests.Session] = None
+
+    # ------------------------------------------------------------------
+    # Schlüssel und Speicher
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[Dict] = None, method: str = 'GET') -> str:
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([method.upper(), url, items], separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _index_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, 'index', key[:2], f"{key}.json")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, 'blobs', digest[:2], digest)
+
+    def _load_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._index_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            if not os.path.exists(self._blob_path(entry['sha256'])):
+                return None
+            return entry
+        except Exception as e:
+            logger.warning(f"Cache-Eintrag {key} unlesbar: {e}")
+            return None
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _store(self, key: str, url: str, params: Optional[Dict], response) -> Dict[str, Any]:
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            self._write_atomic(blob_path, content)
+
+        entry = {
+            'url': url,
+            'params': {k: ('***' if str(k).lower() in SECRET_PARAMS else v) for k, v in (params or {}).items()},
+            'sha256': digest,
+            'size': len(content),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+            'fetched_at': time.time(),
+        }
+        self._write_atomic(self._index_path(key), json.dumps(entry).encode('utf-8'))
+        return entry
+
+    def _touch(self, key: str, entry: Dict[str, Any]):
+        entry['fetched_at'] = time.time()
+        self._write_atomic(self._index_path(key), json.dumps(entry).encode('utf-8'))
+
+    def _mark_used(self, key: str):
+        """LRU: die mtime des Index-Eintrags ist der Zeitpunkt der letzten Nutzung"""
+        try:
+            os.utime(self._index_path(key))
+        except OSError:
+            pass
+
+    def _cached_response(self, entry: Dict[str, Any], revalidated: bool = False) -> CachedResponse:
+        with open(self._blob_path(entry['sha256']), 'rb') as f:
+            content = f.read()
+        headers = {'Content-Type': entry.get('content_type') or ''}
+        return CachedResponse(content, headers, entry['url'], revalidated=revalidated)
+
+    def _default_session(self) -> requests.Session:
+        """Gemeinsame Session mit Datenquelle für Aufrufer ohne eigene Session"""
+        with self.lock:
+            if self._session is None:
+                self._session = data_sources.session()
+            return self._session
+
+    def _count(self, name: str, size: int = 0):
+        with self.lock:
+            self.stats[name] += 1
+            if name in ('hits', 'revalidated', 'stale_served'):
+                self.stats['bytes_saved'] += size
+            due = time.time() - self._last_flush >= STATS_FLUSH_INTERVAL
+        if due:
+            self.flush_stats()
+
+    def _stats_path(self, pid: int) -> str:
+        return os.path.join(self.cache_dir, 'stats', f"{pid}.json")
+
+    def flush_stats(self):
+        """Zähler dieses Prozesses ablegen, damit get_stats alle Worker sieht"""
+        with self.lock:
+            self._last_flush = time.time()
+            data = json.dumps(self.stats).encode('utf-8')
+        try:
+            self._write_atomic(self._stats_path(os.getpid()), data)
+        except OSError as e:
+            logger.warning(f"Cache-Statistik nicht gespeichert: {e}")
+
+    # ------------------------------------------------------------------
+    # Begrenzung (LRU / TTL)
+    # ------------------------------------------------------------------
+
+    def _maybe_prune(self):
+        if time.time() - self._last_prune < PRUNE_INTERVAL or not self.prune_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_prune = time.time()
+            self.prune()
+        except Exception as e:
+            logger.warning(f"Cache-Bereinigung fehlgeschlagen: {e}")
+        finally:
+            self.prune_lock.release()
+
+    def _scan_index(self) -> List[Tuple[float, str, Dict[str, Any]]]:
+        entries = []
+        index_dir = os.path.join(self.cache_dir, 'index')
+        for root, _, files in os.walk(index_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, 'r') as f:
+                        entry = json.load(f)
+                    entries.append((os.path.getmtime(path), name[:-5], entry))
+                except (OSError, ValueError):
+                    continue
+        return entries
+
+    def prune(self, max_bytes: Optional[int] = None, max_age: Optional[float] = None) -> Dict[str, int]:
+        """Entfernt Einträge, die länger als ``max_age`` ungenutzt sind, und danach die
+        am längsten ungenutzten, bis die Blobs höchstens ``max_bytes`` belegen."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age is None else max_age
+        now = time.time()
+
+        entries = sorted(self._scan_index(), key=lambda item: item[0])
+        refs: Dict[str, int] = {}
+        blob_sizes: Dict[str, int] = {}
+        for _, _, entry in entries:
+            refs[entry['sha256']] = refs.get(entry['sha256'], 0) + 1
+            blob_sizes[entry['sha256']] = entry.get('size', 0)
+        total = sum(blob_sizes.values())
+
+        evicted = 0
+        for used_at, key, entry in entries:
+            if now - used_at <= max_age and total <= max_bytes:
+                break
+            try:
+                os.remove(self._index_path(key))
+            except OSError:
+                continue
+            evicted += 1
+            digest = entry['sha256']
+            refs[digest] -= 1
+            if refs[digest] == 0:
+                total -= blob_sizes[digest]
+
+        # Verwaiste Blobs (auch aus abgebrochenen Schreibvorgängen) entfernen
+        blobs_removed = 0
+        for root, _, files in os.walk(os.path.join(self.cache_dir, 'blobs')):
+            for name in files:
+                if refs.get(name, 0) == 0:
+                    try:
+                        os.remove(os.path.join(root, name))
+                        blobs_removed += 1
+                    except OSError:
+                        pass
+
+        # Statistik-Dateien beendeter Prozesse verfallen mit derselben TTL
+        for root, _, files in os.walk(os.path.join(self.cache_dir, 'stats')):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if now - os.path.getmtime(path) > max_age:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+        with self.lock:
+            self.stats['evicted'] += evicted
+        if evicted:
+            logger.info(f"Response-Cache bereinigt: {evicted} Einträge, {blobs_removed} Blobs entfernt")
+        return {'evicted': evicted, 'blobs_removed': blobs_removed, 'bytes': total}
+
+    # ------------------------------------------------------------------
+    # Öffentliche API
+    # ------------------------------------------------------------------
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            session: Optional[requests.Session] = None, timeout: float = 30,
+            max_age: Optional[float] = None, immutable: bool = False):
+        """GET mit Cache.
+
+        Args:
+            immutable: Antwort ändert sich nie (abgeschlossener historischer Zeitraum)
+            max_age: Sekunden, in denen ein Eintrag ohne Revalidierung gilt
+
+        Returns:
+            CachedResponse bei Treffer/304/200, sonst die originale requests.Response
+            (Fehlerbehandlung der Aufrufer bleibt unverändert)
+        """
+        http = session or self._default_session()
+        if not self.enabled:
+            return http.get(url, params=params, headers=headers, timeout=timeout)
+
+        key = self.cache_key(url, params)
+        entry = self._load_entry(key)
+
+        if entry is not None:
+            age = time.time() - entry['fetched_at']
+            if immutable or (max_age is not None and age < max_age):
+                try:
+                    cached = self._cached_response(entry)
+                except OSError:
+                    # Blob zwischenzeitlich von einem anderen Prozess entfernt
+                    entry = None
+                else:
+                    self._mark_used(key)
+                    self._count('hits', entry['size'])
+                    return cached
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = http.get(url, params=params, headers=request_headers, timeout=timeout)
+        except requests.exceptions.RequestException:
+            if entry is not None:
+                logger.warning(f"Netzwerkfehler, liefere Cache-Stand für {url}")
+                self._count('stale_served', entry['size'])
+                return self._cached_response(entry)
+            raise
+
+        if response.status_code == 304 and entry is not None:
+            self._touch(key, entry)
+            self._count('revalidated', entry['size'])
+            return self._cached_response(entry, revalidated=True)
+
+        if response.status_code == 200:
+            self._count('misses')
+            entry = self._store(key, url, params, response)
+            self._maybe_prune()
+            return CachedResponse(response.content, dict(response.headers), url, from_cache=False)
+
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zähler summiert über alle Prozesse, die denselben Cache nutzen"""
+        self.flush_stats()
+        with self.lock:
+            stats = dict(self.stats)
+        own = f"{os.getpid()}.json"
+        stats_dir = os.path.join(self.cache_dir, 'stats')
+        for name in (os.listdir(stats_dir) if os.path.isdir(stats_dir) else []):
+            if not name.endswith('.json') or name == own:
+                continue
+            try:
+                with open(os.path.join(stats_dir, name), 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for counter in STAT_COUNTERS:
+                stats[counter] += data.get(counter, 0)
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['revalidated']) / lookups, 3) if lookups else None
+        return stats
+
+
+def fetch_windowed(start: datetime, end: datetime, fetch_window: Callable[[datetime, datetime, bool], Any],
+                   merge: Callable[[List[Any]], Any], unit: str = 'month',
+                   settle: timedelta = DEFAULT_SETTLE_TIME):
+    """Lädt einen Zeitraum fensterweise und führt die Teilergebnisse zusammen.
+
+    ``fetch_window(window_start, window_end, immutable)`` wird pro Fenster aufgerufen;
+    abgeschlossene Fenster sind ``immutable`` und kommen nach dem ersten Abruf aus dem Cache,
+    sodass nur fehlende bzw. noch offene Fenster tatsächlich angefragt werden.
+    """
+    parts = []
+    for window_start, window_end in split_windows(start, end, unit):
+        part = fetch_window(window_start, window_end, window_is_settled(window_end, settle))
+        if part is not None:
+            parts.append(part)
+    return merge(parts)
+
+
+# Globale Cache-Instanz
+fetch_cache = ResponseCache()
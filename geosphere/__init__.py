@@ -7,12 +7,20 @@ from .geosphere_wind_engine import (
     TimeResolutionConfig,
     run_wind_pipeline,
 )
+from .wind_park_engine import (
+    StationSeriesStore,
+    WindParkConfig,
+    run_wind_park_pipeline,
+)
 
 __all__ = [
     'GeoSphereConfig',
     'WindTurbineConfig',
     'TimeResolutionConfig',
     'run_wind_pipeline',
+    'StationSeriesStore',
+    'WindParkConfig',
+    'run_wind_park_pipeline',
 ]
 
 
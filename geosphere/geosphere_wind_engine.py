@@ -1,12 +1,14 @@
 import io
 import json
-from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import requests
 
+from fetch_cache import fetch_cache, fetch_windowed, window_is_settled
+
 
 # Einfache Standard-Power-Curve (kann später durch echte Herstellerdaten ersetzt werden)
 POWER_CURVE: List[Tuple[float, float]] = [
@@ -37,12 +39,22 @@ class GeoSphereConfig:
     end: str
 
 
+# Weitere Turbinentypen können hier registriert und über "power_curve" referenziert werden
+POWER_CURVES: Dict[str, List[Tuple[float, float]]] = {
+    "default": POWER_CURVE,
+}
+
+
 @dataclass
 class WindTurbineConfig:
     hub_height_m: float
     alpha: float
     rated_power_kw: float
     loss_factor_total: float  # z.B. 0.15 für 15 % Gesamtverluste
+    power_curve: str = "default"  # Schlüssel in POWER_CURVES
+    count: int = 1  # Anzahl gleicher Anlagen im Park
+    cut_in_ms: Optional[float] = None  # None -> erster Stützpunkt der Power-Curve
+    cut_out_ms: Optional[float] = None  # None -> letzter Stützpunkt der Power-Curve
 
 
 @dataclass
@@ -50,25 +62,91 @@ class TimeResolutionConfig:
     target_freq: str  # z.B. "15min"
 
 
+def power_curve_kw(
+    v: np.ndarray,
+    curve: List[Tuple[float, float]],
+    cut_in_ms: Optional[float] = None,
+    cut_out_ms: Optional[float] = None,
+) -> np.ndarray:
+    """Vektorisierte lineare Interpolation der Power-Curve (np.interp).
+
+    Außerhalb (cut_in, cut_out) sowie für fehlende Werte wird 0 kW geliefert.
+    """
+    speeds = np.array([point[0] for point in curve], dtype=float)
+    powers = np.array([point[1] for point in curve], dtype=float)
+    cut_in = speeds[0] if cut_in_ms is None else cut_in_ms
+    cut_out = speeds[-1] if cut_out_ms is None else cut_out_ms
+
+    v = np.asarray(v, dtype=float)
+    power = np.interp(v, speeds, powers)
+    # NaN-Vergleiche sind False -> fehlende Werte fallen ebenfalls heraus
+    running = (v > cut_in) & (v < cut_out)
+    return np.where(running, power, 0.0)
+
+
 def _interpolate_power(v: float, curve: List[Tuple[float, float]]) -> float:
-    """Einfache lineare Interpolation der Power-Curve."""
-    if v <= curve[0][0] or v >= curve[-1][0]:
-        # Unterhalb min oder oberhalb max -> 0 kW (cut-in / cut-out)
-        return 0.0
+    """Einfache lineare Interpolation der Power-Curve (Einzelwert)."""
+    return float(power_curve_kw(np.array([v]), curve)[0])
 
-    for (v1, p1), (v2, p2) in zip(curve[:-1], curve[1:]):
-        if v1 <= v <= v2:
-            if v2 == v1:
-                return p1
-            f = (v - v1) / (v2 - v1)
-            return p1 + f * (p2 - p1)
 
-    return 0.0
+def compute_park_power(
+    v_ref: np.ndarray,
+    turbines: List[WindTurbineConfig],
+    ref_height_m: float = 10.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Berechnet Hubhöhen-Wind und Nettoleistung aller Turbinentypen in einem Durchlauf.
+
+    Returns:
+        (v_hub, p_net) mit Form (Anzahl Turbinentypen, Anzahl Zeitpunkte);
+        p_net enthält bereits Verluste und Anlagenanzahl.
+    """
+    v_ref = np.asarray(v_ref, dtype=float)
+    hub = np.array([t.hub_height_m for t in turbines], dtype=float)
+    alpha = np.array([t.alpha for t in turbines], dtype=float)
+    v_hub = v_ref[np.newaxis, :] * ((hub / ref_height_m) ** alpha)[:, np.newaxis]
+
+    p_net = np.empty_like(v_hub)
+    for i, turbine in enumerate(turbines):
+        p_raw = power_curve_kw(v_hub[i], POWER_CURVES[turbine.power_curve],
+                               turbine.cut_in_ms, turbine.cut_out_ms)
+        p_net[i] = np.minimum(p_raw * (1.0 - turbine.loss_factor_total), turbine.rated_power_kw) * turbine.count
+    return v_hub, p_net
 
 
 def fetch_geosphere_wind_df(cfg: GeoSphereConfig) -> pd.DataFrame:
     """Lädt Winddaten von GeoSphere als DataFrame.
 
+    Längere Zeiträume werden in Monatsfenster zerlegt; abgeschlossene Fenster kommen
+    nach dem ersten Abruf aus dem lokalen Response-Cache, sodass nur fehlende bzw.
+    noch offene Monate tatsächlich angefragt werden.
+    """
+    try:
+        start = pd.Timestamp(cfg.start).to_pydatetime()
+        end = pd.Timestamp(cfg.end).to_pydatetime()
+    except (ValueError, TypeError):
+        return _fetch_geosphere_window_df(cfg, immutable=False)
+
+    if (end - start).days <= 31:
+        return _fetch_geosphere_window_df(cfg, immutable=window_is_settled(end))
+
+    def fetch_window(window_start, window_end, immutable):
+        window_cfg = replace(
+            cfg,
+            start=window_start.strftime("%Y-%m-%dT%H:%M"),
+            end=window_end.strftime("%Y-%m-%dT%H:%M"),
+        )
+        return _fetch_geosphere_window_df(window_cfg, immutable=immutable)
+
+    def merge(frames):
+        df = pd.concat(frames).sort_index()
+        return df[~df.index.duplicated(keep="first")]
+
+    return fetch_windowed(start, end, fetch_window, merge, unit="month")
+
+
+def _fetch_geosphere_window_df(cfg: GeoSphereConfig, immutable: bool = False) -> pd.DataFrame:
+    """Lädt einen Zeitraum von GeoSphere (ein Request) als DataFrame.
+
     Erwartet einen Datensatz mit mindestens einer Zeitspalte und einem FF-Parameter.
     """
     params_str = ",".join(cfg.parameters)
@@ -92,7 +170,7 @@ def fetch_geosphere_wind_df(cfg: GeoSphereConfig) -> pd.DataFrame:
     }
 
     try:
-        resp = requests.get(url, headers=headers, timeout=60)
+        resp = fetch_cache.get(url, headers=headers, timeout=60, immutable=immutable)
         resp.raise_for_status()
     except requests.exceptions.HTTPError as e:
         status_code = e.response.status_code if hasattr(e, 'response') and e.response is not None else None
@@ -179,7 +257,7 @@ def fetch_geosphere_wind_df(cfg: GeoSphereConfig) -> pd.DataFrame:
                 f"&format=csv"
             )
             print(f"🌐 Alternative GeoSphere-API Aufruf: {alt_url}")
-            resp = requests.get(alt_url, headers=headers, timeout=60)
+            resp = fetch_cache.get(alt_url, headers=headers, timeout=60, immutable=immutable)
             resp.raise_for_status()
             url = alt_url  # Für spätere Fehlermeldungen
         else:
@@ -481,10 +559,14 @@ def compute_hub_height_wind(
     return result
 
 
-def apply_power_curve(df: pd.DataFrame, loss_factor_total: float) -> pd.DataFrame:
+def apply_power_curve(
+    df: pd.DataFrame,
+    loss_factor_total: float,
+    curve: List[Tuple[float, float]] = POWER_CURVE,
+) -> pd.DataFrame:
     """Wendet Power-Curve an und berechnet Nettoleistung."""
     result = df.copy()
-    result["P_raw_kW"] = result["v_hub"].apply(lambda v: _interpolate_power(v, POWER_CURVE))
+    result["P_raw_kW"] = power_curve_kw(result["v_hub"].to_numpy(dtype=float), curve)
     result["P_net_kW"] = result["P_raw_kW"] * (1.0 - loss_factor_total)
     return result
 
@@ -509,12 +591,35 @@ def compute_energy(df: pd.DataFrame, target_freq: str) -> pd.DataFrame:
     return result
 
 
+def _turbine_config_from_dict(data: Dict[str, Any]) -> WindTurbineConfig:
+    """WindTurbineConfig aus einem Config-Dict (optionale Felder mit Standardwerten)."""
+    curve = data.get("power_curve", "default")
+    if curve not in POWER_CURVES:
+        raise ValueError(f"Unbekannte Power-Curve: {curve}")
+    return WindTurbineConfig(
+        hub_height_m=float(data["hub_height_m"]),
+        alpha=float(data["alpha"]),
+        rated_power_kw=float(data["rated_power_kw"]),
+        loss_factor_total=float(data["loss_factor_total"]),
+        power_curve=curve,
+        count=int(data.get("count", 1)),
+        cut_in_ms=float(data["cut_in_ms"]) if data.get("cut_in_ms") is not None else None,
+        cut_out_ms=float(data["cut_out_ms"]) if data.get("cut_out_ms") is not None else None,
+    )
+
+
 def run_wind_pipeline(config: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """Führt die komplette GeoSphere-Windpipeline aus.
 
-    Erwartet ein Config-Dict mit Schlüsseln 'geosphere', 'wind_turbine', 'time_resolution'.
+    Erwartet ein Config-Dict mit Schlüsseln 'geosphere', 'wind_turbine' (oder 'wind_turbines'
+    als Liste für Parks mit mehreren Turbinentypen) und 'time_resolution'.
+    Mit 'wind_park' (Stationen + Anlagenstandorte) wird an run_wind_park_pipeline delegiert.
     Gibt DataFrame mit Index 'timestamp' sowie ein KPI-Dict zurück.
     """
+    if config.get("wind_park"):
+        from .wind_park_engine import run_wind_park_pipeline
+        return run_wind_park_pipeline(config)
+
     geo_cfg = GeoSphereConfig(
         base_url=config["geosphere"]["base_url"],
         resource_id=config["geosphere"]["resource_id"],
@@ -524,12 +629,10 @@ def run_wind_pipeline(config: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, A
         end=config["geosphere"]["end"],
     )
 
-    wt_cfg = WindTurbineConfig(
-        hub_height_m=float(config["wind_turbine"]["hub_height_m"]),
-        alpha=float(config["wind_turbine"]["alpha"]),
-        rated_power_kw=float(config["wind_turbine"]["rated_power_kw"]),
-        loss_factor_total=float(config["wind_turbine"]["loss_factor_total"]),
-    )
+    # Einzelanlage ("wind_turbine") oder Park mit mehreren Turbinentypen ("wind_turbines")
+    turbine_dicts = config.get("wind_turbines") or [config["wind_turbine"]]
+    turbines = [_turbine_config_from_dict(t) for t in turbine_dicts]
+    rated_power_total_kw = sum(t.rated_power_kw * t.count for t in turbines)
 
     tr_cfg = TimeResolutionConfig(target_freq=config["time_resolution"]["target_freq"])
 
@@ -544,18 +647,19 @@ def run_wind_pipeline(config: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, A
             raise ValueError("Spalte für Windgeschwindigkeit (FF) nicht gefunden.")
         v_col = matches[0]
 
-    # 3) Hubhöhe berechnen
-    df_hub = compute_hub_height_wind(df_raw, v_col, wt_cfg.hub_height_m, wt_cfg.alpha)
-
-    # 4) Power-Curve anwenden
-    df_power = apply_power_curve(df_hub, wt_cfg.loss_factor_total)
+    # 3) + 4) Hubhöhe und Power-Curve für alle Turbinentypen in einem Durchlauf
+    v_hub, p_net = compute_park_power(df_raw[v_col].to_numpy(dtype=float), turbines)
+    df_power = pd.DataFrame(
+        {"v_hub": v_hub[0], "P_net_kW": p_net.sum(axis=0)},
+        index=df_raw.index,
+    )
 
     # 5) Resampling und Energieberechnung
     df_resampled = resample_to_target(df_power, tr_cfg.target_freq)
     df_energy = compute_energy(df_resampled, tr_cfg.target_freq)
 
     # 6) Clip auf Nennleistung (Sicherheitsnetz)
-    df_energy["P_net_kW"] = np.minimum(df_energy["P_net_kW"], wt_cfg.rated_power_kw)
+    df_energy["P_net_kW"] = np.minimum(df_energy["P_net_kW"], rated_power_total_kw)
 
     # 7) Ausgabe-DataFrame aufräumen
     df_out = df_energy[["v_hub", "P_net_kW", "E_kWh"]].copy()
@@ -563,13 +667,15 @@ def run_wind_pipeline(config: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, A
 
     # KPIs berechnen
     e_year_kwh = float(df_out["E_kWh"].sum())
-    full_load_hours = e_year_kwh / wt_cfg.rated_power_kw if wt_cfg.rated_power_kw > 0 else 0.0
+    full_load_hours = e_year_kwh / rated_power_total_kw if rated_power_total_kw > 0 else 0.0
 
     kpis = {
         "records": int(len(df_out)),
         "time_start": df_out.index.min().isoformat() if not df_out.empty else None,
         "time_end": df_out.index.max().isoformat() if not df_out.empty else None,
         "E_year_kWh": e_year_kwh,
+        "rated_power_kw": rated_power_total_kw,
+        "turbine_count": sum(t.count for t in turbines),
         "full_load_hours": full_load_hours,
         "p_min_kw": float(df_out["P_net_kW"].min()) if not df_out.empty else 0.0,
         "p_max_kw": float(df_out["P_net_kW"].max()) if not df_out.empty else 0.0,
@@ -588,8 +694,11 @@ __all__ = [
     "GeoSphereConfig",
     "WindTurbineConfig",
     "TimeResolutionConfig",
+    "POWER_CURVES",
     "fetch_geosphere_wind_df",
     "compute_hub_height_wind",
+    "power_curve_kw",
+    "compute_park_power",
     "apply_power_curve",
     "resample_to_target",
     "compute_energy",
@@ -0,0 +1,446 @@
+"""Windpark-Engine: mehrere Anlagenstandorte, mehrere GeoSphere-Stationen, Wake-Verluste.
+
+Jede Anlage bezieht ihre Referenzwindgeschwindigkeit aus gewichteten Stationen (explizite
+Gewichte oder inverse Distanzgewichtung). Stationsdaten werden im StationSeriesStore
+zwischengespeichert, sodass ein Park mit N Anlagen nur einmal pro Station lädt.
+Wake-Verluste werden nach Jensen (Top-Hat) je Windrichtungssektor vorberechnet und
+vektorisiert auf die Zeitreihe angewendet.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .geosphere_wind_engine import (
+    POWER_CURVES,
+    GeoSphereConfig,
+    TimeResolutionConfig,
+    WindTurbineConfig,
+    _turbine_config_from_dict,
+    compute_energy,
+    fetch_geosphere_wind_df,
+    power_curve_kw,
+    resample_to_target,
+)
+
+EARTH_RADIUS_M = 6_371_000.0
+
+
+@dataclass
+class WindStation:
+    station_id: str
+    lat: float
+    lon: float
+
+
+@dataclass
+class TurbinePosition:
+    turbine: WindTurbineConfig
+    lat: float
+    lon: float
+    name: str = ""
+    rotor_diameter_m: float = 120.0
+    thrust_coefficient: float = 0.8  # Ct für das Jensen-Modell
+    station_weights: Optional[Dict[str, float]] = None  # None -> inverse Distanzgewichtung
+
+
+@dataclass
+class WakeConfig:
+    model: str = "jensen"  # "jensen" oder "constant"
+    decay_constant: float = 0.075  # Wake-Aufweitung k (Onshore)
+    sectors: int = 36  # Windrichtungssektoren für die vorberechneten Defizite
+    loss_factor: float = 0.0  # Geschwindigkeitsdefizit, nur für model="constant"
+
+
+@dataclass
+class WindParkConfig:
+    stations: List[WindStation]
+    turbines: List[TurbinePosition]
+    wake: WakeConfig = field(default_factory=WakeConfig)
+    idw_power: float = 2.0
+    ref_height_m: float = 10.0
+
+
+class StationSeriesStore:
+    """Zwischenspeicher für GeoSphere-Stationszeitreihen (Speicher + optional Platte).
+
+    Pro (Resource, Station, Parameter) wird ein zusammenhängender Zeitraum gehalten;
+    Anfragen innerhalb dieses Zeitraums werden ohne Netzwerkzugriff beantwortet.
+    Höchstens ``max_entries`` Stationen bleiben im Speicher (LRU). Zeiträume, die bis
+    an die Gegenwart reichen, gelten nur ``recent_ttl`` Sekunden, da GeoSphere die
+    letzten Tage noch nachliefert. Auf der Platte liegt JSON (kein Pickle).
+    """
+
+    # Zeiträume, deren Ende weniger als so lange zurückliegt, können sich noch ändern
+    SETTLE_TIME = pd.Timedelta(days=2)
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: Optional[int] = None,
+                 recent_ttl: Optional[float] = None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries or int(os.getenv("GEOSPHERE_STATION_CACHE_MAX", "32"))
+        self.recent_ttl = recent_ttl if recent_ttl is not None else float(
+            os.getenv("GEOSPHERE_STATION_RECENT_TTL", "3600"))
+        self.lock = threading.Lock()
+        # key -> (start, end, DataFrame, geladen um [epoch])
+        self.series: "OrderedDict[str, Tuple[pd.Timestamp, pd.Timestamp, pd.DataFrame, float]]" = OrderedDict()
+        self.stats = {"hits": 0, "fetches": 0, "refreshes": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(cfg: GeoSphereConfig) -> str:
+        raw = "|".join([cfg.base_url, cfg.resource_id, cfg.station_id, ",".join(sorted(cfg.parameters))])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+
+    def _load_disk(self, key: str):
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return
+        with open(path, "r") as f:
+            payload = json.load(f)
+        frame = json.loads(payload["frame"])
+        index = pd.DatetimeIndex(pd.to_datetime(frame["index"]), name=payload.get("index_name"))
+        df = pd.DataFrame(frame["data"], columns=frame["columns"], index=index, dtype=float)
+        self._put(key, (pd.Timestamp(payload["start"]), pd.Timestamp(payload["end"]), df,
+                        float(payload["fetched_at"])))
+
+    def _save_disk(self, key: str):
+        path = self._disk_path(key)
+        if path:
+            start, end, df, fetched_at = self.series[key]
+            payload = {
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "fetched_at": fetched_at,
+                "index_name": df.index.name,
+                "frame": df.to_json(orient="split", date_format="iso", date_unit="s"),
+            }
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+
+    def _put(self, key: str, value):
+        self.series[key] = value
+        self.series.move_to_end(key)
+        while len(self.series) > self.max_entries:
+            self.series.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _is_stale(self, cached) -> bool:
+        """Zeitraum reicht an die Gegenwart heran und ist älter als recent_ttl"""
+        end, fetched_at = cached[1], cached[3]
+        recent = end >= pd.Timestamp.now(tz="UTC").tz_localize(None) - self.SETTLE_TIME
+        return recent and time.time() - fetched_at > self.recent_ttl
+
+    def get(self, cfg: GeoSphereConfig) -> pd.DataFrame:
+        """Zeitreihe einer Station für [cfg.start, cfg.end]"""
+        key = self._key(cfg)
+        start, end = _as_naive(pd.Timestamp(cfg.start)), _as_naive(pd.Timestamp(cfg.end))
+
+        with self.lock:
+            if key not in self.series:
+                self._load_disk(key)
+            cached = self.series.get(key)
+            stale = bool(cached) and self._is_stale(cached)
+            if cached and not stale and cached[0] <= start and end <= cached[1]:
+                self.series.move_to_end(key)
+                self.stats["hits"] += 1
+                return _slice(cached[2], start, end)
+
+            # Erweiterten Zeitraum laden (abgeschlossene Monate liefert der Response-Cache)
+            if cached:
+                start, end = min(start, cached[0]), max(end, cached[1])
+            fetch_cfg = GeoSphereConfig(
+                base_url=cfg.base_url,
+                resource_id=cfg.resource_id,
+                station_id=cfg.station_id,
+                parameters=cfg.parameters,
+                start=start.strftime("%Y-%m-%dT%H:%M"),
+                end=end.strftime("%Y-%m-%dT%H:%M"),
+            )
+            df = fetch_geosphere_wind_df(fetch_cfg)
+            self.stats["refreshes" if stale else "fetches"] += 1
+            self._put(key, (start, end, df, time.time()))
+            self._save_disk(key)
+
+        return _slice(df, _as_naive(pd.Timestamp(cfg.start)), _as_naive(pd.Timestamp(cfg.end)))
+
+
+def _as_naive(ts: pd.Timestamp) -> pd.Timestamp:
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def _slice(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    index = df.index.tz_convert("UTC").tz_localize(None) if df.index.tz is not None else df.index
+    return df[(index >= start) & (index <= end)]
+
+
+def _find_column(df: pd.DataFrame, name: str) -> Optional[str]:
+    if name in df.columns:
+        return name
+    matches = [c for c in df.columns if name in c]
+    return matches[0] if matches else None
+
+
+def _local_xy(lat: np.ndarray, lon: np.ndarray, lat0: float, lon0: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Äquirektanguläre Projektion in Meter (Ost, Nord) um (lat0, lon0)"""
+    x = np.radians(lon - lon0) * EARTH_RADIUS_M * np.cos(np.radians(lat0))
+    y = np.radians(lat - lat0) * EARTH_RADIUS_M
+    return x, y
+
+
+def station_weight_matrix(park: WindParkConfig) -> np.ndarray:
+    """Gewichte (Anlagen x Stationen), zeilenweise auf 1 normiert"""
+    station_ids = [s.station_id for s in park.stations]
+    lat0 = float(np.mean([s.lat for s in park.stations]))
+    lon0 = float(np.mean([s.lon for s in park.stations]))
+    sx, sy = _local_xy(np.array([s.lat for s in park.stations]), np.array([s.lon for s in park.stations]), lat0, lon0)
+
+    weights = np.zeros((len(park.turbines), len(park.stations)))
+    for i, position in enumerate(park.turbines):
+        if position.station_weights:
+            for station_id, weight in position.station_weights.items():
+                if station_id not in station_ids:
+                    raise ValueError(f"Station {station_id} ist nicht im Park konfiguriert.")
+                weights[i, station_ids.index(station_id)] = weight
+        else:
+            tx, ty = _local_xy(np.array([position.lat]), np.array([position.lon]), lat0, lon0)
+            distance = np.hypot(sx - tx, sy - ty)
+            nearest = distance < 1.0
+            weights[i] = nearest if nearest.any() else 1.0 / distance ** park.idw_power
+
+    totals = weights.sum(axis=1, keepdims=True)
+    if np.any(totals <= 0):
+        raise ValueError("Jede Anlage benötigt mindestens ein positives Stationsgewicht.")
+    return weights / totals
+
+
+def wake_deficit_by_sector(park: WindParkConfig) -> np.ndarray:
+    """Jensen-Geschwindigkeitsdefizite je Richtungssektor (Sektoren x Anlagen).
+
+    Mehrere Wakes werden quadratisch überlagert. Richtungen meteorologisch
+    (Herkunft, 0° = Nord, im Uhrzeigersinn).
+    """
+    n = len(park.turbines)
+    sectors = park.wake.sectors
+    if park.wake.model == "constant":
+        return np.full((sectors, n), park.wake.loss_factor)
+    if park.wake.model != "jensen":
+        raise ValueError(f"Unbekanntes Wake-Modell: {park.wake.model}")
+
+    lat = np.array([t.lat for t in park.turbines])
+    lon = np.array([t.lon for t in park.turbines])
+    x, y = _local_xy(lat, lon, float(lat.mean()), float(lon.mean()))
+    radius = np.array([t.rotor_diameter_m for t in park.turbines]) / 2.0
+    ct = np.array([t.thrust_coefficient for t in park.turbines])
+    k = park.wake.decay_constant
+
+    theta = np.radians(np.arange(sectors) * 360.0 / sectors)
+    # Strömungsrichtung (wohin der Wind weht) je Sektor
+    flow_x, flow_y = -np.sin(theta), -np.cos(theta)
+
+    # Verschiebung Quelle i -> Ziel j: (Anlagen, Anlagen)
+    dx = x[np.newaxis, :] - x[:, np.newaxis]
+    dy = y[np.newaxis, :] - y[:, np.newaxis]
+
+    downstream = flow_x[:, None, None] * dx + flow_y[:, None, None] * dy  # (S, i, j)
+    lateral = np.abs(-flow_y[:, None, None] * dx + flow_x[:, None, None] * dy)
+    wake_radius = radius[None, :, None] + k * downstream
+    inside = (downstream > 0) & (lateral < wake_radius)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deficit = (1.0 - np.sqrt(1.0 - ct))[None, :, None] / (1.0 + k * downstream / radius[None, :, None]) ** 2
+    deficit = np.where(inside, deficit, 0.0)
+    return np.minimum(np.sqrt((deficit ** 2).sum(axis=1)), 1.0)
+
+
+def compute_wind_park_power(
+    station_speeds: np.ndarray,
+    station_directions: Optional[np.ndarray],
+    park: WindParkConfig,
+) -> Dict[str, np.ndarray]:
+    """Parkleistung vektorisiert berechnen.
+
+    Args:
+        station_speeds: (Stationen, Zeitpunkte) Windgeschwindigkeit in Referenzhöhe, NaN = fehlt
+        station_directions: (Stationen, Zeitpunkte) Windrichtung in Grad oder None
+
+    Returns:
+        Dict mit v_hub (Anlagen x Zeit, inkl. Wake), p_gross und p_net (je Anlage, kW)
+    """
+    weights = station_weight_matrix(park)
+    available = ~np.isnan(station_speeds)
+    speeds = np.where(available, station_speeds, 0.0)
+
+    # Gewichte je Zeitpunkt auf verfügbare Stationen renormieren
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v_ref = (weights @ speeds) / (weights @ available)
+
+    hub = np.array([t.turbine.hub_height_m for t in park.turbines])
+    alpha = np.array([t.turbine.alpha for t in park.turbines])
+    v_free = v_ref * ((hub / park.ref_height_m) ** alpha)[:, np.newaxis]
+
+    deficit = wake_deficit_by_sector(park)
+    if station_directions is not None and not np.all(np.isnan(station_directions)):
+        # Richtungen als Einheitsvektoren mitteln (359° und 1° -> 0°)
+        rad = np.radians(station_directions)
+        valid = ~np.isnan(rad)
+        sin_mean = np.nanmean(np.where(valid, np.sin(rad), np.nan), axis=0)
+        cos_mean = np.nanmean(np.where(valid, np.cos(rad), np.nan), axis=0)
+        direction = np.degrees(np.arctan2(sin_mean, cos_mean)) % 360.0
+        sector = np.round(np.nan_to_num(direction) / (360.0 / park.wake.sectors)).astype(int) % park.wake.sectors
+        wake_factor = 1.0 - deficit[sector].T
+        # Ohne Richtungsinformation: über alle Sektoren gemitteltes Defizit
+        wake_factor[:, np.isnan(direction)] = (1.0 - deficit.mean(axis=0))[:, np.newaxis]
+    else:
+        wake_factor = (1.0 - deficit.mean(axis=0))[:, np.newaxis]
+    v_hub = v_free * wake_factor
+
+    p_gross = np.empty_like(v_free)
+    p_net = np.empty_like(v_hub)
+    for i, position in enumerate(park.turbines):
+        p_gross[i] = _turbine_power(v_free[i], position.turbine)
+        p_net[i] = _turbine_power(v_hub[i], position.turbine)
+
+    return {"v_hub": v_hub, "p_gross": p_gross, "p_net": p_net}
+
+
+def _turbine_power(v_hub: np.ndarray, turbine: WindTurbineConfig) -> np.ndarray:
+    p_raw = power_curve_kw(v_hub, POWER_CURVES[turbine.power_curve], turbine.cut_in_ms, turbine.cut_out_ms)
+    return np.minimum(p_raw * (1.0 - turbine.loss_factor_total), turbine.rated_power_kw) * turbine.count
+
+
+def park_config_from_dict(data: Dict[str, Any]) -> WindParkConfig:
+    """WindParkConfig aus dem 'wind_park'-Abschnitt einer Pipeline-Config"""
+    stations = [
+        WindStation(station_id=str(s["station_id"]), lat=float(s["lat"]), lon=float(s["lon"]))
+        for s in data["stations"]
+    ]
+    turbines = []
+    for t in data["turbines"]:
+        turbines.append(TurbinePosition(
+            turbine=_turbine_config_from_dict(t),
+            lat=float(t["lat"]),
+            lon=float(t["lon"]),
+            name=t.get("name", ""),
+            rotor_diameter_m=float(t.get("rotor_diameter_m", 120.0)),
+            thrust_coefficient=float(t.get("thrust_coefficient", 0.8)),
+            station_weights={str(k): float(v) for k, v in t["station_weights"].items()}
+            if t.get("station_weights") else None,
+        ))
+    wake = WakeConfig(**data.get("wake", {}))
+    return WindParkConfig(
+        stations=stations,
+        turbines=turbines,
+        wake=wake,
+        idw_power=float(data.get("idw_power", 2.0)),
+        ref_height_m=float(data.get("ref_height_m", 10.0)),
+    )
+
+
+# Prozessweiter Store (je Gunicorn-Worker, durch max_entries begrenzt);
+# Stationen werden über Aufrufe hinweg wiederverwendet
+station_store = StationSeriesStore(os.getenv("GEOSPHERE_STATION_CACHE_DIR"))
+
+
+def run_wind_park_pipeline(
+    config: Dict[str, Any],
+    store: Optional[StationSeriesStore] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Windpark-Pipeline: Stationsdaten laden, Parkleistung mit Wake berechnen, resamplen.
+
+    Erwartet 'geosphere' (ohne station_id), 'wind_park' und 'time_resolution'.
+    Gibt DataFrame (v_hub, P_gross_kW, P_net_kW, E_kWh) mit Index 'timestamp' sowie KPIs zurück.
+    """
+    store = store or station_store
+    park = park_config_from_dict(config["wind_park"])
+    geo = config["geosphere"]
+    tr_cfg = TimeResolutionConfig(target_freq=config["time_resolution"]["target_freq"])
+
+    # Richtungsaufgelöste Wakes benötigen "DD" in den Parametern, sonst Sektormittel
+    parameters = list(geo.get("parameters") or ["FF"])
+
+    # 1) Stationsdaten (je Station höchstens ein Abruf, danach aus dem Store)
+    speed_series, direction_series = [], []
+    for station in park.stations:
+        df = store.get(GeoSphereConfig(
+            base_url=geo["base_url"],
+            resource_id=geo["resource_id"],
+            station_id=station.station_id,
+            parameters=parameters,
+            start=geo["start"],
+            end=geo["end"],
+        ))
+        v_col = _find_column(df, "FF")
+        if v_col is None:
+            raise ValueError(f"Spalte für Windgeschwindigkeit (FF) für Station {station.station_id} nicht gefunden.")
+        speed_series.append(df[v_col].rename(station.station_id))
+        d_col = _find_column(df, "DD")
+        if d_col is not None:
+            direction_series.append(df[d_col].rename(station.station_id))
+
+    # 2) Gemeinsame Zeitachse
+    speeds = pd.concat(speed_series, axis=1).sort_index()
+    speeds = speeds[~speeds.index.duplicated(keep="first")]
+    directions = None
+    if len(direction_series) == len(speed_series):
+        directions = pd.concat(direction_series, axis=1).reindex(speeds.index).to_numpy(dtype=float).T
+
+    # 3) Parkleistung
+    result = compute_wind_park_power(speeds.to_numpy(dtype=float).T, directions, park)
+    df_power = pd.DataFrame(
+        {
+            "v_hub": np.nanmean(result["v_hub"], axis=0),
+            "P_gross_kW": result["p_gross"].sum(axis=0),
+            "P_net_kW": result["p_net"].sum(axis=0),
+        },
+        index=speeds.index,
+    )
+
+    # 4) Resampling und Energieberechnung
+    df_out = compute_energy(resample_to_target(df_power, tr_cfg.target_freq), tr_cfg.target_freq)
+    df_out = df_out[["v_hub", "P_gross_kW", "P_net_kW", "E_kWh"]]
+    df_out.index.name = "timestamp"
+
+    rated_power_total_kw = sum(t.turbine.rated_power_kw * t.turbine.count for t in park.turbines)
+    e_year_kwh = float(df_out["E_kWh"].sum())
+    gross_sum = float(df_out["P_gross_kW"].sum())
+    kpis = {
+        "records": int(len(df_out)),
+        "time_start": df_out.index.min().isoformat() if not df_out.empty else None,
+        "time_end": df_out.index.max().isoformat() if not df_out.empty else None,
+        "E_year_kWh": e_year_kwh,
+        "rated_power_kw": rated_power_total_kw,
+        "turbine_count": sum(t.turbine.count for t in park.turbines),
+        "station_count": len(park.stations),
+        "full_load_hours": e_year_kwh / rated_power_total_kw if rated_power_total_kw > 0 else 0.0,
+        "wake_loss_pct": (1.0 - float(df_out["P_net_kW"].sum()) / gross_sum) * 100.0 if gross_sum > 0 else 0.0,
+        "p_min_kw": float(df_out["P_net_kW"].min()) if not df_out.empty else 0.0,
+        "p_max_kw": float(df_out["P_net_kW"].max()) if not df_out.empty else 0.0,
+        "p_mean_kw": float(df_out["P_net_kW"].mean()) if not df_out.empty else 0.0,
+    }
+    return df_out, kpis
+
+
+__all__ = [
+    "WindStation",
+    "TurbinePosition",
+    "WakeConfig",
+    "WindParkConfig",
+    "StationSeriesStore",
+    "station_weight_matrix",
+    "wake_deficit_by_sector",
+    "compute_wind_park_power",
+    "run_wind_park_pipeline",
+]
@@ -0,0 +1,724 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Einheitlicher Ingestion-Scheduler für BESS Simulation
+====================================================
+
+Ein asyncio-Prozess statt neun einzelner Scheduler-Skripte (APG, aWattar,
+ENTSO-E, Wetter, Smart Grid, Blockchain, IoT, Telemetrie-Retention):
+
+- steckbare Jobs mit cron-artigen Triggern (``CronTrigger``) oder Intervallen
+- gemeinsamer HTTP-Verbindungspool (requests-Adapter für die Fetcher-Klassen,
+  httpx.AsyncClient für lokale API-Abrufe)
+- ein gemeinsamer Bulk-Writer für spot_price (eine Verbindung, ein Thread)
+- Parallelitätslimit pro Job und globaler Thread-Pool
+- Job-Metriken inkl. Datenfrische in ``instance/ingestion_scheduler_stats.json``
+  (abrufbar über /api/monitoring/ingestion)
+
+Aufruf:
+    python ingestion_scheduler.py                 # Dauerbetrieb
+    python ingestion_scheduler.py --list          # Jobs und nächste Läufe
+    python ingestion_scheduler.py --run awattar_day_ahead
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import signal
+import sqlite3
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+logger = logging.getLogger(__name__)
+
+# Unter instance/, dem einzigen beschreibbaren Projektverzeichnis neben logs/ und archive/ (ProtectSystem=strict)
+STATS_FILE = os.path.join('instance', 'ingestion_scheduler_stats.json')
+LOCAL_API_URL = os.getenv('INGESTION_LOCAL_API', 'http://127.0.0.1:5000')
+
+# Job, in dessen Kontext ``JobContext.run_sync`` gerade aufgerufen wird
+_current_job: contextvars.ContextVar = contextvars.ContextVar('ingestion_job', default=None)
+
+
+# ----------------------------------------------------------------------
+# Trigger
+# ----------------------------------------------------------------------
+
+class CronTrigger:
+    """Cron-Ausdruck mit fünf Feldern: Minute Stunde Tag Monat Wochentag (0/7 = Sonntag)"""
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Ungültiger Cron-Ausdruck: '{expression}'")
+        self.expression = expression
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {0 if d == 7 else d for d in weekdays}
+        self.day_restricted = fields[2] != '*'
+        self.weekday_restricted = fields[4] != '*'
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> List[int]:
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/')
+                step = int(step_text)
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(v) for v in part.split('-'))
+            else:
+                start = end = int(part)
+            if start < low or end > high:
+                raise ValueError(f"Wert außerhalb {low}-{high}: '{field}'")
+            values.update(range(start, end + 1, step))
+        return sorted(values)
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = (day.isoweekday() % 7) in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_run(self, after: datetime) -> datetime:
+        day = after.replace(hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(366 * 4):
+            if self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate > after:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Kein Termin für '{self.expression}' gefunden")
+
+    def __str__(self):
+        return f"cron({self.expression})"
+
+
+class IntervalTrigger:
+    """Festes Intervall in Sekunden"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def next_run(self, after: datetime) -> datetime:
+        return after + timedelta(seconds=self.seconds)
+
+    def __str__(self):
+        return f"every({int(self.seconds)}s)"
+
+
+# ----------------------------------------------------------------------
+# Jobs und Metriken
+# ----------------------------------------------------------------------
+
+class JobMetrics:
+    """Laufzeit- und Frische-Kennzahlen eines Jobs"""
+
+    def __init__(self):
+        self.runs = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped_overlaps = 0
+        self.records_written = 0
+        self.total_duration = 0.0
+        self.last_started: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            'runs': self.runs,
+            'successes': self.successes,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'skipped_overlaps': self.skipped_overlaps,
+            'records_written': self.records_written,
+            'avg_duration_seconds': round(self.total_duration / self.runs, 3) if self.runs else None,
+            'last_duration_seconds': round(self.last_duration, 3) if self.last_duration is not None else None,
+            'last_started': datetime.fromtimestamp(self.last_started).isoformat() if self.last_started else None,
+            'last_success': datetime.fromtimestamp(self.last_success).isoformat() if self.last_success else None,
+            'freshness_seconds': round(now - self.last_success) if self.last_success else None,
+            'last_error': self.last_error,
+        }
+
+
+class IngestionJob:
+    """Ein steckbarer Job: async-Funktion ``func(ctx)`` plus Trigger"""
+
+    def __init__(self, name: str, func: Callable[['JobContext'], Awaitable[Any]], trigger,
+                 max_concurrency: int = 1, timeout: float = 900, run_on_start: bool = False,
+                 description: str = ''):
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.run_on_start = run_on_start
+        self.description = description
+        self.running = 0
+        # Executor-Threads des Jobs; laufen nach einem Timeout weiter
+        self.threads = set()
+        self.next_run: Optional[datetime] = None
+        self.metrics = JobMetrics()
+
+
+# ----------------------------------------------------------------------
+# Gemeinsame Ressourcen
+# ----------------------------------------------------------------------
+
+class BulkPriceWriter:
+    """Serialisiert alle spot_price-Schreibvorgänge über eine Verbindung in einem Thread.
+
+    Anstehende Batches werden gesammelt und in einer Transaktion geschrieben.
+    """
+
+    def __init__(self, db_path: str = 'instance/bess.db'):
+        self.db_path = db_path
+        self.queue: Optional[asyncio.Queue] = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='price-writer')
+        self.conn: Optional[sqlite3.Connection] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+
+    async def write(self, records: List[Dict], **defaults) -> Dict[str, int]:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, defaults, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(self.executor, self._write_batch, batch)
+                for (_, _, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _write_batch(self, batch) -> List[Dict[str, int]]:
+        from app.price_ingestion import upsert_spot_prices
+
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            results = [upsert_spot_prices(self.conn, records, commit=False, **defaults)
+                       for records, defaults, _ in batch]
+            self.conn.commit()
+            return results
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+        if self.conn is not None:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.conn.close)
+        self.executor.shutdown(wait=False)
+
+
+class JobContext:
+    """Wird jedem Job übergeben: HTTP-Pools, Bulk-Writer, Thread-Pool, Metriken"""
+
+    def __init__(self, scheduler: 'IngestionScheduler'):
+        import httpx
+        import data_sources
+
+        self.scheduler = scheduler
+        self.writer = scheduler.writer
+        # Ein Adapter (urllib3-Pool) für alle requests-Sessions der Fetcher; im
+        # record/replay-Modus zugleich die Datenquelle (DATA_SOURCE_MODE)
+        self.http_adapter = data_sources.create_source(pool_connections=10, pool_maxsize=10)
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        self.http = httpx.AsyncClient(
+            timeout=30,
+            limits=limits,
+            transport=data_sources.async_transport(limits=limits)
+        )
+        self._legacy_instances: Dict[str, Any] = {}
+
+    def attach(self, fetcher):
+        """Hängt den gemeinsamen Verbindungspool an die Session eines Fetchers"""
+        session = getattr(fetcher, 'session', None)
+        if session is not None:
+            session.mount('http://', self.http_adapter)
+            session.mount('https://', self.http_adapter)
+        return fetcher
+
+    async def run_sync(self, func: Callable, *args, **kwargs):
+        """Blockierende Fetcher-Aufrufe im gemeinsamen Thread-Pool ausführen.
+
+        Der Thread wird beim aufrufenden Job registriert, damit dessen Slot auch nach
+        einem Timeout belegt bleibt, bis der Thread tatsächlich fertig ist.
+        """
+        future = self.scheduler.executor.submit(func, *args, **kwargs)
+        job = _current_job.get()
+        if job is not None:
+            job.threads.add(future)
+            future.add_done_callback(job.threads.discard)
+        return await asyncio.wrap_future(future)
+
+    def legacy(self, module_name: str, class_name: str):
+        """Einmalig instanziierte Klasse eines bisherigen Scheduler-Skripts"""
+        key = f"{module_name}.{class_name}"
+        if key not in self._legacy_instances:
+            module = __import__(module_name)
+            instance = getattr(module, class_name)()
+            for attr in ('fetcher', 'session'):
+                if hasattr(instance, attr):
+                    self.attach(instance if attr == 'session' else getattr(instance, attr))
+            self._legacy_instances[key] = instance
+        return self._legacy_instances[key]
+
+    def is_fresh(self, job_name: str, max_age_seconds: float) -> bool:
+        job = self.scheduler.jobs.get(job_name)
+        return bool(job and job.metrics.last_success and time.time() - job.metrics.last_success < max_age_seconds)
+
+    async def close(self):
+        await self.http.aclose()
+
+
+# ----------------------------------------------------------------------
+# Scheduler
+# ----------------------------------------------------------------------
+
+class IngestionScheduler:
+    """asyncio-Scheduler für alle Datenquellen"""
+
+    def __init__(self, db_path: str = 'instance/bess.db', max_workers: int = 4,
+                 stats_file: str = STATS_FILE):
+        self.jobs: Dict[str, IngestionJob] = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ingestion')
+        self.writer = BulkPriceWriter(db_path)
+        self.stats_file = stats_file
+        self.started_at: Optional[float] = None
+        self.stop_event: Optional[asyncio.Event] = None
+        self.context: Optional[JobContext] = None
+        self.tasks = set()
+
+    def add_job(self, job: IngestionJob):
+        if job.name in self.jobs:
+            raise ValueError(f"Job '{job.name}' ist bereits registriert")
+        self.jobs[job.name] = job
+
+    async def _setup(self):
+        self.writer.start()
+        self.context = JobContext(self)
+        self.stop_event = asyncio.Event()
+        self.started_at = time.time()
+
+    async def _teardown(self):
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self.context.close()
+        await self.writer.stop()
+        self.executor.shutdown(wait=False)
+        self.save_stats()
+
+    async def run_job(self, job: IngestionJob):
+        """Führt einen Job unter seinem Parallelitätslimit aus und pflegt die Metriken"""
+        if job.running >= job.max_concurrency:
+            job.metrics.skipped_overlaps += 1
+            logger.warning(f"⏭️ {job.name}: läuft noch ({job.running}x) - Lauf übersprungen")
+            return
+
+        job.running += 1
+        _current_job.set(job)
+        metrics = job.metrics
+        metrics.runs += 1
+        metrics.last_started = time.time()
+        try:
+            result = await asyncio.wait_for(job.func(self.context), timeout=job.timeout)
+            metrics.successes += 1
+            metrics.last_success = time.time()
+            metrics.last_error = None
+            if isinstance(result, dict):
+                metrics.records_written += result.get('inserted', 0) + result.get('updated', 0)
+            logger.info(f"✅ {job.name}: {result}")
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            metrics.failures += 1
+            metrics.last_error = f"Timeout nach {job.timeout}s"
+            logger.error(f"❌ {job.name}: {metrics.last_error}")
+        except Exception as e:
+            metrics.failures += 1
+            metrics.last_error = str(e)
+            logger.error(f"❌ {job.name}: {e}")
+        finally:
+            metrics.last_duration = time.time() - metrics.last_started
+            metrics.total_duration += metrics.last_duration
+            self.save_stats()
+            # wait_for bricht nur die Coroutine ab - Executor-Threads laufen weiter.
+            # Slot erst freigeben, wenn sie beendet sind, sonst überlappen Läufe.
+            pending = list(job.threads)
+            if pending:
+                logger.warning(f"⏳ {job.name}: {len(pending)} Thread(s) laufen noch - Slot bleibt belegt")
+                await asyncio.wait([asyncio.wrap_future(f) for f in pending])
+            job.running -= 1
+
+    def _launch(self, job: IngestionJob):
+        task = asyncio.create_task(self.run_job(job))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def run(self):
+        """Hauptschleife: schläft bis zum nächsten fälligen Job"""
+        if not self.jobs:
+            raise ValueError("Keine Jobs registriert")
+        await self._setup()
+        try:
+            # systemd stoppt mit SIGTERM: laufende Jobs sauber beenden lassen
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.stop)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows / nicht im Hauptthread
+        now = datetime.now()
+        for job in self.jobs.values():
+            job.next_run = now if job.run_on_start else job.trigger.next_run(now)
+            logger.info(f"  - {job.name}: {job.trigger} (nächster Lauf {job.next_run:%Y-%m-%d %H:%M})")
+        logger.info(f"Ingestion-Scheduler gestartet: {len(self.jobs)} Jobs")
+
+        try:
+            while not self.stop_event.is_set():
+                now = datetime.now()
+                for job in self.jobs.values():
+                    if job.next_run <= now:
+                        self._launch(job)
+                        job.next_run = job.trigger.next_run(now)
+
+                next_due = min(job.next_run for job in self.jobs.values())
+                delay = max((next_due - datetime.now()).total_seconds(), 0.05)
+                try:
+                    await asyncio.wait_for(self.stop_event.wait(), timeout=min(delay, 60))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._teardown()
+            logger.info("Ingestion-Scheduler beendet")
+
+    async def run_once(self, names: List[str]):
+        """Führt die angegebenen Jobs sofort einmal aus"""
+        await self._setup()
+        try:
+            await asyncio.gather(*(self.run_job(self.jobs[name]) for name in names))
+        finally:
+            await self._teardown()
+
+    def stop(self):
+        if self.stop_event:
+            self.stop_event.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+            'updated_at': datetime.now().isoformat(),
+            'jobs': {
+                name: {
+                    'trigger': str(job.trigger),
+                    'description': job.description,
+                    'running': job.running,
+                    'next_run': job.next_run.isoformat() if job.next_run else None,
+                    **job.metrics.to_dict()
+                }
+                for name, job in self.jobs.items()
+            }
+        }
+
+    def save_stats(self):
+        try:
+            tmp_path = f"{self.stats_file}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.get_stats(), f, indent=2)
+            os.replace(tmp_path, self.stats_file)
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern der Scheduler-Statistiken: {e}")
+
+
+def load_stats(stats_file: str = STATS_FILE) -> Dict[str, Any]:
+    """Statistiken des (separat laufenden) Scheduler-Prozesses lesen"""
+    if not os.path.exists(stats_file):
+        return {}
+    with open(stats_file, 'r') as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------------------
+# Quell-Jobs
+# ----------------------------------------------------------------------
+
+ENTSOE_COUNTRIES = [c.strip() for c in os.getenv('INGESTION_ENTSOE_COUNTRIES', 'AT,DE').split(',') if c.strip()]
+
+
+async def awattar_day_ahead(ctx: JobContext):
+    """aWattar Day-Ahead für heute und morgen (Veröffentlichung ~14:00)"""
+    from awattar_data_fetcher import AWattarDataFetcher
+
+    fetcher = ctx.attach(AWattarDataFetcher())
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    response = await ctx.run_sync(fetcher.fetch_market_data, start, start + timedelta(days=2))
+    if not response.get('success'):
+        raise RuntimeError(response.get('error', 'aWattar API nicht verfügbar'))
+    parsed = fetcher.parse_market_data(response)
+    return await ctx.writer.write(parsed, source='aWATTAR (Live API)')
+
+
+async def awattar_history(ctx: JobContext, days_back: int = 7):
+    """Wöchentlicher Nachimport der letzten Tage (Lücken nach Ausfällen schließen)"""
+    from awattar_data_fetcher import AWattarDataFetcher
+
+    fetcher = ctx.attach(AWattarDataFetcher())
+    end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    response = await ctx.run_sync(fetcher.fetch_market_data, end - timedelta(days=days_back), end)
+    if not response.get('success'):
+        raise RuntimeError(response.get('error', 'aWattar API nicht verfügbar'))
+    parsed = fetcher.parse_market_data(response)
+    return await ctx.writer.write(parsed, source='aWATTAR (Live API)')
+
+
+async def apg_fallback(ctx: JobContext):
+    """APG-Preise nur, wenn aWattar seit 24 h keine Daten geliefert hat"""
+    if ctx.is_fresh('awattar_day_ahead', 24 * 3600):
+        return {'skipped': 'aWattar aktuell'}
+    from apg_data_fetcher import APGDataFetcher
+
+    fetcher = ctx.attach(APGDataFetcher())
+    apg_data = await ctx.run_sync(fetcher.fetch_current_prices)
+    if not apg_data:
+        raise RuntimeError('Keine APG-Daten verfügbar')
+    records = [{
+        'timestamp': entry['timestamp'],
+        'price_eur_mwh': entry['price'],
+        'source': entry.get('source', 'ENTSO-E (Live)'),
+        'region': entry.get('region', 'AT'),
+        'price_type': entry.get('market', 'Day-Ahead')
+    } for entry in apg_data]
+    return await ctx.writer.write(records)
+
+
+def _entsoe_job(price_type: str, days_ahead: int):
+    async def job(ctx: JobContext):
+        from entsoe_api_fetcher import ENTSOEAPIFetcher
+
+        fetcher = ctx.attach(ENTSOEAPIFetcher())
+        if fetcher.demo_mode:
+            return {'skipped': 'ENTSOE_API_KEY nicht gesetzt'}
+
+        start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        period = (start.strftime('%Y%m%d%H%M'), (start + timedelta(days=days_ahead)).strftime('%Y%m%d%H%M'))
+        fetch = fetcher.get_intraday_prices if price_type == 'intraday' else fetcher.get_day_ahead_prices
+        source = f"ENTSO-E ({price_type.replace('_', ' ').title()})"
+
+        totals = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        for country in ENTSOE_COUNTRIES:
+            points = await ctx.run_sync(fetch, country, *period)
+            # Demo-Fallback des Fetchers nicht als echte Preise speichern
+            records = [{'timestamp': p.timestamp, 'price_eur_mwh': p.price_eur_mwh}
+                       for p in points if p.source != 'ENTSO-E (Demo)']
+            result = await ctx.writer.write(records, source=source, region=country, price_type=price_type)
+            for key in totals:
+                totals[key] += result.get(key, 0)
+        return totals
+
+    job.__name__ = f"entsoe_{price_type}"
+    return job
+
+
+async def entsoe_generation(ctx: JobContext):
+    """ENTSO-E Erzeugungsdaten abrufen.
+
+    Wie im bisherigen entsoe_scheduler.py gibt es keine Zieltabelle; der Job dient als
+    täglicher Verfügbarkeitscheck der Generation-Schnittstelle (Datenfrische/Fehler).
+    """
+    from entsoe_api_fetcher import ENTSOEAPIFetcher
+
+    fetcher = ctx.attach(ENTSOEAPIFetcher())
+    if fetcher.demo_mode:
+        return {'skipped': 'ENTSOE_API_KEY nicht gesetzt'}
+
+    counts = {}
+    for country in ENTSOE_COUNTRIES:
+        points = await ctx.run_sync(fetcher.get_generation_data, country)
+        counts[country] = sum(1 for p in points if p.source != 'ENTSO-E (Demo)')
+    if not any(counts.values()):
+        raise RuntimeError('Keine ENTSO-E Generation-Daten erhalten')
+    return {'count': sum(counts.values()), 'countries': counts}
+
+
+def cleanup_old_data(db_path: str, demo_days: int = 7, log_days: int = 30) -> Dict[str, int]:
+    """Löscht alte Demo-Preise und Scheduler-Logs (bisher apg_scheduler_linux.py).
+
+    Echte Preise bleiben erhalten: Die 30-Tage-Löschung von aWattar-Preisen aus
+    awattar_scheduler.py wird bewusst nicht übernommen, da Backtests und
+    Wirtschaftlichkeitsanalysen auf der vollständigen Preishistorie aufbauen.
+    """
+    from app.price_ingestion import ensure_price_schema
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        ensure_price_schema(conn)
+        cursor = conn.cursor()
+        cursor.execute("""
+            DELETE FROM spot_price
+            WHERE source LIKE '%Demo%' AND created_at < ?
+        """, (datetime.now() - timedelta(days=demo_days),))
+        result = {'demo_deleted': cursor.rowcount, 'logs_deleted': 0}
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'apg_scheduler_log'"
+        ).fetchone()
+        if exists:
+            cursor.execute("DELETE FROM apg_scheduler_log WHERE timestamp < ?",
+                           (datetime.now() - timedelta(days=log_days),))
+            result['logs_deleted'] = cursor.rowcount
+        conn.commit()
+        return result
+    finally:
+        conn.close()
+
+
+async def cleanup(ctx: JobContext):
+    return await ctx.run_sync(cleanup_old_data, ctx.writer.db_path)
+
+
+def _local_api_job(path: str):
+    """Ruft einen lokalen Aggregations-Endpunkt über den gemeinsamen httpx-Client ab"""
+    async def job(ctx: JobContext):
+        response = await ctx.http.get(f"{LOCAL_API_URL}{path}", params={'hours': 24})
+        response.raise_for_status()
+        data = response.json()
+        if not data.get('success'):
+            raise RuntimeError(data.get('message', 'Unbekannter Fehler'))
+        return {'count': data.get('count', 0)}
+
+    return job
+
+
+def _legacy_job(module_name: str, class_name: str, method: str):
+    """Adapter für Importmethoden der bisherigen Scheduler-Klassen"""
+    async def job(ctx: JobContext):
+        instance = ctx.legacy(module_name, class_name)
+        return await ctx.run_sync(getattr(instance, method))
+
+    return job
+
+
+async def telemetry_retention(ctx: JobContext):
+    from app.telemetry_retention import TelemetryRetentionManager
+    return await ctx.run_sync(TelemetryRetentionManager().run)
+
+
+def build_default_jobs() -> List[IngestionJob]:
+    """Zeitpläne der bisherigen Einzel-Scheduler als Job-Liste"""
+    jobs = [
+        IngestionJob('awattar_day_ahead', awattar_day_ahead, CronTrigger('0 14,15 * * *'),
+                     description='aWattar Day-Ahead (heute + morgen)'),
+        IngestionJob('apg_fallback', apg_fallback, CronTrigger('30 15 * * *'),
+                     description='APG-Fallback wenn aWattar ausfällt'),
+        IngestionJob('entsoe_day_ahead', _entsoe_job('day_ahead', 2), CronTrigger('0 13 * * *'),
+                     description='ENTSO-E Day-Ahead für INGESTION_ENTSOE_COUNTRIES'),
+        IngestionJob('entsoe_intraday', _entsoe_job('intraday', 1), CronTrigger('0 */4 * * *'),
+                     description='ENTSO-E Intraday'),
+        IngestionJob('entsoe_generation', entsoe_generation, CronTrigger('0 6 * * *'),
+                     description='ENTSO-E Erzeugungsdaten (Verfügbarkeitscheck)'),
+        IngestionJob('awattar_history', awattar_history, CronTrigger('0 16 * * 0'),
+                     description='aWattar Nachimport der letzten 7 Tage'),
+        IngestionJob('cleanup', cleanup, CronTrigger('0 2 * * 1'),
+                     description='Alte Demo-Preise und Scheduler-Logs löschen'),
+        IngestionJob('weather_current', _legacy_job('weather_scheduler', 'WeatherScheduler', 'import_current_weather'),
+                     CronTrigger('0 */3 * * *'), description='Aktuelle Wetterdaten'),
+        IngestionJob('weather_forecast', _legacy_job('weather_scheduler', 'WeatherScheduler', 'import_forecast_weather'),
+                     CronTrigger('0 6 * * *'), description='Wetterprognose'),
+        IngestionJob('blockchain_platforms', _legacy_job('blockchain_scheduler', 'BlockchainScheduler', 'import_all_platforms'),
+                     CronTrigger('0 0 * * *'), description='Blockchain-Energieplattformen'),
+        IngestionJob('telemetry_retention', telemetry_retention, CronTrigger('30 3 * * *'), timeout=3600,
+                     description='Retention/Kompaktierung der Live-Telemetrie'),
+    ]
+
+    smart_grid_minutes = {'fcr': 15, 'afrr': 30, 'mfrr': 60, 'voltage': 10, 'demand_response': 60}
+    for service, minutes in smart_grid_minutes.items():
+        jobs.append(IngestionJob(f"smart_grid_{service}", _local_api_job(f"/api/smart-grid/{service}"),
+                                 IntervalTrigger(minutes * 60), timeout=60,
+                                 description=f"Smart Grid {service}"))
+
+    iot_minutes = {'battery': 5, 'pv': 10, 'grid': 15, 'environmental': 30}
+    for sensor, minutes in iot_minutes.items():
+        jobs.append(IngestionJob(f"iot_{sensor}", _local_api_job(f"/api/iot/{sensor}"),
+                                 IntervalTrigger(minutes * 60), timeout=60,
+                                 description=f"IoT-Sensoren {sensor}"))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Einheitlicher Ingestion-Scheduler')
+    parser.add_argument('--list', action='store_true', help='Jobs und nächste Läufe anzeigen')
+    parser.add_argument('--run', nargs='+', metavar='JOB', help='Jobs einmalig ausführen')
+    parser.add_argument('--only', help='Kommagetrennte Liste aktiver Jobs')
+    parser.add_argument('--db', default='instance/bess.db')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    os.makedirs('logs', exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s',
+        handlers=[
+            logging.FileHandler('logs/ingestion_scheduler.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+    scheduler = IngestionScheduler(db_path=args.db, max_workers=args.workers)
+    only = set(args.only.split(',')) if args.only else None
+    for job in build_default_jobs():
+        if only is None or job.name in only:
+            scheduler.add_job(job)
+
+    if args.list:
+        now = datetime.now()
+        for job in scheduler.jobs.values():
+            print(f"{job.name:28} {str(job.trigger):26} {job.trigger.next_run(now):%Y-%m-%d %H:%M}  {job.description}")
+        return
+
+    if args.run:
+        unknown = [name for name in args.run if name not in scheduler.jobs]
+        if unknown:
+            raise SystemExit(f"Unbekannte Jobs: {', '.join(unknown)}")
+        asyncio.run(scheduler.run_once(args.run))
+        return
+
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        logger.info("Scheduler durch Benutzer gestoppt")
+
+
+if __name__ == '__main__':
+    main()
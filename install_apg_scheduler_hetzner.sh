@@ -27,6 +27,9 @@ warning() {
     echo -e "${YELLOW}[WARNING]${NC} $1"
 }
 
+# Der APG Scheduler ist durch bess-ingestion-scheduler ersetzt (ingestion_scheduler.py)
+error "Veraltet: bess-apg-scheduler wird nicht mehr installiert - bitte install_bess_on_hetzner.sh verwenden (bess-ingestion-scheduler.service)"
+
 # Prüfe ob als root ausgeführt
 if [ "$EUID" -ne 0 ]; then
     error "Bitte als root ausführen: sudo $0"
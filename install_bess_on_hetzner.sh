@@ -38,6 +38,9 @@ mkdir -p /var/log/bess-simulation
 mkdir -p /var/www/bess-simulation/instance/exports
 chown -R www-data:www-data /var/log/bess-simulation
 chown -R www-data:www-data /var/www/bess-simulation
+# Schreibbare Pfade von bess-ingestion-scheduler (ReadWritePaths, müssen existieren)
+mkdir -p /opt/bess-simulation/instance /opt/bess-simulation/logs /opt/bess-simulation/archive/telemetry /var/log/bess
+chown -R www-data:www-data /opt/bess-simulation/instance /opt/bess-simulation/logs /opt/bess-simulation/archive /var/log/bess
 
 # 2. Nginx-Konfiguration installieren
 log_info "Installiere Nginx-Konfiguration..."
@@ -47,8 +50,25 @@ ln -sf /etc/nginx/sites-available/bess.instanet.at /etc/nginx/sites-enabled/
 # 3. Systemd Service installieren
 log_info "Installiere Systemd Service..."
 cp bess-simulation.service /etc/systemd/system/
+cp bess-jobs.service /etc/systemd/system/
+cp bess-ingestion-scheduler.service /etc/systemd/system/
+
+# Alten APG-Scheduler (Service + Cron) stilllegen - sonst laufen zwei Scheduler parallel
+if [ -f /etc/systemd/system/bess-apg-scheduler.service ]; then
+    log_warning "Lege bess-apg-scheduler still (ersetzt durch bess-ingestion-scheduler)..."
+    systemctl disable --now bess-apg-scheduler || true
+    rm -f /etc/systemd/system/bess-apg-scheduler.service
+fi
+for cron_user in bess www-data root; do
+    if crontab -u "$cron_user" -l 2>/dev/null | grep -q apg_scheduler; then
+        crontab -u "$cron_user" -l | grep -v apg_scheduler | crontab -u "$cron_user" -
+    fi
+done
+
 systemctl daemon-reload
 systemctl enable bess-simulation
+systemctl enable bess-jobs
+systemctl enable bess-ingestion-scheduler
 
 # 4. Nginx-Konfiguration testen
 log_info "Teste Nginx-Konfiguration..."
@@ -68,6 +88,8 @@ systemctl reload nginx
 # 6. BESS Simulation Service starten
 log_info "Starte BESS Simulation Service..."
 systemctl start bess-simulation
+systemctl start bess-jobs
+systemctl start bess-ingestion-scheduler
 
 # 7. Status prüfen
 log_info "Prüfe Service-Status..."
@@ -9,6 +9,8 @@ Unterstützt Battery, PV, Grid und Environmental Sensoren.
 
 Autor: Ing. Heinz Schlagintweit
 Datum: Januar 2025
+
+Hinweis: Im Dauerbetrieb durch ingestion_scheduler.py ersetzt (ein Prozess für alle Quellen).
 """
 
 import schedule
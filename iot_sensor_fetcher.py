@@ -35,6 +35,8 @@ from decimal import Decimal
 import math
 import random
 
+import data_sources
+
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -102,6 +104,9 @@ class IoTSensorFetcher:
     """Hauptklasse für IoT-Sensor Integration"""
     
     def __init__(self):
+        # HTTP-Session mit austauschbarer Datenquelle (live/record/replay)
+        self.session = data_sources.session()
+
         # API-Konfiguration
         self.api_keys = {
             'modbus_tcp': os.getenv('MODBUS_TCP_API_KEY', ''),
@@ -182,6 +187,8 @@ class IoTSensorFetcher:
     
     def _rate_limit(self, protocol: str):
         """Rate Limiting für IoT-Requests"""
+        if data_sources.is_replay():
+            return
         current_time = time.time()
         last_time = self.last_request_time.get(protocol, 0)
         time_since_last = current_time - last_time
@@ -196,7 +203,7 @@ class IoTSensorFetcher:
         """Sichere IoT-API-Request mit Fehlerbehandlung"""
         try:
             logger.info(f"📡 IoT Sensor API-Request: {url}")
-            response = requests.get(url, params=params, headers=headers, timeout=15)
+            response = self.session.get(url, params=params, headers=headers, timeout=15)
             response.raise_for_status()
             
             data = response.json()
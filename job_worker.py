@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Job-Worker für BESS Simulation
+==============================
+
+Führt Hintergrund-Jobs (PS/LL-Sizing, 10-Jahres-Analyse, PDF/Excel-Exporte,
+ML-Training, GeoSphere-/PVGIS-Importe) außerhalb der Gunicorn-Worker aus,
+damit lange Berechnungen keine Web-Requests blockieren.
+
+- Warteschlange in instance/bess.db (Tabelle background_job, siehe app/jobs.py)
+- mehrere Prozesse (``--processes``), jeder mit eigener App-Instanz
+- Heartbeat je Job; Jobs abgestürzter Worker werden erneut eingereiht
+- SIGTERM: laufender Job darf BESS_JOB_SHUTDOWN_GRACE Sekunden fertig rechnen, danach
+  geht er ohne Versuchszählung zurück in die Warteschlange (Deploys verbrauchen keine Versuche)
+- abgelaufene Ergebnisse (BESS_JOB_RESULT_TTL) werden regelmäßig gelöscht
+
+Aufruf:
+    python job_worker.py                  # Dauerbetrieb mit einem Prozess
+    python job_worker.py --processes 2    # zwei Worker-Prozesse
+    python job_worker.py --once           # wartende Jobs abarbeiten, dann beenden
+    python job_worker.py --list           # letzte Jobs anzeigen
+    python job_worker.py --purge          # abgelaufene Ergebnisse löschen
+"""
+
+import os
+import sys
+import signal
+import logging
+import argparse
+import threading
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'bess.db')
+
+
+def run_worker(poll_interval: float, once: bool = False) -> int:
+    """Ein Worker-Prozess: eigene App-Instanz, Jobs bis SIGTERM/SIGINT"""
+    # Im Worker keine eigenen Worker-Threads und keine Chart-Aktualisierung starten
+    os.environ['BESS_JOB_INLINE_WORKERS'] = '0'
+    os.environ.setdefault('BESS_DASHBOARD_REFRESH', '0')
+
+    from app.jobs import SHUTDOWN_GRACE, JobQueue, create_worker_app, release_running_jobs, work
+
+    app = create_worker_app()
+    queue = JobQueue(DB_PATH)
+    stop = threading.Event()
+
+    def abandon():
+        released = release_running_jobs(queue)
+        logger.warning('Worker %s beendet: %s laufende Jobs zurück in die Warteschlange', os.getpid(), released)
+        os._exit(0)
+
+    def shutdown(signum, frame):
+        if stop.is_set():
+            # Zweites Signal: nicht länger auf den laufenden Job warten
+            abandon()
+        logger.info('Worker %s beendet nach laufendem Job, spätestens in %.0f s (Signal %s)',
+                    os.getpid(), SHUTDOWN_GRACE, signum)
+        stop.set()
+        timer = threading.Timer(SHUTDOWN_GRACE, abandon)
+        timer.daemon = True
+        timer.start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    logger.info('Job-Worker %s gestartet', os.getpid())
+    return work(app, queue, poll_interval, stop, once=once)
+
+
+def _worker_process(poll_interval: float):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s [%(process)d] %(message)s')
+    run_worker(poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BESS Job-Worker')
+    parser.add_argument('--processes', type=int, default=int(os.getenv('BESS_JOB_WORKERS', '1')),
+                        help='Anzahl Worker-Prozesse (Standard: BESS_JOB_WORKERS bzw. 1)')
+    parser.add_argument('--poll', type=float, default=1.0, help='Abfrageintervall bei leerer Warteschlange (s)')
+    parser.add_argument('--once', action='store_true', help='Wartende Jobs abarbeiten, dann beenden')
+    parser.add_argument('--list', action='store_true', help='Letzte Jobs anzeigen')
+    parser.add_argument('--purge', action='store_true', help='Abgelaufene Ergebnisse löschen')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s [%(process)d] %(message)s')
+
+    if args.list or args.purge:
+        from app.jobs import JOB_TABLE, JobQueue
+        queue = JobQueue(DB_PATH)
+        if args.purge:
+            print(f"🧹 {queue.purge_expired()} abgelaufene Job-Ergebnisse gelöscht")
+        if args.list:
+            conn = queue.connect()
+            rows = conn.execute(f"""
+                SELECT id, kind, status, progress, user_id, datetime(created_at, 'unixepoch', 'localtime')
+                FROM {JOB_TABLE} ORDER BY created_at DESC LIMIT 30
+            """).fetchall()
+            conn.close()
+            for job_id, kind, status, progress, user_id, created in rows:
+                print(f"{job_id}  {kind:<24} {status:<10} {progress * 100:5.1f}%  Benutzer {user_id}  {created}")
+        return
+
+    if args.once:
+        processed = run_worker(args.poll, once=True)
+        print(f"✅ {processed} Jobs ausgeführt")
+        return
+
+    if args.processes <= 1:
+        run_worker(args.poll)
+        return
+
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(args.poll,), name=f"bess-job-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -41,6 +41,7 @@ except ImportError:
 
 # Konfiguration
 DB_PATH = os.getenv("BESS_DB_PATH", "instance/bess.db")
+DB_PAGE_LIMIT = int(os.getenv("BESS_DB_PAGE_LIMIT", "1000"))
 MQTT_HOST = os.getenv("MQTT_BROKER", "localhost")
 MQTT_PORT = int(os.getenv("MQTT_PORT", "1883"))
 MQTT_USERNAME = os.getenv("MQTT_USERNAME")
@@ -278,24 +279,38 @@ def read_pv_load(day: str) -> Dict[str, Any]:
         logger.error(f"Fehler beim Lesen der PV/Last-Daten: {e}")
         return {"error": str(e)}
 
-def db_project(table: str, limit: int = 200) -> Dict[str, Any]:
-    """Datenbank-Tabellen-Dump"""
+def db_project(table: str, limit: int = 200, cursor: Optional[int] = None) -> Dict[str, Any]:
+    """Datenbank-Tabellen-Dump (seitenweise, neueste zuerst)
+
+    ``cursor`` ist die ``next_cursor``-ID der vorherigen Seite; die Abfrage
+    nutzt ``id < cursor`` statt OFFSET, sodass jede Seite gleich schnell ist.
+    """
     if table not in {"spot_prices", "metrics", "pv_load", "projects", "battery_configs"}:
         return {"error": f"Tabelle '{table}' nicht unterstützt"}
     
+    limit = max(1, min(int(limit), DB_PAGE_LIMIT))
     con = _db()
     if not con:
         return {"error": "Datenbank nicht verfügbar"}
     
     try:
-        cur = con.execute(f"SELECT * FROM {table} ORDER BY id DESC LIMIT ?", (limit,))
+        if cursor is not None:
+            cur = con.execute(f"SELECT * FROM {table} WHERE id < ? ORDER BY id DESC LIMIT ?", (int(cursor), limit + 1))
+        else:
+            cur = con.execute(f"SELECT * FROM {table} ORDER BY id DESC LIMIT ?", (limit + 1,))
         rows = [dict(r) for r in cur.fetchall()]
         con.close()
         
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1]["id"]
+        
         return {
             "table": table,
             "rows": rows,
-            "count": len(rows)
+            "count": len(rows),
+            "next_cursor": next_cursor
         }
     except Exception as e:
         logger.error(f"Fehler beim Lesen der Tabelle {table}: {e}")
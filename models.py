@@ -166,6 +166,12 @@ class SpotPrice(db.Model):
     price_type = db.Column(db.String(20))  # 'day_ahead', 'intraday'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Schlüssel für den UPSERT der Preis-Ingestion (app/price_ingestion.py)
+    __table_args__ = (
+        db.Index('uq_spot_price_key', db.func.coalesce(region, ''), db.func.coalesce(source, ''),
+                 db.func.coalesce(price_type, ''), timestamp, unique=True),
+    )
+
 class InvestmentCost(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'))
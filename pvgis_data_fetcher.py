@@ -6,7 +6,15 @@ import sqlite3
 from datetime import datetime, timedelta
 import json
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+
+from fetch_cache import fetch_cache
+
+# Stündliche Messwert-Spalten in solar_data
+SOLAR_VALUE_COLUMNS = (
+    'global_irradiance', 'beam_irradiance', 'diffuse_irradiance',
+    'sun_height', 'temperature_2m', 'wind_speed_10m',
+)
 
 class PVGISDataFetcher:
     """
@@ -263,7 +271,8 @@ class PVGISDataFetcher:
             print(f"   Koordinaten: {lat:.4f}, {lon:.4f}")
             print(f"   API-URL: {api_url}")
             
-            response = requests.get(api_url, timeout=15)
+            # Historische PVGIS-Jahre ändern sich nicht -> Cache ohne Revalidierung
+            response = fetch_cache.get(api_url, timeout=15, immutable=True)
             
             print(f"   HTTP Status: {response.status_code}")
             print(f"   Response Headers: {dict(response.headers)}")
@@ -407,78 +416,130 @@ class PVGISDataFetcher:
         
         return metadata
     
+    def _ensure_solar_schema(self, cursor: sqlite3.Cursor):
+        """solar_data (stündliche Werte) und solar_data_header (Metadaten je Standort/Jahr) anlegen"""
+        
+        # Prüfe ob Tabelle existiert und welche Struktur sie hat
+        cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='solar_data'
+        """)
+        table_exists = cursor.fetchone()
+        
+        if table_exists:
+            # Prüfe welche Spalten die Tabelle hat
+            cursor.execute("PRAGMA table_info(solar_data)")
+            columns = cursor.fetchall()
+            column_names = [col[1] for col in columns]
+            
+            # Prüfe ob location_key Spalte existiert (PVGIS-Struktur)
+            if 'location_key' not in column_names:
+                print(f"⚠️ solar_data Tabelle hat falsche Struktur (SQLAlchemy-Modell). Erstelle neue Tabelle...")
+                # Alte Tabelle umbenennen (Backup)
+                cursor.execute("ALTER TABLE solar_data RENAME TO solar_data_old_sqlalchemy")
+                cursor.connection.commit()
+                print(f"✅ Alte Tabelle umbenannt zu 'solar_data_old_sqlalchemy'")
+        
+        # Tabelle erstellen falls nicht vorhanden (mit korrekter PVGIS-Struktur)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS solar_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                location_key TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                datetime TEXT NOT NULL,
+                global_irradiance REAL,
+                beam_irradiance REAL,
+                diffuse_irradiance REAL,
+                sun_height REAL,
+                temperature_2m REAL,
+                wind_speed_10m REAL,
+                metadata TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(location_key, year, datetime)
+            )
+        ''')
+        
+        # Metadaten einmal pro Standort/Jahr statt in jeder Stundenzeile
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS solar_data_header (
+                location_key TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                metadata TEXT,
+                records INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (location_key, year)
+            )
+        ''')
+    
+    def _solar_rows(self, df: pd.DataFrame, location_key: str, year: int) -> List[tuple]:
+        """DataFrame spaltenweise in Zeilen-Tupel für executemany umwandeln (NaN -> NULL)"""
+        
+        timestamps = pd.to_datetime(df['datetime']).dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+        values = df.reindex(columns=list(SOLAR_VALUE_COLUMNS)).astype(float)
+        values = values.astype(object).where(values.notna(), None)
+        columns = [values[col].tolist() for col in SOLAR_VALUE_COLUMNS]
+        
+        return [
+            (location_key, year, timestamp, *row)
+            for timestamp, *row in zip(timestamps, *columns)
+        ]
+    
     def _save_to_database(self, df: pd.DataFrame, location_key: str, year: int, metadata: Dict) -> Dict:
-        """Solar-Daten in BESS-Datenbank speichern"""
+        """Solar-Daten in BESS-Datenbank speichern.
+        
+        Die Stundenwerte werden per executemany in eine Staging-Tabelle geschrieben und
+        in einer Transaktion gegen solar_data getauscht (UPSERT + Löschen veralteter
+        Zeitpunkte). Leser sehen bis zum Commit den alten, danach den neuen Stand.
+        """
         
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
+            self._ensure_solar_schema(cursor)
             
-            # Prüfe ob Tabelle existiert und welche Struktur sie hat
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='solar_data'
-            """)
-            table_exists = cursor.fetchone()
+            rows = self._solar_rows(df, location_key, year)
+            value_columns = ', '.join(SOLAR_VALUE_COLUMNS)
             
-            if table_exists:
-                # Prüfe welche Spalten die Tabelle hat
-                cursor.execute("PRAGMA table_info(solar_data)")
-                columns = cursor.fetchall()
-                column_names = [col[1] for col in columns]
-                
-                # Prüfe ob location_key Spalte existiert (PVGIS-Struktur)
-                if 'location_key' not in column_names:
-                    print(f"⚠️ solar_data Tabelle hat falsche Struktur (SQLAlchemy-Modell). Erstelle neue Tabelle...")
-                    # Alte Tabelle umbenennen (Backup)
-                    cursor.execute("ALTER TABLE solar_data RENAME TO solar_data_old_sqlalchemy")
-                    conn.commit()
-                    print(f"✅ Alte Tabelle umbenannt zu 'solar_data_old_sqlalchemy'")
-            
-            # Tabelle erstellen falls nicht vorhanden (mit korrekter PVGIS-Struktur)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS solar_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    location_key TEXT NOT NULL,
-                    year INTEGER NOT NULL,
-                    datetime TEXT NOT NULL,
-                    global_irradiance REAL,
-                    beam_irradiance REAL,
-                    diffuse_irradiance REAL,
-                    sun_height REAL,
-                    temperature_2m REAL,
-                    wind_speed_10m REAL,
-                    metadata TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(location_key, year, datetime)
+            cursor.execute(f'''
+                CREATE TEMP TABLE IF NOT EXISTS temp_solar_data_batch (
+                    location_key TEXT, year INTEGER, datetime TEXT,
+                    {', '.join(f'{col} REAL' for col in SOLAR_VALUE_COLUMNS)},
+                    PRIMARY KEY (location_key, year, datetime)
                 )
             ''')
+            cursor.execute("DELETE FROM temp_solar_data_batch")
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO temp_solar_data_batch VALUES ({', '.join('?' * (3 + len(SOLAR_VALUE_COLUMNS)))})",
+                rows
+            )
             
-            # Bestehende Daten für diesen Standort/Jahr löschen
+            # Atomarer Tausch: geänderte Stunden aktualisieren, neue einfügen, entfallene löschen
+            cursor.execute(f'''
+                INSERT INTO solar_data (location_key, year, datetime, {value_columns})
+                SELECT location_key, year, datetime, {value_columns} FROM temp_solar_data_batch WHERE true
+                ON CONFLICT (location_key, year, datetime) DO UPDATE SET
+                    {', '.join(f'{col} = excluded.{col}' for col in SOLAR_VALUE_COLUMNS)},
+                    metadata = NULL
+            ''')
             cursor.execute('''
-                DELETE FROM solar_data 
+                DELETE FROM solar_data
                 WHERE location_key = ? AND year = ?
+                AND datetime NOT IN (SELECT datetime FROM temp_solar_data_batch)
             ''', (location_key, year))
-            
-            # Neue Daten einfügen
-            for _, row in df.iterrows():
-                cursor.execute('''
-                    INSERT INTO solar_data 
-                    (location_key, year, datetime, global_irradiance, beam_irradiance, 
-                     diffuse_irradiance, sun_height, temperature_2m, wind_speed_10m, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    location_key, year, row['datetime'].isoformat(),
-                    row.get('global_irradiance'), row.get('beam_irradiance'),
-                    row.get('diffuse_irradiance'), row.get('sun_height'),
-                    row.get('temperature_2m'), row.get('wind_speed_10m'),
-                    json.dumps(metadata)
-                ))
+            cursor.execute('''
+                INSERT INTO solar_data_header (location_key, year, metadata, records, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (location_key, year) DO UPDATE SET
+                    metadata = excluded.metadata,
+                    records = excluded.records,
+                    updated_at = excluded.updated_at
+            ''', (location_key, year, json.dumps(metadata), len(rows)))
+            cursor.execute("DELETE FROM temp_solar_data_batch")
             
             conn.commit()
             conn.close()
             
-            return {"success": True, "records_inserted": len(df)}
+            return {"success": True, "records_inserted": len(rows)}
             
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -504,8 +565,17 @@ class PVGISDataFetcher:
         
         return True
     
-    def get_solar_data_from_db(self, location_key: str, year: int) -> Optional[pd.DataFrame]:
-        """Solar-Daten aus Datenbank abrufen"""
+    def get_solar_data_from_db(self, location_key: str, year: int,
+                               as_arrays: bool = False) -> Optional[Union[pd.DataFrame, Dict[str, np.ndarray]]]:
+        """Solar-Daten aus Datenbank abrufen
+        
+        Args:
+            as_arrays: Statt DataFrame ein Dict mit NumPy-Arrays liefern
+                (``datetime`` als datetime64[s], Messwerte als float64 mit NaN für fehlende Werte)
+        """
+        
+        if as_arrays:
+            return self._get_solar_arrays(location_key, year)
         
         try:
             conn = sqlite3.connect(self.db_path)
@@ -526,6 +596,46 @@ class PVGISDataFetcher:
             print(f"Fehler beim Datenbankabruf: {e}")
             return None
     
+    def _get_solar_arrays(self, location_key: str, year: int) -> Optional[Dict[str, np.ndarray]]:
+        """Spaltenweiser Abruf ohne DataFrame-Aufbau"""
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            rows = conn.execute(f'''
+                SELECT datetime, {', '.join(SOLAR_VALUE_COLUMNS)} FROM solar_data
+                WHERE location_key = ? AND year = ?
+                ORDER BY datetime
+            ''', (location_key, year)).fetchall()
+            conn.close()
+        except Exception as e:
+            print(f"Fehler beim Datenbankabruf: {e}")
+            return None
+        
+        if not rows:
+            return None
+        
+        timestamps, *columns = zip(*rows)
+        arrays = {'datetime': np.array(timestamps, dtype='datetime64[s]')}
+        for name, values in zip(SOLAR_VALUE_COLUMNS, columns):
+            arrays[name] = np.array(values, dtype=np.float64)
+        return arrays
+    
+    def get_solar_metadata(self, location_key: str, year: int) -> Optional[Dict]:
+        """Metadaten eines Standort/Jahres aus solar_data_header"""
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            row = conn.execute('''
+                SELECT metadata FROM solar_data_header
+                WHERE location_key = ? AND year = ?
+            ''', (location_key, year)).fetchone()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Fehler beim Datenbankabruf: {e}")
+            return None
+        
+        return json.loads(row[0]) if row and row[0] else None
+    
     def _generate_demo_solar_data(self, location_name: str, year: int, lat: float, lon: float) -> Dict:
         """Generiert Demo-Solar-Daten für schnelle Tests"""
         
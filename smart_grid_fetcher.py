@@ -33,6 +33,8 @@ from dataclasses import dataclass
 from decimal import Decimal
 import math
 
+import data_sources
+
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -70,6 +72,9 @@ class SmartGridFetcher:
     """Hauptklasse für Smart Grid Integration"""
     
     def __init__(self):
+        # HTTP-Session mit austauschbarer Datenquelle (live/record/replay)
+        self.session = data_sources.session()
+
         # API-Konfiguration
         self.api_keys = {
             'apg': os.getenv('APG_SMART_GRID_API_KEY', ''),
@@ -145,6 +150,8 @@ class SmartGridFetcher:
     
     def _rate_limit(self, service: str):
         """Rate Limiting für API-Requests"""
+        if data_sources.is_replay():
+            return
         current_time = time.time()
         last_time = self.last_request_time.get(service, 0)
         time_since_last = current_time - last_time
@@ -159,7 +166,7 @@ class SmartGridFetcher:
         """Sichere API-Request mit Fehlerbehandlung"""
         try:
             logger.info(f"🔌 Smart Grid API-Request: {url}")
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = self.session.get(url, params=params, headers=headers, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Telemetrie-Retention Scheduler für BESS Simulation
+Nächtliche Kompaktierung und Archivierung der Live-Telemetrie
+"""
+
+import schedule
+import time
+import logging
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.makedirs('logs', exist_ok=True)
+
+# Logging konfigurieren
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s',
+    handlers=[
+        logging.FileHandler('logs/telemetry_retention.log'),
+        logging.StreamHandler()
+    ]
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetryRetentionScheduler:
+    """Scheduler für die Telemetrie-Retention"""
+
+    def __init__(self):
+        self.manager = None
+        self.is_running = False
+        self.error_count = 0
+        self.max_errors = 5
+
+    def initialize(self):
+        """Initialisiert den Retention-Manager"""
+        try:
+            from app.telemetry_retention import TelemetryRetentionManager
+
+            self.manager = TelemetryRetentionManager()
+            logger.info("Telemetrie-Retention Scheduler erfolgreich initialisiert")
+            return True
+
+        except Exception as e:
+            logger.error(f"Fehler bei der Initialisierung: {e}")
+            return False
+
+    def run_retention(self):
+        """Führt einen Retention-Lauf aus"""
+        try:
+            metrics = self.manager.run()
+
+            from app.logging_config import log_performance_metric
+            log_performance_metric(
+                "telemetry_retention_duration",
+                metrics.get('duration_seconds', 0),
+                unit="seconds",
+                tags={k: v for k, v in metrics.items() if k != 'duration_seconds'}
+            )
+
+            self.error_count = 0
+            return True
+
+        except Exception as e:
+            logger.error(f"Fehler beim Retention-Lauf: {e}")
+            self.error_count += 1
+            return False
+
+    def setup_schedule(self):
+        """Konfiguriert den Zeitplan"""
+        if not self.initialize():
+            return False
+
+        # Täglich nachts, außerhalb der Import-Zeitfenster der Preis-Scheduler
+        schedule.every().day.at("03:30").do(self.run_retention)
+
+        logger.info("Zeitplan konfiguriert:")
+        logger.info("  - Tägliche Retention/Kompaktierung: 03:30 Uhr")
+
+        return True
+
+    def run(self):
+        """Startet den Scheduler"""
+        if not self.setup_schedule():
+            logger.error("Scheduler konnte nicht gestartet werden")
+            return
+
+        self.is_running = True
+        logger.info("Telemetrie-Retention Scheduler gestartet")
+
+        try:
+            while self.is_running:
+                schedule.run_pending()
+                time.sleep(60)
+
+                if self.error_count >= self.max_errors:
+                    logger.error(f"Scheduler gestoppt nach {self.max_errors} Fehlern")
+                    break
+
+        except KeyboardInterrupt:
+            logger.info("Scheduler durch Benutzer gestoppt")
+        finally:
+            self.is_running = False
+            logger.info("Telemetrie-Retention Scheduler beendet")
+
+    def stop(self):
+        """Stoppt den Scheduler"""
+        self.is_running = False
+
+
+def main():
+    """Hauptfunktion für direkten Aufruf"""
+    scheduler = TelemetryRetentionScheduler()
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--once':
+        if scheduler.initialize():
+            scheduler.run_retention()
+        return
+
+    scheduler.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die per Trigger gepflegten Dashboard-Kennzahlen (dashboard_summary)
+"""
+
+import sys
+import os
+import sqlite3
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app.dashboard_summary import (_live_summary, dashboard_charts, dashboard_summary,
+                                   ensure_dashboard_summary_schema, refresh_dashboard_charts)
+from app.price_ingestion import ensure_price_schema, upsert_spot_prices
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript("""
+        CREATE TABLE customer (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE project (id INTEGER PRIMARY KEY, name TEXT, location TEXT, customer_id INTEGER,
+                              bess_size REAL, pv_power REAL, current_electricity_cost REAL,
+                              created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE load_profile (id INTEGER PRIMARY KEY, project_id INTEGER, name TEXT);
+        CREATE TABLE spot_price (id INTEGER PRIMARY KEY, timestamp TEXT, price REAL);
+        INSERT INTO customer (name) VALUES ('Gemeinde');
+        INSERT INTO project (name, location, bess_size, pv_power, current_electricity_cost)
+            VALUES ('Hinterstoder', 'Oberösterreich', 8000, 1500, 18.5), ('Wien Nord', 'Wien', 2000, NULL, NULL);
+        INSERT INTO load_profile (project_id, name) VALUES (1, 'Jahr 2024');
+    """)
+    # Bestandsdaten vor dem Anlegen der Kennzahlen
+    conn.executemany("INSERT INTO spot_price (timestamp, price) VALUES (?, ?)",
+                     [(f"2024-01-01 {h:02d}:00", 80.0 + h) for h in range(24)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_backfill_and_incremental_updates(conn):
+    assert ensure_dashboard_summary_schema(conn)
+    summary = dashboard_summary(conn)
+    assert summary == _live_summary(conn.cursor())
+    assert summary['spot_prices_count'] == 24 and summary['active_projects_count'] == 1
+
+    conn.executescript("""
+        INSERT INTO customer (name) VALUES ('Industrie');
+        INSERT INTO spot_price (timestamp, price) VALUES ('2024-01-02 00:00', 75.0);
+        DELETE FROM spot_price WHERE timestamp < '2024-01-01 03:00';
+        INSERT INTO load_profile (project_id, name) VALUES (1, 'Jahr 2025'), (2, 'Wien 2024');
+        UPDATE project SET bess_size = 3000, current_electricity_cost = 20.0 WHERE id = 2;
+        INSERT INTO project (name, location, pv_power) VALUES ('Graz', 'Steiermark', 500);
+        UPDATE load_profile SET project_id = 3 WHERE name = 'Wien 2024';
+        DELETE FROM load_profile WHERE name = 'Jahr 2024';
+    """)
+    assert dashboard_summary(conn) == _live_summary(conn.cursor())
+
+    # Projekt löschen, Lastprofile bleiben verwaist zurück
+    conn.execute("DELETE FROM project WHERE id = 1")
+    summary = dashboard_summary(conn)
+    assert summary == _live_summary(conn.cursor())
+    assert summary['projects_count'] == 2 and summary['active_projects_count'] == 1
+
+
+def test_missing_tables_fall_back_to_live_queries():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript("""
+        CREATE TABLE customer (id INTEGER PRIMARY KEY);
+        CREATE TABLE project (id INTEGER PRIMARY KEY, bess_size REAL, pv_power REAL, current_electricity_cost REAL);
+        CREATE TABLE load_profile (id INTEGER PRIMARY KEY, project_id INTEGER);
+    """)
+    assert not ensure_dashboard_summary_schema(conn)
+    conn.execute("CREATE TABLE spot_price (id INTEGER PRIMARY KEY)")
+    assert dashboard_summary(conn)['spot_prices_count'] == 0
+    conn.close()
+
+
+def test_charts_recomputed_only_after_project_changes(conn):
+    charts = dashboard_charts(conn)
+    assert charts['capacity_distribution'] == {'bess': 10000.0, 'pv': 1500.0}
+    assert sum(row['count'] for row in charts['project_growth']) == 2
+    assert refresh_dashboard_charts(conn) is None
+
+    # Spotpreise und Kunden beeinflussen die Charts nicht
+    conn.execute("INSERT INTO spot_price (timestamp, price) VALUES ('2024-01-03 00:00', 70.0)")
+    assert refresh_dashboard_charts(conn) is None
+
+    conn.execute("UPDATE project SET bess_size = 9000 WHERE id = 1")
+    assert dashboard_charts(conn)['capacity_distribution']['bess'] == 11000.0
+    assert refresh_dashboard_charts(conn) is None
+
+
+def test_price_reimports_keep_spot_price_count(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'bess.db'))
+    conn.executescript("""
+        CREATE TABLE customer (id INTEGER PRIMARY KEY);
+        CREATE TABLE project (id INTEGER PRIMARY KEY, bess_size REAL, pv_power REAL, current_electricity_cost REAL);
+        CREATE TABLE load_profile (id INTEGER PRIMARY KEY, project_id INTEGER);
+    """)
+    ensure_price_schema(conn)
+    assert ensure_dashboard_summary_schema(conn)
+
+    start = datetime(2024, 1, 1)
+    day = [{'timestamp': start + timedelta(hours=h), 'price_eur_mwh': 50.0 + h} for h in range(24)]
+    demo = [{'timestamp': start + timedelta(hours=h), 'price_eur_mwh': 40.0, 'source': 'Demo (2024-Muster)'}
+            for h in range(24)]
+    # Wiederholte Importe wie in den APG-Schedulern und save_demo_data_to_db (Demo ohne Region/Preisart)
+    for price_offset in (0.0, 0.0, 5.0):
+        upsert_spot_prices(conn, [{**row, 'price_eur_mwh': row['price_eur_mwh'] + price_offset} for row in day],
+                           source='aWattar (Österreich)', region='AT', price_type='Day-Ahead')
+        upsert_spot_prices(conn, demo, region=None, price_type=None)
+
+    summary = dashboard_summary(conn)
+    assert summary == _live_summary(conn.cursor())
+    assert summary['spot_prices_count'] == 48
+    conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
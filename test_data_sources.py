@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die austauschbaren Datenquellen (Aufzeichnung / Wiedergabe)
+Nimmt Antworten eines lokalen HTTP-Servers auf und spielt sie ohne Server wieder ab
+"""
+
+import sys
+import os
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+import requests
+
+import data_sources
+
+
+class _Handler(BaseHTTPRequestHandler):
+    calls = []
+
+    def do_GET(self):
+        _Handler.calls.append(self.path)
+        body = json.dumps({'path': self.path.split('?')[0], 'data': list(range(50))}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.calls = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_record_then_replay_without_network(server, tmp_path):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    fixtures = str(tmp_path / 'fixtures')
+
+    recording = data_sources.session('record', fixtures)
+    live = recording.get(f"{base}/prices", params={'start': '2024-01-01', 'securityToken': 'geheim'}, timeout=5)
+    assert live.status_code == 200
+    assert data_sources.FixtureStore(fixtures).count() == 1
+
+    # Server stoppen: Wiedergabe darf kein Netzwerk benötigen
+    server.shutdown()
+    server.server_close()
+
+    replay = data_sources.session('replay', fixtures)
+    # Parameterreihenfolge und API-Schlüssel spielen für den Schlüssel keine Rolle
+    replayed = replay.get(f"{base}/prices", params={'securityToken': 'anderer', 'start': '2024-01-01'}, timeout=5)
+    assert replayed.status_code == 200
+    assert replayed.content == live.content
+    assert replayed.json()['path'] == '/prices'
+    assert replayed.headers['Content-Type'] == 'application/json'
+    assert len(_Handler.calls) == 1
+
+    # Geheimnisse landen nicht in der Fixture
+    for root, _, files in os.walk(fixtures):
+        for name in files:
+            with gzip.open(os.path.join(root, name), 'rt') as f:
+                assert 'geheim' not in f.read()
+
+
+def test_missing_fixture_behaves_like_network_error(tmp_path):
+    replay = data_sources.session('replay', str(tmp_path))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        replay.get("https://api.awattar.at/v1/marketdata", params={'start': 1}, timeout=5)
+    with pytest.raises(data_sources.FixtureMissingError):
+        replay.get("https://api.awattar.at/v1/marketdata", timeout=5)
+
+
+def test_mode_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv('DATA_SOURCE_MODE', 'replay')
+    monkeypatch.setenv('DATA_SOURCE_FIXTURES', str(tmp_path))
+    source = data_sources.create_source(pool_connections=2, pool_maxsize=2)
+    assert isinstance(source, data_sources.ReplaySource)
+    assert source.store.fixture_dir == str(tmp_path)
+    assert data_sources.is_replay()
+
+    monkeypatch.setenv('DATA_SOURCE_MODE', 'unbekannt')
+    assert type(data_sources.create_source()) is data_sources.DataSource
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
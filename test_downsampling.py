@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test-Script für das serverseitige Chart-Downsampling (LTTB und Min/Max pro Bucket)
+"""
+
+import sys
+import os
+import json
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.downsampling import (
+    downsample_columns,
+    downsample_records,
+    downsampling_params,
+    lttb_indices,
+    minmax_indices,
+    time_axis,
+)
+
+
+def _year_series(seed=0):
+    """Ein Jahr 15-Minuten-Werte mit Tagesgang, Rauschen und zwei Ausreißern"""
+    n = 35040
+    rng = np.random.default_rng(seed)
+    values = 400 + 300 * np.sin(np.arange(n) / 96 * 2 * np.pi) + rng.normal(0, 20, n)
+    values[12345] = 2500.0
+    values[30000] = -800.0
+    stamps = (np.datetime64('2024-01-01T00:00') + np.arange(n) * np.timedelta64(15, 'm')).astype(str)
+    return [s.replace('T', ' ') + ':00' for s in stamps], values
+
+
+def test_parameters():
+    assert downsampling_params({}) == (None, 'lttb')
+    assert downsampling_params({'max_points': '500'}) == (500, 'lttb')
+    assert downsampling_params({'width': 800, 'downsample': 'minmax'}) == (1600, 'minmax')
+    assert downsampling_params({'max_points': 500, 'downsample': 'none'})[0] is None
+    assert downsampling_params({'max_points': 'viele'})[0] is None
+
+
+def test_lttb_and_minmax_keep_peaks():
+    stamps, values = _year_series()
+    x = time_axis(stamps)
+    assert x[1] - x[0] == 900
+
+    for indices in (lttb_indices(x, values, 1000), minmax_indices(values, 1000)):
+        assert len(indices) <= 1000
+        assert indices[0] == 0 and indices[-1] == len(values) - 1
+        assert np.all(np.diff(indices) > 0)
+        assert 12345 in indices and 30000 in indices
+
+    # Min/Max erhält Minimum und Maximum jedes Buckets exakt
+    picked = values[minmax_indices(values, 1000)]
+    assert picked.max() == values.max() and picked.min() == values.min()
+
+
+def test_records_payload_shrinks():
+    stamps, values = _year_series()
+    records = [{'timestamp': ts, 'load': float(v), 'pv_generation': float(v) / 2} for ts, v in zip(stamps, values)]
+    reduced, info = downsample_records(records, ['load', 'pv_generation'], 1200)
+
+    assert info['original_count'] == 35040 and info['count'] == len(reduced) <= 1200
+    assert len(json.dumps(reduced)) < len(json.dumps(records)) / 20
+    assert max(r['load'] for r in reduced) == 2500.0
+    # Tupel aus der Datenbank über Spaltenindizes
+    rows = [(ts, v) for ts, v in zip(stamps, values)]
+    reduced_rows, _ = downsample_records(rows, [1], 500, 'minmax', x_key=0)
+    assert reduced_rows[0] == rows[0] and reduced_rows[-1] == rows[-1]
+    # Kleine Reihen bleiben unverändert
+    assert downsample_records(records[:100], ['load'], 1000) == (records[:100], None)
+
+
+def test_columns_per_station():
+    stamps, values = _year_series()
+    columns = {
+        'timestamp': stamps[:5000] * 2,
+        'water_level_cm': np.concatenate([values[:5000], values[:5000] + 50]),
+        'station_id': ['A'] * 5000 + ['B'] * 5000,
+    }
+    reduced, info = downsample_columns(columns, ['water_level_cm'], 300, group_key='station_id')
+    assert info['count'] == len(reduced['timestamp']) <= 600
+    assert reduced['station_id'].count('A') <= 300 and reduced['station_id'].count('B') <= 300
+    assert isinstance(reduced['water_level_cm'], np.ndarray)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den ENTSO-E Backfill
+Läuft gegen einen lokalen HTTP-Stand-in mit aufgezeichnetem Day-Ahead-Dokument
+"""
+
+import sys
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from entsoe_api_fetcher import ENTSOEAPIFetcher
+from entsoe_backfill import BackfillCheckpoint, ENTSOEBackfill, split_windows
+
+# Aufgezeichnetes Publication_MarketDocument (gekürzt, ein TimeSeries pro Fenster)
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<Publication_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-3:publicationdocument:7:3">
+  <TimeSeries>
+    <businessType>A62</businessType>
+    <in_Domain.mRID codingScheme="A01">10YAT-APG------L</in_Domain.mRID>
+    <Period>
+      <timeInterval><start>{start}</start><end>{end}</end></timeInterval>
+      <resolution>PT60M</resolution>
+{points}
+    </Period>
+  </TimeSeries>
+</Publication_MarketDocument>"""
+
+ACKNOWLEDGEMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<Acknowledgement_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-1:acknowledgementdocument:7:0">
+  <Reason><code>999</code><text>Amount of requested data exceeds allowed limit</text></Reason>
+</Acknowledgement_MarketDocument>"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    fail_first = set()
+    malformed = {}  # periodStart -> Anzahl abgeschnittener Antworten
+    acknowledged = set()  # periodStart -> Acknowledgement mit Fehlergrund
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        key = params['periodStart']
+        StandInHandler.requests_seen.append(key)
+
+        if key in StandInHandler.fail_first:
+            StandInHandler.fail_first.discard(key)
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        if StandInHandler.malformed.get(key):
+            StandInHandler.malformed[key] -= 1
+            body = b'<?xml version="1.0"?><Publication_MarketDocument><TimeSeries><Period>'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if key in StandInHandler.acknowledged:
+            body = ACKNOWLEDGEMENT.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        start = datetime.strptime(params['periodStart'], '%Y%m%d%H%M')
+        end = datetime.strptime(params['periodEnd'], '%Y%m%d%H%M')
+        hours = int((end - start).total_seconds() // 3600)
+        points = '\n'.join(
+            f"      <Point><position>{i + 1}</position><price.amount>{50 + i % 24}</price.amount></Point>"
+            for i in range(hours)
+        )
+        body = DOCUMENT.format(start=start.strftime('%Y-%m-%dT%H:%MZ'),
+                               end=end.strftime('%Y-%m-%dT%H:%MZ'), points=points).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_backfill_against_stand_in(tmp_path):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        fetcher = ENTSOEAPIFetcher(api_key='test-token')
+        fetcher.base_url = f"http://127.0.0.1:{server.server_address[1]}/api"
+
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        windows = split_windows(start, end, 10)
+        StandInHandler.fail_first = {windows[2][0].strftime('%Y%m%d%H%M')}
+        # Abgeschnittene XML-Antwort wird wiederholt statt als leeres Fenster abgehakt
+        StandInHandler.malformed = {windows[4][0].strftime('%Y%m%d%H%M'): 1}
+
+        written = []
+
+        def sink(series):
+            for item in series:
+                written.extend(item['timestamps'].tolist())
+            return {'inserted': sum(len(item['values']) for item in series)}
+
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        backfill = ENTSOEBackfill(fetcher, sink, window_days=10, max_workers=3,
+                                  requests_per_second=50, backoff_base=0.01, checkpoint_path=checkpoint)
+        stats = backfill.run(start, end)
+
+        assert stats['windows_total'] == len(windows)
+        assert stats['windows_done'] == len(windows)
+        assert not stats['windows_failed']
+        assert stats['inserted'] == (end - start) // timedelta(hours=1)
+        assert len(set(written)) == len(written)
+
+        # Zweiter Lauf: alles im Checkpoint, kein weiterer Request
+        seen = len(StandInHandler.requests_seen)
+        stats = ENTSOEBackfill(fetcher, sink, window_days=10, checkpoint_path=checkpoint).run(start, end)
+        assert stats['windows_skipped'] == len(windows)
+        assert len(StandInHandler.requests_seen) == seen
+    finally:
+        server.shutdown()
+
+
+def test_parse_failures_leave_windows_pending(tmp_path):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        fetcher = ENTSOEAPIFetcher(api_key='test-token')
+        fetcher.base_url = f"http://127.0.0.1:{server.server_address[1]}/api"
+
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2024, 1, 31, tzinfo=timezone.utc)
+        windows = split_windows(start, end, 10)
+        broken, acknowledged = (windows[1][0].strftime('%Y%m%d%H%M'), windows[2][0].strftime('%Y%m%d%H%M'))
+        StandInHandler.fail_first = set()
+        StandInHandler.malformed = {broken: 10}
+        StandInHandler.acknowledged = {acknowledged}
+
+        checkpoint = str(tmp_path / 'checkpoint.json')
+
+        def sink(series):
+            return {'inserted': sum(len(item['values']) for item in series)}
+
+        stats = ENTSOEBackfill(fetcher, sink, window_days=10, max_retries=1, backoff_base=0.001,
+                               checkpoint_path=checkpoint).run(start, end)
+        assert stats['windows_done'] == len(windows) - 2
+        assert sorted(stats['windows_failed']) == sorted(BackfillCheckpoint.key(w) for w in windows[1:3])
+        assert not any(BackfillCheckpoint(checkpoint).is_done(w) for w in windows[1:3])
+
+        # Nächster Lauf holt nur die offenen Fenster nach
+        StandInHandler.malformed = {}
+        StandInHandler.acknowledged = set()
+        stats = ENTSOEBackfill(fetcher, sink, window_days=10, checkpoint_path=checkpoint).run(start, end)
+        assert stats['windows_skipped'] == len(windows) - 2 and stats['windows_done'] == 2
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_backfill_against_stand_in(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_parse_failures_leave_windows_pending(pathlib.Path(tmp))
+    print("✅ ENTSO-E Backfill-Test erfolgreich")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den Streaming-XML-Parser des ENTSOEAPIFetcher
+Prüft Auflösung (PT15M/PT60M), Positionslücken (A01/A03) und die ENTSOEData-Kompatibilität
+"""
+
+import sys
+import os
+import xml.etree.ElementTree as ET
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from entsoe_api_fetcher import ENTSOEAPIFetcher
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<Publication_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-3:publicationdocument:7:3">
+  <period.timeInterval><start>2024-01-01T00:00Z</start><end>2024-01-02T00:00Z</end></period.timeInterval>
+  <TimeSeries>
+    <businessType>A62</businessType>
+    <in_Domain.mRID codingScheme="A01">10YAT-APG------L</in_Domain.mRID>
+    <curveType>A03</curveType>
+    <Period>
+      <timeInterval><start>2024-01-01T00:00Z</start><end>2024-01-01T01:00Z</end></timeInterval>
+      <resolution>PT15M</resolution>
+      <Point><position>1</position><price.amount>10.5</price.amount></Point>
+      <Point><position>3</position><price.amount>30</price.amount></Point>
+    </Period>
+  </TimeSeries>
+  <TimeSeries>
+    <businessType>A62</businessType>
+    <in_Domain.mRID codingScheme="A01">10Y1001A1001A82H</in_Domain.mRID>
+    <curveType>A01</curveType>
+    <Period>
+      <timeInterval><start>2024-01-01T00:00Z</start><end>2024-01-01T04:00Z</end></timeInterval>
+      <resolution>PT60M</resolution>
+      <Point><position>1</position><price.amount>50</price.amount></Point>
+      <Point><position>2</position><price.amount>51</price.amount></Point>
+      <Point><position>4</position><price.amount>53</price.amount></Point>
+    </Period>
+  </TimeSeries>
+</Publication_MarketDocument>"""
+
+
+def test_series_arrays():
+    series = ENTSOEAPIFetcher(api_key='x')._parse_xml_series(DOCUMENT)
+    assert len(series) == 2
+
+    quarter_hour = series[0]
+    assert quarter_hour['country_code'] == 'AT'
+    # A03: Position 2 und 4 übernehmen den vorherigen Wert
+    assert quarter_hour['values'].tolist() == [10.5, 10.5, 30.0, 30.0]
+    assert quarter_hour['timestamps'][-1] == np.datetime64('2024-01-01T00:45:00')
+
+    hourly = series[1]
+    assert hourly['country_code'] == 'DE-LU'
+    # A01: fehlende Position 3 wird verworfen
+    assert hourly['values'].tolist() == [50.0, 51.0, 53.0]
+    assert hourly['timestamps'][2] == np.datetime64('2024-01-01T03:00:00')
+
+
+def test_data_points_compatibility():
+    data_points = ENTSOEAPIFetcher(api_key='x')._parse_xml_response(DOCUMENT)
+    assert len(data_points) == 7
+    assert data_points[0].timestamp.isoformat() == '2024-01-01T00:00:00+00:00'
+    assert data_points[-1].price_eur_mwh == 53.0
+    assert ENTSOEAPIFetcher(api_key='x')._parse_xml_response('<kaputt') == []
+
+
+def acknowledgement(reason):
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<Acknowledgement_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-1:acknowledgementdocument:7:0">
+  <mRID>1</mRID>
+  <Reason><code>999</code><text>{reason}</text></Reason>
+</Acknowledgement_MarketDocument>"""
+
+
+def test_strict_mode_reports_failures():
+    fetcher = ENTSOEAPIFetcher(api_key='x')
+    try:
+        fetcher._parse_xml_series('<kaputt', strict=True)
+        raise AssertionError('ParseError erwartet')
+    except ET.ParseError:
+        pass
+
+    # Leerer Zeitraum ist ein gültiges (leeres) Ergebnis, andere Quittungen nicht
+    assert fetcher._parse_xml_series(acknowledgement('No matching data found for Data item'), strict=True) == []
+    try:
+        fetcher._parse_xml_series(acknowledgement('Amount of requested data exceeds allowed limit'), strict=True)
+        raise AssertionError('ValueError erwartet')
+    except ValueError as e:
+        assert 'exceeds allowed limit' in str(e)
+    assert fetcher._parse_xml_series(acknowledgement('Fehler')) == []
+
+
+if __name__ == "__main__":
+    test_series_arrays()
+    test_data_points_compatibility()
+    test_strict_mode_reports_failures()
+    print("✅ ENTSO-E XML-Parser-Tests erfolgreich")
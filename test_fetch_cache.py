@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den Response-Cache der externen Fetcher
+Läuft gegen einen lokalen HTTP-Stand-in mit ETag-Unterstützung
+"""
+
+import sys
+import os
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fetch_cache import ResponseCache, fetch_windowed, split_windows, window_is_settled
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    conditional_seen = 0
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        StandInHandler.requests_seen.append(params)
+
+        etag = f'"{params.get("start", "all")}"'
+        if self.headers.get('If-None-Match') == etag:
+            StandInHandler.conditional_seen += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = f'{{"start": "{params.get("start")}", "end": "{params.get("end")}"}}'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/data"
+
+
+def test_split_windows():
+    windows = split_windows(datetime(2024, 1, 15), datetime(2024, 4, 1), 'month')
+    assert windows == [
+        (datetime(2024, 1, 15), datetime(2024, 2, 1)),
+        (datetime(2024, 2, 1), datetime(2024, 3, 1)),
+        (datetime(2024, 3, 1), datetime(2024, 4, 1)),
+    ]
+    assert len(split_windows(datetime(2024, 1, 1, 12), datetime(2024, 1, 3), 'day')) == 2
+    assert window_is_settled(datetime.now() - timedelta(days=10))
+    assert not window_is_settled(datetime.now())
+
+
+def test_revalidation_and_immutable(tmp_path):
+    server, url = _start_server()
+    StandInHandler.requests_seen = []
+    StandInHandler.conditional_seen = 0
+    try:
+        cache = ResponseCache(str(tmp_path), enabled=True)
+        params = {'start': '2024-01-01', 'api_key': 'geheim'}
+
+        first = cache.get(url, params=params)
+        assert first.status_code == 200 and not first.from_cache
+        assert first.json()['start'] == '2024-01-01'
+
+        # Ohne max_age: bedingter Request, Server antwortet 304
+        second = cache.get(url, params=params)
+        assert second.from_cache and second.revalidated
+        assert second.content == first.content
+        assert StandInHandler.conditional_seen == 1
+
+        # Unveränderlich: kein Netzwerkzugriff mehr
+        seen = len(StandInHandler.requests_seen)
+        third = cache.get(url, params=params, immutable=True)
+        assert third.from_cache and not third.revalidated
+        assert len(StandInHandler.requests_seen) == seen
+
+        # Geheimnisse landen nicht im Index
+        index_files = list((tmp_path / 'index').rglob('*.json'))
+        assert index_files and 'geheim' not in index_files[0].read_text()
+
+        stats = cache.get_stats()
+        assert stats['misses'] == 1 and stats['revalidated'] == 1 and stats['hits'] == 1
+    finally:
+        server.shutdown()
+
+
+def test_windowed_fetch_only_requests_missing_windows(tmp_path):
+    server, url = _start_server()
+    StandInHandler.requests_seen = []
+    try:
+        cache = ResponseCache(str(tmp_path), enabled=True)
+
+        def fetch_window(window_start, window_end, immutable):
+            params = {'start': window_start.strftime('%Y-%m-%d'), 'end': window_end.strftime('%Y-%m-%d')}
+            return cache.get(url, params=params, immutable=immutable).json()
+
+        def merge(parts):
+            return [part['start'] for part in parts]
+
+        # Erster Abruf: Jan-Feb
+        parts = fetch_windowed(datetime(2024, 1, 1), datetime(2024, 3, 1), fetch_window, merge)
+        assert parts == ['2024-01-01', '2024-02-01']
+        assert len(StandInHandler.requests_seen) == 2
+
+        # Erweiterter Zeitraum: nur März wird angefragt
+        parts = fetch_windowed(datetime(2024, 1, 1), datetime(2024, 4, 1), fetch_window, merge)
+        assert parts == ['2024-01-01', '2024-02-01', '2024-03-01']
+        assert len(StandInHandler.requests_seen) == 3
+        assert StandInHandler.requests_seen[-1]['start'] == '2024-03-01'
+    finally:
+        server.shutdown()
+
+
+def test_prune_evicts_least_recently_used_and_aggregates_stats(tmp_path):
+    server, url = _start_server()
+    try:
+        cache = ResponseCache(str(tmp_path), enabled=True)
+        for start in ('2024-01-01', '2024-02-01', '2024-03-01'):
+            cache.get(url, params={'start': start}, immutable=True)
+        entries = sorted((tmp_path / 'index').rglob('*.json'))
+        past = datetime.now().timestamp() - 3600
+        for offset, path in enumerate(entries):
+            os.utime(path, (past + offset, past + offset))
+
+        # Treffer markiert den Eintrag als zuletzt genutzt
+        cache.get(url, params={'start': '2024-01-01'}, immutable=True)
+        size = len(cache.get(url, params={'start': '2024-01-01'}, immutable=True).content)
+
+        result = cache.prune(max_bytes=2 * size, max_age=86400)
+        assert result['evicted'] == 1 and result['blobs_removed'] == 1
+        assert cache.get(url, params={'start': '2024-01-01'}, immutable=True).from_cache
+        assert sum(1 for path in (tmp_path / 'blobs').rglob('*') if path.is_file()) == 2
+
+        # TTL: alles, was länger als max_age ungenutzt ist, fällt weg
+        assert cache.prune(max_age=0)['evicted'] == 2
+
+        # Zähler anderer Worker werden mitgezählt
+        (tmp_path / 'stats' / '999999.json').write_text('{"hits": 5, "misses": 1}')
+        stats = cache.get_stats()
+        assert stats['hits'] == 3 + 5 and stats['evicted'] == 3
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    test_split_windows()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_revalidation_and_immutable(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_windowed_fetch_only_requests_missing_windows(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_prune_evicts_least_recently_used_and_aggregates_stats(pathlib.Path(tmp))
+    print("✅ Fetch-Cache-Tests erfolgreich")
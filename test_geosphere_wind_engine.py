@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die vektorisierte GeoSphere-Windpipeline
+"""
+
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from geosphere import geosphere_wind_engine as engine
+
+
+def _reference_power(v, curve):
+    """Bisherige Segment-Suche pro Wert als Referenz"""
+    if not v > curve[0][0] or not v < curve[-1][0]:
+        return 0.0
+    for (v1, p1), (v2, p2) in zip(curve[:-1], curve[1:]):
+        if v1 <= v <= v2:
+            return p1 if v2 == v1 else p1 + (v - v1) / (v2 - v1) * (p2 - p1)
+    return 0.0
+
+
+def test_power_curve_matches_segment_scan():
+    v = np.concatenate([np.linspace(-1, 30, 2000), [3.0, 14.0, 25.0, np.nan]])
+    expected = np.array([_reference_power(x, engine.POWER_CURVE) for x in v])
+    assert np.allclose(engine.power_curve_kw(v, engine.POWER_CURVE), expected)
+
+    # Eigene Abschaltgrenzen
+    masked = engine.power_curve_kw(np.array([3.5, 10.0, 20.0]), engine.POWER_CURVE, cut_in_ms=4.0, cut_out_ms=18.0)
+    assert masked[0] == 0.0 and masked[1] == 3000.0 and masked[2] == 0.0
+
+
+def test_park_with_multiple_turbine_types():
+    v_ref = np.array([2.0, 6.0, 9.0, 12.0])
+    turbines = [
+        engine.WindTurbineConfig(hub_height_m=100, alpha=0.2, rated_power_kw=4200, loss_factor_total=0.1, count=3),
+        engine.WindTurbineConfig(hub_height_m=10, alpha=0.2, rated_power_kw=2000, loss_factor_total=0.0),
+    ]
+    v_hub, p_net = engine.compute_park_power(v_ref, turbines)
+
+    assert v_hub.shape == p_net.shape == (2, 4)
+    assert np.allclose(v_hub[1], v_ref)
+    assert np.allclose(v_hub[0], v_ref * 10 ** 0.2)
+    single = engine.power_curve_kw(v_hub[0], engine.POWER_CURVE)
+    assert np.allclose(p_net[0], np.minimum(single * 0.9, 4200) * 3)
+    # Nennleistung begrenzt die kleinere Anlage
+    assert p_net[1].max() == 2000
+
+
+def test_run_wind_pipeline_park(monkeypatch):
+    index = pd.date_range("2024-01-01", periods=6 * 24 * 30, freq="10min")
+    rng = np.random.default_rng(1)
+    raw = pd.DataFrame({"FF": rng.weibull(2.0, len(index)) * 6}, index=index)
+    monkeypatch.setattr(engine, "fetch_geosphere_wind_df", lambda cfg: raw)
+
+    config = {
+        "geosphere": {"base_url": "", "resource_id": "klima-v2-10min", "station_id": "1",
+                      "parameters": ["FF"], "start": "2024-01-01", "end": "2024-01-31"},
+        "wind_turbines": [
+            {"hub_height_m": 120, "alpha": 0.14, "rated_power_kw": 4200, "loss_factor_total": 0.1, "count": 2},
+            {"hub_height_m": 80, "alpha": 0.14, "rated_power_kw": 2000, "loss_factor_total": 0.1},
+        ],
+        "time_resolution": {"target_freq": "15min"},
+    }
+    df, kpis = engine.run_wind_pipeline(config)
+
+    assert list(df.columns) == ["v_hub", "P_net_kW", "E_kWh"]
+    assert kpis["rated_power_kw"] == 10400
+    assert kpis["turbine_count"] == 3
+    assert 0 < kpis["p_max_kw"] <= 10400
+    assert np.isclose(kpis["E_year_kWh"], df["P_net_kW"].sum() * 0.25)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
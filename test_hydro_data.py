@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test-Script für das Wasserstands-/Wasserkraft-Subsystem
+Prüft Bulk-UPSERT, Stationskatalog, spaltenweise Abfragen und die Leistungsumrechnung
+"""
+
+import sys
+import os
+import sqlite3
+import numpy as np
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.hydro_data import (
+    HydroPlantCurve,
+    ensure_hydro_schema,
+    flow_from_level,
+    hydro_power_kw,
+    hydro_power_profile,
+    query_water_levels,
+    save_hydro_data,
+    sync_station_catalogue,
+    upsert_water_levels,
+)
+
+RIVERS = {
+    "steyr": {"name": "Steyr", "stations": {
+        "208010": {"name": "Hinterstoder", "river": "Steyr", "ehyd_id": "208010",
+                   "coordinates": {"lat": 47.69, "lon": 14.15}},
+    }},
+    "donau": {"name": "Donau", "stations": [{"id": "207105", "name": "Linz", "river": "Donau"}]},
+}
+
+
+def _levels(station_id, station_name, river, start, hours, level=150.0):
+    return [
+        {"timestamp": (start + timedelta(hours=h)).isoformat(), "station_id": station_id,
+         "station_name": station_name, "river_name": river, "water_level_cm": level + h % 24}
+        for h in range(hours)
+    ]
+
+
+def test_upsert_and_catalogue_queries(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "bess.db"))
+    assert sync_station_catalogue(conn, RIVERS) == 2
+
+    start = datetime(2024, 1, 1)
+    result = upsert_water_levels(conn, _levels("208010", "Hinterstoder", "Steyr", start, 48), project_id=1)
+    assert result == {"inserted": 48, "updated": 0, "unchanged": 0, "skipped": 0}
+
+    # Erneuter Import: 24 unverändert, 24 mit neuen Werten, 24 neue Stunden
+    batch = (_levels("208010", "Hinterstoder", "Steyr", start, 24)
+             + _levels("208010", "Hinterstoder", "Steyr", start + timedelta(hours=24), 48, level=90.0))
+    result = upsert_water_levels(conn, batch)
+    assert result == {"inserted": 24, "updated": 24, "unchanged": 24, "skipped": 0}
+    upsert_water_levels(conn, _levels("207105", "Linz", "Donau", start, 24))
+
+    # Fluss über den Katalog (Name oder Schlüssel), Datum als Bis-Grenze inklusive ganzer Tag
+    steyr = query_water_levels(conn, river_name="steyr", start="2024-01-02", end="2024-01-02")
+    assert len(steyr["timestamp"]) == 24
+    assert set(steyr["station_id"]) == {"208010"}
+    assert steyr["water_level_cm"].dtype == np.float64
+    assert steyr["timestamp"][-1] == "2024-01-02T23:00:00"
+
+    assert len(query_water_levels(conn, river_name="Donau")["timestamp"]) == 24
+    # Projektzuordnung bleibt bei Importen ohne Projekt erhalten
+    assert len(query_water_levels(conn, project_id=1)["timestamp"]) == 48
+    conn.close()
+
+
+def test_vectorized_power_conversion():
+    plant = HydroPlantCurve(rated_power_kw=540, head_m=15, efficiency=0.85, residual_flow_m3s=0.5)
+    flow = np.array([0.0, 0.5, 2.5, 10.0, np.nan])
+    power = hydro_power_kw(flow, plant)
+
+    assert power[0] == 0.0 and power[1] == 0.0
+    assert np.isclose(power[2], 1000 * 9.81 * 2.0 * 15 * 0.85 / 1000)
+    assert power[3] == 540.0
+    assert power[4] == 0.0
+
+    levels = np.array([20.0, 30.0, 130.0])
+    assert np.allclose(flow_from_level(levels, plant), [0.0, 0.0, 2.5 * 1.0 ** 1.6])
+
+
+def test_year_profile(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "bess.db"))
+    upsert_water_levels(conn, _levels("208010", "Hinterstoder", "Steyr", datetime(2024, 1, 1), 8784))
+
+    profile = hydro_power_profile(conn, HydroPlantCurve(), "208010", start="2024-01-01", end="2024-12-31")
+    assert len(profile["power_kw"]) == 8784
+    assert np.allclose(profile["energy_kwh"], profile["power_kw"])
+    assert 0 < profile["full_load_hours"] <= 8784
+    conn.close()
+
+
+def test_legacy_rows_migrated_to_utc_key(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "bess.db"))
+    conn.execute("""
+        CREATE TABLE water_level (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, water_level_cm REAL NOT NULL,
+            station_id TEXT NOT NULL, station_name TEXT NOT NULL, river_name TEXT NOT NULL,
+            project_id INTEGER, profile_name TEXT, source TEXT, region TEXT, created_at TIMESTAMP
+        )
+    """)
+    legacy = [("2024-03-01 12:00:00.000000", 100.0, 1, "EHYD (Live)"),
+              ("2024-03-01T13:00:00+01:00", 110.0, 2, "EHYD (Demo)"),
+              ("2024-03-01T12:00:00", 120.0, None, "EHYD (Demo)")]
+    conn.executemany("""
+        INSERT INTO water_level (timestamp, water_level_cm, project_id, profile_name, source,
+                                 station_id, station_name, river_name)
+        VALUES (?, ?, ?, 'Pegel 2024', ?, '208010', 'Hinterstoder', 'Steyr')
+    """, legacy)
+    conn.commit()
+
+    ensure_hydro_schema(conn)
+    # Offset wird nach UTC umgerechnet: alle drei Zeilen treffen denselben Schlüssel,
+    # die Live-Zeile bleibt, die Projekte der entfernten Duplikate behalten ihre Zuordnung
+    rows = conn.execute("SELECT timestamp, water_level_cm, source FROM water_level").fetchall()
+    assert rows == [("2024-03-01T12:00:00", 100.0, "EHYD (Live)")]
+    for project_id in (1, 2):
+        assert list(query_water_levels(conn, project_id=project_id)["water_level_cm"]) == [100.0]
+    conn.close()
+
+
+def test_projects_share_readings_and_demo_never_replaces_live(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "bess.db"))
+    start = datetime(2024, 1, 1)
+    live = [dict(level, source="EHYD (Live)") for level in _levels("208010", "Hinterstoder", "Steyr", start, 24)]
+    demo = [dict(level, source="EHYD (Demo)", water_level_cm=50.0)
+            for level in _levels("208010", "Hinterstoder", "Steyr", start, 48)]
+
+    upsert_water_levels(conn, live, project_id=1, profile_name="Steyr 2024")
+    # Demo-Fallback für ein anderes Projekt: nur die fehlenden Stunden kommen neu dazu
+    result = upsert_water_levels(conn, demo, project_id=2, profile_name="Steyr Demo")
+    assert result == {"inserted": 24, "updated": 0, "unchanged": 24, "skipped": 0}
+
+    first = query_water_levels(conn, project_id=1)
+    assert len(first["timestamp"]) == 24 and set(first["source"]) == {"EHYD (Live)"}
+    second = query_water_levels(conn, project_id=2)
+    assert len(second["timestamp"]) == 48
+    assert second["source"][:24] == ["EHYD (Live)"] * 24
+
+    # Live ersetzt Demo weiterhin
+    upsert_water_levels(conn, [dict(demo[30], source="EHYD (Live)", water_level_cm=77.0)])
+    assert query_water_levels(conn, start="2024-01-02T06:00:00", end="2024-01-02T06:00:00")["source"] == ["EHYD (Live)"]
+    conn.close()
+
+
+def test_save_hydro_data_batches_update_and_insert(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "bess.db"))
+    conn.execute("""
+        CREATE TABLE hydro_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp DATETIME, water_level_m REAL, flow_rate_m3s REAL,
+            river_name TEXT, station_name TEXT, source TEXT, region TEXT, created_at DATETIME
+        )
+    """)
+    entries = [{"timestamp": f"2024-03-01T{h:02d}:00:00", "water_level_m": 1.5, "flow_rate_m3s": 20.0 + h,
+                "river_name": "Steyr", "station_name": "Hinterstoder"} for h in range(3)]
+    assert save_hydro_data(conn, entries) == {"inserted": 3, "updated": 0}
+
+    entries[0] = dict(entries[0], water_level_m=1.7)
+    entries.append(dict(entries[1], timestamp="2024-03-01T05:00:00"))
+    assert save_hydro_data(conn, entries) == {"inserted": 1, "updated": 3}
+    assert conn.execute("SELECT COUNT(*) FROM hydro_data").fetchone()[0] == 4
+    assert conn.execute("""
+        SELECT water_level_m, flow_rate_m3s FROM hydro_data WHERE timestamp = '2024-03-01 00:00:00'
+    """).fetchone() == (1.7, 20.0)
+    conn.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    for test in (test_upsert_and_catalogue_queries, test_year_profile,
+                 test_legacy_rows_migrated_to_utc_key, test_save_hydro_data_batches_update_and_insert):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    test_vectorized_power_conversion()
+    print("✅ Hydro-Daten-Tests erfolgreich")
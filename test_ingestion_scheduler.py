@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den einheitlichen Ingestion-Scheduler
+Prüft Cron-Trigger, Job-Metriken, Überlappungsschutz und den gemeinsamen Bulk-Writer
+"""
+
+import sys
+import os
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ingestion_scheduler import (CronTrigger, IngestionJob, IngestionScheduler, IntervalTrigger,
+                                 build_default_jobs, cleanup_old_data)
+
+
+def test_cron_trigger():
+    trigger = CronTrigger('0 14,15 * * *')
+    assert trigger.next_run(datetime(2025, 3, 1, 13, 59)) == datetime(2025, 3, 1, 14, 0)
+    assert trigger.next_run(datetime(2025, 3, 1, 14, 0)) == datetime(2025, 3, 1, 15, 0)
+    assert trigger.next_run(datetime(2025, 3, 1, 15, 0)) == datetime(2025, 3, 2, 14, 0)
+
+    # Sonntag 16:00 (2025-03-02 ist ein Sonntag)
+    assert CronTrigger('0 16 * * 0').next_run(datetime(2025, 2, 26)) == datetime(2025, 3, 2, 16, 0)
+    assert CronTrigger('*/15 * * * *').next_run(datetime(2025, 1, 1, 10, 7)) == datetime(2025, 1, 1, 10, 15)
+
+
+def test_jobs_metrics_overlap_and_writer(tmp_path):
+    scheduler = IngestionScheduler(db_path=str(tmp_path / 'bess.db'), stats_file=str(tmp_path / 'stats.json'))
+    start = datetime(2025, 1, 1)
+
+    async def prices(ctx):
+        records = [{'timestamp': start + timedelta(hours=i), 'price_eur_mwh': 40.0 + i} for i in range(24)]
+        return await ctx.writer.write(records, source='Test')
+
+    async def slow(ctx):
+        await asyncio.sleep(0.2)
+        return {}
+
+    async def broken(ctx):
+        raise RuntimeError('API nicht erreichbar')
+
+    for name, func in (('prices', prices), ('slow', slow), ('broken', broken)):
+        scheduler.add_job(IngestionJob(name, func, IntervalTrigger(60)))
+
+    async def scenario():
+        await scheduler._setup()
+        try:
+            await asyncio.gather(
+                scheduler.run_job(scheduler.jobs['prices']),
+                scheduler.run_job(scheduler.jobs['slow']),
+                scheduler.run_job(scheduler.jobs['slow']),
+                scheduler.run_job(scheduler.jobs['broken']),
+            )
+        finally:
+            await scheduler._teardown()
+
+    asyncio.run(scenario())
+
+    stats = scheduler.get_stats()['jobs']
+    assert stats['prices']['records_written'] == 24
+    assert stats['prices']['freshness_seconds'] is not None
+    assert stats['slow']['skipped_overlaps'] == 1
+    assert stats['broken']['failures'] == 1 and 'API' in stats['broken']['last_error']
+
+    conn = sqlite3.connect(str(tmp_path / 'bess.db'))
+    assert conn.execute("SELECT COUNT(*) FROM spot_price WHERE source = 'Test'").fetchone()[0] == 24
+    conn.close()
+    assert os.path.exists(str(tmp_path / 'stats.json'))
+
+
+def test_timeout_keeps_slot_until_thread_finishes(tmp_path):
+    scheduler = IngestionScheduler(db_path=str(tmp_path / 'bess.db'), stats_file=str(tmp_path / 'stats.json'))
+    release = threading.Event()
+
+    async def blocking(ctx):
+        return await ctx.run_sync(release.wait, 5)
+
+    job = IngestionJob('blocking', blocking, IntervalTrigger(60), timeout=0.1)
+    scheduler.add_job(job)
+
+    async def scenario():
+        await scheduler._setup()
+        try:
+            first = asyncio.create_task(scheduler.run_job(job))
+            await asyncio.sleep(0.3)
+            # Timeout ist erreicht, der Executor-Thread läuft aber noch
+            assert job.metrics.timeouts == 1 and job.running == 1
+            await scheduler.run_job(job)
+            assert job.metrics.skipped_overlaps == 1
+            release.set()
+            await first
+            assert job.running == 0 and not job.threads
+        finally:
+            release.set()
+            await scheduler._teardown()
+
+    asyncio.run(scenario())
+
+
+def test_ported_jobs_and_cleanup(tmp_path):
+    names = {job.name for job in build_default_jobs()}
+    assert {'entsoe_generation', 'awattar_history', 'cleanup'} <= names
+
+    db_path = str(tmp_path / 'bess.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE apg_scheduler_log (id INTEGER PRIMARY KEY, timestamp DATETIME)")
+    conn.execute("INSERT INTO apg_scheduler_log (timestamp) VALUES (?)", (datetime.now() - timedelta(days=40),))
+    conn.commit()
+    from app.price_ingestion import upsert_spot_prices
+    old = datetime.now() - timedelta(days=10)
+    upsert_spot_prices(conn, [{'timestamp': datetime(2025, 1, 1), 'price_eur_mwh': 10.0, 'source': 'APG (Demo)'},
+                              {'timestamp': datetime(2025, 1, 1), 'price_eur_mwh': 20.0, 'source': 'aWATTAR'}])
+    conn.execute("UPDATE spot_price SET created_at = ?", (old,))
+    conn.commit()
+    conn.close()
+
+    assert cleanup_old_data(db_path) == {'demo_deleted': 1, 'logs_deleted': 1}
+    conn = sqlite3.connect(db_path)
+    # Echte Preise bleiben erhalten
+    assert conn.execute("SELECT source FROM spot_price").fetchall() == [('aWATTAR',)]
+    conn.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    test_cron_trigger()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_jobs_metrics_overlap_and_writer(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_timeout_keeps_slot_until_thread_finishes(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_ported_jobs_and_cleanup(pathlib.Path(tmp))
+    print("✅ Ingestion-Scheduler-Tests erfolgreich")
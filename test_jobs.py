@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Hintergrund-Jobs (Warteschlange, Deduplizierung, Worker, Status-Endpunkte)
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+pytest.importorskip('flask_login')
+
+from flask import Flask, jsonify, request, send_file
+from flask_login import LoginManager
+
+from app import jobs
+from app.jobs import JobQueue, background_job, jobs_bp, report_progress, work
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / 'bess.db'))
+
+
+def test_submit_deduplicates_and_claims(queue):
+    payload = {'method': 'POST', 'path': '/api/sizing', 'args': [], 'json': {'project_id': 1}}
+    job, created = queue.submit('ps_ll_sizing', payload, user_id=7)
+    again, created_again = queue.submit('ps_ll_sizing', payload, user_id=7)
+    assert created and not created_again and again['id'] == job['id']
+
+    # Anderer Benutzer oder andere Parameter: eigener Job
+    assert queue.submit('ps_ll_sizing', payload, user_id=8)[1]
+    assert queue.submit('ps_ll_sizing', dict(payload, json={'project_id': 2}), user_id=7)[1]
+
+    claimed = queue.claim('test')
+    assert claimed['id'] == job['id'] and claimed['status'] == 'running' and claimed['attempts'] == 1
+    # Laufender Job wird wiederverwendet, fertiger nicht (Daten können sich seitdem geändert haben)
+    assert queue.submit('ps_ll_sizing', payload, user_id=7)[0]['id'] == job['id']
+    queue.complete(job['id'], 200, 'application/json', b'{"ok": true}')
+    assert queue.get(job['id'])['status'] == 'done'
+    rerun, created = queue.submit('ps_ll_sizing', payload, user_id=7)
+    assert created and rerun['id'] != job['id']
+
+
+def test_expired_results_are_purged(queue):
+    job, _ = queue.submit('export_10year_pdf', {'path': '/x'}, ttl=0)
+    queue.claim('test')
+    queue.complete(job['id'], 200, 'application/pdf', b'%PDF-1.4', 'report.pdf')
+    path = queue.get(job['id'], raw=True)['result_path']
+    assert os.path.exists(path)
+
+    time.sleep(0.01)
+    assert queue.purge_expired() == 1
+    assert queue.get(job['id']) is None and not os.path.exists(path)
+    # Abgelaufene Ergebnisse werden nicht wiederverwendet
+    assert queue.submit('export_10year_pdf', {'path': '/x'}, ttl=0)[1]
+
+
+def test_stale_jobs_are_requeued_then_failed(queue):
+    job, _ = queue.submit('train_price_model', {'path': '/train'})
+    for attempt in range(jobs.MAX_ATTEMPTS):
+        assert queue.claim(f'worker-{attempt}')['id'] == job['id']
+        assert queue.requeue_stale(max_age=-1) == (1 if attempt + 1 < jobs.MAX_ATTEMPTS else 0)
+    stale = queue.get(job['id'])
+    assert stale['status'] == 'failed' and stale['attempts'] == jobs.MAX_ATTEMPTS
+    assert queue.claim('worker-x') is None
+
+
+def test_released_jobs_keep_their_attempts(queue):
+    job, _ = queue.submit('train_price_model', {'path': '/train'})
+    # Mehr Deploys als MAX_ATTEMPTS: Freigabe beim Beenden zählt keinen Versuch
+    for _ in range(jobs.MAX_ATTEMPTS + 1):
+        claimed = queue.claim('worker-a')
+        assert claimed['id'] == job['id'] and claimed['attempts'] == 1
+        jobs._running_jobs[job['id']] = claimed['worker']
+        assert jobs.release_running_jobs(queue) == 1
+        jobs._running_jobs.clear()
+    released = queue.get(job['id'])
+    assert released['status'] == 'queued' and released['attempts'] == 0
+    # Nur der eigene Worker gibt frei
+    queue.claim('worker-a')
+    assert not queue.release(job['id'], 'worker-b')
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config['SECRET_KEY'] = 'test'
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: None)
+    calls = []
+
+    @app.route('/api/sizing', methods=['POST'])
+    @background_job('ps_ll_sizing')
+    def sizing():
+        calls.append(request.get_json())
+        report_progress(0.5, 'Halbzeit')
+        return jsonify({'success': True, 'power': request.get_json()['project_id'] * 100})
+
+    @app.route('/api/export/<int:project_id>')
+    @background_job('export_10year_pdf')
+    def export(project_id):
+        path = tmp_path / f'report_{project_id}.pdf'
+        path.write_bytes(b'%PDF-1.4 Bericht')
+        return send_file(str(path), as_attachment=True, download_name=f'report_{project_id}.pdf')
+
+    app.register_blueprint(jobs_bp)
+    app.calls = calls
+    return app
+
+
+def test_async_request_runs_in_worker(app):
+    client = app.test_client()
+    # Ohne Prefer-Header unverändert synchron
+    assert client.post('/api/sizing', json={'project_id': 1}).get_json()['power'] == 100
+
+    accepted = client.post('/api/sizing', json={'project_id': 3}, headers={'Prefer': 'respond-async'})
+    assert accepted.status_code == 202
+    job_id = accepted.get_json()['job']['id']
+    assert accepted.headers['Location'].endswith(f'/api/jobs/{job_id}')
+    assert client.post('/api/sizing?async=1', json={'project_id': 3}).get_json()['job']['id'] == job_id
+    assert client.get(f'/api/jobs/{job_id}/result').status_code == 409
+
+    queue = JobQueue(os.path.join(app.instance_path, 'bess.db'))
+    assert work(app, queue, once=True) == 1
+    assert app.calls == [{'project_id': 1}, {'project_id': 3}]
+
+    status = client.get(f'/api/jobs/{job_id}').get_json()['job']
+    assert status['status'] == 'done' and status['progress'] == 1
+    assert status['result'] == {'success': True, 'power': 300}
+    assert client.get(f'/api/jobs/{job_id}/result').get_json() == {'success': True, 'power': 300}
+
+
+def test_file_results_keep_download_name(app):
+    client = app.test_client()
+    job_id = client.get('/api/export/4?async=1').get_json()['job']['id']
+    work(app, JobQueue(os.path.join(app.instance_path, 'bess.db')), once=True)
+
+    result = client.get(f'/api/jobs/{job_id}/result')
+    assert result.status_code == 200 and result.data == b'%PDF-1.4 Bericht'
+    assert 'report_4.pdf' in result.headers['Content-Disposition']
+    assert client.delete(f'/api/jobs/{job_id}').status_code == 409
+
+
+def test_anonymous_jobs_are_bound_to_the_session(app):
+    client, other = app.test_client(), app.test_client()
+    job_id = client.post('/api/sizing?async=1', json={'project_id': 5}).get_json()['job']['id']
+    # Gleiche Anfrage aus einer anderen Session: eigener Job, keine Einsicht in fremde Jobs
+    other_id = other.post('/api/sizing?async=1', json={'project_id': 5}).get_json()['job']['id']
+    assert other_id != job_id
+
+    assert client.get(f'/api/jobs/{job_id}').status_code == 200
+    assert [job['id'] for job in client.get('/api/jobs').get_json()['jobs']] == [job_id]
+    assert other.get(f'/api/jobs/{job_id}').status_code == 404
+    assert other.get(f'/api/jobs/{job_id}/result').status_code == 404
+    assert other.delete(f'/api/jobs/{job_id}').status_code == 404
+    assert app.test_client().get('/api/jobs').get_json()['jobs'] == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
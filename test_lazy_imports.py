@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test-Script für verzögerte Imports und den Importzeit-Bericht
+"""
+
+import sys
+import os
+import logging
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app.lazy_imports import (import_available, import_time_report, is_loaded, lazy_import, module_available,
+                              parse_importtime)
+
+
+@pytest.fixture
+def slow_module(tmp_path, monkeypatch):
+    (tmp_path / 'bess_lazy_probe.py').write_text(
+        "LOADS = []\n"
+        "LOADS.append(1)\n"
+        "class Fetcher:\n"
+        "    def __init__(self, region='AT'):\n"
+        "        self.region = region\n"
+        "CONSTANT = 'BZN|AT'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'bess_lazy_probe'
+    sys.modules.pop('bess_lazy_probe', None)
+
+
+def test_import_deferred_until_first_use(slow_module):
+    module = lazy_import(slow_module)
+    Fetcher = lazy_import(slow_module, 'Fetcher')
+    assert slow_module not in sys.modules
+    assert not is_loaded(Fetcher)
+
+    fetcher = Fetcher(region='DE')
+    assert fetcher.region == 'DE' and isinstance(fetcher, Fetcher._load())
+    assert slow_module in sys.modules
+    # Modul wird nur einmal ausgeführt, Konstanten über das Modul
+    assert module.CONSTANT == 'BZN|AT' and module.LOADS == [1]
+
+
+def test_module_available():
+    assert module_available('json')
+    assert not module_available('bess_gibt_es_nicht')
+    assert not module_available('bess_gibt_es_nicht.untermodul')
+
+
+def test_import_available_reports_broken_modules(tmp_path, monkeypatch, caplog):
+    (tmp_path / 'bess_broken_probe.py').write_text("import bess_fehlende_abhaengigkeit\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    broken = import_available('json', 'bess_broken_probe')
+    # find_spec allein hielte das Modul für verfügbar
+    assert module_available('bess_broken_probe')
+    with caplog.at_level(logging.WARNING, logger='app.lazy_imports'):
+        assert not broken
+    assert 'bess_fehlende_abhaengigkeit' in broken.error and 'bess_broken_probe' in caplog.text
+    assert import_available('json') and not import_available('bess_gibt_es_nicht')
+
+
+def test_disabled_features_get_stub_endpoints():
+    pytest.importorskip('flask_sqlalchemy')
+    from flask import Blueprint, Flask, render_template_string
+    from app import register_feature_stubs
+
+    app = Flask(__name__)
+    main = Blueprint('main', __name__)
+    main.add_url_rule('/', 'index', lambda: 'start')
+    app.register_blueprint(main)
+    register_feature_stubs(app, active={'co2'})
+
+    template = ("{{ url_for('multi_user.dashboard') if feature_enabled('multi_user') else url_for('main.index') }}|"
+                "{{ url_for('export.export_center') }}|{{ feature_enabled('co2') }}")
+    with app.test_request_context('/'):
+        assert render_template_string(template) == '/|/export/export-center|True'
+    response = app.test_client().get('/multi-user/dashboard')
+    assert response.status_code == 302 and response.headers['Location'].endswith('/')
+    # Aktive Features bekommen keinen Platzhalter
+    assert 'co2_tracking' not in app.blueprints
+
+
+def test_importtime_parsing_and_report():
+    sample = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _json\n"
+        "import time:       900 |       1020 | json\n"
+    )
+    entries = parse_importtime(sample)
+    assert entries == [
+        {'module': '_json', 'self_us': 120, 'cumulative_us': 120, 'depth': 1},
+        {'module': 'json', 'self_us': 900, 'cumulative_us': 1020, 'depth': 0},
+    ]
+
+    report = import_time_report('import json, decimal', top=5)
+    assert report['returncode'] == 0 and report['modules'] > 0
+    assert len(report['top_cumulative']) <= 5
+    assert all(entry['depth'] == 0 for entry in report['top_cumulative'])
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
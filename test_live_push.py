@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den Live-Push-Kanal (SSE)
+Prüft Projekt-Filter, Delta-Encoding und Rate-Limit des LiveTelemetryHub
+"""
+
+import sys
+import os
+import json
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.live_push import LiveTelemetryHub
+
+
+def _events(stream, count):
+    events = []
+    while len(events) < count:
+        chunk = next(stream)
+        if chunk.startswith('event: telemetry'):
+            events.append(json.loads(chunk.split('data: ', 1)[1]))
+    return events
+
+
+def test_filter_and_delta():
+    hub = LiveTelemetryHub()
+    subscriber = hub.subscribe(devices={('site1', 'bess1')}, min_interval=0.05)
+    stream = hub.stream(subscriber, heartbeat=0.2)
+
+    hub.publish({'site': 'site1', 'device': 'bess1', 'soc': 50.0, 'power': 10.0})
+    hub.publish({'site': 'site2', 'device': 'bess1', 'soc': 20.0, 'power': 5.0})
+    first = _events(stream, 1)[0]
+    assert len(first) == 1
+    assert first[0]['full'] is True
+    assert first[0]['data']['soc'] == 50.0
+
+    hub.publish({'site': 'site1', 'device': 'bess1', 'soc': 51.0, 'power': 10.0})
+    second = _events(stream, 1)[0]
+    assert second[0]['full'] is False
+    assert second[0]['data'] == {'soc': 51.0}
+
+    stream.close()
+    assert hub.get_statistics()['subscribers'] == 0
+
+
+def test_rate_limit_coalesces_updates():
+    hub = LiveTelemetryHub()
+    subscriber = hub.subscribe(min_interval=0.1)
+    stream = hub.stream(subscriber, heartbeat=0.5)
+    next(stream)
+
+    for soc in range(10):
+        hub.publish({'site': 'site1', 'device': 'bess1', 'soc': float(soc)})
+
+    batch = _events(stream, 1)[0]
+    assert batch[0]['data']['soc'] == 9.0
+    stream.close()
+
+
+def test_stream_limit_leaves_threads_free():
+    hub = LiveTelemetryHub(max_subscribers=2)
+    streams = [hub.stream(hub.subscribe(), heartbeat=0.1) for _ in range(2)]
+    with pytest.raises(RuntimeError):
+        hub.subscribe()
+
+    # Geschlossener Stream gibt seinen Platz frei
+    next(streams[0])
+    streams[0].close()
+    assert hub.get_statistics()['subscribers'] == 1
+    hub.subscribe()
+
+
+if __name__ == '__main__':
+    test_filter_and_delta()
+    test_rate_limit_coalesces_updates()
+    test_stream_limit_leaves_threads_free()
+    print("✅ Live-Push-Tests erfolgreich")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test-Script für das Level-gesteuerte, asynchrone Logging und gedrosselte Zeilen-Diagnosen
+"""
+
+import sys
+import os
+import logging
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app import logging_config
+from app.logging_config import RowSampler, setup_logging
+
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class _Expensive:
+    """Zählt, wie oft eine Meldung tatsächlich formatiert wird"""
+    calls = 0
+
+    def __str__(self):
+        _Expensive.calls += 1
+        return 'teuer'
+
+
+@pytest.fixture
+def collector():
+    logger = logging.getLogger('test_bess_rows')
+    logger.propagate = False
+    handler = _Collect()
+    logger.addHandler(handler)
+    yield logger, handler
+    logger.removeHandler(handler)
+
+
+def test_sampler_limits_row_messages(collector):
+    logger, handler = collector
+    logger.setLevel(logging.DEBUG)
+    sample = RowSampler(logger, logging.DEBUG, first=3, every=1000)
+    for i in range(2500):
+        sample('Zeile %s', i + 1)
+    sample.summary()
+
+    assert handler.messages[:3] == ['Zeile 1', 'Zeile 2', 'Zeile 3']
+    assert handler.messages[3:5] == ['Zeile 1000', 'Zeile 2000']
+    assert handler.messages[-1] == '2495 weitere Zeilen-Meldungen unterdrückt'
+
+
+def test_disabled_level_skips_formatting(collector):
+    logger, handler = collector
+    logger.setLevel(logging.INFO)
+    _Expensive.calls = 0
+    sample = RowSampler(logger, logging.DEBUG)
+    for _ in range(100):
+        sample('Wert %s', _Expensive())
+        logger.debug('Wert %s', _Expensive())
+    sample.summary()
+    assert _Expensive.calls == 0 and handler.messages == []
+
+
+def test_async_setup_writes_through_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(logging_config, 'APP_LOG', tmp_path / 'app.log')
+    monkeypatch.setattr(logging_config, 'ERROR_LOG', tmp_path / 'errors.log')
+    root = logging.getLogger()
+    previous = root.handlers[:], root.level
+    try:
+        setup_logging('WARNING', async_handlers=True)
+        assert [type(h) for h in root.handlers] == [logging.handlers.QueueHandler]
+        logging.getLogger('bess.test').debug('unsichtbar')
+        logging.getLogger('bess.test').error('Fehler %s', 42)
+        logging_config._stop_queue_listener()
+
+        content = (tmp_path / 'app.log').read_text(encoding='utf-8')
+        assert 'Fehler 42' in content and 'unsichtbar' not in content
+        assert 'Fehler 42' in (tmp_path / 'errors.log').read_text(encoding='utf-8')
+    finally:
+        logging_config._stop_queue_listener()
+        root.handlers[:] = previous[0]
+        root.setLevel(previous[1])
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
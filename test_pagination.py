@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test-Script für Keyset-Pagination und chunkweises Lesen großer Listen
+"""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app.pagination import KeysetQuery, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE spot_price (id INTEGER PRIMARY KEY, timestamp TEXT, price_eur_mwh REAL)")
+    # Doppelte Zeitstempel: erst die ID macht die Sortierung eindeutig
+    conn.executemany(
+        "INSERT INTO spot_price (timestamp, price_eur_mwh) VALUES (?, ?)",
+        [(f"2024-01-01 {h // 2:02d}:00:00", float(h)) for h in range(48)]
+    )
+    yield conn
+    conn.close()
+
+
+def test_cursor_roundtrip():
+    token = encode_cursor(['2024-01-01 10:00:00', 42])
+    assert decode_cursor(token) == ['2024-01-01 10:00:00', 42]
+    assert decode_cursor(None) is None
+    with pytest.raises(ValueError):
+        decode_cursor('kein-cursor')
+
+
+def test_pages_cover_all_rows_once(conn):
+    query = KeysetQuery("SELECT id, timestamp, price_eur_mwh FROM spot_price WHERE price_eur_mwh >= ?",
+                        (0,), key_columns=('timestamp', 'id'))
+    seen, cursor = [], None
+    while True:
+        rows, token = query.page(conn, 10, cursor)
+        seen.extend(row['id'] for row in rows)
+        if token is None:
+            break
+        cursor = decode_cursor(token)
+
+    assert len(seen) == 48 and len(set(seen)) == 48
+    assert [row['id'] for row in query.iterate(conn, chunk_size=7)] == seen
+
+
+def test_descending_and_invalid_cursor(conn):
+    query = KeysetQuery("SELECT id, timestamp FROM spot_price", key_columns=('timestamp', 'id'), descending=True)
+    rows, token = query.page(conn, 5)
+    assert [row['id'] for row in rows] == [48, 47, 46, 45, 44]
+    next_rows, _ = query.page(conn, 5, decode_cursor(token))
+    assert next_rows[0]['id'] == 43
+
+    with pytest.raises(ValueError):
+        query.page(conn, 5, [1])
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die gemeinsame Preis-Ingestion
+Prüft den set-basierten UPSERT (neu / aktualisiert / unverändert) in spot_price
+"""
+
+import sys
+import os
+import sqlite3
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.price_ingestion import ensure_price_schema, upsert_spot_prices
+
+
+def _prices(start, count, price):
+    return [{'timestamp': start + timedelta(minutes=15 * i), 'price_eur_mwh': price + i}
+            for i in range(count)]
+
+
+def test_upsert_counts(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'bess.db'))
+    start = datetime(2024, 1, 1)
+
+    result = upsert_spot_prices(conn, _prices(start, 96, 50.0), source='ENTSO-E (Day Ahead)')
+    assert result == {'inserted': 96, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+
+    # Erste Hälfte unverändert, zweite Hälfte mit neuen Preisen, 4 neue Viertelstunden
+    batch = _prices(start, 48, 50.0) + _prices(start + timedelta(hours=12), 52, 10.0)
+    result = upsert_spot_prices(conn, batch, source='ENTSO-E (Day Ahead)')
+    assert result == {'inserted': 4, 'updated': 48, 'unchanged': 48, 'skipped': 0}
+
+    assert conn.execute("SELECT COUNT(*) FROM spot_price").fetchone()[0] == 100
+    conn.close()
+
+
+def test_key_separates_price_types_and_skips_invalid(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'bess.db'))
+    ts = datetime(2024, 6, 1, 12)
+    records = [
+        {'timestamp': ts, 'price_eur_mwh': 80.0, 'price_type': 'day_ahead'},
+        {'timestamp': ts, 'price_eur_mwh': 95.0, 'price_type': 'intraday'},
+        {'timestamp': '2024-06-01T12:00:00Z', 'price': 81.0, 'price_type': 'day_ahead'},
+        {'timestamp': None, 'price_eur_mwh': 1.0},
+    ]
+    result = upsert_spot_prices(conn, records, source='APG')
+    assert result == {'inserted': 2, 'updated': 0, 'unchanged': 0, 'skipped': 1}
+
+    price = conn.execute(
+        "SELECT price_eur_mwh FROM spot_price WHERE price_type = 'day_ahead'"
+    ).fetchone()[0]
+    assert price == 81.0
+    conn.close()
+
+
+def test_migration_normalizes_legacy_rows_and_treats_null_as_key(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'bess.db'))
+    conn.execute("""
+        CREATE TABLE spot_price (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp DATETIME NOT NULL,
+            price_eur_mwh FLOAT NOT NULL, source VARCHAR(50), region VARCHAR(50),
+            price_type VARCHAR(20), created_at DATETIME
+        )
+    """)
+    # Alter Index ohne COALESCE (NULL-Duplikate rutschen durch)
+    conn.execute("CREATE UNIQUE INDEX uq_spot_price_key ON spot_price (region, source, price_type, timestamp)")
+    conn.executemany(
+        "INSERT INTO spot_price (timestamp, price_eur_mwh, source, region, price_type) VALUES (?, ?, ?, ?, ?)",
+        [
+            ('2024-01-01T00:00:00', 40.0, 'APG', 'AT', 'day_ahead'),
+            ('2024-01-01 01:00:00', 41.0, 'APG', 'AT', None),
+            ('2024-01-01 01:00:00.000000', 42.0, 'APG', 'AT', None),
+        ]
+    )
+    conn.commit()
+
+    ensure_price_schema(conn)
+    rows = conn.execute("SELECT timestamp, price_eur_mwh, price_type FROM spot_price ORDER BY timestamp").fetchall()
+    assert rows == [('2024-01-01 00:00:00.000000', 40.0, 'day_ahead'),
+                    ('2024-01-01 01:00:00.000000', 42.0, None)]
+
+    # Upsert trifft die normalisierte Altzeile statt ein Duplikat anzulegen
+    result = upsert_spot_prices(conn, [{'timestamp': datetime(2024, 1, 1), 'price_eur_mwh': 45.0}], source='APG')
+    assert result['updated'] == 1 and result['inserted'] == 0
+
+    # NULL-Preistyp bleibt eindeutig
+    try:
+        conn.execute("INSERT INTO spot_price (timestamp, price_eur_mwh, source, region) "
+                      "VALUES ('2024-01-01 01:00:00.000000', 43.0, 'APG', 'AT')")
+        raise AssertionError('Duplikat mit NULL-Preistyp wurde angenommen')
+    except sqlite3.IntegrityError:
+        pass
+    conn.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_upsert_counts(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_key_separates_price_types_and_skips_invalid(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_migration_normalizes_legacy_rows_and_treats_null_as_key(pathlib.Path(tmp))
+    print("✅ Preis-Ingestion-Tests erfolgreich")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die vorberechneten Zeilenzahlen je Lastprofil (load_profile_stats)
+"""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app import profile_stats
+from app.profile_stats import (ensure_profile_stats_ready, ensure_profile_stats_schema, profile_row_counts,
+                               refresh_profile_stats)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript("""
+        CREATE TABLE load_profile (id INTEGER PRIMARY KEY, project_id INTEGER, name TEXT);
+        CREATE TABLE load_value (id INTEGER PRIMARY KEY, load_profile_id INTEGER, timestamp TEXT, power_kw REAL);
+        INSERT INTO load_profile (id, project_id, name) VALUES (1, 1, 'Alt'), (2, 1, 'Neu'), (3, 1, 'Leer');
+    """)
+    # Bestandsdaten vor dem Anlegen der Statistik
+    conn.executemany("INSERT INTO load_value (load_profile_id, timestamp, power_kw) VALUES (?, ?, ?)",
+                     [(1, f"2024-01-01 {h:02d}:00", 1.0) for h in range(24)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_backfill_and_triggers(conn):
+    ensure_profile_stats_schema(conn)
+    assert profile_row_counts(conn) == {1: 24}
+
+    conn.executemany("INSERT INTO load_value (load_profile_id, timestamp, power_kw) VALUES (?, ?, ?)",
+                     [(2, f"2024-01-02 {h:02d}:00", 2.0) for h in range(10)])
+    conn.execute("DELETE FROM load_value WHERE load_profile_id = 1 AND timestamp < '2024-01-01 04:00'")
+    conn.execute("UPDATE load_value SET load_profile_id = 3 WHERE load_profile_id = 2 AND timestamp < '2024-01-02 02:00'")
+    assert profile_row_counts(conn, 'load_profile', [1, 2, 3]) == {1: 20, 2: 8, 3: 2}
+
+    # Gelöschte Profile verschwinden aus der Statistik
+    conn.execute("DELETE FROM load_profile WHERE id = 3")
+    assert 3 not in profile_row_counts(conn)
+
+
+def test_counts_match_group_by(conn):
+    ensure_profile_stats_schema(conn)
+    # Zweiter Aufruf legt nichts doppelt an und zählt nicht erneut
+    ensure_profile_stats_schema(conn)
+    conn.execute("INSERT INTO load_value (load_profile_id, timestamp, power_kw) VALUES (2, '2024-02-01', 1.0)")
+    expected = dict(conn.execute("SELECT load_profile_id, COUNT(*) FROM load_value GROUP BY load_profile_id"))
+    assert profile_row_counts(conn) == expected
+
+    refresh_profile_stats(conn)
+    assert profile_row_counts(conn) == expected
+    assert profile_row_counts(conn, profile_ids=[]) == {}
+
+
+def test_ready_runs_schema_once_per_database(tmp_path, monkeypatch):
+    calls = []
+    original = profile_stats.ensure_profile_stats_schema
+    monkeypatch.setattr(profile_stats, 'ensure_profile_stats_schema', lambda c: calls.append(1) or original(c))
+    monkeypatch.setattr(profile_stats, '_schema_ready', set())
+
+    for _ in range(3):
+        file_conn = sqlite3.connect(str(tmp_path / 'bess.db'))
+        ensure_profile_stats_ready(file_conn)
+        file_conn.close()
+    assert len(calls) == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
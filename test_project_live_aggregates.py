@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die inkrementellen Projekt-Aggregate
+Prüft Rainflow-Zählung, Energiedurchsatz und Persistenz des ProjectLiveAggregator
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timezone
+
+from app.project_live_aggregates import StreamingRainflow, ProjectLiveAggregator
+from app.telemetry_rollups import parse_utc
+
+
+def test_rainflow_full_cycles():
+    rainflow = StreamingRainflow(hysteresis=0.5)
+    # Zwei Vollzyklen 20 % <-> 80 %
+    for soc in [20, 50, 80, 50, 20, 50, 80, 50, 20, 50, 80]:
+        rainflow.add(soc)
+
+    assert rainflow.full_cycles >= 1
+    assert abs(rainflow.equivalent_full_cycles() - 1.5) < 1e-6
+
+
+def test_rainflow_ignores_noise():
+    rainflow = StreamingRainflow(hysteresis=0.5)
+    for soc in [50.0, 50.2, 50.1, 50.3, 50.2, 50.4]:
+        rainflow.add(soc)
+
+    assert rainflow.full_cycles == 0
+    assert rainflow.equivalent_full_cycles() < 0.01
+
+
+def test_throughput_and_persistence(tmp_path):
+    db_path = str(tmp_path / 'live.db')
+    aggregator = ProjectLiveAggregator(db_path=db_path, main_db_path=str(tmp_path / 'missing.db'),
+                                       persist_interval=3600)
+    aggregator.set_mappings([('site1', 'bess1', 7)])
+
+    # 1 h mit -100 kW laden, dann 1 h mit 50 kW entladen
+    events = [
+        ('2025-01-01T00:00:00Z', -100.0, 20.0, []),
+        ('2025-01-01T01:00:00Z', 50.0, 90.0, ['OVERTEMP']),
+        ('2025-01-01T02:00:00Z', 0.0, 55.0, []),
+    ]
+    for ts, power, soc, alarms in events:
+        aggregator.on_telemetry({'site': 'site1', 'device': 'bess1', 'timestamp': ts,
+                                 'power': power, 'soc': soc, 'alarms': alarms})
+    aggregator.on_telemetry({'site': 'other', 'device': 'bess1', 'timestamp': events[0][0], 'power': 1.0})
+
+    summary = aggregator.get_project_summary(7)
+    assert summary['energy_charged_kwh'] == 0.0  # Lücke > 15 min wird nicht integriert
+    assert summary['min_soc'] == 20.0 and summary['max_soc'] == 90.0
+    assert summary['alarm_events'] == 1
+    assert summary['message_count'] == 3
+
+    aggregator.persist()
+    restored = ProjectLiveAggregator(db_path=db_path, main_db_path=str(tmp_path / 'missing.db'))
+    assert restored.get_project_summary(7)['max_soc'] == 90.0
+
+
+def test_throughput_integration(tmp_path):
+    aggregator = ProjectLiveAggregator(db_path=str(tmp_path / 'live.db'),
+                                       main_db_path=str(tmp_path / 'missing.db'), persist_interval=3600)
+    aggregator.set_mappings([('site1', 'bess1', 1)])
+
+    for minute, power in [(0, -60.0), (10, -60.0), (20, 120.0), (30, 0.0)]:
+        aggregator.on_telemetry({'site': 'site1', 'device': 'bess1',
+                                 'timestamp': f'2025-01-01T00:{minute:02d}:00Z', 'power': power})
+
+    summary = aggregator.get_project_summary(1)
+    assert abs(summary['energy_charged_kwh'] - 20.0) < 1e-6
+    assert abs(summary['energy_discharged_kwh'] - 20.0) < 1e-6
+    assert abs(summary['energy_throughput_kwh'] - 40.0) < 1e-6
+
+
+def test_parse_utc_accepts_epoch_and_iso():
+    expected = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    values = [1735732800, 1735732800.0, '1735732800', 1735732800000, '2025-01-01T12:00:00Z',
+              '2025-01-01T13:00:00+01:00', datetime(2025, 1, 1, 12, 0)]
+    parsed = [parse_utc(value) for value in values]
+    assert all(value == expected and value.tzinfo is not None for value in parsed)
+    # Gemischte Quellen (Live-Aggregat vs. BESSTelemetryData) bleiben vergleichbar
+    assert max(parsed[0], parse_utc(datetime(2025, 1, 1, 11, 59))) == expected
+    assert parse_utc('kein Zeitstempel') is None and parse_utc(None) is None
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    test_rainflow_full_cycles()
+    test_rainflow_ignores_noise()
+    test_parse_utc_accepts_epoch_and_iso()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_throughput_and_persistence(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_throughput_integration(pathlib.Path(tmp))
+    print("✅ Alle Projekt-Aggregat-Tests erfolgreich")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den Bulk-Speicherpfad der PVGIS-Solardaten
+"""
+
+import sys
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pvgis_data_fetcher import PVGISDataFetcher
+
+
+def _solar_df(year, hours, offset=0.0):
+    index = pd.date_range(f"{year}-01-01", periods=hours, freq='h')
+    irradiance = np.clip(np.sin(np.arange(hours) / 24 * 2 * np.pi) * 800, 0, None) + offset
+    df = pd.DataFrame({
+        'time': index.strftime('%Y%m%d:%H%M'),
+        'datetime': index,
+        'global_irradiance': irradiance,
+        'sun_height': np.linspace(0, 60, hours),
+        'temperature_2m': np.full(hours, 12.5),
+        'wind_speed_10m': np.full(hours, 3.0),
+    })
+    df.loc[5, 'temperature_2m'] = np.nan
+    return df
+
+
+def test_bulk_save_and_atomic_swap(tmp_path):
+    db_path = str(tmp_path / 'bess.db')
+    fetcher = PVGISDataFetcher(db_path=db_path)
+
+    result = fetcher._save_to_database(_solar_df(2020, 8784), 'hinterstoder', 2020, {'location': 'Hinterstoder'})
+    assert result == {"success": True, "records_inserted": 8784}
+
+    # Zweiter Import mit geänderten Werten und kürzerem Zeitraum ersetzt den Stand vollständig
+    result = fetcher._save_to_database(_solar_df(2020, 48, offset=1.0), 'hinterstoder', 2020, {'location': 'neu'})
+    assert result["success"]
+
+    conn = sqlite3.connect(db_path)
+    count, metadata_rows = conn.execute(
+        "SELECT COUNT(*), COUNT(metadata) FROM solar_data WHERE location_key = 'hinterstoder' AND year = 2020"
+    ).fetchone()
+    header = conn.execute("SELECT records FROM solar_data_header WHERE location_key = 'hinterstoder'").fetchone()
+    conn.close()
+
+    assert count == 48
+    assert metadata_rows == 0
+    assert header == (48,)
+    assert fetcher.get_solar_metadata('hinterstoder', 2020) == {'location': 'neu'}
+
+
+def test_get_solar_data_as_arrays(tmp_path):
+    fetcher = PVGISDataFetcher(db_path=str(tmp_path / 'bess.db'))
+    df = _solar_df(2019, 72)
+    fetcher._save_to_database(df, 'hinterstoder', 2019, {})
+
+    arrays = fetcher.get_solar_data_from_db('hinterstoder', 2019, as_arrays=True)
+    assert arrays['datetime'].dtype == np.dtype('datetime64[s]')
+    assert arrays['datetime'][0] == np.datetime64('2019-01-01T00:00:00')
+    assert np.allclose(arrays['global_irradiance'], df['global_irradiance'].to_numpy())
+    assert np.isnan(arrays['temperature_2m'][5])
+    assert np.isnan(arrays['beam_irradiance']).all()
+
+    # DataFrame-Pfad bleibt unverändert
+    frame = fetcher.get_solar_data_from_db('hinterstoder', 2019)
+    assert len(frame) == 72
+    assert fetcher.get_solar_data_from_db('hinterstoder', 2018, as_arrays=True) is None
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_bulk_save_and_atomic_swap(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_get_solar_data_as_arrays(pathlib.Path(tmp))
+    print("✅ PVGIS Bulk-Speicher-Tests erfolgreich")
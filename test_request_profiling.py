@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test-Script für Latenz-Histogramme, SQL-Zähler je Request und Profile langsamer Requests
+"""
+
+import sys
+import os
+import time
+import random
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app import request_profiling
+from app.request_profiling import (EndpointStats, LatencyHistogram, ProfiledConnection, RequestProfiler,
+                                   RequestStats, list_profiles, profile_path)
+
+
+def test_histogram_percentiles_with_fixed_memory():
+    histogram = LatencyHistogram()
+    size = len(histogram.counts)
+    rng = random.Random(42)
+    values = sorted(rng.lognormvariate(10, 1.2) for _ in range(20000))
+    for value in values:
+        histogram.record(value)
+
+    assert len(histogram.counts) == size and histogram.count == len(values)
+    for p in (50, 90, 99):
+        exact = values[int(len(values) * p / 100) - 1]
+        assert abs(histogram.percentile(p) - exact) / exact < 0.04
+    assert histogram.max == int(values[-1])
+
+    # Kleine Werte exakt, Überläufe am Maximum gekappt
+    small = LatencyHistogram(max_value_us=1000)
+    for value in (1, 2, 3, 5000):
+        small.record(value)
+    assert small.percentile(50) == 2 and small.max == 1000
+
+
+def test_histogram_merge_and_roundtrip():
+    a, b = EndpointStats(), EndpointStats()
+    for i in range(100):
+        a.latency.record(1000 + i)
+        b.latency.record(50000 + i)
+        b.sql_count.record(3)
+    restored = EndpointStats.from_dict(b.to_dict())
+    assert restored.summary() == b.summary()
+
+    a.merge(restored)
+    assert a.latency.count == 200 and a.latency.min == 1000 and a.latency.max == 50099
+    assert 48000 < a.latency.percentile(90) <= 50099
+
+
+def test_sqlite_statements_counted_per_request():
+    conn = sqlite3.connect(':memory:', factory=ProfiledConnection)
+    conn.execute('CREATE TABLE project (id INTEGER PRIMARY KEY)')
+    stats = RequestStats()
+    token = request_profiling._current_stats.set(stats)
+    try:
+        conn.executemany('INSERT INTO project (id) VALUES (?)', [(i,) for i in range(10)])
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM project')
+        assert cursor.fetchall() == [(10,)]
+    finally:
+        request_profiling._current_stats.reset(token)
+    assert stats.sql_count == 2 and stats.sql_time > 0
+    # Außerhalb eines Requests wird nichts gezählt
+    conn.execute('SELECT 1')
+    assert stats.sql_count == 2
+    conn.close()
+
+
+def test_slow_requests_are_profiled(tmp_path):
+    flask = pytest.importorskip('flask')
+    app = flask.Flask(__name__)
+    profiler = RequestProfiler(mode='profile', slow_ms=0, sample_rate=1.0, profile_dir=str(tmp_path))
+    profiler.init_app(app)
+
+    @app.route('/api/dashboard/stats')
+    def stats():
+        conn = sqlite3.connect(':memory:', factory=ProfiledConnection)
+        conn.execute('SELECT 1')
+        conn.execute('SELECT 2')
+        conn.close()
+        return flask.jsonify({'ok': True})
+
+    response = app.test_client().get('/api/dashboard/stats')
+    assert response.status_code == 200
+    assert 'desc="2 Abfragen"' in response.headers['Server-Timing']
+
+    report = profiler.endpoint_report(all_workers=False)
+    assert report[0]['endpoint'] == 'stats' and report[0]['count'] == 1
+    assert report[0]['sql_per_request_p50'] == 2
+
+    profiles = list_profiles(str(tmp_path))
+    assert len(profiles) == 1 and profiles[0]['sql_count'] == 2
+    assert profile_path(str(tmp_path), profiles[0]['id']) is not None
+    assert profile_path(str(tmp_path), '../bess') is None
+
+    # Zusammenführung über die abgelegten Stände der Worker
+    profiler.dump_stats()
+    os.rename(tmp_path / f'stats_{os.getpid()}.json', tmp_path / 'stats_1.json')
+    assert profiler.endpoint_report()[0]['count'] == 2
+
+    # Stände beendeter Worker außerhalb des Zusammenführungsfensters werden beim Ablegen gelöscht
+    stale = tmp_path / 'stats_2.json'
+    stale.write_text((tmp_path / 'stats_1.json').read_text())
+    old = time.time() - request_profiling.STATS_MAX_AGE - 60
+    os.utime(stale, (old, old))
+    profiler.dump_stats()
+    assert not stale.exists() and (tmp_path / 'stats_1.json').exists()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
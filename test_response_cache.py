@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den ETag/304-Response-Cache und die Datenversionszähler
+"""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app import response_cache
+from app.response_cache import ResponseStore, compute_etag, ensure_version_schema, invalidate, read_versions
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = tmp_path / 'bess.db'
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE project (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE grid_tariff (id INTEGER PRIMARY KEY, name TEXT);
+        INSERT INTO project (name) VALUES ('Hinterstoder');
+    """)
+    conn.commit()
+    ensure_version_schema(conn)
+    conn.close()
+    monkeypatch.setattr(response_cache, '_db_path', lambda: str(path))
+    response_cache.forget_versions()
+    response_cache.response_store.clear()
+    yield path
+    response_cache.forget_versions()
+
+
+def test_triggers_bump_versions(db):
+    conn = sqlite3.connect(db)
+    before = read_versions(['project', 'grid_tariff'], conn)
+    conn.execute("INSERT INTO project (name) VALUES ('Neu')")
+    conn.execute("UPDATE project SET name = 'Umbenannt' WHERE id = 1")
+    conn.execute("DELETE FROM project WHERE id = 2")
+    conn.commit()
+    after = read_versions(['project', 'grid_tariff'], conn)
+    assert after['project'][0] == before['project'][0] + 3
+    assert after['grid_tariff'] == before['grid_tariff']
+    assert after['project'][1] is not None
+
+    # Tags ohne Tabelle werden explizit hochgezählt
+    invalidate('pvgis_catalogue', conn=conn)
+    invalidate('pvgis_catalogue', conn=conn)
+    assert read_versions(['pvgis_catalogue'], conn)['pvgis_catalogue'][0] == 2
+    conn.close()
+
+
+def test_etag_and_lru_store():
+    assert compute_etag('stats', {'a': 1}, [('x', '1')]) == compute_etag('stats', {'a': 1}, [('x', '1')])
+    assert compute_etag('stats', {'project': 1}) != compute_etag('stats', {'project': 2})
+
+    store = ResponseStore(max_entries=2)
+    store.set('a', (b'1', 200, 'application/json'))
+    store.set('b', (b'2', 200, 'application/json'))
+    store.get('a')
+    store.set('c', (b'3', 200, 'application/json'))
+    assert store.get('b') is None and store.get('a') is not None
+    assert store.stats() == {'entries': 2, 'hits': 2, 'misses': 1}
+
+
+def test_shared_cache_errors_fall_back_to_local():
+    class Broken:
+        def get(self, key):
+            raise ConnectionError('redis weg')
+
+        def set(self, key, value, timeout=None):
+            raise ConnectionError('redis weg')
+
+    store = ResponseStore(shared=Broken())
+    store.set('a', (b'1', 200, 'application/json'))
+    assert store.get('a') == (b'1', 200, 'application/json')
+    assert store.get('b') is None
+
+
+def test_conditional_requests(db):
+    flask = pytest.importorskip('flask')
+    app = flask.Flask(__name__)
+    calls = []
+
+    @app.route('/api/projects-count')
+    @response_cache.cached_response('project')
+    def projects_count():
+        calls.append(1)
+        conn = sqlite3.connect(db)
+        count = conn.execute('SELECT COUNT(*) FROM project').fetchone()[0]
+        conn.close()
+        return flask.jsonify({'count': count})
+
+    client = app.test_client()
+    first = client.get('/api/projects-count')
+    assert first.status_code == 200 and first.headers['X-Cache-Status'] == 'MISS'
+    etag = first.headers['ETag']
+
+    # Gleiche Daten: 304 ohne View-Aufruf bzw. Body aus dem Cache
+    assert client.get('/api/projects-count', headers={'If-None-Match': etag}).status_code == 304
+    cached = client.get('/api/projects-count')
+    assert cached.headers['X-Cache-Status'] == 'HIT' and cached.get_json() == {'count': 1}
+    assert len(calls) == 1
+
+    # Schreibzugriff: neue Version, neuer ETag, neue Daten
+    conn = sqlite3.connect(db)
+    conn.execute("INSERT INTO project (name) VALUES ('Neu')")
+    conn.commit()
+    conn.close()
+    response_cache.forget_versions()
+    fresh = client.get('/api/projects-count', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200 and fresh.get_json() == {'count': 2}
+    assert fresh.headers['ETag'] != etag
+
+
+def test_error_fallback_is_not_cached(db):
+    flask = pytest.importorskip('flask')
+    app = flask.Flask(__name__)
+    failures = [False, True]  # pop(): erst Fehler, dann Erfolg
+
+    @app.route('/api/stats')
+    @response_cache.cached_response('project')
+    def stats():
+        if failures.pop():
+            # Fallback-Body wie in api_dashboard_stats: Nullwerte, aber Status 500
+            return flask.jsonify({'error': 'db gesperrt', 'projects_count': 0}), 500
+        return flask.jsonify({'projects_count': 1})
+
+    client = app.test_client()
+    failed = client.get('/api/stats')
+    assert failed.status_code == 500 and 'X-Cache-Status' not in failed.headers
+    recovered = client.get('/api/stats')
+    assert recovered.status_code == 200 and recovered.get_json() == {'projects_count': 1}
+    assert recovered.headers['X-Cache-Status'] == 'MISS'
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
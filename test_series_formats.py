@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Antwortformate der Zeitreihen-APIs (JSON, Spalten-JSON, MessagePack, Arrow)
+"""
+
+import sys
+import os
+import json
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from app import series_formats
+from app.series_formats import compact_columns, dumps_json, encode_series, format_from
+
+ROWS = [
+    {'timestamp': f"2024-01-01 {h:02d}:{m:02d}:00", 'value': float(h * 4 + m // 15), 'energy_kwh': None}
+    for h in range(24) for m in (0, 15, 30, 45)
+]
+PAYLOAD = {'success': True, 'data': ROWS, 'count': len(ROWS)}
+
+
+def test_format_negotiation():
+    assert format_from({}) == 'json'
+    assert format_from({'format': 'columns'}) == 'columns'
+    assert format_from({'format': 'unbekannt'}, 'application/x-msgpack') == 'msgpack'
+    assert format_from({}, 'text/html, application/vnd.apache.arrow.stream;q=0.9') == 'arrow'
+    assert format_from({}, 'application/json') == 'json'
+
+
+def test_compact_columns_regular_and_irregular():
+    compact = compact_columns(ROWS, ['value', 'energy_kwh'])
+    assert compact['t0'] == '2024-01-01 00:00:00'
+    assert compact['dt'] == 900 and compact['count'] == 96
+    assert 'timestamps' not in compact
+    assert compact['values'][:3] == [0.0, 1.0, 2.0]
+    assert compact['series']['energy_kwh'][0] is None
+
+    irregular = compact_columns(ROWS[:3] + ROWS[10:12], ['value'])
+    assert irregular['dt'] is None and len(irregular['timestamps']) == 5
+
+
+def test_json_and_columns_roundtrip():
+    rows_body = json.loads(encode_series(PAYLOAD, 'json', ['value']))
+    assert rows_body == json.loads(json.dumps(PAYLOAD))
+
+    columns_body = encode_series(PAYLOAD, 'columns', ['value', 'energy_kwh'])
+    decoded = json.loads(columns_body)
+    assert decoded['format'] == 'columns' and decoded['count'] == 96
+    assert decoded['data']['values'] == [row['value'] for row in ROWS]
+    assert len(columns_body) < len(encode_series(PAYLOAD, 'json', ['value'])) / 2
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_dumps_json_matches_jsonify_for_dates_and_decimal(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip('orjson')
+    monkeypatch.setattr(series_formats, 'ORJSON_AVAILABLE', use_orjson)
+    body = json.loads(dumps_json({
+        'naive': datetime(2024, 1, 2, 3, 4, 5),
+        'aware': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=1))),
+        'day': date(2024, 1, 2),
+        'price': Decimal('1.50'),
+    }))
+    assert body == {
+        'naive': 'Tue, 02 Jan 2024 03:04:05 GMT',
+        'aware': 'Tue, 02 Jan 2024 02:04:05 GMT',
+        'day': 'Tue, 02 Jan 2024 00:00:00 GMT',
+        'price': '1.50',
+    }
+
+
+def test_series_response_fallback_does_not_raise(monkeypatch):
+    flask = pytest.importorskip('flask')
+
+    def broken(*args, **kwargs):
+        raise TypeError('nicht serialisierbar')
+
+    monkeypatch.setattr(series_formats, 'encode_series', broken)
+    with flask.Flask(__name__).test_request_context('/?format=json'):
+        response = series_formats.series_response({'data': [{'value': object()}], 'price': Decimal('2')}, ['value'])
+    assert response.status_code == 200
+    assert json.loads(response.get_data())['price'] == '2'
+
+
+def test_msgpack():
+    msgpack = pytest.importorskip('msgpack')
+    decoded = msgpack.unpackb(encode_series(PAYLOAD, 'msgpack', ['value']))
+    assert decoded['data']['dt'] == 900 and len(decoded['data']['values']) == 96
+
+
+def test_arrow():
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.ipc
+    table = pa.ipc.open_stream(encode_series(PAYLOAD, 'arrow', ['value'])).read_all()
+    assert table.num_rows == 96
+    assert str(table.schema.field('timestamp').type) == 'timestamp[s]'
+    assert json.loads(table.schema.metadata[b'bess'])['count'] == 96
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den Telemetrie-Decoder
+Prüft Geräteprofile aus Modbus-Registerkarten, deren Zuordnung bei der
+Geräteregistrierung und den Zähler verworfener Nachrichten
+"""
+
+import sys
+import os
+import sqlite3
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app import telemetry_decoder as decoder_module
+from app.telemetry_decoder import DeviceProfile, TelemetryDecoder, assign_device_profile, get_device_profile
+
+REGISTER_MAP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'live', 'modbus', 'register_maps')
+
+
+def test_register_map_profile_scales_fields():
+    profile = DeviceProfile.from_register_map(os.path.join(REGISTER_MAP_DIR, 'generic_bess.yaml'))
+    assert profile.name == 'generic_bess'
+    assert ('p_batt', 'power', 0.001) in profile.entries
+    assert profile.mapped_columns >= {'soc', 'voltage_dc', 'current_dc', 'power'}
+
+
+def test_assigned_profile_only_applies_to_its_device():
+    decoder = TelemetryDecoder()
+    assert decoder.load_register_maps(REGISTER_MAP_DIR) == ['generic_bess']
+    decoder.assign_profile('site1', 'modbus1', 'generic_bess')
+
+    columns = decoder.decode_batch([
+        ('site1', 'modbus1', {'timestamp': '2025-01-01T00:00:00', 'soc': 55, 'p_batt': 12000}),
+        ('site1', 'mqtt1', {'ts': '2025-01-01T00:00:00', 'soc': 60, 'p': 3.5}),
+    ])
+    assert columns['power'] == [12.0, 3.5]
+    assert columns['soc'] == [55.0, 60.0]
+
+    with pytest.raises(ValueError):
+        decoder.assign_profile('site1', 'modbus1', 'unbekannt')
+    decoder.assign_profile('site1', 'modbus1', None)
+    assert decoder.profile_for('site1', 'modbus1') is decoder.default_profile
+
+
+def test_assignment_is_persisted_for_other_processes(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'live.db')
+    monkeypatch.setattr(decoder_module, 'telemetry_decoder', TelemetryDecoder())
+    monkeypatch.setattr(decoder_module, '_register_maps_loaded', False)
+    monkeypatch.setattr(decoder_module, 'REGISTER_MAP_DIR', REGISTER_MAP_DIR)
+
+    assign_device_profile('site1', 'modbus1', 'generic_bess', db_path=db_path)
+    assert get_device_profile('site1', 'modbus1', db_path=db_path) == 'generic_bess'
+
+    # Anderer Prozess: eigener Decoder lädt die gespeicherte Zuordnung
+    other = TelemetryDecoder()
+    other.load_register_maps(REGISTER_MAP_DIR)
+    assert other.load_assignments(sqlite3.connect(db_path)) == 1
+    assert other.profile_for('site1', 'modbus1').name == 'generic_bess'
+
+    assign_device_profile('site1', 'modbus1', None, db_path=db_path)
+    assert get_device_profile('site1', 'modbus1', db_path=db_path) is None
+    assert other.load_assignments(sqlite3.connect(db_path)) == 0
+
+
+def test_dropped_messages_are_reported(tmp_path, monkeypatch):
+    pytest.importorskip('paho.mqtt.client')
+    monkeypatch.setenv('LIVE_BESS_DB_PATH', str(tmp_path / 'live.db'))
+    monkeypatch.setenv('MQTT_INGEST_QUEUE_SIZE', '2')
+    from app.mqtt_bridge import BESSMQTTBridge
+
+    bridge = BESSMQTTBridge()
+    for _ in range(5):
+        bridge.on_message(None, None, SimpleNamespace(topic='bess/site1/bess1/telemetry', payload=b'{}'))
+    stats = bridge.get_ingest_stats()
+    assert stats['queue_size'] == 2 and stats['dropped_messages'] == 3
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Telemetrie-Retention
+Prüft, dass beim Löschen von Rohdaten keine Messwerte in den Rollups verloren gehen
+"""
+
+import sys
+import os
+import sqlite3
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app.telemetry_retention import TelemetryRetentionManager
+from app.telemetry_rollups import ROLLUP_TABLE, TelemetryRollupStore
+
+HOUR = 1_699_999_200  # 2023-11-14 22:00:00 UTC
+
+
+def _live_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE live_bess_telemetry (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, site TEXT NOT NULL, device TEXT NOT NULL,
+            timestamp TEXT NOT NULL, soc REAL, power REAL, power_charge REAL, power_discharge REAL,
+            voltage_dc REAL, current_dc REAL, temperature_max REAL, soh REAL, alarms TEXT,
+            raw_data TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    TelemetryRollupStore(path).init_schema(conn.cursor())
+    return conn
+
+
+def _insert(conn, minute, with_rollup=False):
+    record = {
+        'site': 'site1', 'device': 'bess1', 'soc': 40.0 + minute,
+        'timestamp': datetime.fromtimestamp(HOUR + minute * 60, timezone.utc).isoformat()
+    }
+    conn.execute("""
+        INSERT INTO live_bess_telemetry (site, device, timestamp, soc, created_at)
+        VALUES (?, ?, ?, ?, '2020-01-01 00:00:00')
+    """, (record['site'], record['device'], record['timestamp'], record['soc']))
+    if with_rollup:
+        TelemetryRollupStore(':memory:').update(conn.cursor(), record)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return TelemetryRetentionManager(
+        live_db_path=str(tmp_path / 'live.db'), main_db_path=str(tmp_path / 'main.db'),
+        config={'batch_size': 10, 'raw_hot_days': 0, 'archive_enabled': False},
+        stats_file=str(tmp_path / 'retention_stats.json')
+    )
+
+
+def _hourly(conn):
+    return conn.execute(f"""
+        SELECT sample_count, soc_n, soc_min, soc_max FROM {ROLLUP_TABLE}
+        WHERE tier_seconds = 3600 AND bucket_start = ?
+    """, (HOUR,)).fetchone()
+
+
+def test_hour_split_across_batches_is_fully_rolled_up(manager):
+    conn = _live_db(manager.live_db_path)
+    for minute in range(30):
+        _insert(conn, minute)
+    conn.commit()
+
+    assert manager.expire_live_telemetry(conn) == 30
+    assert conn.execute('SELECT COUNT(*) FROM live_bess_telemetry').fetchone() == (0,)
+    assert _hourly(conn) == (30, 30, 40.0, 69.0)
+
+
+def test_rows_rolled_up_at_ingest_are_not_counted_twice(manager):
+    conn = _live_db(manager.live_db_path)
+    # 20 Zeilen vor Einführung der Rollups, 10 danach (beim Ingest aggregiert)
+    for minute in range(30):
+        _insert(conn, minute, with_rollup=minute >= 20)
+    conn.commit()
+
+    assert manager.expire_live_telemetry(conn) == 30
+    assert _hourly(conn) == (30, 30, 40.0, 69.0)
+    # Zweiter Lauf: nichts mehr zu löschen, Rollups unverändert
+    assert manager.expire_live_telemetry(conn) == 0
+    assert _hourly(conn) == (30, 30, 40.0, 69.0)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Telemetrie-Rollups
+Prüft Bucket-Berechnung, Stufenauswahl, Aggregation und den einmaligen Backfill
+"""
+
+import sys
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app.telemetry_rollups import (BACKFILL_TABLE, ROLLUP_TABLE, ROLLUP_TIERS, TelemetryRollupStore,
+                                   parse_timestamp, select_tier)
+
+BASE = 1_700_000_000  # 2023-11-14 22:13:20 UTC
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _raw_schema(conn):
+    conn.execute("""
+        CREATE TABLE live_bess_telemetry (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, site TEXT, device TEXT, timestamp TEXT,
+            soc REAL, power REAL, voltage_dc REAL, current_dc REAL, temperature_max REAL
+        )
+    """)
+
+
+def test_bucket_boundaries_per_tier():
+    store = TelemetryRollupStore(':memory:')
+    rows = store.rollup_rows({'site': 's', 'device': 'd', 'timestamp': BASE + 59, 'soc': 50.0})
+    assert [row[0] for row in rows] == list(ROLLUP_TIERS)
+    for tier, _, _, bucket_start, *_ in rows:
+        assert bucket_start % tier == 0 and bucket_start <= BASE + 59 < bucket_start + tier
+    assert parse_timestamp('2023-11-14T22:13:20Z') == BASE
+
+
+def test_select_tier_prefers_finest_fitting_tier():
+    assert select_tier(3600, 300) == 60            # 60 Buckets
+    assert select_tier(24 * 3600, 300) == 900      # 1440 > 300, 96 <= 300
+    assert select_tier(30 * 86400, 300) == 3600    # grobe Stufe als Obergrenze
+    assert select_tier(24 * 3600, 1440) == 60      # Grenzfall: genau max_points
+
+
+def test_upsert_aggregates_min_max_avg_last():
+    conn = sqlite3.connect(':memory:')
+    store = TelemetryRollupStore(':memory:')
+    store.init_schema(conn.cursor())
+    records = [
+        {'site': 's', 'device': 'd', 'timestamp': BASE + 1, 'soc': 40.0, 'power': None},
+        {'site': 's', 'device': 'd', 'timestamp': BASE + 30, 'soc': 60.0, 'power': 5.0},
+        {'site': 's', 'device': 'd', 'timestamp': BASE + 10, 'soc': 50.0, 'power': 7.0},
+    ]
+    store.update_many(conn.cursor(), records)
+    row = conn.execute(f"""
+        SELECT sample_count, soc_min, soc_max, soc_sum / soc_n, soc_last, power_n, power_last
+        FROM {ROLLUP_TABLE} WHERE tier_seconds = 3600
+    """).fetchone()
+    # Letzter Wert folgt dem Zeitstempel, nicht der Eingangsreihenfolge
+    assert row == (3, 40.0, 60.0, 50.0, 60.0, 2, 5.0)
+
+
+def test_backfill_runs_once_and_skips_rows_already_rolled_up():
+    conn = sqlite3.connect(':memory:')
+    store = TelemetryRollupStore(':memory:')
+    _raw_schema(conn)
+    store.init_schema(conn.cursor())
+
+    insert = 'INSERT INTO live_bess_telemetry (site, device, timestamp, soc) VALUES (?, ?, ?, ?)'
+    old = [('s', 'd', _iso(BASE - 7200 + i * 60), 50.0) for i in range(25)]
+    conn.executemany(insert, old)
+    # Nach der Einführung beim Ingest erfasst: Rohzeile und Rollup existieren bereits
+    live = {'site': 's', 'device': 'd', 'timestamp': _iso(BASE), 'soc': 70.0}
+    conn.execute(insert, ('s', 'd', _iso(BASE), 70.0))
+    store.update(conn.cursor(), live)
+    conn.commit()
+
+    assert store.backfill(conn, batch_size=10) == 25
+    assert store.backfill(conn) == 0
+    assert conn.execute(f"SELECT completed_at IS NOT NULL FROM {BACKFILL_TABLE}").fetchone() == (1,)
+
+    counts = conn.execute(f"""
+        SELECT tier_seconds, SUM(sample_count) FROM {ROLLUP_TABLE} GROUP BY tier_seconds
+    """).fetchall()
+    assert counts == [(tier, 26) for tier in ROLLUP_TIERS]
+
+
+def test_parallel_backfills_count_each_row_once(tmp_path):
+    path = str(tmp_path / 'bess.db')
+    conn = sqlite3.connect(path)
+    _raw_schema(conn)
+    TelemetryRollupStore(path).init_schema(conn.cursor())
+    conn.executemany('INSERT INTO live_bess_telemetry (site, device, timestamp, soc) VALUES (?, ?, ?, ?)',
+                     [('s', 'd', _iso(BASE + i * 60), 50.0) for i in range(200)])
+    conn.commit()
+
+    # Wie mehrere Prozesse (Retention-Job, manueller Lauf) mit kleinen Batches
+    totals = []
+
+    def run():
+        worker_conn = sqlite3.connect(path, timeout=30)
+        totals.append(TelemetryRollupStore(path).backfill(worker_conn, batch_size=3))
+        worker_conn.close()
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(totals) == 200
+    counts = conn.execute(f"""
+        SELECT tier_seconds, SUM(sample_count), SUM(soc_n) FROM {ROLLUP_TABLE} GROUP BY tier_seconds
+    """).fetchall()
+    assert counts == [(tier, 200, 200) for tier in ROLLUP_TIERS]
+    conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
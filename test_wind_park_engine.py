@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Windpark-Engine (mehrere Stationen, Wake-Verluste, Stations-Cache)
+"""
+
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from geosphere import wind_park_engine as park_engine
+
+TURBINE = {"hub_height_m": 100, "alpha": 0.14, "rated_power_kw": 4200, "loss_factor_total": 0.05}
+
+
+def _park(turbines, stations=None, wake=None):
+    return park_engine.park_config_from_dict({
+        "stations": stations or [{"station_id": "A", "lat": 48.0, "lon": 16.0}],
+        "turbines": [dict(TURBINE, **t) for t in turbines],
+        "wake": wake or {},
+    })
+
+
+def test_station_weights_idw_and_explicit():
+    park = _park(
+        turbines=[
+            {"lat": 48.0, "lon": 16.0},  # direkt an Station A
+            {"lat": 48.0, "lon": 16.25},  # genau zwischen A und B
+            {"lat": 48.0, "lon": 16.1, "station_weights": {"B": 3, "A": 1}},
+        ],
+        stations=[{"station_id": "A", "lat": 48.0, "lon": 16.0}, {"station_id": "B", "lat": 48.0, "lon": 16.5}],
+    )
+    weights = park_engine.station_weight_matrix(park)
+    assert np.allclose(weights[0], [1.0, 0.0])
+    assert np.allclose(weights[1], [0.5, 0.5])
+    assert np.allclose(weights[2], [0.25, 0.75])
+
+
+def test_jensen_wake_depends_on_direction():
+    # Zwei Anlagen 500 m Nord-Süd versetzt
+    park = _park([{"lat": 48.0, "lon": 16.0}, {"lat": 48.0 - 500 / 111_195, "lon": 16.0}])
+    deficit = park_engine.wake_deficit_by_sector(park)
+
+    north, east = 0, 9  # Sektoren à 10°
+    assert deficit[north, 0] == 0.0 and deficit[north, 1] > 0.05
+    assert np.allclose(deficit[east], 0.0)
+
+    speeds = np.full((1, 2), 9.0)
+    result = park_engine.compute_wind_park_power(speeds, np.array([[0.0, 90.0]]), park)
+    assert result["p_net"][1, 0] < result["p_gross"][1, 0]
+    assert np.isclose(result["p_net"][1, 1], result["p_gross"][1, 1])
+    assert np.allclose(result["p_net"][0], result["p_gross"][0])
+
+
+def test_missing_station_values_are_renormalised():
+    park = _park(
+        turbines=[{"lat": 48.0, "lon": 16.25}],
+        stations=[{"station_id": "A", "lat": 48.0, "lon": 16.0}, {"station_id": "B", "lat": 48.0, "lon": 16.5}],
+        wake={"model": "constant", "loss_factor": 0.0},
+    )
+    speeds = np.array([[6.0, 6.0], [np.nan, 10.0]])
+    result = park_engine.compute_wind_park_power(speeds, None, park)
+    factor = (100 / 10) ** 0.14
+    assert np.allclose(result["v_hub"][0], np.array([6.0, 8.0]) * factor)
+
+
+def test_park_pipeline_fetches_each_station_once(monkeypatch):
+    calls = []
+    index = pd.date_range("2024-01-01", periods=6 * 24 * 10, freq="10min")
+    rng = np.random.default_rng(3)
+
+    def fake_fetch(cfg):
+        calls.append((cfg.station_id, cfg.start, cfg.end))
+        return pd.DataFrame({"FF": rng.weibull(2.0, len(index)) * 7, "DD": rng.uniform(0, 360, len(index))},
+                            index=index)
+
+    monkeypatch.setattr(park_engine, "fetch_geosphere_wind_df", fake_fetch)
+    store = park_engine.StationSeriesStore()
+    config = {
+        "geosphere": {"base_url": "https://example", "resource_id": "klima-v2-10min",
+                      "parameters": ["FF", "DD"], "start": "2024-01-01T00:00", "end": "2024-01-10T23:50"},
+        "wind_park": {
+            "stations": [{"station_id": "A", "lat": 48.0, "lon": 16.0}, {"station_id": "B", "lat": 48.1, "lon": 16.3}],
+            "turbines": [dict(TURBINE, lat=48.0 + i * 0.004, lon=16.1) for i in range(8)],
+        },
+        "time_resolution": {"target_freq": "15min"},
+    }
+
+    df, kpis = park_engine.run_wind_park_pipeline(config, store=store)
+    assert len(calls) == 2
+    assert list(df.columns) == ["v_hub", "P_gross_kW", "P_net_kW", "E_kWh"]
+    assert kpis["turbine_count"] == 8 and kpis["station_count"] == 2
+    assert 0 < kpis["wake_loss_pct"] < 50
+    assert df["P_net_kW"].sum() < df["P_gross_kW"].sum()
+
+    # Teilzeitraum: komplett aus dem Store
+    config["geosphere"]["end"] = "2024-01-05T00:00"
+    park_engine.run_wind_park_pipeline(config, store=store)
+    assert len(calls) == 2
+    assert store.stats["hits"] == 2
+
+
+def test_station_store_bounded_refreshes_recent_and_persists_json(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_fetch(cfg):
+        calls.append(cfg.station_id)
+        index = pd.date_range(cfg.start, cfg.end, freq="10min", tz="UTC")
+        return pd.DataFrame({"FF": np.full(len(index), 5.0)}, index=index)
+
+    monkeypatch.setattr(park_engine, "fetch_geosphere_wind_df", fake_fetch)
+
+    def cfg(station, start="2024-01-01T00:00", end="2024-01-02T00:00"):
+        return park_engine.GeoSphereConfig(base_url="https://example", resource_id="klima-v2-10min",
+                                           station_id=station, parameters=["FF"], start=start, end=end)
+
+    store = park_engine.StationSeriesStore(str(tmp_path), max_entries=2, recent_ttl=60)
+    for station in ("A", "B", "C"):
+        store.get(cfg(station))
+    assert list(store.series) == [store._key(cfg("B")), store._key(cfg("C"))]
+    assert store.stats["evictions"] == 1
+
+    # Von der Platte (JSON) statt erneut aus dem Netz
+    assert not list(tmp_path.glob("*.pkl")) and len(list(tmp_path.glob("*.json"))) == 3
+    df = store.get(cfg("A"))
+    assert calls == ["A", "B", "C"] and str(df.index.tz) == "UTC" and df["FF"].iloc[0] == 5.0
+
+    # Bis an die Gegenwart reichender Zeitraum wird nach recent_ttl neu geladen
+    now = pd.Timestamp.now(tz="UTC").floor("h").tz_localize(None)
+    recent = cfg("R", (now - pd.Timedelta(hours=6)).strftime("%Y-%m-%dT%H:%M"), now.strftime("%Y-%m-%dT%H:%M"))
+    store.get(recent)
+    store.get(recent)
+    assert calls.count("R") == 1
+    key = store._key(recent)
+    start, end, frame, fetched_at = store.series[key]
+    store.series[key] = (start, end, frame, fetched_at - 120)
+    store.get(recent)
+    assert calls.count("R") == 2 and store.stats["refreshes"] == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -22,6 +22,9 @@ import random
 import math
 from dataclasses import dataclass
 
+import data_sources
+from fetch_cache import fetch_cache
+
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -59,6 +62,8 @@ class WeatherAPIFetcher:
         
     def _rate_limit(self):
         """Rate Limiting für API-Requests"""
+        if data_sources.is_replay():
+            return
         current_time = time.time()
         time_since_last = current_time - self.last_request_time
         
@@ -68,13 +73,15 @@ class WeatherAPIFetcher:
         
         self.last_request_time = time.time()
     
-    def _make_request(self, url: str, params: Dict = None) -> Optional[Dict]:
-        """Sichere API-Request mit Fehlerbehandlung"""
+    def _make_request(self, url: str, params: Dict = None, max_age: float = 600,
+                      immutable: bool = False) -> Optional[Dict]:
+        """Sichere API-Request mit Fehlerbehandlung (über den lokalen Response-Cache)"""
         try:
             self._rate_limit()
             
             logger.info(f"🌤️ API-Request: {url}")
-            response = requests.get(url, params=params, timeout=30)
+            response = fetch_cache.get(url, params=params, timeout=30,
+                                       max_age=max_age, immutable=immutable)
             response.raise_for_status()
             
             data = response.json()
@@ -209,7 +216,8 @@ class WeatherAPIFetcher:
             'outputformat': 'json'
         }
         
-        data = self._make_request(url, params)
+        # TMY-Daten sind statisch -> kein erneuter Abruf nötig
+        data = self._make_request(url, params, immutable=True)
         if not data:
             logger.warning("⚠️ PVGIS API nicht verfügbar - verwende Demo-Daten")
             return self._generate_pvgis_demo_data(lat, lon, start_date, end_date)
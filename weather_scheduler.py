@@ -9,6 +9,8 @@ Führt regelmäßige Imports für PV-Prognosen und BESS-Simulationen durch.
 
 Autor: Ing. Heinz Schlagintweit
 Datum: Januar 2025
+
+Hinweis: Im Dauerbetrieb durch ingestion_scheduler.py ersetzt (ein Prozess für alle Quellen).
 """
 
 import schedule